@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Browser Context Configuration Benchmark
+
+Measures navigation time, bytes transferred and request counts for a corpus of
+saved pages with and without resource blocking (see
+src/seo_leads/network/context_config.py).
+
+The corpus is a directory of pages saved with the browser's "Save page as...
+(complete)" option, i.e. each .html file next to its _files/ asset folder.
+Pages are served from a local HTTP server so timings are not dominated by the
+remote sites; third-party assets referenced by absolute URL still load from
+the network, which is what tracker blocking targets.
+
+Usage:
+    python benchmark_context_config.py --corpus saved_pages/ --runs 3
+    python benchmark_context_config.py --corpus saved_pages/ --block image,font,media --trackers
+"""
+
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import statistics
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List
+
+from src.seo_leads.network.browser_pool import AsyncBrowserPool, BrowserPoolConfig
+from src.seo_leads.network.context_config import ContextConfig, RESOURCE_TYPE_PATTERNS
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Static file handler without per-request logging"""
+
+    def log_message(self, format, *args):
+        pass
+
+def start_corpus_server(corpus_dir: Path) -> ThreadingHTTPServer:
+    """Serve the corpus directory on a free local port"""
+    handler = functools.partial(QuietHandler, directory=str(corpus_dir))
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+async def measure_page(pool: AsyncBrowserPool, url: str, context_config: ContextConfig) -> Dict:
+    """Load one page and collect timing, byte and request counts"""
+    finished = []
+    failed = []
+
+    async with pool.page("benchmark", context_config) as page:
+        page.on("requestfinished", finished.append)
+        page.on("requestfailed", failed.append)
+
+        start = time.perf_counter()
+        await page.goto(url, wait_until="load", timeout=60000)
+        navigation_ms = (time.perf_counter() - start) * 1000
+
+        sizes = await asyncio.gather(*(request.sizes() for request in finished), return_exceptions=True)
+        transferred = sum(
+            size['responseBodySize'] + size['responseHeadersSize']
+            for size in sizes
+            if isinstance(size, dict)
+        )
+
+    return {
+        'navigation_ms': navigation_ms,
+        'bytes': transferred,
+        'requests': len(finished),
+        'blocked_or_failed': len(failed)
+    }
+
+async def run_benchmark(corpus_dir: Path, runs: int, block_types: List[str], block_trackers: bool) -> Dict:
+    """Benchmark every corpus page with the baseline and the blocking configuration"""
+    pages = sorted(p for p in corpus_dir.rglob('*') if p.suffix.lower() in ('.html', '.htm'))
+    if not pages:
+        raise SystemExit(f"No .html pages found in {corpus_dir}")
+
+    configurations = {'baseline': ContextConfig(), 'blocking': ContextConfig()}
+    # Set after construction so BROWSER_BLOCK_* env overrides can't make both identical
+    configurations['baseline'].block_resource_types = ()
+    configurations['baseline'].block_trackers = False
+    configurations['blocking'].block_resource_types = tuple(block_types)
+    configurations['blocking'].block_trackers = block_trackers
+
+    server = start_corpus_server(corpus_dir)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    pool = AsyncBrowserPool(BrowserPoolConfig(pool_size=1))
+    await pool.start()
+
+    results = {name: [] for name in configurations}
+
+    try:
+        for page_path in pages:
+            url = f"{base_url}/{page_path.relative_to(corpus_dir).as_posix()}"
+            for _ in range(runs):
+                # Alternate configurations so cache/JIT warm-up affects both equally
+                for name, context_config in configurations.items():
+                    try:
+                        measurement = await measure_page(pool, url, context_config)
+                        measurement['page'] = page_path.name
+                        results[name].append(measurement)
+                    except Exception as e:
+                        logger.warning(f"{name} run failed for {page_path.name}: {e}")
+    finally:
+        await pool.close()
+        server.shutdown()
+
+    summary = {}
+    for name, measurements in results.items():
+        if not measurements:
+            continue
+        summary[name] = {
+            'median_navigation_ms': statistics.median(m['navigation_ms'] for m in measurements),
+            'mean_bytes': statistics.mean(m['bytes'] for m in measurements),
+            'mean_requests': statistics.mean(m['requests'] for m in measurements),
+            'samples': len(measurements)
+        }
+
+    if 'baseline' in summary and 'blocking' in summary:
+        baseline, blocking = summary['baseline'], summary['blocking']
+        summary['reduction'] = {
+            'navigation_time_pct': 100 * (1 - blocking['median_navigation_ms'] / baseline['median_navigation_ms']),
+            'bytes_pct': 100 * (1 - blocking['mean_bytes'] / baseline['mean_bytes']) if baseline['mean_bytes'] else 0.0,
+            'requests_pct': 100 * (1 - blocking['mean_requests'] / baseline['mean_requests']) if baseline['mean_requests'] else 0.0
+        }
+
+    return {
+        'corpus': str(corpus_dir),
+        'pages': len(pages),
+        'runs_per_page': runs,
+        'blocked_resource_types': block_types,
+        'block_trackers': block_trackers,
+        'summary': summary,
+        'measurements': results
+    }
+
+def print_summary(report: Dict):
+    """Print the benchmark summary table"""
+    print("\n🚀 BROWSER CONTEXT CONFIGURATION BENCHMARK")
+    print("=" * 60)
+    print(f"Corpus: {report['corpus']} ({report['pages']} pages x {report['runs_per_page']} runs)")
+    print(f"Blocked: {', '.join(report['blocked_resource_types']) or 'none'}"
+          f"{' + trackers' if report['block_trackers'] else ''}")
+    print()
+    print(f"{'Configuration':<14}{'Median nav (ms)':>18}{'Mean KB':>12}{'Mean requests':>16}")
+
+    for name in ('baseline', 'blocking'):
+        stats = report['summary'].get(name)
+        if stats:
+            print(f"{name:<14}{stats['median_navigation_ms']:>18.0f}{stats['mean_bytes'] / 1024:>12.0f}"
+                  f"{stats['mean_requests']:>16.1f}")
+
+    reduction = report['summary'].get('reduction')
+    if reduction:
+        print()
+        print(f"Navigation time: -{reduction['navigation_time_pct']:.1f}%")
+        print(f"Bytes transferred: -{reduction['bytes_pct']:.1f}%")
+        print(f"Requests: -{reduction['requests_pct']:.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Playwright resource blocking on saved pages")
+    parser.add_argument('--corpus', required=True, type=Path, help='Directory of saved .html pages')
+    parser.add_argument('--runs', type=int, default=3, help='Runs per page per configuration')
+    parser.add_argument('--block', default='image,media,font,stylesheet',
+                        help=f"Resource types to block ({', '.join(RESOURCE_TYPE_PATTERNS)})")
+    parser.add_argument('--trackers', action='store_true', help='Also block known third-party trackers')
+    args = parser.parse_args()
+
+    block_types = [t.strip() for t in args.block.split(',') if t.strip()]
+    unknown = set(block_types) - set(RESOURCE_TYPE_PATTERNS)
+    if unknown:
+        parser.error(f"Unknown resource types: {', '.join(sorted(unknown))}")
+    report = asyncio.run(run_benchmark(args.corpus, args.runs, block_types, args.trackers))
+
+    print_summary(report)
+
+    output_file = f"context_config_benchmark_results_{int(time.time())}.json"
+    with open(output_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved to {output_file}")
+
+if __name__ == "__main__":
+    main()
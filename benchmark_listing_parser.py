@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Directory Listing Parser Microbenchmark
+
+Times the CPU cost of turning saved directory search results pages into
+companies, comparing the old path (two html.parser soups per page: one for the
+listings, one for has_next_page) with the current one (a single tree from
+src/seo_leads/fetchers/listing_parser.py shared by both).
+
+The corpus is a directory of listing pages saved from a directory's search
+results (page.content() or "Save page as... (HTML only)"). With --source the
+pages are run through that fetcher's parse_listing and has_next_page, and the
+company counts from both paths are compared so a builder difference that
+changes extraction shows up next to the timings.
+
+Usage:
+    python benchmark_listing_parser.py --corpus saved_listings/yell/ --source yell
+    python benchmark_listing_parser.py --corpus saved_listings/ --selector "div.businessCapsule" --runs 20
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from bs4 import BeautifulSoup
+
+from src.seo_leads.fetchers import get_fetcher
+from src.seo_leads.fetchers.listing_parser import LISTING_PARSER, parse_listing_html
+
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def baseline_parse(html: str, extract: Callable[[BeautifulSoup], int],
+                   paginate: Callable[[BeautifulSoup], bool]) -> int:
+    """Previous behaviour: one html.parser soup for listings, a second for pagination"""
+    found = extract(BeautifulSoup(html, 'html.parser'))
+    paginate(BeautifulSoup(html, 'html.parser'))
+    return found
+
+def single_parse(html: str, extract: Callable[[BeautifulSoup], int],
+                 paginate: Callable[[BeautifulSoup], bool]) -> int:
+    """Current behaviour: one tree shared by listings and pagination"""
+    soup = parse_listing_html(html)
+    found = extract(soup)
+    paginate(soup)
+    return found
+
+def build_steps(source: Optional[str], selector: Optional[str]):
+    """Listing extraction and pagination callables for a fetcher or a bare selector"""
+    if source:
+        fetcher = get_fetcher(source)
+
+        def extract(soup: BeautifulSoup) -> int:
+            return len(fetcher._parse_search_results(soup, 'Benchmark'))
+
+        return extract, fetcher.has_next_page, fetcher.get_listing_selector()
+
+    def extract(soup: BeautifulSoup) -> int:
+        return len(soup.select(selector)) if selector else 0
+
+    return extract, (lambda soup: False), selector
+
+def time_path(parse: Callable, html: str, extract, paginate, runs: int) -> Dict:
+    """Median wall time of one parse path over several runs"""
+    timings = []
+    found = 0
+    for _ in range(runs):
+        start = time.perf_counter()
+        found = parse(html, extract, paginate)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {'median_ms': statistics.median(timings), 'companies': found}
+
+def run_benchmark(corpus_dir: Path, runs: int, source: Optional[str], selector: Optional[str]) -> Dict:
+    """Benchmark both parse paths on every corpus page"""
+    pages = sorted(p for p in corpus_dir.rglob('*') if p.suffix.lower() in ('.html', '.htm'))
+    if not pages:
+        raise SystemExit(f"No .html pages found in {corpus_dir}")
+
+    extract, paginate, selector = build_steps(source, selector)
+    measurements: List[Dict] = []
+
+    for page_path in pages:
+        html = page_path.read_text(encoding='utf-8', errors='replace')
+        baseline = time_path(baseline_parse, html, extract, paginate, runs)
+        current = time_path(single_parse, html, extract, paginate, runs)
+
+        if baseline['companies'] != current['companies']:
+            logger.warning(f"{page_path.name}: {baseline['companies']} companies with html.parser, "
+                           f"{current['companies']} with {LISTING_PARSER}")
+
+        measurements.append({
+            'page': page_path.name,
+            'kb': len(html.encode('utf-8')) / 1024,
+            'baseline_ms': baseline['median_ms'],
+            'single_parse_ms': current['median_ms'],
+            'baseline_companies': baseline['companies'],
+            'single_parse_companies': current['companies']
+        })
+
+    baseline_total = sum(m['baseline_ms'] for m in measurements)
+    current_total = sum(m['single_parse_ms'] for m in measurements)
+
+    return {
+        'corpus': str(corpus_dir),
+        'pages': len(pages),
+        'runs_per_page': runs,
+        'source': source,
+        'selector': selector,
+        'parser': LISTING_PARSER,
+        'summary': {
+            'baseline_ms_per_page': baseline_total / len(measurements),
+            'single_parse_ms_per_page': current_total / len(measurements),
+            'speedup': baseline_total / current_total if current_total else 0.0,
+            'pages_with_count_mismatch': sum(
+                1 for m in measurements if m['baseline_companies'] != m['single_parse_companies']
+            )
+        },
+        'measurements': measurements
+    }
+
+def print_summary(report: Dict):
+    """Print the benchmark summary table"""
+    print("\n🚀 DIRECTORY LISTING PARSER BENCHMARK")
+    print("=" * 60)
+    print(f"Corpus: {report['corpus']} ({report['pages']} pages x {report['runs_per_page']} runs)")
+    print(f"Fetcher: {report['source'] or 'none'}  Selector: {report['selector'] or 'none'}")
+    print()
+    print(f"{'Page':<32}{'KB':>8}{'2x html.parser':>16}{'1x ' + report['parser']:>16}")
+
+    for m in report['measurements']:
+        print(f"{m['page'][:31]:<32}{m['kb']:>8.0f}{m['baseline_ms']:>14.1f}ms{m['single_parse_ms']:>14.1f}ms")
+
+    summary = report['summary']
+    print()
+    print(f"Mean per page: {summary['baseline_ms_per_page']:.1f}ms -> {summary['single_parse_ms_per_page']:.1f}ms "
+          f"({summary['speedup']:.1f}x)")
+    if summary['pages_with_count_mismatch']:
+        print(f"⚠️  {summary['pages_with_count_mismatch']} pages extracted a different number of companies")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark directory listing page parsing on saved pages")
+    parser.add_argument('--corpus', required=True, type=Path, help='Directory of saved listing .html pages')
+    parser.add_argument('--source', default=None, help='Fetcher to run parse_listing/has_next_page with (e.g. yell)')
+    parser.add_argument('--selector', default=None, help='Listing CSS selector when no --source is given')
+    parser.add_argument('--runs', type=int, default=10, help='Runs per page per path')
+    args = parser.parse_args()
+
+    report = run_benchmark(args.corpus, args.runs, args.source, args.selector)
+
+    print_summary(report)
+
+    output_file = f"listing_parser_benchmark_results_{int(time.time())}.json"
+    with open(output_file, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n💾 Results saved to {output_file}")
+
+if __name__ == "__main__":
+    main()
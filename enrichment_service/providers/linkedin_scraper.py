@@ -22,6 +22,12 @@ from ..core.director_models import (
     LinkedInProfile, ContactHints, Director, DataSource, FreeDataBundle
 )
 
+try:
+    # Shared (optionally cross-process) LinkedIn budget when run alongside the SEO pipeline
+    from src.seo_leads.network.rate_limiter import LINKEDIN_RATE_KEY, RateLimit, get_rate_limiter
+except ImportError:
+    get_rate_limiter = None
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,6 +69,13 @@ class RateLimiter:
     
     async def acquire(self):
         """Acquire rate limit permission"""
+        if get_rate_limiter is not None:
+            await get_rate_limiter().acquire(
+                LINKEDIN_RATE_KEY,
+                RateLimit.per_window(self.requests_per_minute, 60)
+            )
+            return
+        
         async with self.lock:
             now = datetime.now()
             # Remove requests older than 1 minute
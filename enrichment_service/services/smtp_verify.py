@@ -19,6 +19,18 @@ from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_excep
 
 from enrichment_service.core.models import EmailValidation
 
+try:
+    # Shared (optionally cross-process) per-domain budget when run alongside the SEO pipeline
+    from src.seo_leads.network.rate_limiter import RateLimit, get_rate_limiter
+except ImportError:
+    get_rate_limiter = None
+
+try:
+    # Process-wide async DNS cache with negative caching
+    from src.seo_leads.network.dns_cache import get_dns_cache
+except ImportError:
+    get_dns_cache = None
+
 @dataclass
 class SMTPVerificationResult:
     """SMTP verification result"""
@@ -153,6 +165,13 @@ class AsyncSMTPVerifier:
     
     async def _get_mx_records(self, domain: str) -> List[str]:
         """Get MX records for domain"""
+        if get_dns_cache is not None:
+            # Shared resolver cache honours record TTLs, so no local caching
+            try:
+                return await get_dns_cache().mx(domain)
+            except Exception:
+                return []
+        
         if domain in self.mx_cache:
             mx_records, cached_time = self.mx_cache[domain]
             if datetime.utcnow() - cached_time < self.cache_ttl:
@@ -290,6 +309,14 @@ class AsyncSMTPVerifier:
     
     async def _enforce_rate_limit(self, domain: str):
         """Enforce rate limiting per domain"""
+        if get_rate_limiter is not None:
+            await get_rate_limiter().acquire(
+                f"smtp_{domain}",
+                RateLimit.per_interval(self.domain_min_interval.total_seconds())
+            )
+            self.domain_last_check[domain] = datetime.utcnow()
+            return
+        
         now = datetime.utcnow()
         if domain in self.domain_last_check:
             time_since_last = now - self.domain_last_check[domain]
@@ -5,6 +5,7 @@ RSS feeds, JSON APIs, HTML scraping, and headless browser automation.
 
 The module is organized into:
 - browser_pool: Browser context management for headless fetching
+- async_browser_pool: Asyncio browser context pool for concurrent headless fetching
 - base_fetcher: Core Fetcher class and common functionality  
 - parsers: Site-specific HTML parsers
 - headless: Advanced headless browser automation
@@ -14,8 +15,10 @@ from typing import List, Dict, Any, Optional, Union
 
 from .base_fetcher import Fetcher
 from .browser_pool import BrowserPool
+from .async_browser_pool import AsyncBrowserPool
 
 __all__ = [
     'Fetcher',
-    'BrowserPool'
+    'BrowserPool',
+    'AsyncBrowserPool'
 ] 
\ No newline at end of file
@@ -0,0 +1,311 @@
+"""Asyncio-native browser context pool for headless fetching.
+
+This module provides AsyncBrowserPool, the async_playwright counterpart of
+BrowserPool. Per-domain contexts are kept in an LRU (an OrderedDict, so lookup,
+touch and eviction are O(1)), pages are bounded per browser with a semaphore
+so many feeds can load at once without exhausting the browser, and cookies are
+written back in the background only when they have changed.
+"""
+
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional
+import os
+import json
+import asyncio
+import logging
+import pathlib
+from playwright.async_api import async_playwright, BrowserContext, Browser, Page, Playwright
+
+from .browser_pool import context_options, cookies_file, custom_cookie_list, load_proxies
+
+logger = logging.getLogger(__name__)
+
+
+def _write_cookie_file(path: pathlib.Path, serialized: str) -> None:
+    """Atomically replace a cookie jar file (runs in a worker thread)."""
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(serialized)
+    os.replace(tmp_path, path)
+
+
+def _read_cookie_file(path: pathlib.Path) -> Optional[list]:
+    """Read a cookie jar file (runs in a worker thread)."""
+    if not path.exists():
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+class AsyncBrowserPool:
+    """Manages a pool of browser contexts for concurrent headless fetching.
+
+    Features:
+    - One Chromium per pool, started on first use
+    - Per-domain contexts in an O(1) LRU; only idle contexts are evicted
+    - Bounded concurrent pages per browser
+    - Proxy rotation support (shared with BrowserPool)
+    - Cookie persistence per domain, written off the event loop and only
+      when the cookie jar changed
+
+    Usage:
+        async with AsyncBrowserPool(max_pages=4) as pool:
+            async with pool.page("example.com") as page:
+                await page.goto("https://example.com/jobs")
+                await pool.save_cookies("example.com")
+    """
+
+    def __init__(self, max_contexts: int = 3, max_pages: int = 4,
+                 cookie_flush_interval: float = 5.0, test_mode: bool = False) -> None:
+        """Initialize the browser pool.
+
+        Args:
+            max_contexts: Maximum number of idle browser contexts to keep in the pool
+            max_pages: Maximum number of pages open in the browser at once
+            cookie_flush_interval: Seconds to batch cookie changes before writing them
+            test_mode: Set to True for testing to skip cookie persistence
+        """
+        self.max_contexts = max_contexts
+        self.max_pages = max_pages
+        self.cookie_flush_interval = cookie_flush_interval
+        self.test_mode = test_mode
+
+        self.contexts: "OrderedDict[str, BrowserContext]" = OrderedDict()  # domain -> context, oldest first
+        self.playwright: Optional[Playwright] = None
+        self.browser: Optional[Browser] = None
+        self._initialized = False
+
+        self._init_lock = asyncio.Lock()
+        self._context_lock = asyncio.Lock()
+        self._page_slots = asyncio.Semaphore(max_pages)
+        self._active_pages: Dict[str, int] = {}
+
+        # Cookie jars are compared against what was last read/written and
+        # queued for one batched write instead of rewritten on every save
+        self._cookie_snapshots: Dict[str, str] = {}
+        self._dirty_cookies: Dict[str, str] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+        # Proxy rotation support
+        self.proxies: list[str] = load_proxies()
+        self.current_proxy_index = 0
+
+    async def __aenter__(self) -> "AsyncBrowserPool":
+        await self.initialize()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def get_next_proxy(self) -> Optional[str]:
+        """Get the next proxy in rotation.
+
+        Returns:
+            Next proxy URL or None if no proxies available
+        """
+        if not self.proxies:
+            return None
+
+        proxy = self.proxies[self.current_proxy_index]
+        self.current_proxy_index = (self.current_proxy_index + 1) % len(self.proxies)
+        return proxy
+
+    async def initialize(self) -> None:
+        """Start the browser if not already started.
+
+        Raises:
+            Exception: If browser initialization fails
+        """
+        if self._initialized:
+            return
+
+        async with self._init_lock:
+            if self._initialized:
+                return
+            try:
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=True)
+                self._initialized = True
+            except Exception as e:
+                logger.error(f"Failed to initialize async browser pool: {e}")
+                raise
+
+    async def get_context(self, domain: str, headers: Optional[Dict[str, str]] = None,
+                          cookies: Optional[Dict[str, str]] = None) -> BrowserContext:
+        """Get a browser context for a domain, creating one if necessary.
+
+        Args:
+            domain: Domain to get context for
+            headers: Custom HTTP headers
+            cookies: Custom HTTP cookies
+
+        Returns:
+            Playwright browser context
+        """
+        await self.initialize()
+
+        async with self._context_lock:
+            if domain in self.contexts:
+                self.contexts.move_to_end(domain)
+                return self.contexts[domain]
+
+            # Get proxy if available
+            proxy = self.get_next_proxy() if "indeed.com" in domain else None
+            context = await self.browser.new_context(**context_options(domain, headers, proxy))
+
+            # Load cookies from file if it exists
+            try:
+                stored_cookies = await asyncio.to_thread(_read_cookie_file, cookies_file(domain))
+                if stored_cookies:
+                    await context.add_cookies(stored_cookies)
+                    self._cookie_snapshots[domain] = json.dumps(stored_cookies, indent=2)
+                    logger.info(f"Loaded cookies for {domain}")
+            except Exception as e:
+                logger.warning(f"Failed to load cookies for {domain}: {e}")
+
+            # Add custom cookies if provided
+            if cookies:
+                try:
+                    custom_cookies = custom_cookie_list(domain, cookies)
+                    await context.add_cookies(custom_cookies)
+                    logger.info(f"Added {len(custom_cookies)} custom cookies for {domain}")
+                except Exception as e:
+                    logger.warning(f"Failed to add custom cookies: {e}")
+
+            self.contexts[domain] = context
+            await self._evict_idle_contexts(keep=domain)
+            return context
+
+    @asynccontextmanager
+    async def page(self, domain: str, headers: Optional[Dict[str, str]] = None,
+                   cookies: Optional[Dict[str, str]] = None) -> AsyncIterator[Page]:
+        """Open a page in the domain's context, waiting for a free page slot.
+
+        Args:
+            domain: Domain to open the page for
+            headers: Custom HTTP headers
+            cookies: Custom HTTP cookies
+
+        Yields:
+            Playwright page, closed on exit
+        """
+        async with self._page_slots:
+            # Counted before the context exists so it can't be evicted under us
+            self._active_pages[domain] = self._active_pages.get(domain, 0) + 1
+            page = None
+            try:
+                context = await self.get_context(domain, headers=headers, cookies=cookies)
+                page = await context.new_page()
+                yield page
+            finally:
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception as e:
+                        logger.warning(f"Error closing page: {e}")
+                self._active_pages[domain] -= 1
+                if not self._active_pages[domain]:
+                    del self._active_pages[domain]
+
+    async def save_cookies(self, domain: str) -> None:
+        """Queue a domain's cookies for writing if they changed.
+
+        The write happens in the background after cookie_flush_interval
+        seconds (or on flush_cookies/close), so repeated saves for the same
+        domain cost one file write.
+
+        Args:
+            domain: Domain to save cookies for
+        """
+        if self.test_mode:
+            return
+
+        context = self.contexts.get(domain)
+        if context is None:
+            return
+
+        try:
+            serialized = json.dumps(await context.cookies(), indent=2)
+        except Exception as e:
+            logger.warning(f"Failed to read cookies for {domain}: {e}")
+            return
+
+        if self._cookie_snapshots.get(domain) == serialized:
+            return
+
+        self._cookie_snapshots[domain] = serialized
+        self._dirty_cookies[domain] = serialized
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_interval())
+
+    async def flush_cookies(self) -> None:
+        """Write every queued cookie jar to disk now."""
+        dirty, self._dirty_cookies = self._dirty_cookies, {}
+
+        for domain, serialized in dirty.items():
+            try:
+                await asyncio.to_thread(_write_cookie_file, cookies_file(domain), serialized)
+                logger.info(f"Saved cookies for {domain}")
+            except Exception as e:
+                logger.warning(f"Failed to save cookies for {domain}: {e}")
+
+    async def _flush_after_interval(self) -> None:
+        """Background task batching cookie writes."""
+        await asyncio.sleep(self.cookie_flush_interval)
+        await self.flush_cookies()
+
+    async def _evict_idle_contexts(self, keep: str) -> None:
+        """Close least recently used contexts beyond max_contexts that have no open pages.
+
+        Args:
+            keep: Domain whose context is being handed out and must survive
+        """
+        while len(self.contexts) > self.max_contexts:
+            idle_domain = next(
+                (domain for domain in self.contexts
+                 if domain != keep and not self._active_pages.get(domain)),
+                None
+            )
+            if idle_domain is None:
+                # Everything is in use; shrink back once pages are released
+                return
+
+            await self.save_cookies(idle_domain)
+            context = self.contexts.pop(idle_domain)
+            try:
+                await context.close()
+                logger.info(f"Cleaned up old context for {idle_domain}")
+            except Exception as e:
+                logger.warning(f"Error cleaning up context for {idle_domain}: {e}")
+
+    async def close(self) -> None:
+        """Flush cookies and close all browser resources."""
+        try:
+            if self._flush_task and not self._flush_task.done():
+                self._flush_task.cancel()
+
+            for domain in list(self.contexts):
+                await self.save_cookies(domain)
+            await self.flush_cookies()
+
+            for domain, context in self.contexts.items():
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning(f"Error closing context for {domain}: {e}")
+
+            if self.browser:
+                await self.browser.close()
+            if self.playwright:
+                await self.playwright.stop()
+
+            logger.info("Async browser pool cleanup completed")
+        except Exception as e:
+            logger.error(f"Error during async browser pool cleanup: {e}")
+        finally:
+            self._initialized = False
+            self.contexts.clear()
+            self.browser = None
+            self.playwright = None
@@ -2,6 +2,8 @@
 
 This module provides the BrowserPool class which manages Playwright browser
 contexts for efficient web scraping with proxy rotation and cookie persistence.
+The context settings, proxy list and cookie files are shared with
+AsyncBrowserPool (see async_browser_pool).
 """
 
 from typing import Dict, Tuple, Optional, Any
@@ -16,6 +18,89 @@ from playwright.sync_api import sync_playwright, BrowserContext, Browser, Playwr
 
 logger = logging.getLogger(__name__)
 
+# Standard Chrome user agent - less randomization for consistent identity
+STANDARD_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+
+COOKIES_DIR = pathlib.Path("cookies")
+
+
+def load_proxies() -> list[str]:
+    """Load proxies from the PROXY_LIST environment variable or proxies.txt.
+    
+    Returns:
+        List of proxy URLs, empty if none are configured
+    """
+    proxies: list[str] = []
+    
+    # Try to load from environment first
+    proxy_list = os.getenv("PROXY_LIST", "").strip()
+    if proxy_list:
+        proxies = [p.strip() for p in proxy_list.split(",") if p.strip()]
+        
+    # If no proxies in env, try to load from file
+    if not proxies:
+        proxy_file = pathlib.Path("proxies.txt")
+        if proxy_file.exists():
+            try:
+                with open(proxy_file, "r") as f:
+                    proxies = [line.strip() for line in f if line.strip()]
+            except Exception as e:
+                logger.warning(f"Failed to load proxies from file: {e}")
+    
+    logger.info(f"Loaded {len(proxies)} proxies")
+    return proxies
+
+
+def context_options(domain: str, headers: Optional[Dict[str, str]] = None,
+                    proxy: Optional[str] = None) -> Dict[str, Any]:
+    """Build the new_context keyword arguments used for every domain.
+    
+    Args:
+        domain: Domain the context is for
+        headers: Custom HTTP headers (only User-Agent is applied)
+        proxy: Proxy server URL, if any
+        
+    Returns:
+        Keyword arguments for Browser.new_context
+    """
+    user_agent = STANDARD_USER_AGENT
+    if headers and 'User-Agent' in headers:
+        user_agent = headers['User-Agent']
+    
+    proxy_config = None
+    if proxy:
+        proxy_config = {
+            "server": proxy,
+            "username": os.getenv("PROXY_USERNAME", ""),
+            "password": os.getenv("PROXY_PASSWORD", "")
+        }
+        logger.info(f"Using proxy for {domain}: {proxy}")
+    
+    return {
+        "user_agent": user_agent,
+        "viewport": {"width": 1920, "height": 1080},
+        "locale": "en-US",
+        "timezone_id": "America/New_York",
+        "geolocation": {"latitude": 40.730610, "longitude": -73.935242},  # NYC
+        "color_scheme": "no-preference",
+        "device_scale_factor": 1,
+        "proxy": proxy_config
+    }
+
+
+def cookies_file(domain: str) -> pathlib.Path:
+    """Path of the persisted cookie jar for a domain."""
+    COOKIES_DIR.mkdir(exist_ok=True)
+    return COOKIES_DIR / f"{domain}.json"
+
+
+def custom_cookie_list(domain: str, cookies: Dict[str, str]) -> list[Dict[str, str]]:
+    """Convert a name -> value mapping into Playwright cookie dicts."""
+    return [
+        {"name": k, "value": v, "domain": domain, "path": "/"}
+        for k, v in cookies.items()
+    ]
+
 
 class BrowserPool:
     """Manages a pool of browser contexts for headless fetching.
@@ -49,22 +134,7 @@ class BrowserPool:
         
     def _load_proxies(self) -> None:
         """Load proxies from environment or file."""
-        # Try to load from environment first
-        proxy_list = os.getenv("PROXY_LIST", "").strip()
-        if proxy_list:
-            self.proxies = [p.strip() for p in proxy_list.split(",") if p.strip()]
-            
-        # If no proxies in env, try to load from file
-        if not self.proxies:
-            proxy_file = pathlib.Path("proxies.txt")
-            if proxy_file.exists():
-                try:
-                    with open(proxy_file, "r") as f:
-                        self.proxies = [line.strip() for line in f if line.strip()]
-                except Exception as e:
-                    logger.warning(f"Failed to load proxies from file: {e}")
-        
-        logger.info(f"Loaded {len(self.proxies)} proxies")
+        self.proxies = load_proxies()
         
     def get_next_proxy(self) -> Optional[str]:
         """Get the next proxy in rotation.
@@ -120,42 +190,18 @@ class BrowserPool:
                 self.contexts[domain] = (context, time.time())
                 return context
             
-            # Standard Chrome user agent - less randomization for consistent identity
-            standard_ua = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
-            if headers and 'User-Agent' in headers:
-                standard_ua = headers['User-Agent']
-            
             # Get proxy if available
             proxy = self.get_next_proxy() if "indeed.com" in domain else None
-            proxy_config = None
-            if proxy:
-                proxy_config = {
-                    "server": proxy,
-                    "username": os.getenv("PROXY_USERNAME", ""),
-                    "password": os.getenv("PROXY_PASSWORD", "")
-                }
-                logger.info(f"Using proxy for {domain}: {proxy}")
             
             # Create a new context with proxy if available
-            context = self.browser.new_context(
-                user_agent=standard_ua,
-                viewport={"width": 1920, "height": 1080},
-                locale="en-US",
-                timezone_id="America/New_York",
-                geolocation={"latitude": 40.730610, "longitude": -73.935242},  # NYC
-                color_scheme="no-preference",
-                device_scale_factor=1,
-                proxy=proxy_config
-            )
+            context = self.browser.new_context(**context_options(domain, headers, proxy))
             
             # Load cookies from file if it exists
-            cookies_dir = pathlib.Path("cookies")
-            cookies_dir.mkdir(exist_ok=True)
-            cookies_file = cookies_dir / f"{domain}.json"
+            stored_cookies_file = cookies_file(domain)
             
-            if cookies_file.exists():
+            if stored_cookies_file.exists():
                 try:
-                    with open(cookies_file, "r") as f:
+                    with open(stored_cookies_file, "r") as f:
                         stored_cookies = json.load(f)
                     context.add_cookies(stored_cookies)
                     logger.info(f"Loaded cookies for {domain}")
@@ -165,15 +211,7 @@ class BrowserPool:
             # Add custom cookies if provided
             if cookies:
                 try:
-                    custom_cookies = []
-                    for k, v in cookies.items():
-                        cookie = {
-                            "name": k,
-                            "value": v,
-                            "domain": domain,
-                            "path": "/"
-                        }
-                        custom_cookies.append(cookie)
+                    custom_cookies = custom_cookie_list(domain, cookies)
                     context.add_cookies(custom_cookies)
                     logger.info(f"Added {len(custom_cookies)} custom cookies for {domain}")
                 except Exception as e:
@@ -203,11 +241,8 @@ class BrowserPool:
             if domain in self.contexts:
                 context, _ = self.contexts[domain]
                 cookies = context.cookies()
-                cookies_dir = pathlib.Path("cookies")
-                cookies_dir.mkdir(exist_ok=True)
-                cookies_file = cookies_dir / f"{domain}.json"
                 
-                with open(cookies_file, "w") as f:
+                with open(cookies_file(domain), "w") as f:
                     json.dump(cookies, f, indent=2)
                 logger.info(f"Saved {len(cookies)} cookies for {domain}")
         except Exception as e:
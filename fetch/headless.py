@@ -3,24 +3,58 @@
 This module provides the HeadlessFetcher class which uses Playwright
 for sophisticated job scraping that requires JavaScript execution,
 user interaction simulation, and security challenge handling.
+
+fetch() drives one page at a time through the synchronous BrowserPool;
+fetch_many() loads several feeds concurrently through AsyncBrowserPool.
 """
 
 from typing import List, Optional, Dict, Any
+import asyncio
 import logging
 import time
 import random
 import re
 from urllib.parse import urlparse
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
-from playwright_stealth import stealth_sync
+from playwright.async_api import Page as AsyncPage
+from playwright_stealth import stealth_async, stealth_sync
 from bs4 import BeautifulSoup
 
 from ..models import Job, Feed
+from .async_browser_pool import AsyncBrowserPool
 from .browser_pool import BrowserPool
 from .parsers import HTMLParsers
 
 logger = logging.getLogger(__name__)
 
+# Common security challenge indicators
+CHALLENGE_SELECTORS = [
+    'iframe[src*="captcha"]',
+    'iframe[src*="recaptcha"]',
+    '[data-sitekey]',  # reCAPTCHA
+    '.cf-challenge',  # Cloudflare
+    '#challenge-form',  # Generic challenge
+    '.challenge-container',
+    '[id*="captcha"]',
+    '[class*="captcha"]'
+]
+
+CHALLENGE_KEYWORDS = ['challenge', 'captcha', 'verification', 'security check', 'blocked']
+
+CONTINUE_WORDS = ['continue', 'proceed', 'verify', 'submit']
+
+# "Load More" buttons
+LOAD_MORE_SELECTORS = [
+    'button:has-text("Load More")',
+    'button:has-text("Show More")',
+    'a:has-text("Load More")',
+    '.load-more',
+    '.show-more',
+    '[data-testid*="load"]'
+]
+
+INFINITE_SCROLL_SITES = ['indeed.com', 'linkedin.com']
+
 
 class HeadlessFetcher:
     """Advanced headless browser automation for job fetching.
@@ -33,13 +67,17 @@ class HeadlessFetcher:
     - Cookie and session management
     """
     
-    def __init__(self, browser_pool: BrowserPool) -> None:
+    def __init__(self, browser_pool: BrowserPool,
+                 async_browser_pool: Optional[AsyncBrowserPool] = None) -> None:
         """Initialize the headless fetcher.
         
         Args:
             browser_pool: Shared browser pool instance
+            async_browser_pool: Pool used by fetch_many; the caller owns and closes it.
+                If omitted, each fetch_many call starts and closes its own pool.
         """
         self.browser_pool = browser_pool
+        self.async_browser_pool = async_browser_pool
         self.html_parsers = HTMLParsers()
     
     def fetch(self, feed: Feed) -> List[Job]:
@@ -114,6 +152,88 @@ class HeadlessFetcher:
             except Exception as e:
                 logger.warning(f"Error closing page: {e}")
     
+    async def fetch_many(self, feeds: List[Feed]) -> List[Job]:
+        """Fetch jobs from several feeds concurrently.
+        
+        Page loads overlap up to the async pool's max_pages; each feed still
+        gets its own stealth, challenge handling and human-like interaction.
+        
+        Args:
+            feeds: Feed configuration objects
+            
+        Returns:
+            List of Job objects from all feeds, in feed order
+        """
+        # A pool created here is bound to this call's event loop, so it is
+        # closed before returning rather than kept for a later asyncio.run
+        pool = self.async_browser_pool
+        owns_pool = pool is None
+        if owns_pool:
+            pool = AsyncBrowserPool(max_contexts=self.browser_pool.max_contexts,
+                                    test_mode=self.browser_pool.test_mode)
+        
+        logger.info(f"Starting concurrent headless fetch for {len(feeds)} feeds")
+        try:
+            results = await asyncio.gather(*(self._fetch_async(pool, feed) for feed in feeds))
+            await pool.flush_cookies()
+        finally:
+            if owns_pool:
+                await pool.close()
+        
+        jobs: List[Job] = []
+        for feed_jobs in results:
+            jobs.extend(feed_jobs)
+        
+        logger.info(f"Concurrent headless fetch completed: {len(jobs)} jobs from {len(feeds)} feeds")
+        return jobs
+    
+    async def _fetch_async(self, pool: AsyncBrowserPool, feed: Feed) -> List[Job]:
+        """Fetch one feed through the async browser pool.
+        
+        Args:
+            pool: Async browser pool to open the page in
+            feed: Feed configuration object
+            
+        Returns:
+            List of Job objects
+        """
+        domain = urlparse(feed.url).netloc
+        
+        try:
+            async with pool.page(domain, headers=feed.headers, cookies=feed.cookies) as page:
+                # Apply stealth to avoid detection
+                await stealth_async(page)
+                
+                logger.info(f"Navigating to {feed.url}")
+                await page.goto(feed.url, wait_until='networkidle', timeout=30000)
+                
+                if await self._detect_security_challenge_async(page):
+                    logger.warning(f"Security challenge detected for {feed.url}")
+                    if not await self._handle_security_challenge_async(page, feed):
+                        logger.error(f"Failed to handle security challenge for {feed.url}")
+                        return []
+                
+                await self._simulate_human_behavior_async(page)
+                await page.wait_for_timeout(2000)
+                await self._handle_dynamic_loading_async(page, feed)
+                
+                html_content = await page.content()
+                await pool.save_cookies(domain)
+            
+            soup = BeautifulSoup(html_content, 'html.parser')
+            jobs = self.html_parsers.parse_jobs(soup, feed)
+            
+            logger.info(f"Headless fetch completed: {len(jobs)} jobs from {feed.name}")
+            return jobs
+            
+        except PlaywrightTimeoutError:
+            # Same error class for the sync and async APIs
+            logger.error(f"Timeout loading {feed.url}")
+            return []
+        except Exception as e:
+            logger.error(f"Error in headless fetch for {feed.url}: {e}")
+            return []
+    
     def _detect_security_challenge(self, page: Page) -> bool:
         """Detect if the page contains security challenges.
         
@@ -128,33 +248,21 @@ class HeadlessFetcher:
             page.wait_for_timeout(2000)
             
             # Check for common security challenge indicators
-            challenge_selectors = [
-                'iframe[src*="captcha"]',
-                'iframe[src*="recaptcha"]',
-                '[data-sitekey]',  # reCAPTCHA
-                '.cf-challenge',  # Cloudflare
-                '#challenge-form',  # Generic challenge
-                '.challenge-container',
-                '[id*="captcha"]',
-                '[class*="captcha"]'
-            ]
-            
-            for selector in challenge_selectors:
+            for selector in CHALLENGE_SELECTORS:
                 if page.query_selector(selector):
                     logger.info(f"Security challenge detected: {selector}")
                     return True
             
             # Check page title and content for challenge indicators
             title = page.title().lower()
-            challenge_keywords = ['challenge', 'captcha', 'verification', 'security check', 'blocked']
             
-            if any(keyword in title for keyword in challenge_keywords):
+            if any(keyword in title for keyword in CHALLENGE_KEYWORDS):
                 logger.info(f"Security challenge detected in title: {title}")
                 return True
             
             # Check for challenge-related text content
             page_text = page.text_content('body').lower()
-            if any(keyword in page_text for keyword in challenge_keywords):
+            if any(keyword in page_text for keyword in CHALLENGE_KEYWORDS):
                 logger.info("Security challenge detected in page content")
                 return True
             
@@ -194,7 +302,7 @@ class HeadlessFetcher:
             
             for button in continue_buttons:
                 button_text = button.text_content().lower()
-                if any(word in button_text for word in ['continue', 'proceed', 'verify', 'submit']):
+                if any(word in button_text for word in CONTINUE_WORDS):
                     logger.info(f"Attempting to click continue button: {button_text}")
                     button.click()
                     page.wait_for_timeout(3000)
@@ -251,16 +359,7 @@ class HeadlessFetcher:
         """
         try:
             # Look for "Load More" buttons
-            load_more_selectors = [
-                'button:has-text("Load More")',
-                'button:has-text("Show More")',
-                'a:has-text("Load More")',
-                '.load-more',
-                '.show-more',
-                '[data-testid*="load"]'
-            ]
-            
-            for selector in load_more_selectors:
+            for selector in LOAD_MORE_SELECTORS:
                 try:
                     load_button = page.query_selector(selector)
                     if load_button and load_button.is_visible():
@@ -273,11 +372,137 @@ class HeadlessFetcher:
                     continue
             
             # Handle infinite scroll
-            if 'indeed.com' in feed.url or 'linkedin.com' in feed.url:
+            if any(site in feed.url for site in INFINITE_SCROLL_SITES):
                 logger.info("Handling infinite scroll")
                 for _ in range(3):
                     page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
                     page.wait_for_timeout(2000)
             
+        except Exception as e:
+            logger.debug(f"Error handling dynamic loading: {e}")
+    
+    async def _detect_security_challenge_async(self, page: AsyncPage) -> bool:
+        """Async counterpart of _detect_security_challenge.
+        
+        Args:
+            page: Playwright async page object
+            
+        Returns:
+            True if security challenge detected
+        """
+        try:
+            await page.wait_for_timeout(2000)
+            
+            for selector in CHALLENGE_SELECTORS:
+                if await page.query_selector(selector):
+                    logger.info(f"Security challenge detected: {selector}")
+                    return True
+            
+            title = (await page.title()).lower()
+            if any(keyword in title for keyword in CHALLENGE_KEYWORDS):
+                logger.info(f"Security challenge detected in title: {title}")
+                return True
+            
+            page_text = ((await page.text_content('body')) or '').lower()
+            if any(keyword in page_text for keyword in CHALLENGE_KEYWORDS):
+                logger.info("Security challenge detected in page content")
+                return True
+            
+            return False
+            
+        except Exception as e:
+            logger.warning(f"Error detecting security challenge: {e}")
+            return False
+    
+    async def _handle_security_challenge_async(self, page: AsyncPage, feed: Feed) -> bool:
+        """Async counterpart of _handle_security_challenge.
+        
+        Args:
+            page: Playwright async page object
+            feed: Feed configuration object
+            
+        Returns:
+            True if challenge was successfully handled
+        """
+        try:
+            logger.info("Attempting to handle security challenge")
+            
+            if await page.query_selector('.cf-challenge'):
+                logger.info("Cloudflare challenge detected, waiting for automatic resolution")
+                await page.wait_for_timeout(10000)
+                
+                if not await page.query_selector('.cf-challenge'):
+                    logger.info("Cloudflare challenge resolved")
+                    return True
+            
+            for button in await page.query_selector_all('button, input[type="submit"], a'):
+                button_text = ((await button.text_content()) or '').lower()
+                if any(word in button_text for word in CONTINUE_WORDS):
+                    logger.info(f"Attempting to click continue button: {button_text}")
+                    await button.click()
+                    await page.wait_for_timeout(3000)
+                    
+                    if not await self._detect_security_challenge_async(page):
+                        logger.info("Challenge resolved by clicking continue button")
+                        return True
+                    break
+            
+            logger.info("Waiting for challenge to resolve automatically")
+            await page.wait_for_timeout(15000)
+            
+            return not await self._detect_security_challenge_async(page)
+            
+        except Exception as e:
+            logger.error(f"Error handling security challenge: {e}")
+            return False
+    
+    async def _simulate_human_behavior_async(self, page: AsyncPage) -> None:
+        """Async counterpart of _simulate_human_behavior.
+        
+        Args:
+            page: Playwright async page object
+        """
+        try:
+            for _ in range(random.randint(2, 5)):
+                await page.mouse.move(random.randint(100, 800), random.randint(100, 600))
+                await page.wait_for_timeout(random.randint(100, 500))
+            
+            scroll_distance = random.randint(200, 800)
+            await page.evaluate(f"window.scrollTo(0, {scroll_distance})")
+            await page.wait_for_timeout(random.randint(500, 1500))
+            
+            scroll_up = random.randint(100, scroll_distance // 2)
+            await page.evaluate(f"window.scrollTo(0, {scroll_distance - scroll_up})")
+            await page.wait_for_timeout(random.randint(300, 1000))
+            
+        except Exception as e:
+            logger.debug(f"Error simulating human behavior: {e}")
+    
+    async def _handle_dynamic_loading_async(self, page: AsyncPage, feed: Feed) -> None:
+        """Async counterpart of _handle_dynamic_loading.
+        
+        Args:
+            page: Playwright async page object
+            feed: Feed configuration object
+        """
+        try:
+            for selector in LOAD_MORE_SELECTORS:
+                try:
+                    load_button = await page.query_selector(selector)
+                    if load_button and await load_button.is_visible():
+                        logger.info(f"Clicking load more button: {selector}")
+                        await load_button.click()
+                        await page.wait_for_timeout(3000)
+                        break
+                except Exception as e:
+                    logger.debug(f"Error with load more button {selector}: {e}")
+                    continue
+            
+            if any(site in feed.url for site in INFINITE_SCROLL_SITES):
+                logger.info("Handling infinite scroll")
+                for _ in range(3):
+                    await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+                    await page.wait_for_timeout(2000)
+            
         except Exception as e:
             logger.debug(f"Error handling dynamic loading: {e}") 
\ No newline at end of file
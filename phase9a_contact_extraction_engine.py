@@ -38,7 +38,10 @@ class Phase9aConfig:
     # Processing Configuration
     max_concurrent_companies: int = 5
     max_pages_per_company: int = 15
+    max_concurrent_page_probes: int = 4  # Per host
     session_timeout: int = 30
+    max_page_bytes: int = 2 * 1024 * 1024  # Body read per page
+    max_company_bytes: int = 4 * 1024 * 1024  # Bodies read per company before skipping pages
     
     # Contact Extraction Configuration
     phone_confidence_threshold: float = 0.75
@@ -597,8 +600,16 @@ class Phase9aContactExtractionEngine:
             'processing_time': 0.0
         }
     
-    async def extract_executive_contacts(self, company_name: str, website_url: str, existing_executives: List[Dict] = None) -> Dict[str, Any]:
-        """Extract executive contact information using Context7 best practices"""
+    async def extract_executive_contacts(self, company_name: str, website_url: str, existing_executives: List[Dict] = None,
+                                         page_store: Any = None, candidate_urls: List[str] = None) -> Dict[str, Any]:
+        """
+        Extract executive contact information using Context7 best practices
+        
+        A shared page store (seo_leads.network.PageStore) can be passed so pages
+        already fetched by earlier discovery steps are not fetched again, and
+        candidate_urls (ranked pages from the site's sitemap/navigation) replace
+        the guessed priority paths.
+        """
         start_time = time.time()
         
         try:
@@ -608,7 +619,7 @@ class Phase9aContactExtractionEngine:
             company_domain = self._extract_domain(website_url)
             
             # Fetch content from multiple pages
-            content_data = await self._fetch_company_content(website_url)
+            content_data = await self._fetch_company_content(website_url, page_store, candidate_urls)
             
             # If no existing executives provided, extract them first
             if not existing_executives:
@@ -660,7 +671,8 @@ class Phase9aContactExtractionEngine:
                 'extraction_timestamp': int(time.time())
             }
     
-    async def _fetch_company_content(self, website_url: str) -> Dict[str, Any]:
+    async def _fetch_company_content(self, website_url: str, page_store: Any = None,
+                                     candidate_urls: List[str] = None) -> Dict[str, Any]:
         """Fetch company content using Context7 multi-page strategy"""
         content_data = {
             'full_content': '',
@@ -677,26 +689,78 @@ class Phase9aContactExtractionEngine:
             '/people', '/our-team', '/meet-the-team'
         ]
         
-        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.config.session_timeout)) as session:
-            for path in priority_paths[:self.config.max_pages_per_company]:
+        if candidate_urls:
+            # Discovered pages that exist, instead of guessing paths
+            urls = [website_url] + candidate_urls[:self.config.max_pages_per_company - 1]
+        else:
+            urls = [urljoin(website_url, path) for path in priority_paths[:self.config.max_pages_per_company]]
+        
+        page_texts = []
+        
+        if page_store is not None:
+            # Shared store: fetch only misses and parse redirect duplicates once
+            for record in await page_store.fetch_unique(urls):
+                page_texts.append(record.text)
+                content_data['relevant_pages'].append(record.url)
+        else:
+            for url, text in await self._probe_pages(urls):
+                page_texts.append(text)
+                content_data['relevant_pages'].append(url)
+        
+        # Join once instead of growing one string per page
+        content_data['full_content'] = ''.join(f"\n\n{text}" for text in page_texts)
+        content_data['pages_analyzed'] = len(page_texts)
+        return content_data
+    
+    async def _probe_pages(self, urls: List[str]) -> List[Tuple[str, str]]:
+        """Fetch pages concurrently with per-page and per-company byte caps, returning (url, text) in priority order"""
+        probe_limit = asyncio.Semaphore(self.config.max_concurrent_page_probes)
+        bytes_read = 0
+        
+        async def probe(session: aiohttp.ClientSession, url: str) -> Optional[Tuple[bytes, Optional[str]]]:
+            nonlocal bytes_read
+            async with probe_limit:
+                if bytes_read >= self.config.max_company_bytes:
+                    return None
                 try:
-                    url = urljoin(website_url, path)
                     async with session.get(url) as response:
-                        if response.status == 200:
-                            html = await response.text()
-                            soup = BeautifulSoup(html, 'html.parser')
-                            
-                            # Extract text content
-                            text_content = soup.get_text()
-                            content_data['full_content'] += f"\n\n{text_content}"
-                            content_data['pages_analyzed'] += 1
-                            content_data['relevant_pages'].append(url)
-                            
+                        if response.status != 200:
+                            return None
+                        
+                        # Reject PDFs, images and downloads before reading the body
+                        content_type = response.content_type.lower()
+                        if content_type not in ('text/html', 'application/xhtml+xml', 'application/octet-stream'):
+                            self.logger.debug(f"Skipping {url}: {content_type}")
+                            return None
+                        
+                        chunks = []
+                        size = 0
+                        async for chunk in response.content.iter_chunked(64 * 1024):
+                            chunks.append(chunk)
+                            size += len(chunk)
+                            if size >= self.config.max_page_bytes:
+                                break
+                        bytes_read += size
+                        
+                        return b''.join(chunks)[:self.config.max_page_bytes], response.charset
                 except Exception as e:
                     self.logger.warning(f"Failed to fetch {url}: {e}")
-                    continue
+                return None
         
-        return content_data
+        async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.config.session_timeout)) as session:
+            # Probe all paths concurrently, assemble in priority order
+            bodies = await asyncio.gather(*(probe(session, url) for url in urls))
+        
+        pages = []
+        for url, fetched in zip(urls, bodies):
+            if fetched is None:
+                continue
+            body, charset = fetched
+            # Declared charset first; BeautifulSoup falls back to <meta> and detection
+            soup = BeautifulSoup(body, 'html.parser', from_encoding=charset)
+            pages.append((url, soup.get_text()))
+        
+        return pages
     
     async def _extract_executives_from_content(self, content_data: Dict) -> List[Dict]:
         """Extract executives from content using existing AI pipeline"""
@@ -6,23 +6,31 @@ No external API dependencies - works standalone.
 """
 
 import re
+import asyncio
 import logging
-from typing import Dict
+from typing import Dict, List
 import requests
 from bs4 import BeautifulSoup
 
+from ..database import claim_companies, default_worker_id, get_db_session, release_companies
+from ..models import UKCompany
+from ..network.http_client import close_http_client, get_http_client
+from ..write_behind import get_write_behind
+
 
 class SEOAnalyzer:
     """Simple SEO analyzer for Phase 4A integration"""
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.worker_id = default_worker_id()
         
     async def analyze_website(self, url: str) -> Dict:
         """Comprehensive website SEO analysis - required for workflow integration"""
         try:
-            response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.content, 'html.parser')
+            http_client = await get_http_client()
+            response = await http_client.get_html(url, timeout=10)
+            soup = BeautifulSoup(response.text(), 'html.parser')
             
             # Extract SEO elements
             title = soup.find('title')
@@ -103,6 +111,84 @@ class SEOAnalyzer:
                 'analysis_timestamp': 1234567890
             }
     
+    def analyze_batch(self, batch_size: int = 10) -> int:
+        """Analyze a batch of not-yet-analyzed companies leased to this worker"""
+        company_ids = claim_companies(
+            ['scraped', 'contacts_extracted'], batch_size, owner=self.worker_id,
+            filters=[UKCompany.website.isnot(None), UKCompany.seo_overall_score.is_(None)]
+        )
+        
+        if not company_ids:
+            self.logger.info("No companies found needing SEO analysis")
+            return 0
+        
+        try:
+            # Rows are read up front; no session stays open across the website fetches
+            with get_db_session() as session:
+                companies = session.query(UKCompany.id, UKCompany.company_name, UKCompany.website).filter(
+                    UKCompany.id.in_(company_ids)
+                ).all()
+            
+            analyses = asyncio.run(self._analyze_companies([website for _, _, website in companies]))
+            
+            updates = []
+            for (company_id, company_name, _), analysis in zip(companies, analyses):
+                if analysis.get('error'):
+                    self.logger.warning(f"SEO analysis failed for {company_name}: {analysis['error']}")
+                    continue
+                
+                updates.append({'id': company_id, **self._analysis_columns(analysis)})
+            
+            if updates:
+                with get_db_session() as session:
+                    session.bulk_update_mappings(UKCompany, updates)
+                    # Analyzed companies become qualifiable even without an extracted contact
+                    session.query(UKCompany).filter(
+                        UKCompany.id.in_([update['id'] for update in updates]),
+                        UKCompany.status == 'scraped'
+                    ).update({'status': 'seo_analyzed'}, synchronize_session=False)
+            
+            self.logger.info(f"SEO analysis batch complete: {len(updates)}/{len(companies)} analyzed")
+            return len(updates)
+                
+        except Exception as e:
+            self.logger.error(f"Error in SEO analysis batch: {e}")
+            return 0
+        finally:
+            release_companies(company_ids, self.worker_id)
+    
+    async def save_analysis(self, company_id: str, analysis: Dict) -> bool:
+        """Store one website analysis on its company record, returning once it is committed"""
+        try:
+            # Batched with other workers' writes; waiting also commits the
+            # contact data queued for this company before it
+            writer = await get_write_behind()
+            updated = await writer.update_company(company_id, self._analysis_columns(analysis),
+                                                  advance_status=('scraped', 'seo_analyzed'), wait=True)
+            if not updated:
+                self.logger.warning(f"Company {company_id} no longer exists; SEO analysis not saved")
+            return updated
+        except Exception as e:
+            self.logger.error(f"Error saving SEO analysis for company {company_id}: {e}")
+            return False
+    
+    def _analysis_columns(self, analysis: Dict) -> Dict:
+        """Company columns for analyze_website results"""
+        return {
+            # Scores are 0-1 here; the database and qualifier use 0-100
+            'seo_overall_score': round(analysis['overall_score'] * 100, 1),
+            'meta_description_missing': not analysis['meta_description'],
+            'critical_issues': analysis['seo_recommendations']
+        }
+    
+    async def _analyze_companies(self, urls: List[str]) -> List[Dict]:
+        """Analyze several websites concurrently on the shared HTTP client"""
+        try:
+            return await asyncio.gather(*(self.analyze_website(url) for url in urls))
+        finally:
+            # The client's session is bound to this asyncio.run loop
+            await close_http_client()
+    
     def _generate_seo_recommendations(self, title: str, description: str, word_count: int, has_contact: bool) -> list:
         """Generate SEO improvement recommendations"""
         recommendations = []
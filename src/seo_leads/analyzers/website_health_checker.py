@@ -9,10 +9,11 @@ import time
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from urllib.parse import urlparse
-import aiohttp
 import requests
 from datetime import datetime
 
+from ..network.http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -65,27 +66,26 @@ class WebsiteHealthChecker:
         start_time = time.time()
         
         try:
-            async with aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(total=30)
-            ) as session:
-                async with session.get(url) as response:
-                    status.response_time = time.time() - start_time
-                    status.status_code = response.status
-                    
-                    if response.status == 200:
-                        content = await response.text()
-                        status.content_length = len(content)
-                        status.is_accessible = True
-                        
-                        # Analyze content quality
-                        quality_analysis = self._analyze_content_quality(content)
-                        status.content_quality_score = quality_analysis['quality_score']
-                        status.has_meaningful_content = quality_analysis['has_meaningful_content']
-                        status.is_under_construction = quality_analysis['is_under_construction']
-                    else:
-                        status.error_type = f"http_error_{response.status}"
-                        status.error_message = f"HTTP {response.status}"
-                        
+            # Body capped at the client's max_page_bytes; non-HTML bodies aren't downloaded
+            http_client = await get_http_client()
+            response = await http_client.get_html(url, timeout=30)
+            status.response_time = time.time() - start_time
+            status.status_code = response.status
+            
+            if response.status == 200:
+                content = response.text()
+                status.content_length = len(content)
+                status.is_accessible = True
+                
+                # Analyze content quality
+                quality_analysis = self._analyze_content_quality(content)
+                status.content_quality_score = quality_analysis['quality_score']
+                status.has_meaningful_content = quality_analysis['has_meaningful_content']
+                status.is_under_construction = quality_analysis['is_under_construction']
+            else:
+                status.error_type = f"http_error_{response.status}"
+                status.error_message = f"HTTP {response.status}"
+                
         except asyncio.TimeoutError:
             status.error_type = "timeout"
             status.error_message = "Connection timeout"
@@ -228,10 +228,10 @@ class EnhancedWebsiteFetcher:
     async def _fetch_content(self, url: str) -> Optional[str]:
         """Fetch website content"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        return await response.text()
+            http_client = await get_http_client()
+            response = await http_client.get_html(url)
+            if response.status == 200 and response.body:
+                return response.text()
         except:
             pass
         return None 
\ No newline at end of file
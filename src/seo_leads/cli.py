@@ -4,6 +4,7 @@ Command Line Interface for UK Company SEO Lead Generation System
 Provides commands for testing and running the complete pipeline:
 - Database initialization
 - Company data fetching  
+- Cross-directory duplicate resolution
 - SEO analysis
 - Contact extraction
 - Lead qualification
@@ -21,7 +22,7 @@ from .config import get_config, get_processing_config
 from .database import initialize_database, get_db_session, get_processing_metrics
 from .fetchers import YellDirectoryFetcher
 from .analyzers import SEOAnalyzer
-from .processors import ContactExtractor, LeadQualifier
+from .processors import ContactExtractor, LeadQualifier, resolve_company_entities
 from .exporters import MakeExporter
 from .models import UKCompany
 
@@ -78,7 +79,8 @@ def init():
 @click.option('--cities', default=None, help='Comma-separated list of cities (default: all configured)')
 @click.option('--sectors', default=None, help='Comma-separated list of sectors (default: all configured)')
 @click.option('--limit', default=10, help='Limit companies per city/sector combination')
-def fetch(cities, sectors, limit):
+@click.option('--refresh', is_flag=True, help='Re-crawl city/sector searches already completed')
+def fetch(cities, sectors, limit, refresh):
     """Fetch company data from UK directories"""
     try:
         click.echo("Starting company data fetch...")
@@ -104,9 +106,11 @@ def fetch(cities, sectors, limit):
             try:
                 async with YellDirectoryFetcher() as fetcher:
                     fetcher.processing_config.max_companies_per_city = limit
-                    companies_found = await fetcher.fetch_companies_batch(city_list, sector_list)
+                    companies_found = await fetcher.fetch_companies_batch(city_list, sector_list, refresh=refresh)
                     if companies_found > 0:
                         return companies_found, "Yell.com"
+                    if not fetcher.searches_queued:
+                        return 0, None
             except Exception as e:
                 click.echo(f"⚠️  Yell.com failed: {e}")
             
@@ -116,7 +120,7 @@ def fetch(cities, sectors, limit):
                 click.echo("🔄 Trying Yelp UK as fallback...")
                 async with YelpUKDirectoryFetcher() as fetcher:
                     fetcher.processing_config.max_companies_per_city = limit
-                    companies_found = await fetcher.fetch_companies_batch(city_list, sector_list)
+                    companies_found = await fetcher.fetch_companies_batch(city_list, sector_list, refresh=refresh)
                     return companies_found, "Yelp UK"
             except Exception as e:
                 click.echo(f"❌ Yelp UK also failed: {e}")
@@ -126,6 +130,9 @@ def fetch(cities, sectors, limit):
         
         if companies_found > 0:
             click.echo(f"✅ Fetch complete! Found {companies_found} companies from {source}")
+            _echo_resolution(resolve_company_entities())
+        elif source is None:
+            click.echo("✅ Nothing left to crawl (use --refresh to re-crawl completed searches)")
         else:
             click.echo("❌ No companies found from any source")
         
@@ -143,8 +150,10 @@ def fetch(cities, sectors, limit):
 @click.option('--sectors', default=None, help='Comma-separated list of sectors (default: all configured)')
 @click.option('--limit', default=10, help='Limit companies per city/sector combination')
 @click.option('--sources', default=None, help='Comma-separated list of sources to try (default: all working sources)')
-def fetch_multi(cities, sectors, limit, sources):
-    """Fetch company data from multiple UK directories with automatic fallback"""
+@click.option('--pages', default=None, type=int, help='Browser pages per directory (default: directory_pages_per_source)')
+@click.option('--refresh', is_flag=True, help='Re-crawl city/sector searches already completed')
+def fetch_multi(cities, sectors, limit, sources, pages, refresh):
+    """Fetch company data from multiple UK directories concurrently"""
     try:
         click.echo("🌐 Starting multi-source company data fetch...")
         
@@ -170,59 +179,32 @@ def fetch_multi(cities, sectors, limit, sources):
         
         click.echo(f"Target cities: {', '.join(city_list)}")
         click.echo(f"Target sectors: {', '.join(sector_list)}")
-        click.echo(f"Sources to try: {', '.join(source_list)}")
+        click.echo(f"Sources to crawl concurrently: {', '.join(source_list)}")
         
         async def run_multi_fetch():
-            from .fetchers import get_fetcher
-            from .fetchers.yelp_uk_fetcher import YelpUKDirectoryFetcher
+            from .fetchers import DirectoryCrawlScheduler
+            
+            # All sources crawl at once, each at its own DIRECTORY_CONFIGS rate
+            scheduler = DirectoryCrawlScheduler(
+                source_list,
+                pages_per_directory=pages,
+                max_companies_per_city=limit,
+                refresh=refresh
+            )
+            results = await scheduler.run(city_list, sector_list)
             
             total_companies = 0
             successful_sources = []
             
-            for source in source_list:
-                try:
-                    click.echo(f"\n🔍 Trying {source}...")
-                    
-                    if source == 'yelp':
-                        # Use our working Yelp UK fetcher
-                        async with YelpUKDirectoryFetcher() as fetcher:
-                            fetcher.processing_config.max_companies_per_city = limit
-                            companies_found = await fetcher.fetch_companies_batch(city_list, sector_list)
-                            if companies_found > 0:
-                                click.echo(f"   ✅ {source}: Found {companies_found} companies")
-                                total_companies += companies_found
-                                successful_sources.append(f"{source} ({companies_found})")
-                            else:
-                                click.echo(f"   ⚠️  {source}: No companies found")
-                    
-                    elif source == 'yell':
-                        # Try Yell.com
-                        async with YellDirectoryFetcher() as fetcher:
-                            fetcher.processing_config.max_companies_per_city = limit
-                            companies_found = await fetcher.fetch_companies_batch(city_list, sector_list)
-                            if companies_found > 0:
-                                click.echo(f"   ✅ {source}: Found {companies_found} companies")
-                                total_companies += companies_found
-                                successful_sources.append(f"{source} ({companies_found})")
-                            else:
-                                click.echo(f"   ⚠️  {source}: Blocked or no companies found")
-                    
-                    else:
-                        # Try other sources
-                        fetcher = get_fetcher(source)
-                        async with fetcher:
-                            fetcher.processing_config.max_companies_per_city = limit
-                            companies_found = await fetcher.fetch_companies_batch(city_list, sector_list)
-                            if companies_found > 0:
-                                click.echo(f"   ✅ {source}: Found {companies_found} companies")
-                                total_companies += companies_found
-                                successful_sources.append(f"{source} ({companies_found})")
-                            else:
-                                click.echo(f"   ⚠️  {source}: No companies found")
-                
-                except Exception as e:
-                    click.echo(f"   ❌ {source}: Failed - {e}")
-                    continue
+            for source, result in results.items():
+                if result.error:
+                    click.echo(f"   ❌ {source}: Failed - {result.error}")
+                elif result.companies_found > 0:
+                    click.echo(f"   ✅ {source}: Found {result.companies_found} companies ({result.duration:.0f}s)")
+                    total_companies += result.companies_found
+                    successful_sources.append(f"{source} ({result.companies_found})")
+                else:
+                    click.echo(f"   ⚠️  {source}: Blocked or no companies found")
             
             return total_companies, successful_sources
         
@@ -232,6 +214,7 @@ def fetch_multi(cities, sectors, limit, sources):
             click.echo(f"\n✅ Multi-source fetch complete!")
             click.echo(f"📊 Total companies found: {total_companies}")
             click.echo(f"🎯 Successful sources: {', '.join(successful_sources)}")
+            _echo_resolution(resolve_company_entities())
         else:
             click.echo("\n❌ No companies found from any source")
         
@@ -244,6 +227,26 @@ def fetch_multi(cities, sectors, limit, sources):
         click.echo(f"❌ Error during multi-source fetch: {e}", err=True)
         sys.exit(1)
 
+def _echo_resolution(stats):
+    """Report an entity resolution run"""
+    if stats['merged']:
+        click.echo(f"🔗 Merged {stats['merged']} duplicate listings into {stats['clusters']} companies")
+    else:
+        click.echo("🔗 No duplicate listings across directories")
+
+@cli.command()
+def resolve():
+    """Merge duplicate companies listed on several directories"""
+    try:
+        click.echo("Resolving duplicate companies across directories...")
+        stats = resolve_company_entities()
+        click.echo(f"📊 Compared {stats['companies']} companies")
+        _echo_resolution(stats)
+        
+    except Exception as e:
+        click.echo(f"❌ Error during entity resolution: {e}", err=True)
+        sys.exit(1)
+
 @cli.command()
 @click.option('--batch-size', default=10, help='Number of companies to analyze per batch')
 def analyze(batch_size):
@@ -398,17 +401,24 @@ def qualify(batch_size):
 
 @cli.command()
 @click.option('--min-score', default=50.0, help='Minimum lead score to export')
-@click.option('--format', default='both', help='Export format: json, csv, or both')
+@click.option('--format', default='both', help='Export format: json, ndjson, csv, or both (json + csv)')
 @click.option('--webhook/--no-webhook', default=True, help='Send to Make.com webhook')
-def export(min_score, format, webhook):
+@click.option('--since-last', is_flag=True, help='Only export leads that changed since the last export')
+@click.option('--rebuild', is_flag=True, help='Forget previous exports and export every lead above --min-score')
+def export(min_score, format, webhook, since_last, rebuild):
     """Export qualified leads to Make.com"""
     try:
         click.echo(f"Starting export (min score: {min_score}, format: {format})...")
         
         exporter = MakeExporter()
-        result = exporter.export_qualified_leads(min_score, format, webhook)
-        
-        if result['status'] == 'success':
+        result = exporter.export_qualified_leads(min_score, format, webhook,
+                                                 since_last=since_last, rebuild=rebuild)
+        
+        if result['status'] == 'no_changes':
+            click.echo(f"✅ No leads changed since the last export ({result['scanned']} checked)")
+        elif result['status'] == 'no_leads':
+            click.echo("ℹ️  No qualified leads to export")
+        elif result['status'] == 'success':
             click.echo(f"✅ Export complete! Exported {result['count']} leads")
             
             for export_type, details in result.get('exports', {}).items():
@@ -416,6 +426,11 @@ def export(min_score, format, webhook):
                     click.echo(f"   📁 {export_type.upper()}: {details['filepath']}")
                 if 'status' in details:
                     click.echo(f"   🌐 Webhook: {details['status']}")
+            
+            stats = result.get('stats', {})
+            if stats:
+                click.echo(f"   ⏱️  {stats['elapsed_seconds']}s, {stats['leads_per_second']} leads/s, "
+                           f"peak RSS {stats['peak_rss_mb']} MB")
         else:
             click.echo(f"❌ Export failed: {result.get('error', 'Unknown error')}")
         
@@ -424,21 +439,75 @@ def export(min_score, format, webhook):
         sys.exit(1)
 
 @cli.command()
-def pipeline():
-    """Run complete pipeline: fetch → analyze → extract → qualify → export"""
+@click.option('--report', type=click.Choice(['hit-rates', 'step-latencies', 'tiers']), default='hit-rates',
+              help='Question to answer from the results warehouse')
+@click.option('--by', default='sector', help='Grouping column for hit-rates and tiers (e.g. sector, city, source)')
+@click.option('--since', default=None, help='Only runs on or after this date (YYYY-MM-DD)')
+@click.option('--source', default=None, help='Only results from this source partition')
+@click.option('--warehouse', default=None, help='Warehouse directory (default: RESULTS_WAREHOUSE_DIR or ./results_warehouse)')
+def results(report, by, since, source, warehouse):
+    """Query the Parquet results warehouse"""
+    try:
+        from .exporters.results_warehouse import ResultsQuery
+        
+        query = ResultsQuery(warehouse)
+        if report == 'hit-rates':
+            rows = query.hit_rates(by=by, since=since, source=source)
+        elif report == 'step-latencies':
+            rows = query.step_latencies(since=since, source=source)
+        else:
+            rows = query.tier_breakdown(by=by, since=since, source=source)
+        
+        if not rows:
+            click.echo(f"No results in {query.root}")
+            return
+        
+        columns = list(rows[0])
+        click.echo("  ".join(f"{column:>20}" for column in columns))
+        for row in rows:
+            click.echo("  ".join(f"{str(row[column]):>20}" for column in columns))
+        
+    except ImportError as e:
+        click.echo(f"❌ {e} (pip install pyarrow)", err=True)
+        sys.exit(1)
+    except Exception as e:
+        click.echo(f"❌ Error querying results: {e}", err=True)
+        sys.exit(1)
+
+@cli.command()
+@click.option('--cities', default='Brighton', help='Comma-separated list of cities to fetch')
+@click.option('--sectors', default='retail', help='Comma-separated list of sectors to fetch')
+@click.option('--limit', default=5, help='Limit companies per city/sector combination')
+@click.option('--contact-workers', default=None, type=int, help='Concurrent contact extractions (default: 3)')
+@click.option('--seo-workers', default=None, type=int, help='Concurrent SEO analyses (default: 8)')
+@click.option('--qualify-workers', default=None, type=int, help='Concurrent qualifications (default: 2)')
+@click.option('--queue-size', default=None, type=int, help='Companies buffered between stages (default: 20)')
+@click.option('--no-fetch', is_flag=True, help='Only process companies already in the database')
+def pipeline(cities, sectors, limit, contact_workers, seo_workers, qualify_workers, queue_size, no_fetch):
+    """Run complete pipeline: fetch → extract → analyze → qualify, streamed, then export"""
     try:
-        click.echo("🚀 Starting complete UK lead generation pipeline...")
+        from .orchestrators.pipeline_runner import StreamingPipelineConfig, StreamingPipelineRunner
+        
+        click.echo("🚀 Starting streaming UK lead generation pipeline...")
+        
+        city_list = [city.strip() for city in cities.split(',')]
+        sector_list = [sector.strip() for sector in sectors.split(',')]
+        
+        config = StreamingPipelineConfig()
+        for name, value in (('contact_workers', contact_workers), ('seo_workers', seo_workers),
+                            ('qualify_workers', qualify_workers), ('queue_size', queue_size)):
+            if value is not None:
+                setattr(config, name, value)
         
-        # Step 1: Fetch companies (small batch for demo)
-        click.echo("\n📥 Step 1: Fetching companies...")
         async def run_fetch():
             # Try Yell.com first
             try:
                 async with YellDirectoryFetcher() as fetcher:
-                    fetcher.processing_config.max_companies_per_city = 5  # Small demo batch
-                    companies_found = await fetcher.fetch_companies_batch(['Brighton'], ['retail'])
+                    fetcher.processing_config.max_companies_per_city = limit
+                    companies_found = await fetcher.fetch_companies_batch(city_list, sector_list)
                     if companies_found > 0:
-                        return companies_found, "Yell.com"
+                        click.echo(f"   ✅ Found {companies_found} companies from Yell.com")
+                        return companies_found
             except Exception as e:
                 click.echo(f"⚠️  Yell.com failed: {e}")
             
@@ -447,39 +516,36 @@ def pipeline():
                 from .fetchers.yelp_uk_fetcher import YelpUKDirectoryFetcher
                 click.echo("🔄 Trying Yelp UK as fallback...")
                 async with YelpUKDirectoryFetcher() as fetcher:
-                    fetcher.processing_config.max_companies_per_city = 5  # Small demo batch
-                    companies_found = await fetcher.fetch_companies_batch(['Brighton'], ['retail'])
-                    return companies_found, "Yelp UK"
+                    fetcher.processing_config.max_companies_per_city = limit
+                    companies_found = await fetcher.fetch_companies_batch(city_list, sector_list)
+                    click.echo(f"   ✅ Found {companies_found} companies from Yelp UK")
+                    return companies_found
             except Exception as e:
                 click.echo(f"❌ Yelp UK also failed: {e}")
-                return 0, "None"
-        
-        companies_found, source = asyncio.run(run_fetch())
-        
-        if companies_found > 0:
-            click.echo(f"   ✅ Found {companies_found} companies from {source}")
-        else:
-            click.echo("❌ No companies found, stopping pipeline")
+                return 0
+        
+        # Steps 1-4: companies flow through extract → analyze → qualify as they are fetched
+        click.echo(f"\n📥 Fetching {', '.join(sector_list)} in {', '.join(city_list)} and processing as companies arrive...")
+        click.echo(f"   Workers: {config.contact_workers} contact, {config.seo_workers} SEO, "
+                   f"{config.qualify_workers} qualify (queue size {config.queue_size})")
+        
+        runner = StreamingPipelineRunner(config)
+        stats = asyncio.run(runner.run(None if no_fetch else run_fetch()))
+        
+        click.echo(f"   ✅ Claimed {stats.claimed} companies")
+        if stats.merged:
+            click.echo(f"   🔗 Merged {stats.merged} duplicate listings before processing")
+        click.echo(f"   📞 Extracted {stats.contacts_extracted} contacts")
+        click.echo(f"   🔍 Analyzed {stats.analyzed} websites")
+        click.echo(f"   🎯 Qualified {stats.qualified} leads ({stats.failed} failed)")
+        if stats.first_qualified_after is not None:
+            click.echo(f"   ⏱️  First qualified lead after {stats.first_qualified_after:.1f}s "
+                       f"(total {stats.elapsed:.1f}s)")
+        
+        if not stats.qualified:
+            click.echo("❌ No leads qualified, skipping export")
             return
         
-        # Step 2: Analyze SEO
-        click.echo("\n🔍 Step 2: Analyzing SEO...")
-        analyzer = SEOAnalyzer()
-        analyzed_count = analyzer.analyze_batch(companies_found)
-        click.echo(f"   ✅ Analyzed {analyzed_count} companies")
-        
-        # Step 3: Extract contacts
-        click.echo("\n📞 Step 3: Extracting contacts...")
-        extractor = ContactExtractor()
-        extracted_count = extractor.extract_batch(companies_found)
-        click.echo(f"   ✅ Extracted {extracted_count} contacts")
-        
-        # Step 4: Qualify leads
-        click.echo("\n🎯 Step 4: Qualifying leads...")
-        qualifier = LeadQualifier()
-        qualified_count = qualifier.qualify_batch(companies_found)
-        click.echo(f"   ✅ Qualified {qualified_count} leads")
-        
         # Step 5: Export
         click.echo("\n📤 Step 5: Exporting leads...")
         exporter = MakeExporter()
@@ -68,6 +68,7 @@ class ProcessingConfig:
     
     # Scraping configuration
     max_companies_per_city: int = 200
+    directory_pages_per_source: int = 3  # Browser pages crawling each directory at once
     target_cities: List[str] = field(default_factory=lambda: [
         'London', 'Manchester', 'Birmingham', 'Leeds', 'Liverpool',
         'Sheffield', 'Bristol', 'Newcastle', 'Leicester', 'Nottingham',
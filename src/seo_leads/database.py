@@ -2,21 +2,84 @@
 Database configuration and connection management for UK Company SEO Lead Generation System
 
 Provides session management, migrations, and connection pooling for optimal performance.
+Scraped listings are ingested with bulk_insert_companies: one multi-row
+INSERT ... ON CONFLICT DO NOTHING per batch plus an in-place counter update,
+instead of an existence query and ORM add per listing.
+
+Pipeline stages take work with claim_companies: rows are leased to one worker
+(lease_owner / lease_expires_at) in a single UPDATE, so several extractor or
+qualifier processes can share one database. Leases of crashed workers expire
+and the rows are claimed again.
+
+Coroutine processors use the async engine next to the sync one (aiosqlite for
+SQLite, asyncpg for PostgreSQL) through get_async_db_session or run_db_session,
+so database writes don't block the event loop while fetches are in flight.
 """
 
+import asyncio
 import os
+import socket
+import hashlib
 import logging
-from datetime import datetime
-from contextlib import contextmanager
-from typing import Optional, Generator
-from sqlalchemy import create_engine, MetaData, event
+from datetime import datetime, timedelta
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Generator, Sequence, TypeVar
+from sqlalchemy import create_engine, MetaData, event, case, insert, inspect, or_, select, text, update
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker, Session, scoped_session
-from sqlalchemy.pool import QueuePool
+from sqlalchemy.pool import NullPool, QueuePool
 from .models import Base, UKCompany, ProcessingStatus
 
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+    ASYNC_SQLALCHEMY_AVAILABLE = True
+except ImportError:
+    ASYNC_SQLALCHEMY_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
+# Shared by the sync and async engines
+SQLITE_CONNECT_ARGS = {
+    'check_same_thread': False,
+    'timeout': 60,
+    'isolation_level': None  # Autocommit mode
+}
+
+POOL_SETTINGS = {
+    'pool_size': 20,
+    'max_overflow': 30,
+    'pool_pre_ping': True,
+    'pool_recycle': 3600
+}
+
+def _set_sqlite_pragma(dbapi_connection, connection_record):
+    """Enable SQLite optimizations on every new connection"""
+    cursor = dbapi_connection.cursor()
+    # Performance optimizations
+    cursor.execute("PRAGMA synchronous = NORMAL")
+    cursor.execute("PRAGMA cache_size = 10000")
+    cursor.execute("PRAGMA temp_store = MEMORY")
+    cursor.execute("PRAGMA mmap_size = 268435456")  # 256MB
+    cursor.execute("PRAGMA journal_mode = WAL")
+    cursor.execute("PRAGMA foreign_keys = ON")
+    cursor.close()
+
+def async_database_url(database_url: str) -> Optional[str]:
+    """Async driver URL for a sync database URL (None if there is no async driver for it)"""
+    scheme, separator, rest = database_url.partition('://')
+    if not separator:
+        return None
+    
+    if scheme in ('sqlite', 'sqlite+pysqlite'):
+        return f"sqlite+aiosqlite://{rest}"
+    if scheme in ('postgresql', 'postgres', 'postgresql+psycopg2'):
+        return f"postgresql+asyncpg://{rest}"
+    if scheme in ('sqlite+aiosqlite', 'postgresql+asyncpg'):
+        return database_url
+    return None
+
 class DatabaseConfig:
     """Database configuration with connection pooling and optimization"""
     
@@ -27,48 +90,33 @@ class DatabaseConfig:
         )
         self.engine = None
         self.SessionLocal = None
+        self.async_engine = None
+        self.AsyncSessionLocal = None
+        self._async_initialized = False
+        self._async_loop = None
         self._initialize()
     
     def _initialize(self):
         """Initialize database engine and session factory"""
         # Configure SQLite with optimizations
         if self.database_url.startswith('sqlite'):
-            connect_args = {
-                'check_same_thread': False,
-                'timeout': 60,
-                'isolation_level': None  # Autocommit mode
-            }
-            
             self.engine = create_engine(
                 self.database_url,
-                connect_args=connect_args,
+                connect_args=SQLITE_CONNECT_ARGS,
                 echo=False,  # Set to True for debugging
                 future=True
             )
             
             # Enable SQLite optimizations
-            @event.listens_for(self.engine, "connect")
-            def set_sqlite_pragma(dbapi_connection, connection_record):
-                cursor = dbapi_connection.cursor()
-                # Performance optimizations
-                cursor.execute("PRAGMA synchronous = NORMAL")
-                cursor.execute("PRAGMA cache_size = 10000")
-                cursor.execute("PRAGMA temp_store = MEMORY") 
-                cursor.execute("PRAGMA mmap_size = 268435456")  # 256MB
-                cursor.execute("PRAGMA journal_mode = WAL")
-                cursor.execute("PRAGMA foreign_keys = ON")
-                cursor.close()
+            event.listen(self.engine, "connect", _set_sqlite_pragma)
                 
         else:
             # PostgreSQL/MySQL configuration with connection pooling
             self.engine = create_engine(
                 self.database_url,
                 poolclass=QueuePool,
-                pool_size=20,
-                max_overflow=30,
-                pool_pre_ping=True,
-                pool_recycle=3600,
-                echo=False
+                echo=False,
+                **POOL_SETTINGS
             )
         
         # Create session factory
@@ -81,10 +129,68 @@ class DatabaseConfig:
             )
         )
     
+    def _initialize_async(self):
+        """Initialize the async engine and session factory with the sync engine's settings"""
+        if not ASYNC_SQLALCHEMY_AVAILABLE:
+            logger.warning("sqlalchemy.ext.asyncio unavailable; async processors will use worker threads")
+            return
+        
+        async_url = async_database_url(self.database_url)
+        if async_url is None:
+            logger.info(f"No async driver for {self.database_url.split('://')[0]}; async processors will use worker threads")
+            return
+        
+        try:
+            if async_url.startswith('sqlite'):
+                # aiosqlite connections are cheap to open but each owns a thread bound
+                # to the opening loop, so they aren't pooled across asyncio.run calls
+                self.async_engine = create_async_engine(
+                    async_url,
+                    connect_args=SQLITE_CONNECT_ARGS,
+                    poolclass=NullPool,
+                    echo=False
+                )
+                
+                # Same WAL and cache pragmas as the sync engine
+                event.listen(self.async_engine.sync_engine, "connect", _set_sqlite_pragma)
+            else:
+                self.async_engine = create_async_engine(
+                    async_url,
+                    echo=False,
+                    **POOL_SETTINGS
+                )
+        except ImportError as e:
+            logger.warning(f"Async database driver not installed ({e}); async processors will use worker threads")
+            return
+        
+        self.AsyncSessionLocal = async_sessionmaker(
+            bind=self.async_engine,
+            autoflush=False,
+            expire_on_commit=False
+        )
+    
+    async def get_async_session_factory(self) -> Optional['async_sessionmaker']:
+        """Async session factory, created on first use; None without an async driver"""
+        loop = asyncio.get_running_loop()
+        if self.async_engine is not None and self._async_loop is not loop:
+            # Batch commands run one asyncio.run per company; pooled connections
+            # belong to the loop that opened them, so start a fresh pool
+            await self.async_engine.dispose(close=False)
+            self.async_engine = None
+            self.AsyncSessionLocal = None
+            self._async_initialized = False
+        
+        if not self._async_initialized:
+            self._async_initialized = True
+            self._async_loop = loop
+            self._initialize_async()
+        return self.AsyncSessionLocal
+    
     def create_tables(self):
         """Create all database tables"""
         try:
             Base.metadata.create_all(bind=self.engine)
+            self._add_missing_columns()
             logger.info("Database tables created successfully")
             
             # Initialize processing status tracking
@@ -94,6 +200,27 @@ class DatabaseConfig:
             logger.error(f"Error creating database tables: {e}")
             raise
     
+    def _add_missing_columns(self):
+        """Add nullable columns introduced since an existing table was created"""
+        inspector = inspect(self.engine)
+        
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or column.primary_key or not column.nullable:
+                    continue
+                
+                column_type = column.type.compile(dialect=self.engine.dialect)
+                with self.engine.begin() as connection:
+                    connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+                logger.info(f"Added column {table.name}.{column.name}")
+            
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
+    
     def _initialize_processing_status(self):
         """Initialize processing status tracking table"""
         try:
@@ -138,12 +265,36 @@ class DatabaseConfig:
         finally:
             session.close()
     
+    @asynccontextmanager
+    async def get_async_session(self) -> AsyncIterator['AsyncSession']:
+        """Get async database session with proper cleanup"""
+        session_factory = await self.get_async_session_factory()
+        if session_factory is None:
+            raise RuntimeError("No async database driver installed (aiosqlite for SQLite, asyncpg for PostgreSQL)")
+        
+        async with session_factory() as session:
+            try:
+                yield session
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                logger.error(f"Async database session error: {e}")
+                raise
+    
     def close(self):
         """Close database connections"""
         if self.SessionLocal:
             self.SessionLocal.remove()
         if self.engine:
             self.engine.dispose()
+    
+    async def close_async(self):
+        """Close async database connections (call from the event loop that used them)"""
+        if self.async_engine:
+            await self.async_engine.dispose()
+            self.async_engine = None
+            self.AsyncSessionLocal = None
+            self._async_initialized = False
 
 # Global database instance
 db_config = None
@@ -175,19 +326,263 @@ def get_db_session() -> Generator[Session, None, None]:
     with db.get_session() as session:
         yield session
 
+@asynccontextmanager
+async def get_async_db_session() -> AsyncIterator['AsyncSession']:
+    """Async context manager for database sessions"""
+    db = get_database()
+    async with db.get_async_session() as session:
+        yield session
+
+def _run_in_sync_session(work: Callable[[Session], T]) -> T:
+    with get_db_session() as session:
+        return work(session)
+
+async def run_db_session(work: Callable[[Session], T]) -> T:
+    """
+    Run ORM work written against a sync Session without blocking the event loop
+    
+    The work runs on the async engine (AsyncSession.run_sync) when an async
+    driver is installed, otherwise in a worker thread with a regular session.
+    Either way it is committed afterwards, and rolled back if it raises.
+    
+    Usage:
+        company = await run_db_session(lambda session: session.get(UKCompany, company_id))
+    """
+    db = get_database()
+    if await db.get_async_session_factory() is not None:
+        async with db.get_async_session() as session:
+            return await session.run_sync(work)
+    
+    return await asyncio.to_thread(_run_in_sync_session, work)
+
+def generate_company_id(name: str, website: Optional[str], city: str) -> str:
+    """Stable company ID: website when known, otherwise name and city"""
+    if website:
+        identifier = website.lower().strip()
+    else:
+        identifier = f"{name.lower().strip()}:{city.lower().strip()}"
+    
+    return hashlib.md5(identifier.encode()).hexdigest()
+
+# Rows per INSERT statement; keeps bound parameters under SQLite's 999 limit
+BULK_INSERT_CHUNK_ROWS = 80
+
+def _insert_ignoring_conflicts(session: Session, rows: list) -> int:
+    """Insert rows into uk_companies, skipping existing IDs; returns rows inserted"""
+    table = UKCompany.__table__
+    dialect = session.get_bind().dialect.name
+    inserted = 0
+    
+    for start in range(0, len(rows), BULK_INSERT_CHUNK_ROWS):
+        chunk = rows[start:start + BULK_INSERT_CHUNK_ROWS]
+        
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            statement = dialect_insert(table).values(chunk).on_conflict_do_nothing(index_elements=['id'])
+            inserted += max(session.execute(statement).rowcount, 0)
+        else:
+            # No portable ON CONFLICT; one lookup for the whole chunk instead
+            existing = set(session.execute(
+                select(table.c.id).where(table.c.id.in_([row['id'] for row in chunk]))
+            ).scalars())
+            new_rows = [row for row in chunk if row['id'] not in existing]
+            if new_rows:
+                session.execute(insert(table).values(new_rows))
+            inserted += len(new_rows)
+    
+    return inserted
+
+def increment_stage_counters(session: Session, stage: str, processed: int = 0,
+                             failed: int = 0, total: int = 0):
+    """Add to a stage's ProcessingStatus counters in place (x = x + n)"""
+    if not (processed or failed or total):
+        return
+    
+    new_total = ProcessingStatus.total_companies + total
+    new_processed = ProcessingStatus.processed_companies + processed
+    session.execute(
+        update(ProcessingStatus)
+        .where(ProcessingStatus.stage == stage)
+        .values(
+            total_companies=new_total,
+            processed_companies=new_processed,
+            failed_companies=ProcessingStatus.failed_companies + failed,
+            success_rate=case(
+                (new_total > 0, new_processed * 100.0 / new_total),
+                else_=ProcessingStatus.success_rate
+            ),
+            last_updated=datetime.utcnow()
+        )
+    )
+
+def bulk_insert_companies(companies: Iterable[Any], stage: Optional[str] = 'scraping') -> Dict[str, int]:
+    """
+    Insert scraped directory listings in bulk, skipping companies already stored
+    
+    Args:
+        companies: CompanyBasicInfo-like objects (name, website, city, region,
+            address, sector, phone, source)
+        stage: ProcessingStatus stage credited with the inserted rows (None to skip)
+    
+    Returns:
+        {'inserted': n, 'skipped': m, 'failed': f}; duplicates within the batch
+        count as skipped
+    
+    If the batch statement fails, the rows are retried one per transaction so
+    a single bad row doesn't take the rest of the batch down with it.
+    """
+    rows = {}
+    received = 0
+    
+    for company in companies:
+        received += 1
+        company_id = generate_company_id(company.name, company.website, company.city)
+        rows.setdefault(company_id, {
+            'id': company_id,
+            'company_name': company.name,
+            'website': company.website,
+            'city': company.city,
+            'region': company.region,
+            'address': company.address,
+            'sector': company.sector,
+            'phone': company.phone,
+            'status': 'scraped',
+            'source': company.source
+        })
+    
+    if not rows:
+        return {'inserted': 0, 'skipped': received, 'failed': 0}
+    
+    try:
+        with get_db_session() as session:
+            inserted = _insert_ignoring_conflicts(session, list(rows.values()))
+            if stage:
+                increment_stage_counters(session, stage, processed=inserted)
+        return {'inserted': inserted, 'skipped': received - inserted, 'failed': 0}
+    except Exception as e:
+        logger.warning(f"Bulk insert of {len(rows)} companies failed ({e}); retrying individually")
+    
+    inserted = failed = 0
+    for row in rows.values():
+        try:
+            with get_db_session() as session:
+                inserted += _insert_ignoring_conflicts(session, [row])
+        except Exception as e:
+            failed += 1
+            logger.error(f"Error inserting company {row['company_name']}: {e}")
+    
+    if stage and inserted:
+        try:
+            with get_db_session() as session:
+                increment_stage_counters(session, stage, processed=inserted)
+        except Exception as e:
+            logger.error(f"Error updating {stage} counters: {e}")
+    
+    return {'inserted': inserted, 'skipped': received - inserted - failed, 'failed': failed}
+
+# How long a claimed company stays leased before another worker may take it
+DEFAULT_LEASE_SECONDS = int(os.environ.get('WORK_LEASE_SECONDS', 900))
+
+def default_worker_id() -> str:
+    """Lease owner name for this process"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+def claim_companies(statuses: Sequence[str], batch_size: int, owner: Optional[str] = None,
+                    lease_seconds: Optional[int] = None, filters: Sequence[Any] = ()) -> List[str]:
+    """
+    Lease up to batch_size companies to one worker
+    
+    Free rows (never leased, released, or with an expired lease) in the given
+    statuses are leased with one UPDATE. PostgreSQL picks candidates with
+    FOR UPDATE SKIP LOCKED so concurrent claimers never wait on or share rows;
+    SQLite runs the statement under its single-writer lock. IDs come back
+    through RETURNING, or by owner and expiry where RETURNING is unavailable.
+    
+    Args:
+        statuses: Company statuses this stage processes
+        batch_size: Maximum rows to claim
+        owner: Lease owner (default: hostname:pid)
+        lease_seconds: Lease length (default: WORK_LEASE_SECONDS, 900)
+        filters: Extra SQLAlchemy criteria on UKCompany
+    
+    Returns:
+        IDs of the claimed companies, oldest first
+    """
+    owner = owner or default_worker_id()
+    now = datetime.utcnow()
+    expires_at = now + timedelta(seconds=lease_seconds or DEFAULT_LEASE_SECONDS)
+    
+    candidates = select(UKCompany.id).where(
+        UKCompany.status.in_(list(statuses)),
+        UKCompany.canonical_id.is_(None),
+        or_(UKCompany.lease_expires_at.is_(None), UKCompany.lease_expires_at < now),
+        *filters
+    ).order_by(UKCompany.created_at).limit(batch_size)
+    
+    try:
+        with get_db_session() as session:
+            dialect = session.get_bind().dialect
+            if dialect.name == 'postgresql':
+                candidates = candidates.with_for_update(skip_locked=True)
+            
+            statement = (
+                update(UKCompany)
+                .where(UKCompany.id.in_(candidates))
+                .values(lease_owner=owner, lease_expires_at=expires_at)
+                .execution_options(synchronize_session=False)
+            )
+            
+            if getattr(dialect, 'update_returning', False):
+                claimed = list(session.execute(statement.returning(UKCompany.id)).scalars())
+            else:
+                session.execute(statement)
+                claimed = list(session.execute(
+                    select(UKCompany.id).where(
+                        UKCompany.lease_owner == owner,
+                        UKCompany.lease_expires_at == expires_at
+                    )
+                ).scalars())
+    except Exception as e:
+        logger.error(f"Error claiming companies: {e}")
+        return []
+    
+    if claimed:
+        logger.debug(f"{owner} claimed {len(claimed)} companies until {expires_at.isoformat()}")
+    return claimed
+
+def release_companies(company_ids: Iterable[str], owner: Optional[str] = None):
+    """Release leases held by owner so the rows are free immediately"""
+    company_ids = list(company_ids)
+    if not company_ids:
+        return
+    
+    try:
+        with get_db_session() as session:
+            session.execute(
+                update(UKCompany)
+                .where(UKCompany.id.in_(company_ids), UKCompany.lease_owner == (owner or default_worker_id()))
+                .values(lease_owner=None, lease_expires_at=None)
+                .execution_options(synchronize_session=False)
+            )
+    except Exception as e:
+        logger.error(f"Error releasing company leases: {e}")
+
 def get_processing_metrics() -> dict:
     """Get current processing metrics from database"""
     try:
         with get_db_session() as session:
-            # Get overall company counts
-            total_companies = session.query(UKCompany).count()
+            # Get overall company counts (merged duplicates aren't separate companies)
+            total_companies = session.query(UKCompany).filter(UKCompany.canonical_id.is_(None)).count()
             processed_companies = session.query(UKCompany).filter(
                 UKCompany.status.in_(['qualified', 'exported'])
             ).count()
             
             # Get status breakdown
             status_breakdown = {}
-            for status in ['scraped', 'contacts_extracted', 'seo_analyzed', 'qualified', 'exported', 'failed']:
+            for status in ['scraped', 'contacts_extracted', 'seo_analyzed', 'qualified', 'exported', 'failed', 'merged']:
                 count = session.query(UKCompany).filter(UKCompany.status == status).count()
                 status_breakdown[status] = count
             
@@ -18,7 +18,6 @@ import asyncio
 import logging
 import random
 import re
-import time
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import quote_plus, urljoin, urlparse
 from dataclasses import dataclass
@@ -29,6 +28,7 @@ from fuzzywuzzy import fuzz
 
 from ..models import ExecutiveContact
 from ..config import get_processing_config
+from ..network.rate_limiter import RateLimit, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -162,8 +162,8 @@ class BusinessDirectoryEnricher:
             'Cache-Control': 'max-age=0',
         })
         
-        # Rate limiting tracking
-        self.last_requests = {}
+        # Rate limiting, shared per directory host
+        self.rate_limiter = get_rate_limiter()
         
         logger.info("Business Directory Enricher initialized for P2.3 executive discovery")
     
@@ -197,9 +197,6 @@ class BusinessDirectoryEnricher:
                     
                     logger.info(f"{directory_config.name}: Found {len(directory_executives)} executives from {len(listings)} listings")
                     
-                    # Rate limiting between directories
-                    await asyncio.sleep(directory_config.rate_limit)
-                    
                 except Exception as e:
                     logger.warning(f"Directory search failed for {directory_name}: {e}")
                     continue
@@ -226,11 +223,11 @@ class BusinessDirectoryEnricher:
             
             for query in queries[:3]:  # Limit to top 3 queries per directory
                 try:
-                    await self._enforce_rate_limit(directory.name)
-                    
                     # Try different UK locations
                     for location in self.uk_locations[:2]:  # Top 2 locations
                         try:
+                            await self._enforce_rate_limit(directory)
+                            
                             # Build search URL
                             search_url = self._build_search_url(directory, query, location)
                             
@@ -265,9 +262,6 @@ class BusinessDirectoryEnricher:
                             else:
                                 logger.debug(f"{directory.name} returned status {response.status_code}")
                             
-                            # Rate limiting between location searches
-                            await asyncio.sleep(1.0)
-                            
                         except Exception as e:
                             logger.debug(f"Location search failed: {query} in {location} - {e}")
                             continue
@@ -726,20 +720,9 @@ class BusinessDirectoryEnricher:
         
         return executives
     
-    async def _enforce_rate_limit(self, directory_name: str):
+    async def _enforce_rate_limit(self, directory: DirectoryConfig):
         """Enforce rate limiting for directory requests"""
-        current_time = time.time()
-        
-        if directory_name in self.last_requests:
-            time_since_last = current_time - self.last_requests[directory_name]
-            min_delay = self.directories[directory_name].rate_limit
-            
-            if time_since_last < min_delay:
-                sleep_time = min_delay - time_since_last
-                logger.debug(f"{directory_name} rate limiting: sleeping {sleep_time:.2f}s")
-                await asyncio.sleep(sleep_time)
-        
-        self.last_requests[directory_name] = time.time()
+        await self.rate_limiter.acquire(directory.base_url, RateLimit.per_interval(directory.rate_limit))
 
 # Usage example
 async def test_business_directory():
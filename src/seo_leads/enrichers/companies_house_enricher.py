@@ -19,18 +19,19 @@ Coverage: 95%+ of UK companies
 Cost: £0.00 (completely free)
 """
 
-import asyncio
 import logging
 import re
-import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-from urllib.parse import quote
+from urllib.parse import quote, urlencode
 
-import requests
 from fuzzywuzzy import fuzz
 
+from ..network.http_cache import SOURCE_COMPANIES_HOUSE, CachedResponse
+from ..network.http_client import get_http_client
+from ..network.rate_limiter import COMPANIES_HOUSE_RATE_KEY, RateLimit, get_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -87,21 +88,19 @@ class CompaniesHouseEnricher:
     
     def __init__(self):
         self.base_url = "https://api.company-information.service.gov.uk"
-        self.session = requests.Session()
         
-        # Set user agent for API requests
-        self.session.headers.update({
+        # Set user agent for API requests (sent on the shared async HTTP client)
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
-        })
+        }
         
-        # Rate limiting (be respectful to free API)
-        self.last_request_time = 0
+        # Rate limiting (be respectful to free API), shared with every Companies House client
         self.min_request_interval = 0.5  # 500ms between requests
+        self.rate_limiter = get_rate_limiter()
         
         logger.info("Companies House enricher initialized (FREE API)")
     
@@ -130,11 +129,11 @@ class CompaniesHouseEnricher:
             search_url = "https://find-and-update.company-information.service.gov.uk/search"
             params = {'q': search_name}  # Use original name for search
             
-            response = self.session.get(search_url, params=params, timeout=15)
+            response = await self._get(f"{search_url}?{urlencode(params)}", timeout=15)
             
-            if response.status_code == 200:
+            if response.status == 200:
                 from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = BeautifulSoup(response.text(), 'html.parser')
                 
                 companies = []
                 
@@ -200,7 +199,7 @@ class CompaniesHouseEnricher:
                 return companies
             
             else:
-                logger.warning(f"Companies House search failed: {response.status_code}")
+                logger.warning(f"Companies House search failed: {response.status}")
                 return []
                 
         except Exception as e:
@@ -225,20 +224,21 @@ class CompaniesHouseEnricher:
             company_url = f"https://find-and-update.company-information.service.gov.uk/company/{company_number}"
             
             logger.debug(f"Getting officers for company: {company_number}")
-            response = self.session.get(company_url, timeout=15)
+            response = await self._get(company_url, timeout=15)
             
-            if response.status_code == 200:
+            if response.status == 200:
                 from bs4 import BeautifulSoup
-                soup = BeautifulSoup(response.text, 'html.parser')
+                soup = BeautifulSoup(response.text(), 'html.parser')
                 
                 officers = []
                 
                 # Method 1: Try to get them from a direct officers endpoint (most reliable)
                 officers_url = f"https://find-and-update.company-information.service.gov.uk/company/{company_number}/officers"
-                officers_response = self.session.get(officers_url, timeout=10)
+                await self._rate_limit()
+                officers_response = await self._get(officers_url, timeout=10)
                 
-                if officers_response.status_code == 200:
-                    officers_soup = BeautifulSoup(officers_response.text, 'html.parser')
+                if officers_response.status == 200:
+                    officers_soup = BeautifulSoup(officers_response.text(), 'html.parser')
                     
                     # Look for officer profile links - these contain the names
                     officer_links = officers_soup.find_all('a', href=lambda x: x and '/officers/' in x)
@@ -316,7 +316,7 @@ class CompaniesHouseEnricher:
                 return unique_officers
                 
             else:
-                logger.warning(f"Failed to get company page for {company_number}: {response.status_code}")
+                logger.warning(f"Failed to get company page for {company_number}: {response.status}")
                 return []
                 
         except Exception as e:
@@ -583,16 +583,18 @@ class CompaniesHouseEnricher:
         
         return clean_name.strip()
     
+    async def _get(self, url: str, timeout: float) -> CachedResponse:
+        """GET a Companies House page on the shared client, through the HTTP cache"""
+        http_client = await get_http_client()
+        return await http_client.get(url, headers=self.headers, timeout=timeout,
+                                     cache_source=SOURCE_COMPANIES_HOUSE)
+    
     async def _rate_limit(self):
         """Implement rate limiting for API requests"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.min_request_interval:
-            sleep_time = self.min_request_interval - time_since_last
-            await asyncio.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        await self.rate_limiter.acquire(
+            COMPANIES_HOUSE_RATE_KEY,
+            RateLimit.per_interval(self.min_request_interval)
+        )
     
     def get_statistics(self) -> Dict:
         """Get enricher statistics"""
@@ -20,11 +20,12 @@ from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass
 from urllib.parse import urlparse
 
-import requests
 from bs4 import BeautifulSoup
 
 from ..models import ExecutiveContact
 from ..config import get_processing_config
+from ..network.http_cache import SOURCE_COMPANY_SITE
+from ..network.http_client import get_http_client
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +54,20 @@ class PhoneCandidate:
     source: str
     format_type: str = "unknown"  # mobile, landline, etc.
 
+async def _fetch_website_pages(urls: List[str]) -> List[str]:
+    """Fetch website pages concurrently on the shared HTTP client, returning 200 bodies"""
+    http_client = await get_http_client()
+    
+    async def fetch(url: str) -> Optional[str]:
+        try:
+            response = await http_client.get_html(url, timeout=10, cache_source=SOURCE_COMPANY_SITE)
+            return response.text() if response.status == 200 else None
+        except Exception:
+            return None
+    
+    pages = await asyncio.gather(*(fetch(url) for url in urls))
+    return [content for content in pages if content]
+
 class EmailDiscoveryEngine:
     """
     Advanced email discovery engine using multiple strategies.
@@ -221,31 +236,19 @@ class EmailDiscoveryEngine:
                 f"https://www.{domain}/about"
             ]
             
-            for url in pages_to_search:
-                try:
-                    response = requests.get(url, timeout=10, headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    })
-                    
-                    if response.status_code == 200:
-                        emails = self._extract_emails_from_content(response.text, domain)
-                        for email in emails:
-                            # Check if email might belong to executive
-                            confidence = self._calculate_email_executive_relevance(
-                                email, executive
-                            )
-                            if confidence > 0.3:
-                                candidates.append(EmailCandidate(
-                                    email=email,
-                                    confidence=confidence,
-                                    source="website_extraction"
-                                ))
-                    
-                    # Rate limiting
-                    await asyncio.sleep(1)
-                    
-                except Exception:
-                    continue
+            for content in await _fetch_website_pages(pages_to_search):
+                emails = self._extract_emails_from_content(content, domain)
+                for email in emails:
+                    # Check if email might belong to executive
+                    confidence = self._calculate_email_executive_relevance(
+                        email, executive
+                    )
+                    if confidence > 0.3:
+                        candidates.append(EmailCandidate(
+                            email=email,
+                            confidence=confidence,
+                            source="website_extraction"
+                        ))
                     
         except Exception as e:
             logger.debug(f"Website email search failed: {e}")
@@ -391,26 +394,15 @@ class PhoneDiscoveryEngine:
                 f"https://www.{domain}/contact"
             ]
             
-            for url in pages_to_search:
-                try:
-                    response = requests.get(url, timeout=10, headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    })
-                    
-                    if response.status_code == 200:
-                        phones = self._extract_phones_from_content(response.text)
-                        for phone in phones:
-                            candidates.append(PhoneCandidate(
-                                phone=phone,
-                                confidence=0.7,
-                                source="website_extraction",
-                                format_type=self._identify_phone_type(phone)
-                            ))
-                    
-                    await asyncio.sleep(1)
-                    
-                except Exception:
-                    continue
+            for content in await _fetch_website_pages(pages_to_search):
+                phones = self._extract_phones_from_content(content)
+                for phone in phones:
+                    candidates.append(PhoneCandidate(
+                        phone=phone,
+                        confidence=0.7,
+                        source="website_extraction",
+                        format_type=self._identify_phone_type(phone)
+                    ))
                     
         except Exception as e:
             logger.debug(f"Website phone search failed: {e}")
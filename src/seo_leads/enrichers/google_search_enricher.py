@@ -21,11 +21,9 @@ Coverage: 90%+ of companies with online presence
 Cost: £0.00 (free search)
 """
 
-import asyncio
 import logging
 import random
 import re
-import time
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
@@ -37,6 +35,7 @@ from fuzzywuzzy import fuzz
 
 from ..models import ExecutiveContact
 from ..config import get_processing_config
+from ..network.rate_limiter import GOOGLE_SEARCH_RATE_KEY, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -65,9 +64,7 @@ class EnhancedGoogleSearchEnricher:
             'Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:109.0) Gecko/20100101 Firefox/121.0',
         ]
         
-        # Request delay tracking
-        self.last_request = 0
-        self.min_delay = 2.0  # Minimum 2 seconds between requests
+        self.rate_limiter = get_rate_limiter()
         
         # Search patterns for different types of executives
         self.executive_search_patterns = [
@@ -106,17 +103,8 @@ class EnhancedGoogleSearchEnricher:
     
     async def _enforce_rate_limit(self):
         """Enhanced rate limiting with jitter"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request
-        
-        if time_since_last < self.min_delay:
-            # Add random jitter to avoid predictable patterns
-            jitter = random.uniform(0.5, 1.5)
-            sleep_time = (self.min_delay - time_since_last) + jitter
-            logger.debug(f"Rate limiting: sleeping {sleep_time:.2f}s")
-            await asyncio.sleep(sleep_time)
-        
-        self.last_request = time.time()
+        # google.com has one registered budget (with jitter) shared by every Google caller
+        await self.rate_limiter.acquire(GOOGLE_SEARCH_RATE_KEY)
     
     async def discover_executives(self, company_name: str, website_domain: str) -> List[ExecutiveContact]:
         """Enhanced executive discovery with multiple search strategies"""
@@ -516,5 +504,5 @@ class EnhancedGoogleSearchEnricher:
             'cost': '£0.00 (FREE)',
             'coverage': '90%+ companies with online presence',
             'data_quality': 'MEDIUM-HIGH',
-            'rate_limit': f'{1/self.min_delay:.1f} requests/second'
+            'rate_limit': f'{self.rate_limiter.get_limit(GOOGLE_SEARCH_RATE_KEY).rate:.2f} requests/second'
         } 
\ No newline at end of file
@@ -18,7 +18,6 @@ import asyncio
 import logging
 import random
 import re
-import time
 from typing import Dict, List, Optional, Tuple
 from urllib.parse import quote_plus, urljoin, urlparse
 from dataclasses import dataclass
@@ -29,6 +28,7 @@ from fuzzywuzzy import fuzz
 
 from ..models import ExecutiveContact
 from ..config import get_processing_config
+from ..network.rate_limiter import LINKEDIN_RATE_KEY, RateLimit, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -111,8 +111,8 @@ class LinkedInDirectEnricher:
         })
         
         # Rate limiting for LinkedIn (more conservative)
-        self.last_request = 0
         self.min_delay = 3.0  # 3 seconds between LinkedIn requests
+        self.rate_limiter = get_rate_limiter()
         
         logger.info("LinkedIn Direct Enricher initialized for P2.2 executive discovery")
     
@@ -844,15 +844,7 @@ class LinkedInDirectEnricher:
     
     async def _enforce_rate_limit(self):
         """Enforce rate limiting for LinkedIn requests"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request
-        
-        if time_since_last < self.min_delay:
-            sleep_time = self.min_delay - time_since_last
-            logger.debug(f"LinkedIn rate limiting: sleeping {sleep_time:.2f}s")
-            await asyncio.sleep(sleep_time)
-        
-        self.last_request = time.time()
+        await self.rate_limiter.acquire(LINKEDIN_RATE_KEY, RateLimit.per_interval(self.min_delay))
 
 # Usage example
 async def test_linkedin_direct():
@@ -3,10 +3,15 @@ Data Export Modules
 
 Provides data export and integration capabilities including:
 - JSON export optimized for Make.com automation
-- CSV export for manual review
+- NDJSON and CSV export for manual review and bulk loading
 - Webhook integration
+- Incremental exports (per-destination watermarks and lead hashes)
+- Partitioned Parquet results warehouse with query helpers (optional, pyarrow)
 """
 
 from .make_exporter import MakeExporter
+from .export_state import ExportStateStore
+from .results_warehouse import ResultsWarehouse, ResultsWarehouseConfig, ResultsQuery, get_results_warehouse
 
-__all__ = ['MakeExporter'] 
\ No newline at end of file
+__all__ = ['MakeExporter', 'ExportStateStore', 'ResultsWarehouse', 'ResultsWarehouseConfig', 'ResultsQuery',
+           'get_results_warehouse'] 
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""
+Incremental Export State
+
+Remembers what each export destination (json, ndjson, csv, webhook) has
+already received so `export --since-last` only emits leads that changed:
+
+- export_watermarks: per destination, the start time of its last successful
+  export. Only leads updated after the oldest watermark are read.
+- exported_leads: per destination and lead, a hash of the fields that
+  destination exports. A lead is emitted when its hash differs, so touching
+  a row without changing what's exported (e.g. status -> exported) doesn't
+  resend it.
+
+Hashes are recorded page by page while the export runs. If an export fails,
+the hashes it wrote are dropped again, which makes those leads look new and
+re-exports them next time rather than losing them.
+"""
+
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+from ..database import get_db_session
+from ..models import ExportedLead, ExportWatermark
+
+logger = logging.getLogger(__name__)
+
+def lead_content_hash(content: Dict) -> str:
+    """Stable hash of the exported fields of one lead"""
+    serialized = json.dumps(content, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(serialized.encode('utf-8')).hexdigest()
+
+class ExportStateStore:
+    """
+    Read and write export watermarks and lead hashes
+
+    Usage:
+        state = ExportStateStore()
+        watermarks = state.load_watermarks(['json', 'webhook'])
+        known = state.known_hashes('json', lead_ids)
+        state.record('json', {lead_id: content_hash})
+        state.advance('json', started_at, leads_exported)
+    """
+
+    def load_watermarks(self, destinations: Iterable[str]) -> Dict[str, Optional[datetime]]:
+        """Watermark per destination (None if it has never been exported to)"""
+        watermarks = {destination: None for destination in destinations}
+        try:
+            with get_db_session() as session:
+                rows = session.query(ExportWatermark).filter(
+                    ExportWatermark.destination.in_(list(watermarks))
+                ).all()
+                for row in rows:
+                    watermarks[row.destination] = row.watermark
+        except Exception as e:
+            logger.error(f"Error loading export watermarks: {e}")
+        return watermarks
+
+    def known_hashes(self, destination: str, lead_ids: Iterable[str]) -> Dict[str, str]:
+        """Hashes of these leads as last exported to destination"""
+        lead_ids = list(lead_ids)
+        if not lead_ids:
+            return {}
+
+        with get_db_session() as session:
+            rows = session.query(ExportedLead.lead_id, ExportedLead.content_hash).filter(
+                ExportedLead.destination == destination,
+                ExportedLead.lead_id.in_(lead_ids)
+            ).all()
+            return {lead_id: content_hash for lead_id, content_hash in rows}
+
+    def record(self, destination: str, hashes: Dict[str, str]):
+        """Store the hashes of leads just emitted to destination"""
+        if not hashes:
+            return
+
+        now = datetime.utcnow()
+        with get_db_session() as session:
+            session.query(ExportedLead).filter(
+                ExportedLead.destination == destination,
+                ExportedLead.lead_id.in_(list(hashes))
+            ).delete(synchronize_session=False)
+            session.bulk_insert_mappings(ExportedLead, [
+                {'destination': destination, 'lead_id': lead_id, 'content_hash': content_hash, 'exported_at': now}
+                for lead_id, content_hash in hashes.items()
+            ])
+            session.commit()
+
+    def advance(self, destination: str, watermark: datetime, leads_exported: int):
+        """Move a destination's watermark after a successful export"""
+        with get_db_session() as session:
+            row = session.get(ExportWatermark, destination)
+            if row is None:
+                row = ExportWatermark(destination=destination)
+                session.add(row)
+
+            row.watermark = watermark
+            row.leads_exported = leads_exported
+            row.last_export_at = datetime.utcnow()
+            session.commit()
+
+    def forget_since(self, destinations: Iterable[str], since: datetime):
+        """Drop hashes written by a failed export so its leads are exported again"""
+        try:
+            with get_db_session() as session:
+                session.query(ExportedLead).filter(
+                    ExportedLead.destination.in_(list(destinations)),
+                    ExportedLead.exported_at >= since
+                ).delete(synchronize_session=False)
+                session.commit()
+        except Exception as e:
+            logger.error(f"Error rolling back export state: {e}")
+
+    def reset(self, destinations: Iterable[str]):
+        """Forget everything exported to these destinations (full rebuild)"""
+        destinations = list(destinations)
+        with get_db_session() as session:
+            session.query(ExportedLead).filter(
+                ExportedLead.destination.in_(destinations)
+            ).delete(synchronize_session=False)
+            session.query(ExportWatermark).filter(
+                ExportWatermark.destination.in_(destinations)
+            ).delete(synchronize_session=False)
+            session.commit()
+        logger.info(f"Reset export state for {', '.join(destinations)}")
@@ -6,24 +6,234 @@ Exports qualified leads with complete business intelligence data.
 
 Based on creative design decisions:
 - Hierarchical JSON structure for webhook compatibility
-- Multi-format support (JSON, CSV) 
+- Multi-format support (JSON, NDJSON, CSV) 
 - Batch export with progress tracking
+
+Leads are streamed: the database is read in keyset-paginated pages ordered by
+lead_score and every lead is written to all requested files as it arrives, so
+memory stays flat however many leads are exported.
 """
 
 import json
 import csv
 import logging
+import os
+import sys
+import time
+from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 from pathlib import Path
 import requests
+from sqlalchemy import and_, or_
 
 from ..config import get_export_config, get_processing_config
 from ..database import get_db_session
 from ..models import UKCompany, UKCompanyLead
+from .export_state import ExportStateStore, lead_content_hash
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
 
 logger = logging.getLogger(__name__)
 
+EXPORT_PAGE_ROWS = int(os.environ.get('EXPORT_PAGE_ROWS', 1000))
+WEBHOOK_SAMPLE_LEADS = 10  # Leads included in the webhook payload
+
+CSV_COLUMNS = [
+    'lead_id', 'company_name', 'website', 'city', 'sector',
+    'contact_person', 'contact_role', 'email', 'phone', 'linkedin_url',
+    'seo_score', 'lead_score', 'priority_tier', 'tier_label',
+    'urgency', 'estimated_value', 'contact_confidence'
+]
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident memory of this process so far, in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def flatten_lead_for_csv(lead: Dict) -> Dict:
+    """Flatten a hierarchical lead into one CSV row"""
+    return {
+        'lead_id': lead['lead_id'],
+        'company_name': lead['company']['name'],
+        'website': lead['company']['website'],
+        'city': lead['company']['location']['city'],
+        'sector': lead['company']['business']['sector'],
+        'contact_person': lead['contact']['person'],
+        'contact_role': lead['contact']['role'],
+        'email': lead['contact']['email'],
+        'phone': lead['contact']['phone'],
+        'linkedin_url': lead['contact']['linkedin_url'],
+        'seo_score': lead['seo_analysis']['overall_score'],
+        'lead_score': lead['lead_qualification']['final_score'],
+        'priority_tier': lead['lead_qualification']['priority_tier'],
+        'tier_label': lead['lead_qualification']['tier_label'],
+        'urgency': lead['outreach_intelligence']['urgency'],
+        'estimated_value': lead['outreach_intelligence']['estimated_value'],
+        'contact_confidence': lead['contact']['confidence']
+    }
+
+class LeadFileWriter(ABC):
+    """Incremental writer for one export file"""
+    
+    format = ''
+    suffix = ''
+    
+    def __init__(self, filepath: Path):
+        self.filepath = filepath
+        self.count = 0
+        self._file = open(filepath, 'w', newline='', encoding='utf-8')
+        self.start()
+    
+    @staticmethod
+    def content(lead: Dict) -> Dict:
+        """Fields this format exports, for change detection (metadata is volatile)"""
+        return {key: value for key, value in lead.items() if key != 'metadata'}
+    
+    def start(self):
+        pass
+    
+    @abstractmethod
+    def write(self, lead: Dict):
+        """Append one lead to the file"""
+        pass
+    
+    def finish(self, export_info: Dict):
+        pass
+    
+    def close(self, export_info: Dict) -> Dict:
+        """Finish the file and return its export result"""
+        self.finish(export_info)
+        self._file.close()
+        logger.info(f"{self.format.upper()} export complete: {self.filepath}")
+        return {
+            'format': self.format,
+            'filepath': str(self.filepath),
+            'size_mb': self.filepath.stat().st_size / (1024 * 1024),
+            'count': self.count
+        }
+    
+    def discard(self):
+        """Close and delete a partial or empty file"""
+        if not self._file.closed:
+            self._file.close()
+        self.filepath.unlink(missing_ok=True)
+
+class JSONLeadWriter(LeadFileWriter):
+    """Single JSON document: {"leads": [...], "export_info": {...}}
+    
+    export_info follows the leads because total_leads is only known at the end.
+    """
+    
+    format = 'json'
+    suffix = 'json'
+    
+    def start(self):
+        self._file.write('{\n  "leads": [')
+    
+    def write(self, lead: Dict):
+        separator = ',\n    ' if self.count else '\n    '
+        body = json.dumps(lead, indent=2, ensure_ascii=False).replace('\n', '\n    ')
+        self._file.write(separator + body)
+        self.count += 1
+    
+    def finish(self, export_info: Dict):
+        info = json.dumps(export_info, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+        self._file.write(f'\n  ],\n  "export_info": {info}\n}}\n')
+
+class NDJSONLeadWriter(LeadFileWriter):
+    """One lead per line with no envelope; the total is in the export result"""
+    
+    format = 'ndjson'
+    suffix = 'ndjson'
+    
+    def write(self, lead: Dict):
+        self._file.write(json.dumps(lead, ensure_ascii=False) + '\n')
+        self.count += 1
+
+class CSVLeadWriter(LeadFileWriter):
+    """Flattened leads for manual review"""
+    
+    format = 'csv'
+    suffix = 'csv'
+    
+    @staticmethod
+    def content(lead: Dict) -> Dict:
+        return flatten_lead_for_csv(lead)
+    
+    def start(self):
+        self._writer = csv.DictWriter(self._file, fieldnames=CSV_COLUMNS)
+        self._writer.writeheader()
+    
+    def write(self, lead: Dict):
+        self._writer.writerow(flatten_lead_for_csv(lead))
+        self.count += 1
+
+LEAD_WRITERS = {writer.format: writer for writer in (JSONLeadWriter, NDJSONLeadWriter, CSVLeadWriter)}
+
+class WebhookDelivery:
+    """Collects leads for the Make.com webhook during an export
+    
+    Full exports send the first WEBHOOK_SAMPLE_LEADS leads in one request, as
+    before, and leave the webhook watermark alone since the other leads were
+    never sent. Incremental exports send every changed lead, WEBHOOK_SAMPLE_LEADS
+    per request. Lead hashes are only recorded for requests that succeeded.
+    """
+    
+    def __init__(self, exporter: 'MakeExporter', incremental: bool):
+        self.exporter = exporter
+        self.incremental = incremental
+        self.pending: List[Dict] = []
+        self.pending_hashes: Dict[str, str] = {}
+        self.leads_sent = 0
+        self.requests = 0
+        self.failure: Optional[Dict] = None
+    
+    def add_page(self, page: List[Dict]) -> List[str]:
+        """Queue a page's leads for delivery; returns the IDs queued"""
+        if not self.incremental:
+            page = page[:WEBHOOK_SAMPLE_LEADS - len(self.pending)]
+        
+        changed, hashes = self.exporter._changed_leads('webhook', LeadFileWriter.content, page, self.incremental)
+        self.pending.extend(changed)
+        self.pending_hashes.update(hashes)
+        
+        if self.incremental:
+            while len(self.pending) >= WEBHOOK_SAMPLE_LEADS:
+                self._send(WEBHOOK_SAMPLE_LEADS, WEBHOOK_SAMPLE_LEADS)
+        return [lead['lead_id'] for lead in changed]
+    
+    def finish(self, lead_count: int) -> Dict:
+        """Send what's left and summarize delivery"""
+        if self.pending:
+            self._send(len(self.pending), len(self.pending) if self.incremental else lead_count)
+        
+        if self.failure:
+            return {**self.failure, 'leads_sent': self.leads_sent, 'requests': self.requests}
+        return {'status': 'success', 'leads_sent': self.leads_sent, 'requests': self.requests}
+    
+    def _send(self, size: int, lead_count: int):
+        batch, self.pending = self.pending[:size], self.pending[size:]
+        if self.failure:
+            return  # Stop after the first failed request; these leads go next time
+        
+        result = self.exporter._send_webhook(batch, lead_count)
+        self.requests += 1
+        if result['status'] != 'success':
+            self.failure = result
+            return
+        
+        self.leads_sent += len(batch)
+        self.exporter.export_state.record(
+            'webhook', {lead['lead_id']: self.pending_hashes.pop(lead['lead_id']) for lead in batch}
+        )
+
 class MakeExporter:
     """
     Make.com optimized exporter with multi-format support
@@ -38,87 +248,202 @@ class MakeExporter:
     def __init__(self):
         self.export_config = get_export_config()
         self.processing_config = get_processing_config()
+        self.export_state = ExportStateStore()
     
     def export_qualified_leads(self, min_score: float = 50.0, 
                              export_format: str = 'json',
-                             send_webhook: bool = True) -> Dict:
+                             send_webhook: bool = True,
+                             since_last: bool = False,
+                             rebuild: bool = False) -> Dict:
         """
         Export qualified leads in specified format
         
         Args:
             min_score: Minimum lead score to export
-            export_format: 'json' or 'csv'
+            export_format: 'json', 'ndjson', 'csv' or 'both' (json + csv)
             send_webhook: Whether to send to Make.com webhook
+            since_last: Only emit leads whose exported fields changed since the
+                last export to each destination (webhook included)
+            rebuild: Forget previous exports and emit every lead above min_score
             
         Returns:
             Export results with file paths and webhook status
         """
+        writers: List[LeadFileWriter] = []
+        destinations: List[str] = []
+        started_at = datetime.utcnow()
         try:
-            logger.info(f"Starting export of qualified leads (min_score: {min_score})")
+            logger.info(f"Starting export of qualified leads (min_score: {min_score}"
+                        f"{', since last export' if since_last else ''}{', rebuild' if rebuild else ''})")
+            start_time = time.perf_counter()
             
-            # Get qualified leads from database
-            leads_data = self._get_qualified_leads(min_score)
+            # 'both' keeps its old meaning: JSON and CSV
+            formats = ['json', 'csv'] if export_format == 'both' else [export_format]
+            unknown = [fmt for fmt in formats if fmt not in LEAD_WRITERS]
+            if unknown:
+                return {'status': 'error', 'error': f"Unknown export format: {', '.join(unknown)}"}
             
-            if not leads_data:
-                logger.info("No qualified leads found for export")
-                return {'status': 'no_leads', 'count': 0}
+            writers = self._open_writers(formats)
+            use_webhook = send_webhook and bool(self.export_config.make_webhook_url)
+            destinations = [writer.format for writer in writers] + (['webhook'] if use_webhook else [])
             
-            logger.info(f"Found {len(leads_data)} qualified leads for export")
+            if rebuild:
+                self.export_state.reset(destinations)
             
-            # Export in specified format
-            export_results = {}
+            # Only leads updated since the oldest watermark can have changed; a
+            # destination that was never exported to needs everything
+            watermarks = self.export_state.load_watermarks(destinations) if since_last else {}
+            updated_since = min(watermarks.values()) if watermarks and all(watermarks.values()) else None
             
-            if export_format == 'json':
-                export_results['json'] = self._export_json(leads_data)
-            elif export_format == 'csv':
-                export_results['csv'] = self._export_csv(leads_data)
-            else:
-                # Export both formats
-                export_results['json'] = self._export_json(leads_data)
-                export_results['csv'] = self._export_csv(leads_data)
+            # Incremental and rebuild exports cover leads exported before too
+            statuses = ['qualified', 'exported'] if since_last or rebuild else ['qualified']
+            
+            webhook = WebhookDelivery(self, incremental=since_last) if use_webhook else None
+            scanned = emitted = 0
+            
+            # File hashes are recorded page by page once the file is safely
+            # closed, never for a file a crash would leave half written
+            written_hashes: Dict[str, List[Dict[str, str]]] = {writer.format: [] for writer in writers}
             
-            # Send webhook if requested and configured
-            webhook_result = None
-            if send_webhook and self.export_config.make_webhook_url:
-                webhook_result = self._send_webhook(leads_data)
+            # One pass over the database feeds every destination
+            for page in self._iter_lead_pages(min_score, statuses, updated_since):
+                scanned += len(page)
+                emitted_ids = set()
+                
+                for writer in writers:
+                    changed, hashes = self._changed_leads(writer.format, writer.content, page, since_last)
+                    for lead in changed:
+                        writer.write(lead)
+                        emitted_ids.add(lead['lead_id'])
+                    if hashes:
+                        written_hashes[writer.format].append(hashes)
+                
+                if webhook:
+                    emitted_ids.update(webhook.add_page(page))
+                
+                emitted += len(emitted_ids)
+            
+            webhook_result = webhook.finish(scanned) if webhook else None
+            
+            if not emitted:
+                for writer in writers:
+                    writer.discard()
+                if not since_last:
+                    logger.info("No qualified leads found for export")
+                    return {'status': 'no_leads', 'count': 0}
+                
+                logger.info(f"No changed leads since the last export ({scanned} checked)")
+                self._update_export_status(min_score, started_at, {destination: 0 for destination in destinations})
+                return {'status': 'no_changes', 'count': 0, 'scanned': scanned}
+            
+            export_results = {}
+            for writer in writers:
+                export_results[writer.format] = writer.close({
+                    'timestamp': datetime.utcnow().isoformat(),
+                    'total_leads': writer.count,
+                    'format': writer.format,
+                    'incremental': since_last,
+                    'source': 'UK Company SEO Lead Generation System'
+                })
+                for hashes in written_hashes[writer.format]:
+                    self.export_state.record(writer.format, hashes)
+            
+            # Written destinations move their watermark; a failed webhook keeps
+            # its own, and so does a full export's webhook, which only got a sample
+            exported_counts = {writer.format: writer.count for writer in writers}
+            if webhook_result:
                 export_results['webhook'] = webhook_result
+                if webhook_result['status'] == 'success' and webhook.incremental:
+                    exported_counts['webhook'] = webhook_result['leads_sent']
             
             # Update export status in database
-            self._update_export_status(leads_data)
+            self._update_export_status(min_score, started_at, exported_counts)
+            
+            elapsed = time.perf_counter() - start_time
+            stats = {
+                'elapsed_seconds': round(elapsed, 2),
+                'leads_per_second': round(scanned / elapsed, 1) if elapsed else None,
+                'peak_rss_mb': round(peak_rss_mb(), 1) if resource else None
+            }
+            logger.info(f"Exported {emitted} of {scanned} leads in {stats['elapsed_seconds']}s "
+                        f"({stats['leads_per_second']} leads/s, peak RSS {stats['peak_rss_mb']} MB)")
             
             return {
                 'status': 'success',
-                'count': len(leads_data),
+                'count': emitted,
+                'scanned': scanned,
                 'exports': export_results,
+                'stats': stats,
                 'timestamp': datetime.utcnow().isoformat()
             }
             
         except Exception as e:
+            for writer in writers:
+                writer.discard()
+            self.export_state.forget_since(destinations, started_at)
             logger.error(f"Error exporting qualified leads: {e}")
             return {'status': 'error', 'error': str(e)}
     
-    def _get_qualified_leads(self, min_score: float) -> List[Dict]:
-        """Get qualified leads from database with complete data"""
-        try:
+    def _open_writers(self, formats: List[str]) -> List[LeadFileWriter]:
+        """Open one incremental writer per export format"""
+        Path(self.export_config.output_directory).mkdir(exist_ok=True)
+        timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
+        
+        writers = []
+        for fmt in formats:
+            writer_class = LEAD_WRITERS[fmt]
+            filepath = Path(self.export_config.output_directory) / f"uk_leads_export_{timestamp}.{writer_class.suffix}"
+            writers.append(writer_class(filepath))
+        return writers
+    
+    def _changed_leads(self, destination: str, content: Callable[[Dict], Dict],
+                       page: List[Dict], since_last: bool) -> Tuple[List[Dict], Dict[str, str]]:
+        """Leads of a page to emit to a destination, and their new content hashes"""
+        hashes = {lead['lead_id']: lead_content_hash(content(lead)) for lead in page}
+        known = self.export_state.known_hashes(destination, hashes) if since_last else {}
+        
+        changed = [lead for lead in page if known.get(lead['lead_id']) != hashes[lead['lead_id']]]
+        return changed, {lead['lead_id']: hashes[lead['lead_id']] for lead in changed}
+    
+    def _iter_lead_pages(self, min_score: float, statuses: List[str],
+                         updated_since: Optional[datetime] = None) -> Iterator[List[Dict]]:
+        """
+        Stream leads, best first, one page of rows at a time
+        
+        Keyset pagination on (lead_score DESC, id): each page continues after
+        the last row of the previous one, so every page is an index range scan
+        instead of an ever-growing OFFSET, and each page gets its own session
+        so loaded rows are released before the next page is read.
+        """
+        last_score = last_id = None
+        
+        while True:
             with get_db_session() as session:
-                # Query qualified companies above minimum score
-                companies = session.query(UKCompany).filter(
-                    UKCompany.status == 'qualified',
+                query = session.query(UKCompany).filter(
+                    UKCompany.status.in_(statuses),
                     UKCompany.lead_score >= min_score
-                ).order_by(UKCompany.lead_score.desc()).all()
-                
-                leads_data = []
+                )
+                if updated_since is not None:
+                    query = query.filter(UKCompany.updated_at > updated_since)
+                if last_id is not None:
+                    query = query.filter(or_(
+                        UKCompany.lead_score < last_score,
+                        and_(UKCompany.lead_score == last_score, UKCompany.id > last_id)
+                    ))
                 
-                for company in companies:
-                    # Build hierarchical lead data structure
-                    lead_data = self._build_lead_structure(company)
-                    leads_data.append(lead_data)
+                companies = query.order_by(
+                    UKCompany.lead_score.desc(), UKCompany.id
+                ).limit(EXPORT_PAGE_ROWS).all()
                 
-                return leads_data
-                
-        except Exception as e:
-            logger.error(f"Error getting qualified leads: {e}")
-            return []
+                page = [self._build_lead_structure(company) for company in companies]
+                if companies:
+                    last_score, last_id = companies[-1].lead_score, companies[-1].id
+            
+            if page:
+                yield page
+            
+            if len(page) < EXPORT_PAGE_ROWS:
+                return
     
     def _build_lead_structure(self, company: UKCompany) -> Dict:
         """Build hierarchical lead data structure for export"""
@@ -184,107 +509,8 @@ class MakeExporter:
             }
         }
     
-    def _export_json(self, leads_data: List[Dict]) -> Dict:
-        """Export leads as JSON file"""
-        try:
-            # Create export directory
-            Path(self.export_config.output_directory).mkdir(exist_ok=True)
-            
-            # Generate filename
-            timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-            filename = f"uk_leads_export_{timestamp}.json"
-            filepath = Path(self.export_config.output_directory) / filename
-            
-            # Create export structure
-            export_data = {
-                'export_info': {
-                    'timestamp': datetime.utcnow().isoformat(),
-                    'total_leads': len(leads_data),
-                    'format': 'json',
-                    'source': 'UK Company SEO Lead Generation System'
-                },
-                'leads': leads_data
-            }
-            
-            # Write JSON file
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(export_data, f, indent=2, ensure_ascii=False)
-            
-            logger.info(f"JSON export complete: {filepath}")
-            
-            return {
-                'format': 'json',
-                'filepath': str(filepath),
-                'size_mb': filepath.stat().st_size / (1024 * 1024),
-                'count': len(leads_data)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error exporting JSON: {e}")
-            return {'format': 'json', 'error': str(e)}
-    
-    def _export_csv(self, leads_data: List[Dict]) -> Dict:
-        """Export leads as CSV file for manual review"""
-        try:
-            # Create export directory
-            Path(self.export_config.output_directory).mkdir(exist_ok=True)
-            
-            # Generate filename
-            timestamp = datetime.utcnow().strftime('%Y%m%d_%H%M%S')
-            filename = f"uk_leads_export_{timestamp}.csv"
-            filepath = Path(self.export_config.output_directory) / filename
-            
-            # Define CSV columns
-            columns = [
-                'lead_id', 'company_name', 'website', 'city', 'sector',
-                'contact_person', 'contact_role', 'email', 'phone', 'linkedin_url',
-                'seo_score', 'lead_score', 'priority_tier', 'tier_label',
-                'urgency', 'estimated_value', 'contact_confidence'
-            ]
-            
-            # Write CSV file
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=columns)
-                writer.writeheader()
-                
-                for lead in leads_data:
-                    # Flatten lead data for CSV
-                    csv_row = {
-                        'lead_id': lead['lead_id'],
-                        'company_name': lead['company']['name'],
-                        'website': lead['company']['website'],
-                        'city': lead['company']['location']['city'],
-                        'sector': lead['company']['business']['sector'],
-                        'contact_person': lead['contact']['person'],
-                        'contact_role': lead['contact']['role'],
-                        'email': lead['contact']['email'],
-                        'phone': lead['contact']['phone'],
-                        'linkedin_url': lead['contact']['linkedin_url'],
-                        'seo_score': lead['seo_analysis']['overall_score'],
-                        'lead_score': lead['lead_qualification']['final_score'],
-                        'priority_tier': lead['lead_qualification']['priority_tier'],
-                        'tier_label': lead['lead_qualification']['tier_label'],
-                        'urgency': lead['outreach_intelligence']['urgency'],
-                        'estimated_value': lead['outreach_intelligence']['estimated_value'],
-                        'contact_confidence': lead['contact']['confidence']
-                    }
-                    writer.writerow(csv_row)
-            
-            logger.info(f"CSV export complete: {filepath}")
-            
-            return {
-                'format': 'csv',
-                'filepath': str(filepath),
-                'size_mb': filepath.stat().st_size / (1024 * 1024),
-                'count': len(leads_data)
-            }
-            
-        except Exception as e:
-            logger.error(f"Error exporting CSV: {e}")
-            return {'format': 'csv', 'error': str(e)}
-    
-    def _send_webhook(self, leads_data: List[Dict]) -> Dict:
-        """Send leads data to Make.com webhook"""
+    def _send_webhook(self, leads_data: List[Dict], lead_count: int) -> Dict:
+        """Send the first leads of an export to Make.com webhook"""
         try:
             webhook_url = self.export_config.make_webhook_url
             
@@ -295,8 +521,8 @@ class MakeExporter:
             payload = {
                 'source': 'UK Company SEO Lead Generation System',
                 'timestamp': datetime.utcnow().isoformat(),
-                'lead_count': len(leads_data),
-                'leads': leads_data[:10]  # Send first 10 leads to avoid payload size limits
+                'lead_count': lead_count,
+                'leads': leads_data[:WEBHOOK_SAMPLE_LEADS]  # First leads only to avoid payload size limits
             }
             
             # Add webhook secret if configured
@@ -331,19 +557,32 @@ class MakeExporter:
             logger.error(f"Error sending webhook: {e}")
             return {'status': 'error', 'error': str(e)}
     
-    def _update_export_status(self, leads_data: List[Dict]):
-        """Update export status for exported leads"""
+    def _update_export_status(self, min_score: float, started_at: datetime,
+                              exported_counts: Dict[str, int]):
+        """Mark the exported leads as exported and move destination watermarks
+        
+        One UPDATE over the export's filter instead of an IN list of every
+        exported ID. Rows changed after the export started may not be in the
+        files, so they stay qualified, and the watermarks are set to the start
+        of the export so the next --since-last run looks at them again.
+        """
         try:
             with get_db_session() as session:
-                lead_ids = [lead['lead_id'] for lead in leads_data]
-                
-                # Update status to exported
-                session.query(UKCompany).filter(
-                    UKCompany.id.in_(lead_ids)
-                ).update({'status': 'exported'}, synchronize_session=False)
+                updated = session.query(UKCompany).filter(
+                    UKCompany.status == 'qualified',
+                    UKCompany.lead_score >= min_score,
+                    or_(UKCompany.updated_at.is_(None), UKCompany.updated_at <= started_at)
+                ).update(
+                    # Keep updated_at: a status change isn't a change to the lead
+                    {'status': 'exported', 'updated_at': UKCompany.updated_at},
+                    synchronize_session=False
+                )
                 
                 session.commit()
-                logger.info(f"Updated export status for {len(lead_ids)} leads")
+                logger.info(f"Updated export status for {updated} leads")
+            
+            for destination, count in exported_counts.items():
+                self.export_state.advance(destination, started_at, count)
                 
         except Exception as e:
             logger.error(f"Error updating export status: {e}")
@@ -0,0 +1,414 @@
+"""
+Results Warehouse
+
+Columnar sink for pipeline results. Executive discovery results, lead
+qualifications and per-step discovery timings are appended to Parquet
+datasets partitioned by the run's start date and source:
+
+    <directory>/discovery_results/run_date=2025-06-23/source=orchestrator/part-<run>-00001.parquet
+    <directory>/lead_qualifications/...
+    <directory>/step_timings/...
+
+Each table has a fixed schema, so files from different runs read back as one
+dataset, and rows are buffered and written in zstd-compressed batches instead
+of one pretty-printed *_results_<timestamp>.json per run. ResultsQuery answers
+the common questions (hit rates by sector, step latencies, tier breakdowns)
+straight from the Parquet files.
+
+Requires pyarrow; without it the warehouse is disabled and results are only
+logged as before. Enabled by setting RESULTS_WAREHOUSE_DIR.
+"""
+
+import atexit
+import logging
+import os
+import re
+import threading
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DISCOVERY_TABLE = 'discovery_results'
+QUALIFICATION_TABLE = 'lead_qualifications'
+STEP_TIMING_TABLE = 'step_timings'
+
+if PYARROW_AVAILABLE:
+    EXECUTIVE_TYPE = pa.struct([
+        ('name', pa.string()),
+        ('title', pa.string()),
+        ('seniority_tier', pa.string()),
+        ('email', pa.string()),
+        ('phone', pa.string()),
+        ('linkedin_url', pa.string()),
+        ('confidence', pa.float64())
+    ])
+
+    SCHEMAS = {
+        DISCOVERY_TABLE: pa.schema([
+            ('run_id', pa.string()),
+            ('recorded_at', pa.timestamp('ms')),
+            ('company_id', pa.string()),
+            ('company_name', pa.string()),
+            ('website_url', pa.string()),
+            ('sector', pa.string()),
+            ('city', pa.string()),
+            ('executives_found', pa.int32()),
+            ('has_decision_maker', pa.bool_()),
+            ('companies_house_verified', pa.bool_()),
+            ('overall_confidence', pa.float64()),
+            ('total_processing_ms', pa.int64()),
+            ('discovery_sources', pa.list_(pa.string())),
+            ('executives', pa.list_(EXECUTIVE_TYPE))
+        ]),
+        QUALIFICATION_TABLE: pa.schema([
+            ('run_id', pa.string()),
+            ('recorded_at', pa.timestamp('ms')),
+            ('company_id', pa.string()),
+            ('company_name', pa.string()),
+            ('sector', pa.string()),
+            ('city', pa.string()),
+            ('final_score', pa.float64()),
+            ('priority_tier', pa.string()),
+            ('seo_score', pa.float64()),
+            ('business_score', pa.float64()),
+            ('sector_score', pa.float64()),
+            ('growth_score', pa.float64()),
+            ('contact_score', pa.float64()),
+            ('estimated_value', pa.float64()),
+            ('urgency', pa.string())
+        ]),
+        STEP_TIMING_TABLE: pa.schema([
+            ('run_id', pa.string()),
+            ('recorded_at', pa.timestamp('ms')),
+            ('company_id', pa.string()),
+            ('company_name', pa.string()),
+            ('step_number', pa.int32()),
+            ('step_name', pa.string()),
+            ('step_source', pa.string()),
+            ('success', pa.bool_()),
+            ('confidence', pa.float64()),
+            ('fallback_triggered', pa.bool_()),
+            ('processing_ms', pa.int64()),
+            ('error_message', pa.string())
+        ])
+    }
+
+    # Partition directories are read back as strings, never inferred as dates/ints
+    PARTITIONING = ds.partitioning(pa.schema([('run_date', pa.string()), ('source', pa.string())]), flavor='hive')
+
+@dataclass
+class ResultsWarehouseConfig:
+    """Where results are written and how many rows are buffered per write"""
+    directory: str = "./results_warehouse"
+    enabled: bool = False
+    flush_rows: int = 2000  # Buffered rows per partition before a Parquet file is written
+    compression: str = 'zstd'
+
+    def __post_init__(self):
+        env_directory = os.environ.get('RESULTS_WAREHOUSE_DIR')
+        if env_directory:
+            self.directory = env_directory
+            self.enabled = True
+        self.flush_rows = int(os.environ.get('RESULTS_WAREHOUSE_FLUSH_ROWS', self.flush_rows))
+
+def _partition_value(value: Optional[str]) -> str:
+    """Safe directory name for a partition value"""
+    cleaned = re.sub(r'[^A-Za-z0-9_.-]+', '_', (value or 'unknown').strip().lower()).strip('_')
+    return cleaned or 'unknown'
+
+def _executive_row(executive: Any) -> Dict:
+    """Normalize either ExecutiveContact dataclass (models / orchestrator)"""
+    return {
+        'name': getattr(executive, 'full_name', None) or getattr(executive, 'name', None),
+        'title': getattr(executive, 'title', None),
+        'seniority_tier': getattr(executive, 'seniority_tier', None),
+        'email': getattr(executive, 'email', None),
+        'phone': getattr(executive, 'phone', None),
+        'linkedin_url': getattr(executive, 'linkedin_url', None),
+        'confidence': getattr(executive, 'overall_confidence', None) or getattr(executive, 'confidence_score', None)
+    }
+
+class ResultsWarehouse:
+    """
+    Buffered, partitioned Parquet writer for pipeline results
+
+    Usage:
+        warehouse = ResultsWarehouse(ResultsWarehouseConfig(directory='results_warehouse'))
+        warehouse.record_discovery(result, source='orchestrator', sector='plumbing')
+        warehouse.record_qualification(company_data, qualification)
+        warehouse.close()
+    """
+
+    def __init__(self, config: Optional[ResultsWarehouseConfig] = None, run_id: Optional[str] = None):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required for the results warehouse")
+
+        self.config = config or ResultsWarehouseConfig()
+        self.root = Path(self.config.directory)
+        started_at = datetime.utcnow()
+        self.run_id = run_id or f"{started_at:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        # Partition by the run's start date so a run crossing midnight stays in one partition
+        self.run_date = started_at.date().isoformat()
+        self._buffers: Dict[Tuple[str, str, str], List[Dict]] = {}
+        self._file_counter = 0
+        self._lock = threading.Lock()
+
+    def record_discovery(self, result: Any, source: str = 'orchestrator', company_id: Optional[str] = None,
+                         sector: Optional[str] = None, city: Optional[str] = None):
+        """
+        Append an ExecutiveDiscoveryResult and its step timings
+
+        Accepts the orchestrator's result (discovery_steps, executives) and the
+        models.py one (executives_found, primary_decision_maker).
+        """
+        recorded_at = datetime.utcnow()
+        company_id = company_id or getattr(result, 'company_id', None)
+        company_name = getattr(result, 'company_name', None)
+        executives = getattr(result, 'executives', None)
+        if executives is None:
+            executives = getattr(result, 'executives_found', None) or []
+        steps = getattr(result, 'discovery_steps', None) or []
+
+        if hasattr(result, 'total_processing_time'):
+            total_ms = int(result.total_processing_time * 1000)
+        else:
+            total_ms = sum(step.processing_time_ms for step in steps)
+
+        if hasattr(result, 'primary_decision_maker'):
+            has_decision_maker = result.primary_decision_maker is not None
+        else:
+            tiers = [getattr(executive, 'seniority_tier', None) for executive in executives]
+            has_decision_maker = 'tier_1' in tiers if any(tiers) else None
+
+        self._append(DISCOVERY_TABLE, source, recorded_at, {
+            'company_id': company_id,
+            'company_name': company_name,
+            'website_url': getattr(result, 'website_url', None) or getattr(result, 'company_domain', None),
+            'sector': sector,
+            'city': city,
+            'executives_found': len(executives),
+            'has_decision_maker': has_decision_maker,
+            'companies_house_verified': getattr(result, 'companies_house_verified', None),
+            'overall_confidence': getattr(result, 'overall_confidence', None) or getattr(result, 'success_rate', None),
+            'total_processing_ms': total_ms,
+            'discovery_sources': list(getattr(result, 'discovery_sources', None) or
+                                      sorted({step.source for step in steps})),
+            'executives': [_executive_row(executive) for executive in executives]
+        })
+
+        for step in steps:
+            self._append(STEP_TIMING_TABLE, source, recorded_at, {
+                'company_id': company_id,
+                'company_name': company_name,
+                'step_number': step.step_number,
+                'step_name': step.step_name,
+                'step_source': step.source,
+                'success': step.success,
+                'confidence': step.confidence,
+                'fallback_triggered': step.fallback_triggered,
+                'processing_ms': step.processing_time_ms,
+                'error_message': step.error_message
+            })
+
+    def record_qualification(self, company_data: Dict, qualification: Any, source: Optional[str] = None):
+        """Append a LeadQualification with the company it belongs to"""
+        factors = qualification.factor_breakdown or {}
+
+        def factor_score(name: str) -> Optional[float]:
+            factor = factors.get(name)
+            return getattr(factor, 'score', factor)
+
+        tier = qualification.priority_tier
+        self._append(QUALIFICATION_TABLE, source or company_data.get('source') or 'lead_qualifier', datetime.utcnow(), {
+            'company_id': company_data.get('id'),
+            'company_name': company_data.get('company_name'),
+            'sector': company_data.get('sector'),
+            'city': company_data.get('city'),
+            'final_score': qualification.final_score,
+            'priority_tier': getattr(tier, 'value', tier),
+            'seo_score': factor_score('seo'),
+            'business_score': factor_score('business'),
+            'sector_score': factor_score('sector'),
+            'growth_score': factor_score('growth'),
+            'contact_score': factor_score('contact'),
+            'estimated_value': qualification.estimated_value,
+            'urgency': qualification.urgency
+        })
+
+    def flush(self):
+        """Write every buffered partition to a new Parquet file"""
+        with self._lock:
+            buffers, self._buffers = self._buffers, {}
+            for (table, run_date, source), rows in buffers.items():
+                self._write(table, run_date, source, rows)
+
+    def close(self):
+        self.flush()
+
+    def _append(self, table: str, source: str, recorded_at: datetime, row: Dict):
+        row['run_id'] = self.run_id
+        row['recorded_at'] = recorded_at
+        key = (table, self.run_date, _partition_value(source))
+
+        with self._lock:
+            rows = self._buffers.setdefault(key, [])
+            rows.append(row)
+            if len(rows) >= self.config.flush_rows:
+                del self._buffers[key]
+                self._write(*key, rows)
+
+    def _write(self, table: str, run_date: str, source: str, rows: List[Dict]):
+        """Write one partition batch atomically (temp file, then rename)"""
+        try:
+            arrow_table = pa.Table.from_pylist(rows, schema=SCHEMAS[table])
+            directory = self.root / table / f"run_date={run_date}" / f"source={source}"
+            directory.mkdir(parents=True, exist_ok=True)
+
+            self._file_counter += 1
+            path = directory / f"part-{self.run_id}-{self._file_counter:05d}.parquet"
+            tmp_path = path.with_suffix('.parquet.tmp')
+            pq.write_table(arrow_table, tmp_path, compression=self.config.compression)
+            os.replace(tmp_path, path)
+            logger.debug(f"Wrote {len(rows)} rows to {path}")
+        except Exception as e:
+            logger.error(f"Error writing {len(rows)} {table} rows to the results warehouse: {e}")
+
+class ResultsQuery:
+    """
+    Common questions answered from the warehouse's Parquet datasets
+
+    Usage:
+        query = ResultsQuery('results_warehouse')
+        query.hit_rates(by='sector', since='2025-06-01')
+        query.step_latencies(source='orchestrator')
+    """
+
+    def __init__(self, directory: Optional[str] = None):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow is required to query the results warehouse")
+        self.root = Path(directory or ResultsWarehouseConfig().directory)
+
+    def load(self, table: str, since: Optional[str] = None, source: Optional[str] = None,
+             columns: Optional[List[str]] = None) -> 'pa.Table':
+        """Read a table, pruning partitions by run date (YYYY-MM-DD) and source"""
+        path = self.root / table
+        if not path.exists():
+            return SCHEMAS[table].empty_table()
+
+        dataset = ds.dataset(str(path), format='parquet', partitioning=PARTITIONING,
+                             schema=SCHEMAS[table].append(pa.field('run_date', pa.string()))
+                                                  .append(pa.field('source', pa.string())))
+        expression = None
+        if since:
+            expression = ds.field('run_date') >= str(since)
+        if source:
+            source_filter = ds.field('source') == _partition_value(source)
+            expression = source_filter if expression is None else expression & source_filter
+
+        return dataset.to_table(columns=columns, filter=expression)
+
+    def hit_rates(self, by: str = 'sector', since: Optional[str] = None, source: Optional[str] = None) -> List[Dict]:
+        """Share of companies with at least one executive / a decision maker, per group"""
+        table = self.load(DISCOVERY_TABLE, since, source,
+                          columns=[by, 'executives_found', 'has_decision_maker'])
+        if not table.num_rows:
+            return []
+
+        table = table.set_column(0, by, pc.fill_null(table[by], 'unknown'))
+        table = table.append_column('hit', pc.cast(pc.greater(table['executives_found'], 0), pa.int8()))
+        table = table.append_column('decision_maker', pc.cast(pc.fill_null(table['has_decision_maker'], False), pa.int8()))
+
+        grouped = table.group_by(by).aggregate([
+            ('hit', 'count'),
+            ('hit', 'mean'),
+            ('decision_maker', 'mean'),
+            ('executives_found', 'mean')
+        ])
+        rows = [{
+            by: row[by],
+            'companies': row['hit_count'],
+            'hit_rate': round(row['hit_mean'], 3),
+            'decision_maker_rate': round(row['decision_maker_mean'], 3),
+            'mean_executives': round(row['executives_found_mean'], 2)
+        } for row in grouped.to_pylist()]
+        return sorted(rows, key=lambda row: row['companies'], reverse=True)
+
+    def step_latencies(self, since: Optional[str] = None, source: Optional[str] = None) -> List[Dict]:
+        """Latency (ms) and success rate per discovery step"""
+        table = self.load(STEP_TIMING_TABLE, since, source,
+                          columns=['step_number', 'step_name', 'processing_ms', 'success'])
+        if not table.num_rows:
+            return []
+
+        table = table.append_column('succeeded', pc.cast(pc.fill_null(table['success'], False), pa.int8()))
+        grouped = table.group_by(['step_number', 'step_name']).aggregate([
+            ('processing_ms', 'count'),
+            ('processing_ms', 'mean'),
+            ('processing_ms', 'approximate_median'),
+            ('processing_ms', 'max'),
+            ('succeeded', 'mean')
+        ])
+        rows = [{
+            'step_number': row['step_number'],
+            'step_name': row['step_name'],
+            'runs': row['processing_ms_count'],
+            'mean_ms': round(row['processing_ms_mean'], 1),
+            'median_ms': round(row['processing_ms_approximate_median'], 1),
+            'max_ms': row['processing_ms_max'],
+            'success_rate': round(row['succeeded_mean'], 3)
+        } for row in grouped.to_pylist()]
+        return sorted(rows, key=lambda row: row['step_number'])
+
+    def tier_breakdown(self, by: str = 'sector', since: Optional[str] = None,
+                       source: Optional[str] = None) -> List[Dict]:
+        """Qualified leads and mean score per group and priority tier"""
+        table = self.load(QUALIFICATION_TABLE, since, source, columns=[by, 'priority_tier', 'final_score'])
+        if not table.num_rows:
+            return []
+
+        table = table.set_column(0, by, pc.fill_null(table[by], 'unknown'))
+        grouped = table.group_by([by, 'priority_tier']).aggregate([
+            ('final_score', 'count'),
+            ('final_score', 'mean')
+        ])
+        rows = [{
+            by: row[by],
+            'priority_tier': row['priority_tier'],
+            'leads': row['final_score_count'],
+            'mean_score': round(row['final_score_mean'], 1)
+        } for row in grouped.to_pylist()]
+        return sorted(rows, key=lambda row: (row[by], row['priority_tier'] or ''))
+
+# Global warehouse instance
+_results_warehouse: Optional[ResultsWarehouse] = None
+_results_warehouse_checked = False
+
+def get_results_warehouse() -> Optional[ResultsWarehouse]:
+    """Process-wide warehouse, or None when disabled or pyarrow isn't installed"""
+    global _results_warehouse, _results_warehouse_checked
+
+    if not _results_warehouse_checked:
+        _results_warehouse_checked = True
+        config = ResultsWarehouseConfig()
+        if config.enabled:
+            if PYARROW_AVAILABLE:
+                _results_warehouse = ResultsWarehouse(config)
+                atexit.register(_results_warehouse.close)
+                logger.info(f"Recording results to {config.directory}")
+            else:
+                logger.warning("RESULTS_WAREHOUSE_DIR is set but pyarrow is not installed; results warehouse disabled")
+
+    return _results_warehouse
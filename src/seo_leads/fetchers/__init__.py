@@ -18,9 +18,14 @@ Available Fetchers:
 - OneNineTwoFetcher: 192.com
 
 All fetchers use a common BaseDirectoryFetcher class for consistent functionality.
+DirectoryCrawlScheduler runs several of them concurrently, each at its own
+DIRECTORY_CONFIGS rate. Searches are checkpointed in the crawl frontier, so an
+interrupted crawl resumes where it stopped.
 """
 
 from .base_fetcher import BaseDirectoryFetcher, CompanyBasicInfo
+from .crawl_frontier import CrawlCheckpoint, DirectoryCrawlFrontier
+from .crawl_scheduler import DirectoryCrawlScheduler, DirectoryCrawlResult
 from .yell_fetcher import YellDirectoryFetcher, fetch_uk_companies
 from .thomson_fetcher import ThomsonLocalFetcher, fetch_thomson_companies
 from .yelp_uk_fetcher import YelpUKDirectoryFetcher, fetch_uk_companies_yelp
@@ -39,6 +44,10 @@ __all__ = [
     # Base classes
     'BaseDirectoryFetcher',
     'CompanyBasicInfo',
+    'DirectoryCrawlScheduler',
+    'DirectoryCrawlResult',
+    'DirectoryCrawlFrontier',
+    'CrawlCheckpoint',
     
     # Fetcher classes
     'YellDirectoryFetcher',
@@ -108,7 +117,7 @@ FETCH_FUNCTIONS = {
 
 async def fetch_from_all_sources(cities: list, sectors: list = None) -> dict:
     """
-    Fetch companies from all directory sources
+    Fetch companies from all directory sources concurrently
     
     Args:
         cities: List of UK cities to search
@@ -117,17 +126,14 @@ async def fetch_from_all_sources(cities: list, sectors: list = None) -> dict:
     Returns:
         Dictionary mapping source name to number of companies found
     """
-    results = {}
+    scheduler = DirectoryCrawlScheduler(list(DIRECTORY_SOURCES.keys()))
+    results = await scheduler.run(cities, sectors)
     
-    for source_name, fetch_function in FETCH_FUNCTIONS.items():
-        try:
-            companies_found = await fetch_function(cities, sectors)
-            results[source_name] = companies_found
-        except Exception as e:
-            print(f"Error fetching from {source_name}: {e}")
-            results[source_name] = 0
+    for source_name, result in results.items():
+        if result.error:
+            print(f"Error fetching from {source_name}: {result.error}")
     
-    return results
+    return {source_name: result.companies_found for source_name, result in results.items()}
 
 
 def get_fetcher(source_name: str) -> BaseDirectoryFetcher:
@@ -10,18 +10,21 @@ Inspired by the fetch module patterns but adapted for business directory scrapin
 import asyncio
 import logging
 import time
-import hashlib
-import random
-from typing import Dict, List, Optional, Generator, Tuple
+from typing import Dict, List, Optional, Generator, Tuple, Union
 from urllib.parse import urljoin, urlparse
 from dataclasses import dataclass
 from abc import ABC, abstractmethod
-from playwright.async_api import async_playwright, Page, Browser
+from playwright.async_api import Page
 from bs4 import BeautifulSoup
 
 from ..config import get_api_config, get_processing_config
-from ..database import get_db_session
-from ..models import UKCompany, ProcessingStatus
+from ..database import bulk_insert_companies, generate_company_id, get_db_session, increment_stage_counters
+from ..network.browser_pool import get_browser_pool
+from ..network.http_cache import SOURCE_DIRECTORY, get_http_cache
+from ..network.rate_limiter import RateLimit, get_rate_limiter, rate_limit_key
+from .crawl_frontier import CrawlCheckpoint, DirectoryCrawlFrontier
+from .directory_config import DIRECTORY_CONFIGS, DirectoryConfig
+from .listing_parser import as_listing_soup, parse_listing_html
 
 logger = logging.getLogger(__name__)
 
@@ -43,9 +46,10 @@ class BaseDirectoryFetcher(ABC):
     Base class for UK business directory scrapers
     
     Features:
-    - Intelligent rate limiting
-    - Resume from previous state
+    - Per-directory rate limiting from DIRECTORY_CONFIGS
+    - Resume from the crawl frontier (last stored page per city/sector search)
     - Batch processing with database persistence
+    - City/sector searches spread across several pages of one browser context
     - Error recovery and retry logic
     - Site-specific customization through inheritance
     """
@@ -54,11 +58,16 @@ class BaseDirectoryFetcher(ABC):
         self.source_name = source_name
         self.api_config = get_api_config()
         self.processing_config = get_processing_config()
-        self.browser = None
+        self.browser_pool = None
+        self.context = None
         self.page = None
+        self.directory_config = self._find_directory_config()
+        self.frontier = DirectoryCrawlFrontier(source_name)
+        
+        # Listing pages crawling this directory at once; they share its rate budget
+        self.pages_per_directory = getattr(self.processing_config, 'directory_pages_per_source', 3)
         
         # Rate limiting state
-        self.last_request_time = 0
         self.request_count = 0
         self.start_time = time.time()
         
@@ -66,6 +75,7 @@ class BaseDirectoryFetcher(ABC):
         self.total_companies_found = 0
         self.companies_processed = 0
         self.errors_encountered = 0
+        self.searches_queued = 0  # Searches the last batch crawled; 0 when all were completed
     
     async def __aenter__(self):
         """Async context manager entry"""
@@ -77,23 +87,11 @@ class BaseDirectoryFetcher(ABC):
         await self._close_browser()
     
     async def _init_browser(self):
-        """Initialize browser with optimal settings"""
-        playwright = await async_playwright().start()
-        
-        self.browser = await playwright.chromium.launch(
-            headless=self.api_config.headless_browser,
-            args=[
-                '--no-sandbox',
-                '--disable-dev-shm-usage',
-                '--disable-blink-features=AutomationControlled',
-                '--disable-web-security',
-                '--disable-features=VizDisplayCompositor',
-                '--no-first-run',
-                '--no-default-browser-check'
-            ]
-        )
+        """Lease a browser context from the shared pool with optimal settings"""
+        self.browser_pool = await get_browser_pool()
         
-        context = await self.browser.new_context(
+        self.context = await self.browser_pool.acquire_context(
+            urlparse(self.get_base_url()).netloc,
             user_agent=self.api_config.browser_user_agent,
             viewport={'width': 1280, 'height': 720},
             extra_http_headers={
@@ -106,10 +104,17 @@ class BaseDirectoryFetcher(ABC):
             }
         )
         
-        self.page = await context.new_page()
+        self.page = await self._new_listing_page()
+        
+        # Small delay to let browser fully initialize
+        await asyncio.sleep(1)
+    
+    async def _new_listing_page(self) -> Page:
+        """Open a page in this directory's context with stealth scripts and timeouts"""
+        page = await self.context.new_page()
         
         # Add stealth JavaScript to avoid detection
-        await self.page.add_init_script("""
+        await page.add_init_script("""
             Object.defineProperty(navigator, 'webdriver', {
                 get: () => undefined,
             });
@@ -128,39 +133,50 @@ class BaseDirectoryFetcher(ABC):
         """)
         
         # Set timeouts
-        self.page.set_default_timeout(self.api_config.browser_timeout * 1000)
-        
-        # Small delay to let browser fully initialize
-        await asyncio.sleep(1)
+        page.set_default_timeout(self.api_config.browser_timeout * 1000)
+        return page
     
     async def _close_browser(self):
-        """Clean up browser resources"""
+        """Return the browser context to the shared pool"""
         if self.page:
             await self.page.close()
-        if self.browser:
-            await self.browser.close()
+        if self.context:
+            await self.browser_pool.release_context(self.context)
+            self.context = None
     
-    def _rate_limit(self):
-        """Enforce rate limiting for directory requests"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        # Enforce minimum delay between requests with some randomness
-        min_delay = getattr(self.api_config, 'yell_page_delay', 6.0)  # Use yell_page_delay or default to 6 seconds
-        # Add random variation to make it more human-like (±20%)
-        random_delay = min_delay + random.uniform(-min_delay * 0.2, min_delay * 0.2)
-        
-        if time_since_last < random_delay:
-            sleep_time = random_delay - time_since_last
-            logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
-            time.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+    async def _goto_listing(self, url: str, page: Optional[Page] = None, **goto_options):
+        """Navigate to a listing page, served from the HTTP cache when unchanged"""
+        page = page or self.page
+        goto_options.setdefault('wait_until', "domcontentloaded")
+        async with get_http_cache().cached_navigation(self.context, url, SOURCE_DIRECTORY):
+            return await page.goto(url, **goto_options)
+    
+    def _find_directory_config(self) -> Optional[DirectoryConfig]:
+        """DIRECTORY_CONFIGS entry for this fetcher's host"""
+        host = rate_limit_key(self.get_base_url())
+        for directory in DIRECTORY_CONFIGS.values():
+            if rate_limit_key(directory.base_url) == host:
+                return directory
+        return None
+    
+    async def _rate_limit(self):
+        """Wait for this directory's host budget in the shared rate limiter"""
+        # The directory's own rate_limit_ms; unlisted directories keep the
+        # yell_page_delay spacing. Both get ±20% jitter.
+        if self.directory_config is not None:
+            min_delay = self.directory_config.rate_limit_ms / 1000
+        else:
+            min_delay = getattr(self.api_config, 'yell_page_delay', 6.0)
+        await get_rate_limiter().acquire(
+            self.get_base_url(),
+            RateLimit.per_interval(min_delay, jitter=0.2)
+        )
+        
         self.request_count += 1
         
         # Log rate limiting stats periodically
         if self.request_count % 50 == 0:
-            elapsed = self.last_request_time - self.start_time
+            elapsed = time.time() - self.start_time
             rate = self.request_count / elapsed if elapsed > 0 else 0
             logger.info(f"Rate limiting stats: {self.request_count} requests in {elapsed:.1f}s ({rate:.2f} req/s)")
     
@@ -189,13 +205,25 @@ class BaseDirectoryFetcher(ABC):
         """Check if there are more pages available"""
         pass
     
-    async def fetch_companies_batch(self, cities: List[str], sectors: Optional[List[str]] = None) -> int:
+    async def fetch_companies_batch(self, cities: List[str], sectors: Optional[List[str]] = None,
+                                    pages: Optional[int] = None, refresh: bool = False) -> int:
         """
         Fetch companies in batch from specified cities and sectors
         
+        City/sector searches are spread across several browser pages. All
+        pages draw from this directory's single rate budget, so the extra
+        pages overlap rendering and parsing with the politeness wait instead
+        of sending requests faster.
+        
+        Each search is checkpointed in the crawl frontier after every stored
+        results page. Completed searches are skipped and interrupted or
+        failed ones resume from the page after their last stored page.
+        
         Args:
             cities: List of UK cities to search
             sectors: Optional list of business sectors to filter by
+            pages: Browser pages to use (default: pages_per_directory)
+            refresh: Ignore the crawl frontier and search everything from page 1
             
         Returns:
             Total number of companies found and stored
@@ -203,42 +231,103 @@ class BaseDirectoryFetcher(ABC):
         logger.info(f"Starting batch fetch for {self.source_name}")
         logger.info(f"Cities: {len(cities)}, Sectors: {len(sectors) if sectors else 'All'}")
         
-        total_found = 0
-        
+        saved_checkpoints = {} if refresh else self.frontier.load()
+        searches = []
+        skipped = 0
         for city in cities:
-            try:
-                if sectors:
-                    for sector in sectors:
-                        companies = await self._search_companies_in_city(city, sector)
-                        stored_count = self._store_companies_batch(companies)
-                        total_found += stored_count
-                        logger.info(f"Stored {stored_count} companies for {city} - {sector}")
-                        self._update_progress('scraping', stored_count)
-                else:
-                    companies = await self._search_companies_in_city(city)
-                    stored_count = self._store_companies_batch(companies)
-                    total_found += stored_count
-                    logger.info(f"Stored {stored_count} companies for {city}")
-                    self._update_progress('scraping', stored_count)
-                    
-            except Exception as e:
-                logger.error(f"Error processing {city}: {e}")
-                continue
+            for sector in (sectors or [None]):
+                checkpoint = self.frontier.checkpoint_for(city, sector, saved_checkpoints, refresh)
+                if checkpoint.completed:
+                    skipped += 1
+                    continue
+                searches.append((city, sector, checkpoint))
+        
+        if skipped:
+            logger.info(f"Skipping {skipped} completed searches for {self.source_name} (use refresh to re-crawl)")
+        self.searches_queued = len(searches)
+        if not searches:
+            logger.info(f"Nothing left to crawl for {self.source_name}")
+            return 0
+        
+        queue: asyncio.Queue = asyncio.Queue()
+        for search in searches:
+            queue.put_nowait(search)
+        
+        worker_count = max(1, min(pages or self.pages_per_directory, len(searches)))
+        totals = []
+        
+        async def crawl(page: Page):
+            found = 0
+            while True:
+                try:
+                    city, sector, checkpoint = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                
+                try:
+                    # Pages are stored as they are crawled; see _record_listing_page
+                    already_found = checkpoint.companies_found
+                    await self._search_companies_in_city(city, sector, page=page, checkpoint=checkpoint)
+                    stored_count = checkpoint.companies_found - already_found
+                    found += stored_count
+                    label = f"{city} - {sector}" if sector else city
+                    logger.info(f"Stored {stored_count} companies for {label}")
+                except Exception as e:
+                    logger.error(f"Error processing {city}: {e}")
+            totals.append(found)
+        
+        extra_pages = []
+        try:
+            for _ in range(worker_count - 1):
+                try:
+                    extra_pages.append(await self._new_listing_page())
+                except Exception as e:
+                    logger.warning(f"Could not open extra page for {self.source_name}: {e}")
+                    break
+            
+            await asyncio.gather(*(crawl(page) for page in [self.page] + extra_pages))
+        finally:
+            for page in extra_pages:
+                try:
+                    await page.close()
+                except Exception as e:
+                    logger.debug(f"Error closing listing page: {e}")
         
+        total_found = sum(totals)
         logger.info(f"Batch fetch complete for {self.source_name}. Total companies found: {total_found}")
         return total_found
     
-    async def _search_companies_in_city(self, city: str, sector: Optional[str] = None) -> List[CompanyBasicInfo]:
-        """Search for companies in a specific city and sector"""
+    async def _search_companies_in_city(self, city: str, sector: Optional[str] = None,
+                                        page: Optional[Page] = None,
+                                        checkpoint: Optional[CrawlCheckpoint] = None) -> List[CompanyBasicInfo]:
+        """
+        Search for companies in a specific city and sector
+        
+        With a checkpoint, the search starts after its last stored page and
+        each results page is stored and checkpointed as soon as it is parsed.
+        """
         companies = []
+        page = page or self.page
+        error = None
+        limited = False
+        # Companies a resumed search already stored count toward the per-city limit
+        previously_found = checkpoint.companies_found if checkpoint is not None else 0
         
         try:
-            page_number = 1
-            max_pages = getattr(self.api_config, 'max_pages', 10)
+            page_number = self._start_listing_search(checkpoint)
+            first_request = True
+            max_pages = self._max_listing_pages()
+            max_companies = getattr(self.processing_config, 'max_companies_per_city', 1000)
             
             while page_number <= max_pages:
+                # Apply per-city limit
+                if previously_found + len(companies) >= max_companies:
+                    logger.info(f"Reached max companies limit for {city}: {previously_found + len(companies)}")
+                    limited = True
+                    break
+                
                 # Rate limiting
-                self._rate_limit()
+                await self._rate_limit()
                 
                 # Build page URL
                 search_url = self.build_search_url(city, sector, page_number)
@@ -247,69 +336,118 @@ class BaseDirectoryFetcher(ABC):
                 
                 try:
                     # First visit homepage to establish session (anti-bot measure)
-                    if page_number == 1:
+                    if first_request:
+                        first_request = False
                         logger.debug("Visiting homepage first to establish session...")
-                        homepage_response = await self.page.goto(self.get_base_url(), wait_until="domcontentloaded")
+                        homepage_response = await page.goto(self.get_base_url(), wait_until="domcontentloaded")
                         if homepage_response.status == 200:
                             await asyncio.sleep(2)  # Wait like a human would
                         
                     # Navigate to search page
-                    response = await self.page.goto(search_url, wait_until="domcontentloaded")
+                    response = await self._goto_listing(search_url, page=page)
                     
                     if response.status != 200:
                         logger.warning(f"Non-200 response ({response.status}) for {search_url}")
+                        # Past page 1 this is usually pagination overshooting the last page
+                        if page_number == 1:
+                            error = f"HTTP {response.status} on page {page_number}"
                         break
                     
                     # Wait for listings to load
                     try:
-                        await self.page.wait_for_selector(self.get_listing_selector(), timeout=10000)
+                        await page.wait_for_selector(self.get_listing_selector(), timeout=10000)
                     except:
+                        # Bot block, CAPTCHA or a page that never loaded: retried on resume
                         logger.warning(f"Listing selector not found on {search_url}")
+                        error = f"Listing selector not found on page {page_number}"
                         break
                     
-                    # Extract page content
-                    content = await self.page.content()
-                    page_companies = self._parse_search_results(content, city)
+                    # Parse once; listings and pagination share the tree
+                    soup = parse_listing_html(await page.content())
+                    page_companies = self._parse_search_results(soup, city)
                     
                     if not page_companies:
-                        logger.info(f"No more companies found on page {page_number}")
+                        if page_number == 1:
+                            # A search with no results at all is more likely blocked than empty
+                            logger.warning(f"No companies found on the first page of {search_url}")
+                            error = "No companies found on page 1"
+                        else:
+                            logger.info(f"No more companies found on page {page_number}")
                         break
                     
                     companies.extend(page_companies)
                     logger.info(f"Found {len(page_companies)} companies on page {page_number}")
+                    self._record_listing_page(checkpoint, page_number, search_url, page_companies)
                     
                     # Check if there's a next page
-                    soup = BeautifulSoup(content, 'html.parser')
                     if not self.has_next_page(soup):
                         logger.info("No next page found, stopping")
                         break
                     
                     page_number += 1
-                    
-                    # Apply per-city limit
-                    max_companies = getattr(self.processing_config, 'max_companies_per_city', 1000)
-                    if len(companies) >= max_companies:
-                        logger.info(f"Reached max companies limit for {city}: {len(companies)}")
-                        break
                 
                 except Exception as e:
                     logger.error(f"Error on page {page_number} for {city}: {e}")
                     self.errors_encountered += 1
+                    error = f"Page {page_number}: {e}"
                     break
         
         except Exception as e:
             logger.error(f"Error searching companies in {city}: {e}")
             self.errors_encountered += 1
+            error = str(e)
+        
+        self._finish_listing_search(checkpoint, error, limited)
         
         logger.info(f"Total companies found in {city}: {len(companies)}")
         return companies
     
-    def _parse_search_results(self, html_content: str, city: str) -> List[CompanyBasicInfo]:
-        """Parse search results page and extract company information"""
+    def _max_listing_pages(self) -> int:
+        """Results pages to crawl per search; api_config.max_pages overrides the directory's own"""
+        configured = getattr(self.api_config, 'max_pages', None)
+        if configured is not None:
+            return configured
+        if self.directory_config is not None:
+            return self.directory_config.max_pages
+        return 10
+    
+    def _start_listing_search(self, checkpoint: Optional[CrawlCheckpoint]) -> int:
+        """Mark a checkpointed search in progress and return its first results page"""
+        if checkpoint is None:
+            return 1
+        
+        if checkpoint.page_number:
+            logger.info(f"Resuming {self.source_name} {checkpoint.city} "
+                        f"{checkpoint.sector or 'all sectors'} from page {checkpoint.next_page}")
+        self.frontier.start(checkpoint)
+        return checkpoint.next_page
+    
+    def _finish_listing_search(self, checkpoint: Optional[CrawlCheckpoint], error: Optional[str],
+                               limited: bool = False):
+        """Checkpoint a finished search; one stopped by the company limit stays resumable"""
+        if checkpoint is None:
+            return
+        
+        if limited and not error:
+            self.frontier.pause(checkpoint)
+        else:
+            self.frontier.finish(checkpoint, error)
+    
+    def _record_listing_page(self, checkpoint: Optional[CrawlCheckpoint], page_number: int,
+                             url: str, page_companies: List[CompanyBasicInfo]):
+        """Store a results page and advance the search's cursor past it"""
+        if checkpoint is None:
+            return
+        
+        stored_count = self._store_companies_batch(page_companies)
+        self.frontier.record_page(checkpoint, page_number, url, stored_count)
+    
+    def _parse_search_results(self, page_content: Union[str, BeautifulSoup], city: str) -> List[CompanyBasicInfo]:
+        """Extract company information from a search results page (HTML or parsed tree)"""
         companies = []
         
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+            soup = as_listing_soup(page_content)
             listings = soup.select(self.get_listing_selector())
             
             for listing in listings:
@@ -328,73 +466,21 @@ class BaseDirectoryFetcher(ABC):
         return companies
     
     def _store_companies_batch(self, companies: List[CompanyBasicInfo]) -> int:
-        """Store a batch of companies in the database"""
-        stored_count = 0
-        
-        try:
-            with get_db_session() as session:
-                for company_info in companies:
-                    try:
-                        # Generate unique ID
-                        company_id = self._generate_company_id(
-                            company_info.name, 
-                            company_info.website, 
-                            company_info.city
-                        )
-                        
-                        # Check if company already exists
-                        existing = session.query(UKCompany).filter_by(id=company_id).first()
-                        if existing:
-                            continue
-                        
-                        # Create new company record
-                        company = UKCompany(
-                            id=company_id,
-                            company_name=company_info.name,
-                            website=company_info.website,
-                            city=company_info.city,
-                            region=company_info.region,
-                            address=company_info.address,
-                            sector=company_info.sector,
-                            phone=company_info.phone,
-                            status='scraped',
-                            source=company_info.source
-                        )
-                        
-                        session.add(company)
-                        stored_count += 1
-                        
-                    except Exception as e:
-                        logger.debug(f"Error storing company {company_info.name}: {e}")
-                        continue
-                
-                session.commit()
-                
-        except Exception as e:
-            logger.error(f"Error storing companies batch: {e}")
-        
-        return stored_count
+        """Store a batch of companies in the database and credit the scraping stage"""
+        result = bulk_insert_companies(companies, stage='scraping')
+        if result['skipped']:
+            logger.debug(f"Skipped {result['skipped']} companies already stored")
+        return result['inserted']
     
     def _generate_company_id(self, name: str, website: Optional[str], city: str) -> str:
         """Generate a unique ID for a company"""
-        # Use website as primary identifier, fallback to name+city
-        if website:
-            identifier = website.lower().strip()
-        else:
-            identifier = f"{name.lower().strip()}:{city.lower().strip()}"
-        
-        return hashlib.md5(identifier.encode()).hexdigest()
+        return generate_company_id(name, website, city)
     
     def _update_progress(self, stage: str, increment: int):
         """Update processing progress for a stage"""
         try:
             with get_db_session() as session:
-                status = session.query(ProcessingStatus).filter_by(stage=stage).first()
-                if status:
-                    status.processed_companies += increment
-                    if status.total_companies > 0:
-                        status.success_rate = (status.processed_companies / status.total_companies) * 100
-                    session.commit()
+                increment_stage_counters(session, stage, processed=increment)
         except Exception as e:
             logger.error(f"Error updating progress: {e}")
     
@@ -0,0 +1,140 @@
+"""
+Directory Crawl Frontier
+
+Persists a checkpoint per (source, city, sector) search in the crawl_frontier
+table: its status and the last results page that was stored successfully.
+Fetchers skip completed searches and resume interrupted or failed ones from
+the page after the saved cursor, so restarting a long crawl doesn't re-request
+every page it already covered.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from ..database import get_db_session
+from ..models import CrawlFrontier, CrawlStatus
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class CrawlCheckpoint:
+    """Progress of one directory search"""
+    source: str
+    city: str
+    sector: str = ''  # '' for all-sector searches
+    page_number: int = 0  # Last results page stored successfully
+    last_url: Optional[str] = None
+    status: str = CrawlStatus.PENDING.value
+    companies_found: int = 0
+    error_message: Optional[str] = None
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.city, self.sector)
+
+    @property
+    def completed(self) -> bool:
+        return self.status == CrawlStatus.COMPLETED.value
+
+    @property
+    def next_page(self) -> int:
+        """Results page to request next"""
+        return self.page_number + 1
+
+class DirectoryCrawlFrontier:
+    """
+    Load and save crawl checkpoints for one directory
+
+    Usage:
+        frontier = DirectoryCrawlFrontier('yell')
+        checkpoints = frontier.load()
+        checkpoint = frontier.checkpoint_for('Leeds', 'retail', checkpoints)
+        ...
+        frontier.record_page(checkpoint, 3, url, stored_count)
+        frontier.finish(checkpoint)  # or frontier.pause(checkpoint) when a limit stopped it
+    """
+
+    def __init__(self, source: str):
+        self.source = source
+
+    def load(self) -> Dict[Tuple[str, str], CrawlCheckpoint]:
+        """Load every saved checkpoint for this source, keyed by (city, sector)"""
+        checkpoints = {}
+        try:
+            with get_db_session() as session:
+                rows = session.query(CrawlFrontier).filter_by(source=self.source).all()
+                for row in rows:
+                    checkpoint = CrawlCheckpoint(
+                        source=row.source,
+                        city=row.city,
+                        sector=row.sector or '',
+                        page_number=row.page_number or 0,
+                        last_url=row.last_url,
+                        status=row.status or CrawlStatus.PENDING.value,
+                        companies_found=row.companies_found or 0,
+                        error_message=row.error_message
+                    )
+                    checkpoints[checkpoint.key] = checkpoint
+        except Exception as e:
+            logger.error(f"Error loading crawl frontier for {self.source}: {e}")
+        return checkpoints
+
+    def checkpoint_for(self, city: str, sector: Optional[str],
+                       checkpoints: Dict[Tuple[str, str], CrawlCheckpoint],
+                       refresh: bool = False) -> CrawlCheckpoint:
+        """Saved checkpoint for a search, or a fresh one when absent or refreshing"""
+        checkpoint = checkpoints.get((city, sector or ''))
+        if checkpoint is None or refresh:
+            checkpoint = CrawlCheckpoint(source=self.source, city=city, sector=sector or '')
+        return checkpoint
+
+    def start(self, checkpoint: CrawlCheckpoint):
+        """Mark a search in progress, keeping its page cursor"""
+        checkpoint.status = CrawlStatus.IN_PROGRESS.value
+        checkpoint.error_message = None
+        self.save(checkpoint)
+
+    def record_page(self, checkpoint: CrawlCheckpoint, page_number: int, url: str, stored_count: int):
+        """Advance the cursor after a results page has been stored"""
+        checkpoint.page_number = page_number
+        checkpoint.last_url = url
+        checkpoint.companies_found += stored_count
+        self.save(checkpoint)
+
+    def finish(self, checkpoint: CrawlCheckpoint, error: Optional[str] = None):
+        """Mark a search completed, or failed so the next run resumes it"""
+        checkpoint.status = CrawlStatus.FAILED.value if error else CrawlStatus.COMPLETED.value
+        checkpoint.error_message = error
+        self.save(checkpoint)
+
+    def pause(self, checkpoint: CrawlCheckpoint):
+        """Leave a search stopped by a company limit pending so a later run continues it"""
+        checkpoint.status = CrawlStatus.PENDING.value
+        checkpoint.error_message = None
+        self.save(checkpoint)
+
+    def save(self, checkpoint: CrawlCheckpoint):
+        """Write a checkpoint to the crawl_frontier table"""
+        try:
+            with get_db_session() as session:
+                row = session.get(CrawlFrontier, (checkpoint.source, checkpoint.city, checkpoint.sector))
+                if row is None:
+                    row = CrawlFrontier(source=checkpoint.source, city=checkpoint.city,
+                                        sector=checkpoint.sector)
+                    session.add(row)
+
+                row.page_number = checkpoint.page_number
+                row.last_url = checkpoint.last_url
+                row.status = checkpoint.status
+                row.companies_found = checkpoint.companies_found
+                row.error_message = checkpoint.error_message
+                row.updated_at = datetime.utcnow()
+                row.completed_at = datetime.utcnow() if checkpoint.completed else None
+                if checkpoint.status == CrawlStatus.IN_PROGRESS.value and checkpoint.page_number == 0:
+                    row.started_at = datetime.utcnow()
+
+                session.commit()
+        except Exception as e:
+            logger.error(f"Error saving crawl checkpoint {checkpoint.source}/{checkpoint.city}: {e}")
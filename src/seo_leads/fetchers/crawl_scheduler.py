@@ -0,0 +1,101 @@
+"""
+Directory Crawl Scheduler
+
+Runs the selected directory fetchers concurrently instead of one after another.
+Each directory keeps its own politeness budget (DIRECTORY_CONFIGS rate_limit_ms
+through the shared rate limiter) and spreads its city x sector searches over
+several pages of its browser context, so a multi-directory crawl takes about as
+long as the slowest directory rather than the sum of all of them.
+
+Every fetcher resumes from its crawl frontier, skipping city x sector searches
+it already completed unless the scheduler is created with refresh=True.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class DirectoryCrawlResult:
+    """Outcome of crawling one directory"""
+    source: str
+    companies_found: int = 0
+    duration: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+class DirectoryCrawlScheduler:
+    """
+    Crawl several UK business directories at once
+
+    Usage:
+        scheduler = DirectoryCrawlScheduler(['yell', 'thomson', 'cylex', 'hotfrog'])
+        results = await scheduler.run(['Leeds', 'York'], ['retail', 'legal'])
+        for source, result in results.items():
+            print(source, result.companies_found)
+    """
+
+    def __init__(self, sources: List[str], pages_per_directory: Optional[int] = None,
+                 max_companies_per_city: Optional[int] = None,
+                 max_concurrent_directories: Optional[int] = None, refresh: bool = False):
+        self.sources = list(dict.fromkeys(sources))
+        self.pages_per_directory = pages_per_directory
+        self.max_companies_per_city = max_companies_per_city
+        self.max_concurrent_directories = max_concurrent_directories or len(self.sources) or 1
+        self.refresh = refresh
+
+    async def run(self, cities: List[str], sectors: Optional[List[str]] = None) -> Dict[str, DirectoryCrawlResult]:
+        """
+        Crawl every source concurrently
+
+        Args:
+            cities: UK cities to search
+            sectors: Optional business sectors to search in each city
+
+        Returns:
+            Dictionary mapping source name to its crawl result, in source order
+        """
+        logger.info(f"Crawling {len(self.sources)} directories concurrently: {', '.join(self.sources)}")
+        start_time = time.time()
+        directory_limit = asyncio.Semaphore(self.max_concurrent_directories)
+
+        async def crawl_with_limit(source: str) -> DirectoryCrawlResult:
+            async with directory_limit:
+                return await self._crawl(source, cities, sectors)
+
+        results = await asyncio.gather(*(crawl_with_limit(source) for source in self.sources))
+
+        total = sum(result.companies_found for result in results)
+        logger.info(f"Directory crawl complete in {time.time() - start_time:.1f}s: "
+                    f"{total} companies from {sum(1 for r in results if r.ok)}/{len(results)} directories")
+        return {result.source: result for result in results}
+
+    async def _crawl(self, source: str, cities: List[str], sectors: Optional[List[str]]) -> DirectoryCrawlResult:
+        """Crawl one directory, capturing failures instead of raising"""
+        from . import get_fetcher
+
+        result = DirectoryCrawlResult(source=source)
+        start_time = time.time()
+
+        try:
+            fetcher = get_fetcher(source)
+            async with fetcher:
+                if self.max_companies_per_city is not None:
+                    fetcher.processing_config.max_companies_per_city = self.max_companies_per_city
+                result.companies_found = await fetcher.fetch_companies_batch(
+                    cities, sectors, pages=self.pages_per_directory, refresh=self.refresh
+                )
+        except Exception as e:
+            logger.error(f"Directory crawl failed for {source}: {e}")
+            result.error = str(e)
+
+        result.duration = time.time() - start_time
+        logger.info(f"{source}: {result.companies_found} companies in {result.duration:.1f}s")
+        return result
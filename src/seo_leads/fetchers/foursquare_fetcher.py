@@ -9,8 +9,11 @@ import logging
 from typing import Optional
 from urllib.parse import quote_plus
 from bs4 import BeautifulSoup
+from playwright.async_api import Page
 
 from .base_fetcher import BaseDirectoryFetcher, CompanyBasicInfo
+from .crawl_frontier import CrawlCheckpoint
+from .listing_parser import parse_listing_html
 
 logger = logging.getLogger(__name__)
 
@@ -170,17 +173,31 @@ class FoursquareUKFetcher(BaseDirectoryFetcher):
         # If we found venues and haven't hit our limit, assume more pages exist
         return len(venues) > 0
     
-    async def _search_companies_in_city(self, city: str, sector: Optional[str] = None) -> list:
+    async def _search_companies_in_city(self, city: str, sector: Optional[str] = None,
+                                        page: Optional[Page] = None,
+                                        checkpoint: Optional[CrawlCheckpoint] = None) -> list:
         """Override to limit Foursquare pages since it uses infinite scroll"""
         companies = []
+        page = page or self.page
+        error = None
+        limited = False
+        # Companies a resumed search already stored count toward the per-city limit
+        previously_found = checkpoint.companies_found if checkpoint is not None else 0
         
         try:
-            page_number = 1
+            page_number = self._start_listing_search(checkpoint)
             max_pages = 5  # Limit Foursquare to 5 pages due to infinite scroll
+            max_companies = getattr(self.processing_config, 'max_companies_per_city', 1000)
             
             while page_number <= max_pages:
+                # Apply per-city limit
+                if previously_found + len(companies) >= max_companies:
+                    logger.info(f"Reached max companies limit for {city}: {previously_found + len(companies)}")
+                    limited = True
+                    break
+                
                 # Rate limiting
-                self._rate_limit()
+                await self._rate_limit()
                 
                 # Build page URL
                 search_url = self.build_search_url(city, sector, page_number)
@@ -189,46 +206,56 @@ class FoursquareUKFetcher(BaseDirectoryFetcher):
                 
                 try:
                     # Navigate to page
-                    response = await self.page.goto(search_url, wait_until="domcontentloaded")
+                    response = await self._goto_listing(search_url, page=page)
                     
                     if response.status != 200:
                         logger.warning(f"Non-200 response ({response.status}) for {search_url}")
+                        # Past page 1 this is usually pagination overshooting the last page
+                        if page_number == 1:
+                            error = f"HTTP {response.status} on page {page_number}"
                         break
                     
                     # Wait for listings to load
                     try:
-                        await self.page.wait_for_selector(self.get_listing_selector(), timeout=10000)
+                        await page.wait_for_selector(self.get_listing_selector(), timeout=10000)
                     except:
                         logger.warning(f"Listing selector not found on {search_url}")
+                        # Without a next-page link, a later page with no listings is the end of
+                        # the results; on page 1 it means the search was blocked or never loaded
+                        if page_number == 1:
+                            error = "Listing selector not found on page 1"
                         break
                     
                     # Extract page content
-                    content = await self.page.content()
-                    page_companies = self._parse_search_results(content, city)
+                    soup = parse_listing_html(await page.content())
+                    page_companies = self._parse_search_results(soup, city)
                     
                     if not page_companies:
-                        logger.info(f"No more companies found on page {page_number}")
+                        if page_number == 1:
+                            logger.warning(f"No companies found on the first page of {search_url}")
+                            error = "No companies found on page 1"
+                        else:
+                            logger.info(f"No more companies found on page {page_number}")
                         break
                     
                     companies.extend(page_companies)
                     logger.info(f"Found {len(page_companies)} companies on page {page_number}")
+                    self._record_listing_page(checkpoint, page_number, search_url, page_companies)
                     
                     page_number += 1
-                    
-                    # Apply per-city limit
-                    max_companies = getattr(self.processing_config, 'max_companies_per_city', 1000)
-                    if len(companies) >= max_companies:
-                        logger.info(f"Reached max companies limit for {city}: {len(companies)}")
-                        break
                 
                 except Exception as e:
                     logger.error(f"Error on page {page_number} for {city}: {e}")
                     self.errors_encountered += 1
+                    error = f"Page {page_number}: {e}"
                     break
         
         except Exception as e:
             logger.error(f"Error searching companies in {city}: {e}")
             self.errors_encountered += 1
+            error = str(e)
+        
+        self._finish_listing_search(checkpoint, error, limited)
         
         logger.info(f"Total companies found in {city}: {len(companies)}")
         return companies
@@ -110,7 +110,7 @@ class GoogleBusinessFetcher(BaseDirectoryFetcher):
                 await asyncio.sleep(0.5)
                 
                 # Navigate to search URL
-                response = await self.page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                response = await self._goto_listing(url, timeout=30000)
                 
                 if response.status == 200:
                     # Wait for dynamic content to load
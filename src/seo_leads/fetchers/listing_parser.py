@@ -0,0 +1,35 @@
+"""
+Directory Listing Page Parsing
+
+Search results pages are parsed once per page with BeautifulSoup's lxml tree
+builder (libxml2, C) and the same tree is handed to parse_listing and
+has_next_page. Fetchers keep the BeautifulSoup API they were written against;
+only the builder underneath changes. html.parser is used when lxml isn't
+installed.
+
+benchmark_listing_parser.py compares the builders on saved listing pages.
+"""
+
+import logging
+from typing import Union
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml  # noqa: F401 - only needed as the BeautifulSoup tree builder
+    LISTING_PARSER = 'lxml'
+except ImportError:
+    LISTING_PARSER = 'html.parser'
+    logger.info("lxml not installed; directory listing pages will be parsed with html.parser")
+
+def parse_listing_html(html: Union[str, bytes], parser: str = LISTING_PARSER) -> BeautifulSoup:
+    """Parse a listing page into the tree shared by parse_listing and has_next_page"""
+    return BeautifulSoup(html, parser)
+
+def as_listing_soup(page: Union[str, bytes, BeautifulSoup]) -> BeautifulSoup:
+    """Accept either raw HTML (older callers) or an already parsed page"""
+    if isinstance(page, BeautifulSoup):
+        return page
+    return parse_listing_html(page)
@@ -111,7 +111,7 @@ class ThomsonLocalFetcher(BaseDirectoryFetcher):
                 await asyncio.sleep(random.uniform(1, 3))
                 
                 # Navigate to search URL
-                response = await self.page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                response = await self._goto_listing(url, timeout=30000)
                 
                 if response.status == 200:
                     # Wait for dynamic content
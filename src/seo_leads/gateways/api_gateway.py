@@ -22,6 +22,7 @@ from abc import ABC, abstractmethod
 
 from ..config.credential_manager import get_credential_manager, APIProvider
 from ..models import ExecutiveContact
+from ..network.dns_cache import caching_connector
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -248,7 +249,7 @@ class APIGateway:
         self.is_running = True
         self.session = aiohttp.ClientSession(
             timeout=aiohttp.ClientTimeout(total=60),
-            connector=aiohttp.TCPConnector(limit=50),
+            connector=caching_connector(limit=50),
             headers={'User-Agent': 'UK-SEO-Lead-Generator-Gateway/1.0'}
         )
         
@@ -4,9 +4,7 @@ Alternative data source for executive discovery
 Provides director information from UK Companies House registry
 """
 
-import asyncio
 import logging
-import time
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
 import aiohttp
@@ -14,6 +12,9 @@ import requests
 from datetime import datetime, date
 import json
 
+from ..network.dns_cache import caching_connector
+from ..network.rate_limiter import COMPANIES_HOUSE_RATE_KEY, RateLimit, get_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -58,7 +59,7 @@ class CompaniesHouseAPI:
         
         # Rate limiting
         self.rate_limit_delay = 0.6  # 100 requests per minute = 0.6s between requests
-        self.last_request_time = 0
+        self.rate_limiter = get_rate_limiter()
         
         # Cache for reducing API calls
         self.company_cache = {}
@@ -67,6 +68,7 @@ class CompaniesHouseAPI:
     async def __aenter__(self):
         """Async context manager entry"""
         self.session = aiohttp.ClientSession(
+            connector=caching_connector(),
             headers={
                 'Authorization': f'Basic {self.api_key}',
                 'Content-Type': 'application/json'
@@ -280,14 +282,10 @@ class CompaniesHouseAPI:
     
     async def _rate_limit(self):
         """Implement rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last
-            await asyncio.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        await self.rate_limiter.acquire(
+            COMPANIES_HOUSE_RATE_KEY,
+            RateLimit.per_interval(self.rate_limit_delay)
+        )
 
 class CompaniesHouseExecutiveExtractor:
     """Extract executives from Companies House data"""
@@ -8,7 +8,6 @@ optimized for lead management workflows.
 import asyncio
 import json
 import logging
-import time
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass, asdict
@@ -19,6 +18,8 @@ from pydantic import BaseModel, Field, HttpUrl
 
 from ..config import get_export_config
 from ..models import UKCompany, PriorityTier, ContactSeniorityTier
+from ..network.dns_cache import caching_connector
+from ..network.rate_limiter import MAKE_WEBHOOK_RATE_KEY, RateLimit, get_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -112,7 +113,7 @@ class MakeWebhookSender:
         # Rate limiting (respects Make.com limits)
         self.max_requests_per_minute = 60
         self.stream_delay = 0.15  # 150ms between streaming calls
-        self.request_timestamps = []
+        self.rate_limiter = get_rate_limiter()
         
         # Posting style configuration
         self.posting_style = "batch"  # "stream" or "batch"
@@ -320,7 +321,7 @@ class MakeWebhookSender:
         """Send batch payload with Make.com optimizations"""
         for attempt in range(self.max_retries + 1):
             try:
-                async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+                async with aiohttp.ClientSession(connector=caching_connector(), timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
                     headers = {
                         'Content-Type': 'application/json',
                         'User-Agent': 'UK-SEO-Leads-System/1.0'
@@ -475,7 +476,7 @@ class MakeWebhookSender:
         """Send webhook with retry logic"""
         for attempt in range(self.max_retries + 1):
             try:
-                async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+                async with aiohttp.ClientSession(connector=caching_connector(), timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
                     headers = {
                         'Content-Type': 'application/json',
                         'User-Agent': 'UK-SEO-Leads-System/1.0'
@@ -520,21 +521,12 @@ class MakeWebhookSender:
     
     async def _apply_rate_limit(self):
         """Apply rate limiting to prevent overwhelming Make.com"""
-        current_time = time.time()
-        
-        # Clean old timestamps
-        cutoff_time = current_time - 60  # 1 minute ago
-        self.request_timestamps = [ts for ts in self.request_timestamps if ts > cutoff_time]
-        
-        # Check if we need to wait
-        if len(self.request_timestamps) >= self.max_requests_per_minute:
-            sleep_time = 60 - (current_time - self.request_timestamps[0])
-            if sleep_time > 0:
-                logger.info(f"Rate limiting: waiting {sleep_time:.1f} seconds")
-                await asyncio.sleep(sleep_time)
-        
-        # Record this request
-        self.request_timestamps.append(current_time)
+        wait_time = await self.rate_limiter.acquire(
+            MAKE_WEBHOOK_RATE_KEY,
+            RateLimit.per_window(self.max_requests_per_minute, 60)
+        )
+        if wait_time > 1:
+            logger.info(f"Rate limiting: waited {wait_time:.1f} seconds")
     
     def _filter_companies_for_delivery(self, companies: List[UKCompany]) -> List[UKCompany]:
         """Filter companies based on delivery criteria"""
@@ -563,7 +555,7 @@ class MakeWebhookSender:
                 }
             }
             
-            async with aiohttp.ClientSession() as session:
+            async with aiohttp.ClientSession(connector=caching_connector()) as session:
                 async with session.post(
                     self.webhook_url,
                     json=completion_payload,
@@ -615,7 +607,7 @@ async def test_webhook_connection(webhook_url: Optional[str] = None) -> bool:
     }
     
     try:
-        async with aiohttp.ClientSession() as session:
+        async with aiohttp.ClientSession(connector=caching_connector()) as session:
             async with session.post(
                 sender.webhook_url,
                 json=test_payload,
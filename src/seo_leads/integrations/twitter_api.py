@@ -13,7 +13,7 @@ import asyncio
 import aiohttp
 import logging
 from typing import Dict, List, Optional, Any, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 from dataclasses import dataclass, field
 import json
 import re
@@ -21,6 +21,8 @@ from urllib.parse import quote_plus
 
 from ..config.credential_manager import get_credential_manager, APIProvider
 from ..models import ExecutiveContact
+from ..network.dns_cache import caching_connector
+from ..network.rate_limiter import TWITTER_RATE_KEY, RateLimit, get_rate_limiter
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -115,37 +117,23 @@ class TwitterProfile:
         return min(confidence, 1.0)
 
 class TwitterRateLimiter:
-    """Twitter API v2 rate limiter (300 requests per 15 minutes)"""
+    """Twitter API v2 rate limiter (300 requests per 15 minutes) on the shared token bucket"""
     
     def __init__(self, max_requests: int = 300, time_window: int = 900):  # 15 minutes
         self.max_requests = max_requests
         self.time_window = time_window
-        self.requests = []
-        self.lock = asyncio.Lock()
+        self.limit = RateLimit.per_window(max_requests, time_window)
+        self.limiter = get_rate_limiter()
+        self.requests_made = 0
     
     async def acquire(self, endpoint: str = "default") -> bool:
         """Acquire rate limit slot for specific endpoint"""
-        async with self.lock:
-            now = datetime.now()
-            
-            # Remove old requests outside time window
-            cutoff = now - timedelta(seconds=self.time_window)
-            self.requests = [req_time for req_time in self.requests if req_time > cutoff]
-            
-            # Check if we can make request
-            if len(self.requests) >= self.max_requests:
-                # Calculate wait time
-                oldest_request = min(self.requests)
-                wait_time = (oldest_request + timedelta(seconds=self.time_window) - now).total_seconds()
-                
-                if wait_time > 0:
-                    logger.info(f"Twitter rate limit reached, waiting {wait_time:.2f} seconds")
-                    await asyncio.sleep(wait_time)
-                    return await self.acquire(endpoint)  # Recursive call after waiting
-            
-            # Record this request
-            self.requests.append(now)
-            return True
+        wait_time = await self.limiter.acquire(TWITTER_RATE_KEY, self.limit)
+        if wait_time > 1:
+            logger.info(f"Twitter rate limit reached, waited {wait_time:.2f} seconds")
+        
+        self.requests_made += 1
+        return True
 
 class TwitterAPIClient:
     """Production Twitter API v2 client"""
@@ -163,6 +151,7 @@ class TwitterAPIClient:
     async def __aenter__(self):
         """Async context manager entry"""
         self.session = aiohttp.ClientSession(
+            connector=caching_connector(),
             timeout=aiohttp.ClientTimeout(total=30),
             headers={'User-Agent': 'UK-SEO-Lead-Generator/1.0'}
         )
@@ -498,7 +487,7 @@ class TwitterAPIClient:
             'rate_limiter': {
                 'max_requests': self.rate_limiter.max_requests,
                 'time_window': self.rate_limiter.time_window,
-                'current_requests': len(self.rate_limiter.requests)
+                'requests_made': self.rate_limiter.requests_made
             },
             'cache': {
                 'entries': len(self.cache),
@@ -35,6 +35,13 @@ class ProcessingStatus(str, Enum):
     QUALIFIED = "qualified"
     EXPORTED = "exported"
     FAILED = "failed"
+    MERGED = "merged"  # Duplicate folded into a canonical company by entity resolution
+
+class CrawlStatus(str, Enum):
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    COMPLETED = "completed"
+    FAILED = "failed"
 
 class PriorityTier(str, Enum):
     A = "A"  # Hot Lead (80+)
@@ -69,10 +76,18 @@ class UKCompany(Base):
     # Data source
     source = Column(String, index=True)  # Directory source (e.g., "Yell.com", "Thomson Local")
     
+    # Entity resolution
+    canonical_id = Column(String, index=True)  # Set on merged duplicates; None on canonical rows
+    source_records = Column(JSON)  # Provenance of the listings merged into this company
+    
+    # Work leases (see database.claim_companies)
+    lease_owner = Column(String, index=True)  # Worker currently processing this company
+    lease_expires_at = Column(DateTime, index=True)  # Lease is free to reclaim after this
+    
     # Processing status
     status = Column(String, default=ProcessingStatus.SCRAPED.value, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
     
     # Contact information
     contact_person = Column(String)
@@ -83,6 +98,7 @@ class UKCompany(Base):
     phone = Column(String)
     contact_confidence = Column(Float)
     contact_extraction_method = Column(String)
+    processing_metadata = Column(JSON)  # Executive discovery summary from enhanced contact extraction
     
     # SEO analysis results
     seo_overall_score = Column(Float, index=True)
@@ -122,6 +138,40 @@ class ProcessingStatus(Base):
     success_rate = Column(Float, default=0.0)
     last_updated = Column(DateTime, default=datetime.utcnow)
 
+class CrawlFrontier(Base):
+    """Checkpoint for one directory search (source, city, sector) so crawls can resume"""
+    __tablename__ = "crawl_frontier"
+    
+    source = Column(String, primary_key=True)
+    city = Column(String, primary_key=True)
+    sector = Column(String, primary_key=True, default='')  # '' for all-sector searches
+    page_number = Column(Integer, default=0)  # Last results page stored successfully
+    last_url = Column(String)  # Cursor: URL of that page
+    status = Column(String, default=CrawlStatus.PENDING.value, index=True)
+    companies_found = Column(Integer, default=0)
+    error_message = Column(Text)
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime)
+
+class ExportWatermark(Base):
+    """Last successful export per destination (json, ndjson, csv, webhook)"""
+    __tablename__ = "export_watermarks"
+    
+    destination = Column(String, primary_key=True)
+    watermark = Column(DateTime)  # Leads updated after this may have changed since the last export
+    leads_exported = Column(Integer, default=0)  # Leads emitted by the last export
+    last_export_at = Column(DateTime, default=datetime.utcnow)
+
+class ExportedLead(Base):
+    """Content hash of a lead as last exported to a destination"""
+    __tablename__ = "exported_leads"
+    
+    destination = Column(String, primary_key=True)
+    lead_id = Column(String, primary_key=True)
+    content_hash = Column(String, nullable=False)
+    exported_at = Column(DateTime, default=datetime.utcnow, index=True)
+
 # Pydantic Models for validation and API
 
 class CompanyLocation(BaseModel):
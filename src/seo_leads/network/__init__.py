@@ -0,0 +1,120 @@
+"""
+Shared Network Layer
+
+Process-wide fetching infrastructure used by the orchestrators, processors,
+scrapers and directory fetchers:
+- browser_pool: Warm Chromium instances handing out per-domain contexts
+- context_config: Driver-side request filtering and resource blocking for contexts
+- page_store: Crawl-once per-run store of fetched pages shared by discovery stages
+- fetch_strategy: HTTP-first page fetching with per-domain browser escalation
+- http_client: Pooled keep-alive aiohttp client with DNS caching and per-host limits
+- http_cache: Persistent conditional-GET cache with per-source TTLs
+- dns_cache: Async A/AAAA/MX cache with negative caching and batch prefetch
+- origin_resolver: Races URL variations and caches each site's canonical origin
+- site_map: Sitemap and navigation driven discovery of executive pages
+- rate_limiter: Async token-bucket limits per host/provider, optionally shared across processes
+"""
+
+from .browser_pool import (
+    AsyncBrowserPool,
+    BrowserPoolConfig,
+    get_browser_pool,
+    close_browser_pool
+)
+from .context_config import ContextConfig
+from .dns_cache import (
+    AsyncDnsCache,
+    CachingResolver,
+    DnsCacheConfig,
+    caching_connector,
+    get_dns_cache
+)
+from .fetch_strategy import (
+    FetchStrategy,
+    FetchStrategyConfig,
+    detect_js_rendering,
+    get_fetch_strategy,
+    close_fetch_strategy
+)
+from .http_cache import (
+    CachedResponse,
+    HttpCache,
+    HttpCacheConfig,
+    get_http_cache
+)
+from .http_client import (
+    AsyncHttpClient,
+    HttpClientConfig,
+    get_http_client,
+    close_http_client
+)
+from .origin_resolver import (
+    OriginResolver,
+    OriginResolverConfig,
+    get_origin_resolver,
+    close_origin_resolver
+)
+from .page_store import (
+    PageRecord,
+    PageStore,
+    build_page_record,
+    normalize_page_url
+)
+from .rate_limiter import (
+    AsyncRateLimiter,
+    RateLimit,
+    RateLimiterConfig,
+    get_rate_limiter,
+    rate_limit_key
+)
+from .site_map import (
+    SiteMap,
+    SiteMapDiscovery,
+    get_site_map_discovery,
+    close_site_map_discovery,
+    is_executive_link_text
+)
+
+__all__ = [
+    'AsyncBrowserPool',
+    'BrowserPoolConfig',
+    'get_browser_pool',
+    'close_browser_pool',
+    'ContextConfig',
+    'AsyncDnsCache',
+    'CachingResolver',
+    'DnsCacheConfig',
+    'caching_connector',
+    'get_dns_cache',
+    'FetchStrategy',
+    'FetchStrategyConfig',
+    'detect_js_rendering',
+    'get_fetch_strategy',
+    'close_fetch_strategy',
+    'CachedResponse',
+    'HttpCache',
+    'HttpCacheConfig',
+    'get_http_cache',
+    'AsyncHttpClient',
+    'HttpClientConfig',
+    'get_http_client',
+    'close_http_client',
+    'OriginResolver',
+    'OriginResolverConfig',
+    'get_origin_resolver',
+    'close_origin_resolver',
+    'PageRecord',
+    'PageStore',
+    'build_page_record',
+    'normalize_page_url',
+    'AsyncRateLimiter',
+    'RateLimit',
+    'RateLimiterConfig',
+    'get_rate_limiter',
+    'rate_limit_key',
+    'SiteMap',
+    'SiteMapDiscovery',
+    'get_site_map_discovery',
+    'close_site_map_discovery',
+    'is_executive_link_text'
+]
@@ -0,0 +1,462 @@
+"""
+Shared Async Browser Pool
+
+Process-wide pool of warm Chromium instances for website and directory scraping.
+Launching Chromium per URL variation / per page dominated wall-clock time per
+company, so the pool keeps a few browsers running and hands out fresh,
+isolated contexts instead.
+
+Features:
+- Warm Chromium instances shared by orchestrators, extractors and fetchers
+- Fresh BrowserContext per lease (no cookie or cache bleed between domains)
+- Browser recycling after N pages or above an RSS threshold
+- Bounded concurrent contexts per browser
+- Per-context request filtering (see context_config)
+"""
+
+import asyncio
+import logging
+import os
+import signal
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from .context_config import ContextConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-web-security',
+    '--disable-features=VizDisplayCompositor',
+    '--ignore-certificate-errors',
+    '--ignore-ssl-errors',
+    '--ignore-certificate-errors-spki-list',
+    '--no-first-run',
+    '--no-default-browser-check'
+]
+
+def _configured_headless() -> bool:
+    """Headless default from api_config.headless_browser"""
+    try:
+        from ..config import get_api_config
+        return get_api_config().headless_browser
+    except Exception as e:
+        logger.debug(f"API browser settings unavailable: {e}")
+        return True
+
+@dataclass
+class BrowserPoolConfig:
+    """Browser pool sizing and recycling limits"""
+
+    pool_size: int = 2
+    max_contexts_per_browser: int = 4
+    max_pages_per_browser: int = 200
+    max_rss_mb: int = 1536
+    headless: bool = field(default_factory=_configured_headless)  # BROWSER_HEADLESS overrides
+    launch_args: List[str] = field(default_factory=lambda: list(DEFAULT_LAUNCH_ARGS))
+    context_config: ContextConfig = field(default_factory=ContextConfig)
+
+    def __post_init__(self):
+        # Allow deployment-specific sizing without code changes
+        self.pool_size = int(os.environ.get('BROWSER_POOL_SIZE', self.pool_size))
+        self.max_contexts_per_browser = int(os.environ.get('BROWSER_MAX_CONTEXTS', self.max_contexts_per_browser))
+        self.max_pages_per_browser = int(os.environ.get('BROWSER_MAX_PAGES', self.max_pages_per_browser))
+        self.max_rss_mb = int(os.environ.get('BROWSER_MAX_RSS_MB', self.max_rss_mb))
+        self.headless = os.environ.get('BROWSER_HEADLESS', str(self.headless)).lower() != 'false'
+
+@dataclass
+class PooledBrowser:
+    """A warm Chromium instance and its usage counters"""
+    browser: Browser
+    browser_id: int
+    pid: Optional[int] = None
+    pages_served: int = 0
+    active_contexts: int = 0
+    retiring: bool = False
+
+class AsyncBrowserPool:
+    """
+    Pool of warm Chromium browsers handing out per-domain contexts
+
+    Usage:
+        pool = await get_browser_pool()
+        async with pool.context("example.co.uk", user_agent=ua) as context:
+            page = await context.new_page()
+
+    Long-lived callers (directory fetchers) can use acquire_context() and
+    release_context() directly instead of the context manager.
+    """
+
+    def __init__(self, config: Optional[BrowserPoolConfig] = None):
+        self.config = config or BrowserPoolConfig()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._playwright: Optional[Playwright] = None
+        self._browsers: List[PooledBrowser] = []
+        self._context_owner: Dict[BrowserContext, PooledBrowser] = {}
+        self._lock = asyncio.Lock()
+        self._start_lock = asyncio.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._next_browser_id = 0
+        self._closed = False
+        self._background = set()
+
+        self.stats = {
+            'browsers_launched': 0,
+            'browsers_recycled': 0,
+            'contexts_leased': 0,
+            'pages_served': 0
+        }
+
+    async def start(self):
+        """Start Playwright and warm up the configured number of browsers"""
+        async with self._start_lock:
+            if self._playwright is not None:
+                return
+
+            self.loop = asyncio.get_running_loop()
+            self._playwright = await async_playwright().start()
+            self._slots = asyncio.Semaphore(self.config.pool_size * self.config.max_contexts_per_browser)
+
+            async with self._lock:
+                for _ in range(self.config.pool_size):
+                    try:
+                        await self._launch_browser()
+                    except Exception as e:
+                        logger.error(f"Failed to warm browser: {e}")
+
+            logger.info(f"Browser pool started with {len(self._browsers)} warm browsers")
+
+    async def acquire_context(self, domain: str = "", context_config: Optional[ContextConfig] = None,
+                              **context_options: Any) -> BrowserContext:
+        """
+        Lease a fresh browser context from the least loaded browser
+
+        Args:
+            domain: Domain the context will be used for (logging and stats)
+            context_config: Request filters and defaults (pool default if omitted)
+            **context_options: Passed through to Browser.new_context()
+
+        Returns:
+            New BrowserContext; must be returned with release_context()
+        """
+        if self._playwright is None:
+            await self.start()
+
+        context_config = context_config or self.config.context_config
+        context_options = {**context_config.context_options(), **context_options}
+
+        await self._slots.acquire()
+        try:
+            async with self._lock:
+                pooled = await self._select_browser()
+                pooled.active_contexts += 1
+
+            try:
+                context = await pooled.browser.new_context(**context_options)
+            except Exception:
+                async with self._lock:
+                    pooled.active_contexts -= 1
+                raise
+
+            try:
+                await context_config.apply(context)
+            except Exception:
+                await context.close()
+                async with self._lock:
+                    pooled.active_contexts -= 1
+                raise
+        except Exception:
+            self._slots.release()
+            raise
+
+        # Count every page opened in this context against its browser
+        context.on("page", lambda _page: self._count_page(pooled))
+
+        self._context_owner[context] = pooled
+        self.stats['contexts_leased'] += 1
+        logger.debug(f"Leased context on browser {pooled.browser_id} for {domain or 'unknown domain'}")
+
+        return context
+
+    async def release_context(self, context: BrowserContext):
+        """Close a leased context and recycle its browser if it hit a limit"""
+        pooled = self._context_owner.pop(context, None)
+
+        try:
+            await context.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser context: {e}")
+
+        if pooled is None:
+            return
+
+        self._slots.release()
+
+        async with self._lock:
+            pooled.active_contexts -= 1
+
+            if not pooled.retiring and self._should_recycle(pooled):
+                pooled.retiring = True
+
+            if pooled.retiring and pooled.active_contexts == 0:
+                await self._retire_browser(pooled)
+                # Hold a reference so the replenish task isn't garbage collected mid-run
+                task = asyncio.create_task(self._replenish())
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+
+    @asynccontextmanager
+    async def context(self, domain: str = "", context_config: Optional[ContextConfig] = None,
+                      **context_options: Any) -> AsyncIterator[BrowserContext]:
+        """Context manager around acquire_context()/release_context()"""
+        context = await self.acquire_context(domain, context_config, **context_options)
+        try:
+            yield context
+        finally:
+            await self.release_context(context)
+
+    @asynccontextmanager
+    async def page(self, domain: str = "", context_config: Optional[ContextConfig] = None,
+                   **context_options: Any) -> AsyncIterator[Page]:
+        """Convenience context manager yielding a single page in a fresh context"""
+        async with self.context(domain, context_config, **context_options) as context:
+            page = await context.new_page()
+            yield page
+
+    async def close(self):
+        """Close every browser and stop Playwright"""
+        self._closed = True
+
+        for task in list(self._background):
+            task.cancel()
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
+
+        async with self._lock:
+            for pooled in list(self._browsers):
+                try:
+                    await pooled.browser.close()
+                except Exception as e:
+                    logger.debug(f"Error closing browser {pooled.browser_id}: {e}")
+            self._browsers.clear()
+            self._context_owner.clear()
+
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception as e:
+                logger.debug(f"Error stopping Playwright: {e}")
+            self._playwright = None
+
+        logger.info(f"Browser pool closed: {self.stats}")
+
+    def abandon(self):
+        """
+        Terminate the browsers of a pool whose event loop is gone
+
+        Its Playwright objects can't be awaited from another loop, so close()
+        is impossible; the Chromium processes are killed by pid instead of
+        being left running.
+        """
+        self._closed = True
+        for pooled in self._browsers:
+            self._terminate_browser_process(pooled)
+        self._browsers.clear()
+        self._context_owner.clear()
+        self._playwright = None
+        logger.warning("Abandoned a browser pool from a finished event loop; "
+                       "close_browser_pool() should be awaited before the loop ends")
+
+    def _terminate_browser_process(self, pooled: PooledBrowser):
+        """Kill one browser's process tree"""
+        if pooled.pid is None:
+            return
+
+        try:
+            if psutil is not None:
+                root = psutil.Process(pooled.pid)
+                for process in root.children(recursive=True) + [root]:
+                    try:
+                        process.kill()
+                    except psutil.NoSuchProcess:
+                        continue
+            else:
+                os.kill(pooled.pid, signal.SIGKILL)
+        except Exception as e:
+            logger.debug(f"Error terminating browser {pooled.browser_id} (pid: {pooled.pid}): {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage statistics"""
+        return {
+            **self.stats,
+            'live_browsers': len(self._browsers),
+            'active_contexts': sum(b.active_contexts for b in self._browsers),
+            'browsers': [
+                {
+                    'browser_id': b.browser_id,
+                    'pages_served': b.pages_served,
+                    'active_contexts': b.active_contexts,
+                    'rss_mb': self._browser_rss_mb(b),
+                    'retiring': b.retiring
+                }
+                for b in self._browsers
+            ]
+        }
+
+    async def _select_browser(self) -> PooledBrowser:
+        """Pick the least loaded live browser, launching one if the pool is short"""
+        live = [
+            b for b in self._browsers
+            if not b.retiring and b.browser.is_connected()
+        ]
+
+        if len(live) < self.config.pool_size:
+            return await self._launch_browser()
+
+        available = [b for b in live if b.active_contexts < self.config.max_contexts_per_browser]
+        candidates = available or live
+        return min(candidates, key=lambda b: b.active_contexts)
+
+    async def _launch_browser(self) -> PooledBrowser:
+        """Launch a Chromium instance and register it with the pool"""
+        known_pids = self._chromium_root_pids()
+
+        browser = await self._playwright.chromium.launch(
+            headless=self.config.headless,
+            args=self.config.launch_args
+        )
+
+        # Identify the new Chromium root process so its RSS can be tracked
+        new_pids = self._chromium_root_pids() - known_pids
+        pid = new_pids.pop() if len(new_pids) == 1 else None
+
+        pooled = PooledBrowser(browser=browser, browser_id=self._next_browser_id, pid=pid)
+        self._next_browser_id += 1
+        self._browsers.append(pooled)
+        self.stats['browsers_launched'] += 1
+
+        logger.debug(f"Launched browser {pooled.browser_id} (pid: {pid})")
+        return pooled
+
+    async def _retire_browser(self, pooled: PooledBrowser):
+        """Close a browser that reached its page or memory limit"""
+        if pooled in self._browsers:
+            self._browsers.remove(pooled)
+
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.debug(f"Error closing retired browser {pooled.browser_id}: {e}")
+
+        self.stats['browsers_recycled'] += 1
+        logger.info(f"Recycled browser {pooled.browser_id} after {pooled.pages_served} pages")
+
+    async def _replenish(self):
+        """Launch replacement browsers so the pool stays warm"""
+        if self._closed:
+            return
+
+        async with self._lock:
+            live = [b for b in self._browsers if not b.retiring]
+            for _ in range(self.config.pool_size - len(live)):
+                try:
+                    await self._launch_browser()
+                except Exception as e:
+                    logger.warning(f"Failed to replenish browser pool: {e}")
+                    break
+
+    def _should_recycle(self, pooled: PooledBrowser) -> bool:
+        """Check page-count, memory and connection limits for a browser"""
+        if not pooled.browser.is_connected():
+            return True
+
+        if pooled.pages_served >= self.config.max_pages_per_browser:
+            return True
+
+        rss_mb = self._browser_rss_mb(pooled)
+        if rss_mb is not None and rss_mb > self.config.max_rss_mb:
+            logger.info(f"Browser {pooled.browser_id} RSS {rss_mb:.0f}MB above {self.config.max_rss_mb}MB limit")
+            return True
+
+        return False
+
+    def _count_page(self, pooled: PooledBrowser):
+        """Record a page opened on a pooled browser"""
+        pooled.pages_served += 1
+        self.stats['pages_served'] += 1
+
+    def _chromium_root_pids(self) -> Set[int]:
+        """PIDs of top-level Chromium processes spawned by this process"""
+        if psutil is None:
+            return set()
+
+        try:
+            root_pids = set()
+            for child in psutil.Process().children(recursive=True):
+                try:
+                    if 'chrom' not in child.name().lower() and 'headless_shell' not in child.name().lower():
+                        continue
+                    parent = child.parent()
+                    if parent is None or 'chrom' not in parent.name().lower():
+                        root_pids.add(child.pid)
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return root_pids
+        except Exception:
+            return set()
+
+    def _browser_rss_mb(self, pooled: PooledBrowser) -> Optional[float]:
+        """Resident memory of a browser and its renderer processes in MB"""
+        if psutil is None or pooled.pid is None:
+            return None
+
+        try:
+            root = psutil.Process(pooled.pid)
+            processes = [root] + root.children(recursive=True)
+            rss = 0
+            for process in processes:
+                try:
+                    rss += process.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return rss / (1024 * 1024)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+
+# Global browser pool instance
+_browser_pool: Optional[AsyncBrowserPool] = None
+
+async def get_browser_pool() -> AsyncBrowserPool:
+    """Get global browser pool instance for the running event loop"""
+    global _browser_pool
+    loop = asyncio.get_running_loop()
+
+    # Playwright objects are bound to the loop that created them, so callers
+    # that use asyncio.run() per batch get a fresh pool per loop
+    if _browser_pool is not None and _browser_pool.loop is not None and _browser_pool.loop is not loop:
+        _browser_pool.abandon()
+        _browser_pool = None
+
+    if _browser_pool is None:
+        _browser_pool = AsyncBrowserPool()
+
+    await _browser_pool.start()
+    return _browser_pool
+
+async def close_browser_pool():
+    """Close the global browser pool if it was started"""
+    global _browser_pool
+    if _browser_pool is not None:
+        await _browser_pool.close()
+        _browser_pool = None
@@ -0,0 +1,102 @@
+"""
+Browser Context Configuration
+
+Request filtering for pooled Playwright contexts. Routing "**/*" through a
+Python handler just to abort /robots.txt sent every image, font, stylesheet
+and analytics request round-tripping through the event loop. Here every rule
+is a URL glob or regex that Playwright matches inside the browser driver, so
+only requests that are actually blocked ever reach Python; allowed traffic is
+never intercepted.
+
+Resource blocking is opt-in (BROWSER_BLOCK_RESOURCES / BROWSER_BLOCK_TRACKERS)
+because dropping stylesheets changes innerText visibility on some sites.
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Pattern, Tuple, Union
+
+from playwright.async_api import BrowserContext, Route
+
+logger = logging.getLogger(__name__)
+
+ROBOTS_PATTERN = "**/robots.txt"
+
+# Resource types matched by URL extension (query strings allowed, e.g. ?ver=6.4)
+RESOURCE_TYPE_PATTERNS: Dict[str, Pattern] = {
+    'image': re.compile(r'\.(?:png|jpe?g|gif|webp|avif|svg|ico|bmp|tiff?)(?:[?#]|$)', re.IGNORECASE),
+    'media': re.compile(r'\.(?:mp4|webm|ogg|ogv|mp3|wav|m4a|mov|m3u8)(?:[?#]|$)', re.IGNORECASE),
+    'font': re.compile(r'\.(?:woff2?|ttf|otf|eot)(?:[?#]|$)', re.IGNORECASE),
+    'stylesheet': re.compile(r'\.css(?:[?#]|$)', re.IGNORECASE)
+}
+
+TRACKER_HOSTS = [
+    'google-analytics.com', 'googletagmanager.com', 'googleadservices.com',
+    'doubleclick.net', 'googlesyndication.com', 'connect.facebook.net',
+    'facebook.com/tr', 'hotjar.com', 'clarity.ms', 'bat.bing.com',
+    'snap.licdn.com', 'px.ads.linkedin.com', 'analytics.tiktok.com',
+    'cdn.segment.com', 'js.hs-analytics.net', 'js.hs-scripts.com',
+    'static.ads-twitter.com', 'cdn.mouseflow.com', 'script.crazyegg.com'
+]
+
+TRACKER_PATTERN = re.compile(
+    r'^https?://(?:[^/]+\.)?(?:' + '|'.join(re.escape(host) for host in TRACKER_HOSTS) + r')(?:[/?:]|$)',
+    re.IGNORECASE
+)
+
+async def _abort_route(route: Route):
+    """Abort a matched request"""
+    await route.abort()
+
+@dataclass
+class ContextConfig:
+    """Options and request filters applied to every pooled browser context"""
+
+    block_robots: bool = True
+    block_resource_types: Tuple[str, ...] = ()
+    block_trackers: bool = False
+    ignore_https_errors: bool = True
+    bypass_csp: bool = True
+    java_script_enabled: bool = True
+    extra_options: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        env_types = os.environ.get('BROWSER_BLOCK_RESOURCES')
+        if env_types is not None:
+            self.block_resource_types = tuple(t.strip() for t in env_types.split(',') if t.strip())
+        self.block_trackers = os.environ.get('BROWSER_BLOCK_TRACKERS', str(self.block_trackers)).lower() == 'true'
+
+        unknown = set(self.block_resource_types) - set(RESOURCE_TYPE_PATTERNS)
+        if unknown:
+            logger.warning(f"Ignoring unknown resource types to block: {sorted(unknown)}")
+            self.block_resource_types = tuple(t for t in self.block_resource_types if t in RESOURCE_TYPE_PATTERNS)
+
+    def context_options(self) -> Dict[str, Any]:
+        """Keyword arguments for Browser.new_context()"""
+        options = {
+            'ignore_https_errors': self.ignore_https_errors,
+            'bypass_csp': self.bypass_csp,
+            'java_script_enabled': self.java_script_enabled
+        }
+        if self.block_resource_types or self.block_trackers:
+            # Service workers can serve requests that routes never see
+            options['service_workers'] = 'block'
+        options.update(self.extra_options)
+        return options
+
+    def route_patterns(self) -> List[Union[str, Pattern]]:
+        """URL patterns whose requests are aborted"""
+        patterns: List[Union[str, Pattern]] = []
+        if self.block_robots:
+            patterns.append(ROBOTS_PATTERN)
+        patterns.extend(RESOURCE_TYPE_PATTERNS[t] for t in self.block_resource_types)
+        if self.block_trackers:
+            patterns.append(TRACKER_PATTERN)
+        return patterns
+
+    async def apply(self, context: BrowserContext):
+        """Install the request filters on a context"""
+        for pattern in self.route_patterns():
+            await context.route(pattern, _abort_route)
@@ -0,0 +1,363 @@
+"""
+Shared Async DNS Cache
+
+One process-wide resolver cache for every outbound connection, so new aiohttp
+sessions and SMTP checks don't start from a cold resolver. Lookups are async
+(dnspython's asyncresolver, falling back to the event loop's getaddrinfo), so
+DNS never ties up the default thread pool.
+
+Caching:
+- A, AAAA and MX answers are kept for their record TTL (clamped to min/max)
+- NXDOMAIN and "no records of this type" answers are cached negatively
+- Timeouts and SERVFAIL are cached briefly so a dead nameserver isn't hammered
+- Concurrent lookups for the same name share one query
+
+Batch runners call prefetch() for the next companies in the queue so their
+lookups are already warm when the companies start.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+import aiohttp
+from aiohttp.abc import AbstractResolver
+
+try:
+    import dns.asyncresolver
+    import dns.exception
+    import dns.resolver
+    DNSPYTHON_AVAILABLE = True
+except ImportError:
+    DNSPYTHON_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+RDTYPE_A = 'A'
+RDTYPE_AAAA = 'AAAA'
+RDTYPE_MX = 'MX'
+
+_ADDRESS_FAMILIES = {RDTYPE_A: socket.AF_INET, RDTYPE_AAAA: socket.AF_INET6}
+
+@dataclass
+class DnsCacheConfig:
+    """Resolver timeouts and cache lifetimes"""
+
+    min_ttl: int = 30
+    max_ttl: int = 3600
+    negative_ttl: int = 300  # NXDOMAIN / no records
+    error_ttl: int = 30  # Timeouts, SERVFAIL
+    fallback_ttl: int = 300  # getaddrinfo answers carry no TTL
+    query_timeout: float = 5.0
+    prefetch_concurrency: int = 20
+
+    def __post_init__(self):
+        self.max_ttl = int(os.environ.get('DNS_CACHE_MAX_TTL', self.max_ttl))
+        self.negative_ttl = int(os.environ.get('DNS_NEGATIVE_TTL', self.negative_ttl))
+        self.query_timeout = float(os.environ.get('DNS_QUERY_TIMEOUT', self.query_timeout))
+
+@dataclass
+class DnsEntry:
+    """A cached answer for one name and record type"""
+    values: List[str]
+    expires_at: float
+    negative: bool = False  # Name doesn't exist or has no records of this type
+
+    @property
+    def expired(self) -> bool:
+        return time.time() >= self.expires_at
+
+def dns_hostname(value: str) -> str:
+    """Hostname to look up for a domain, host or URL"""
+    value = value.strip().lower()
+    if '://' in value:
+        value = urlparse(value).hostname or ''
+    else:
+        value = value.split('/')[0].split('@')[-1].split(':')[0]
+    return value.rstrip('.')
+
+class AsyncDnsCache:
+    """
+    TTL-respecting A/AAAA/MX cache shared across the process
+
+    Usage:
+        dns_cache = get_dns_cache()
+        addresses = await dns_cache.resolve_host("example.co.uk")
+        mail_servers = await dns_cache.mx("example.co.uk")
+        await dns_cache.prefetch(["next-company.co.uk", "another.co.uk"])
+    """
+
+    def __init__(self, config: Optional[DnsCacheConfig] = None):
+        self.config = config or DnsCacheConfig()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._entries: Dict[Tuple[str, str], DnsEntry] = {}
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self._resolver = None
+        self._background = set()
+
+        self.stats = {
+            'hits': 0,
+            'negative_hits': 0,
+            'misses': 0,
+            'errors': 0,
+            'prefetched': 0
+        }
+
+    async def resolve_entry(self, name: str, rdtype: str = RDTYPE_A) -> DnsEntry:
+        """Get the cached entry for a name, querying on a miss"""
+        name = dns_hostname(name)
+        key = (name, rdtype)
+
+        entry = self._entries.get(key)
+        if entry is not None and not entry.expired:
+            self.stats['negative_hits' if entry.negative else 'hits'] += 1
+            return entry
+
+        # Futures belong to the loop that created them
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            self.loop = loop
+            self._inflight = {}
+
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+
+        self.stats['misses'] += 1
+        future = loop.create_future()
+        self._inflight[key] = future
+
+        try:
+            entry = await self._query(name, rdtype)
+            self._entries[key] = entry
+            future.set_result(entry)
+            return entry
+        except BaseException:
+            # Waiters get an error entry; only the caller that owns the query re-raises
+            future.set_result(DnsEntry(values=[], expires_at=time.time()))
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def resolve(self, name: str, rdtype: str = RDTYPE_A) -> List[str]:
+        """Resolve one record type, returning [] for missing names"""
+        return list((await self.resolve_entry(name, rdtype)).values)
+
+    async def resolve_host(self, host: str) -> List[str]:
+        """IPv4 then IPv6 addresses for a host"""
+        ipv4, ipv6 = await asyncio.gather(self.resolve(host, RDTYPE_A), self.resolve(host, RDTYPE_AAAA))
+        return ipv4 + ipv6
+
+    async def mx(self, domain: str) -> List[str]:
+        """Mail exchangers for a domain, most preferred first"""
+        return await self.resolve(domain, RDTYPE_MX)
+
+    async def domain_exists(self, domain: str) -> bool:
+        """Whether a domain has an A or AAAA record"""
+        if await self.resolve(domain, RDTYPE_A):
+            return True
+        return bool(await self.resolve(domain, RDTYPE_AAAA))
+
+    async def prefetch(self, domains: Iterable[str], rdtypes: Sequence[str] = (RDTYPE_A,)) -> int:
+        """
+        Warm the cache for a batch of domains or URLs
+
+        Args:
+            domains: Domains, hosts or URLs (duplicates and cached names are skipped)
+            rdtypes: Record types to resolve for each name
+
+        Returns:
+            Number of lookups sent to the resolver
+        """
+        keys = []
+        for domain in domains:
+            name = dns_hostname(domain or '')
+            if not name or _is_ip_address(name):
+                continue
+            for rdtype in rdtypes:
+                entry = self._entries.get((name, rdtype))
+                if (entry is None or entry.expired) and (name, rdtype) not in keys:
+                    keys.append((name, rdtype))
+
+        if not keys:
+            return 0
+
+        limit = asyncio.Semaphore(self.config.prefetch_concurrency)
+
+        async def warm(name: str, rdtype: str):
+            async with limit:
+                await self.resolve_entry(name, rdtype)
+
+        results = await asyncio.gather(*(warm(name, rdtype) for name, rdtype in keys), return_exceptions=True)
+        sent = sum(1 for result in results if not isinstance(result, BaseException))
+        self.stats['prefetched'] += sent
+        logger.debug(f"Prefetched {sent} DNS lookups")
+        return sent
+
+    def prefetch_in_background(self, domains: Iterable[str],
+                               rdtypes: Sequence[str] = (RDTYPE_A,)) -> Optional[asyncio.Task]:
+        """Start prefetch() without waiting for it"""
+        domains = list(domains)
+        if not domains:
+            return None
+        task = asyncio.ensure_future(self.prefetch(domains, rdtypes))
+        # Hold a reference so fire-and-forget prefetches aren't garbage collected
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    def clear(self):
+        """Drop all cached answers"""
+        self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters"""
+        lookups = self.stats['hits'] + self.stats['negative_hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'hit_rate': (self.stats['hits'] + self.stats['negative_hits']) / lookups if lookups else 0.0,
+            'backend': 'dnspython' if DNSPYTHON_AVAILABLE else 'getaddrinfo'
+        }
+
+    async def _query(self, name: str, rdtype: str) -> DnsEntry:
+        """Send one lookup to the resolver and build its cache entry"""
+        if DNSPYTHON_AVAILABLE:
+            return await self._query_dnspython(name, rdtype)
+        return await self._query_getaddrinfo(name, rdtype)
+
+    async def _query_dnspython(self, name: str, rdtype: str) -> DnsEntry:
+        """Async lookup through dnspython, using the record TTL"""
+        if self._resolver is None:
+            self._resolver = dns.asyncresolver.Resolver()
+            self._resolver.lifetime = self.config.query_timeout
+
+        try:
+            answer = await self._resolver.resolve(name, rdtype)
+        except dns.resolver.NXDOMAIN:
+            # The name doesn't exist, so no record type will answer
+            entry = self._negative_entry()
+            for other in (RDTYPE_A, RDTYPE_AAAA, RDTYPE_MX):
+                self._entries[(name, other)] = entry
+            return entry
+        except dns.resolver.NoAnswer:
+            return self._negative_entry()
+        except (dns.exception.DNSException, OSError) as e:
+            self.stats['errors'] += 1
+            logger.debug(f"DNS {rdtype} lookup failed for {name}: {e}")
+            return DnsEntry(values=[], expires_at=time.time() + self.config.error_ttl)
+
+        if rdtype == RDTYPE_MX:
+            values = [
+                str(record.exchange).rstrip('.')
+                for record in sorted(answer, key=lambda record: record.preference)
+            ]
+            values = [value for value in values if value]  # Null MX (RFC 7505)
+        else:
+            values = [record.to_text() for record in answer]
+
+        ttl = answer.rrset.ttl if answer.rrset is not None else self.config.min_ttl
+        ttl = min(max(ttl, self.config.min_ttl), self.config.max_ttl)
+        return DnsEntry(values=values, expires_at=time.time() + ttl, negative=not values)
+
+    async def _query_getaddrinfo(self, name: str, rdtype: str) -> DnsEntry:
+        """Address lookup through the event loop when dnspython isn't installed"""
+        if rdtype not in _ADDRESS_FAMILIES:
+            logger.debug(f"DNS {rdtype} lookups need dnspython; skipping {name}")
+            return DnsEntry(values=[], expires_at=time.time() + self.config.error_ttl)
+
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await asyncio.wait_for(
+                loop.getaddrinfo(name, None, family=_ADDRESS_FAMILIES[rdtype], type=socket.SOCK_STREAM),
+                timeout=self.config.query_timeout
+            )
+        except socket.gaierror as e:
+            if e.errno in (socket.EAI_NONAME, getattr(socket, 'EAI_NODATA', socket.EAI_NONAME)):
+                return self._negative_entry()
+            self.stats['errors'] += 1
+            logger.debug(f"DNS {rdtype} lookup failed for {name}: {e}")
+            return DnsEntry(values=[], expires_at=time.time() + self.config.error_ttl)
+        except (asyncio.TimeoutError, OSError) as e:
+            self.stats['errors'] += 1
+            logger.debug(f"DNS {rdtype} lookup failed for {name}: {e}")
+            return DnsEntry(values=[], expires_at=time.time() + self.config.error_ttl)
+
+        values = list(dict.fromkeys(info[4][0] for info in infos))
+        return DnsEntry(values=values, expires_at=time.time() + self.config.fallback_ttl, negative=not values)
+
+    def _negative_entry(self) -> DnsEntry:
+        return DnsEntry(values=[], expires_at=time.time() + self.config.negative_ttl, negative=True)
+
+def _is_ip_address(value: str) -> bool:
+    """Whether a hostname is already an IP literal"""
+    for family in (socket.AF_INET, socket.AF_INET6):
+        try:
+            socket.inet_pton(family, value.strip('[]'))
+            return True
+        except (OSError, ValueError):
+            continue
+    return False
+
+class CachingResolver(AbstractResolver):
+    """
+    aiohttp resolver backed by the shared DNS cache
+
+    Names the cache can't answer (e.g. /etc/hosts entries, NXDOMAIN from the
+    DNS servers, resolver errors) fall through to aiohttp's threaded
+    getaddrinfo resolver, which raises if the name is really unknown.
+    """
+
+    def __init__(self, dns_cache: Optional[AsyncDnsCache] = None):
+        self._dns_cache = dns_cache
+        self._fallback = aiohttp.ThreadedResolver()
+
+    async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET) -> List[Dict[str, Any]]:
+        dns_cache = self._dns_cache or get_dns_cache()
+
+        if family == socket.AF_INET:
+            rdtypes = (RDTYPE_A,)
+        elif family == socket.AF_INET6:
+            rdtypes = (RDTYPE_AAAA,)
+        else:
+            rdtypes = (RDTYPE_A, RDTYPE_AAAA)
+
+        entries = await asyncio.gather(*(dns_cache.resolve_entry(host, rdtype) for rdtype in rdtypes))
+
+        hosts = []
+        for rdtype, entry in zip(rdtypes, entries):
+            for address in entry.values:
+                hosts.append({
+                    'hostname': host,
+                    'host': address,
+                    'port': port,
+                    'family': _ADDRESS_FAMILIES[rdtype],
+                    'proto': 0,
+                    'flags': socket.AI_NUMERICHOST
+                })
+
+        if hosts:
+            return hosts
+        # Negative answers still fall through: dnspython never reads /etc/hosts
+        return await self._fallback.resolve(host, port, family)
+
+    async def close(self):
+        await self._fallback.close()
+
+def caching_connector(**connector_kwargs: Any) -> aiohttp.TCPConnector:
+    """TCPConnector resolving through the shared DNS cache"""
+    return aiohttp.TCPConnector(resolver=CachingResolver(), **connector_kwargs)
+
+# Global DNS cache instance
+_dns_cache: Optional[AsyncDnsCache] = None
+
+def get_dns_cache() -> AsyncDnsCache:
+    """Get global DNS cache instance"""
+    global _dns_cache
+    if _dns_cache is None:
+        _dns_cache = AsyncDnsCache()
+    return _dns_cache
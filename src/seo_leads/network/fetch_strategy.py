@@ -0,0 +1,303 @@
+"""
+HTTP-First Fetch Strategy
+
+Most UK SME websites serve static HTML, so pages are fetched with a plain async
+HTTP GET first and only escalated to a pooled headless browser when the HTML
+looks JavaScript-rendered. The decision is remembered per domain (in memory,
+and in SQLite when FETCH_STRATEGY_DB is set) so later pages and later runs
+skip the probe.
+
+Escalation signals:
+- Empty body text
+- Empty SPA root element (React, Vue, Next.js, Nuxt, Gatsby, Angular)
+- <noscript> "enable JavaScript" warnings on a near-empty page
+"""
+
+import asyncio
+import logging
+import os
+import re
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Set
+from urllib.parse import urlparse
+
+from .browser_pool import get_browser_pool
+from .http_cache import SOURCE_COMPANY_SITE
+from .http_client import DEFAULT_USER_AGENT, get_http_client
+from .page_store import PageRecord, build_page_record
+
+logger = logging.getLogger(__name__)
+
+MODE_HTTP = 'http'
+MODE_BROWSER = 'browser'
+
+SPA_ROOT_PATTERN = re.compile(
+    r'<(?:div|main)[^>]+id=["\'](?:root|app|__next|__nuxt|___gatsby|svelte)["\'][^>]*>\s*</(?:div|main)>'
+    r'|<app-root[^>]*>\s*</app-root>',
+    re.IGNORECASE
+)
+
+NOSCRIPT_WARNING_PATTERN = re.compile(
+    r'<noscript[^>]*>(?:(?!</noscript>).)*?'
+    r'(?:enable javascript|javascript is (?:required|disabled)|requires javascript|turn on javascript)',
+    re.IGNORECASE | re.DOTALL
+)
+
+@dataclass
+class FetchStrategyConfig:
+    """HTTP-first fetch settings"""
+
+    http_timeout: int = 15
+    browser_timeout_ms: int = 15000
+    min_text_chars: int = 200
+    noscript_text_chars: int = 1000
+    memory_path: Optional[str] = None  # SQLite file for cross-run memory (FETCH_STRATEGY_DB)
+    memory_ttl_days: int = 30
+    user_agent: str = DEFAULT_USER_AGENT
+
+    def __post_init__(self):
+        self.http_timeout = int(os.environ.get('FETCH_HTTP_TIMEOUT', self.http_timeout))
+        self.memory_path = os.environ.get('FETCH_STRATEGY_DB', self.memory_path) or None
+
+def detect_js_rendering(html: str, text: str, config: Optional[FetchStrategyConfig] = None) -> Optional[str]:
+    """
+    Check whether statically fetched HTML needs a browser to render
+
+    Returns:
+        Escalation reason, or None if the HTML is usable as-is
+    """
+    config = config or FetchStrategyConfig()
+    text_length = len(text.strip())
+
+    if text_length < config.min_text_chars:
+        if SPA_ROOT_PATTERN.search(html):
+            return 'spa_root'
+        return 'empty_body'
+
+    if SPA_ROOT_PATTERN.search(html) and text_length < config.noscript_text_chars:
+        return 'spa_root'
+
+    if text_length < config.noscript_text_chars and NOSCRIPT_WARNING_PATTERN.search(html):
+        return 'noscript_warning'
+
+    return None
+
+def domain_key(url: str) -> str:
+    """Domain used for per-site fetch mode memory"""
+    domain = urlparse(url).netloc.lower()
+    return domain[4:] if domain.startswith('www.') else domain
+
+class FetchStrategy:
+    """
+    Fetch pages over HTTP first, escalating to the browser pool when needed
+
+    Usage:
+        strategy = await get_fetch_strategy()
+        record = await strategy.fetch("https://example.co.uk/about")
+
+    FetchStrategy.fetch matches the PageStore fetcher signature, so it can be
+    passed directly as PageStore(fetcher=strategy.fetch).
+    """
+
+    def __init__(self, config: Optional[FetchStrategyConfig] = None):
+        self.config = config or FetchStrategyConfig()
+        self._domain_modes: Dict[str, str] = {}
+        self._looked_up: Set[str] = set()  # Domains already checked in SQLite
+
+        self.stats = {
+            'http_pages': 0,
+            'browser_pages': 0,
+            'escalations': 0,
+            'remembered_browser_domains': 0
+        }
+
+        if self.config.memory_path:
+            self._init_database()
+
+    async def fetch(self, url: str, force_browser: bool = False,
+                    user_agent: Optional[str] = None) -> Optional[PageRecord]:
+        """
+        Fetch a page, using the cheapest mode known to work for its domain
+
+        Args:
+            url: Page URL
+            force_browser: Skip the HTTP attempt
+            user_agent: Override the configured User-Agent
+
+        Returns:
+            PageRecord, or None if the page could not be fetched
+        """
+        domain = domain_key(url)
+        user_agent = user_agent or self.config.user_agent
+
+        mode = await self.get_domain_mode(domain)
+        if force_browser or mode == MODE_BROWSER:
+            return await self._fetch_with_browser(url, user_agent)
+
+        record = await self._fetch_with_http(url, user_agent)
+
+        if record is None:
+            # Network-level failure; a browser may still get through bot checks
+            return await self._fetch_with_browser(url, user_agent)
+
+        if not record.ok:
+            return record
+
+        if mode == MODE_HTTP:
+            self.stats['http_pages'] += 1
+            return record
+
+        reason = detect_js_rendering(record.html, record.text, self.config)
+        if reason is None:
+            await self.remember_domain_mode(domain, MODE_HTTP, 'static_html')
+            self.stats['http_pages'] += 1
+            return record
+
+        logger.info(f"Escalating {url} to browser rendering ({reason})")
+        self.stats['escalations'] += 1
+
+        browser_record = await self._fetch_with_browser(url, user_agent)
+        if browser_record is None or not browser_record.ok:
+            return record
+
+        # Only switch the whole domain when rendering actually adds content;
+        # a genuinely sparse static page shouldn't cost every later page a browser
+        if len(browser_record.text) > len(record.text) + self.config.min_text_chars:
+            await self.remember_domain_mode(domain, MODE_BROWSER, reason)
+            return browser_record
+
+        await self.remember_domain_mode(domain, MODE_HTTP, f"{reason}_not_confirmed")
+        self.stats['http_pages'] += 1
+        return record
+
+    async def get_domain_mode(self, domain: str) -> Optional[str]:
+        """Get the remembered fetch mode for a domain"""
+        if domain in self._domain_modes or domain in self._looked_up:
+            return self._domain_modes.get(domain)
+
+        # SQLite runs in a worker thread so lookups don't stall concurrent fetches
+        mode = await asyncio.to_thread(self._load_domain_mode, domain)
+        self._looked_up.add(domain)
+        if mode and domain not in self._domain_modes:
+            self._domain_modes[domain] = mode
+        return self._domain_modes.get(domain)
+
+    async def remember_domain_mode(self, domain: str, mode: str, reason: str = ""):
+        """Record the fetch mode that works for a domain"""
+        if self._domain_modes.get(domain) == mode:
+            return
+
+        self._domain_modes[domain] = mode
+        if mode == MODE_BROWSER:
+            self.stats['remembered_browser_domains'] += 1
+
+        if self.config.memory_path:
+            await asyncio.to_thread(self._persist_domain_mode, domain, mode, reason)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get fetch mode statistics"""
+        return {**self.stats, 'domains_known': len(self._domain_modes)}
+
+    async def _fetch_with_http(self, url: str, user_agent: str) -> Optional[PageRecord]:
+        """Capped async GET on the shared client, through the conditional-GET cache"""
+        try:
+            http_client = await get_http_client()
+            response = await http_client.get_html(
+                url, headers={'User-Agent': user_agent},
+                timeout=self.config.http_timeout, cache_source=SOURCE_COMPANY_SITE
+            )
+            return build_page_record(
+                response.url, response.status, response.headers, response.text(),
+                fetch_method=MODE_HTTP
+            )
+        except Exception as e:
+            logger.debug(f"HTTP fetch failed for {url}: {e}")
+            return None
+
+    async def _fetch_with_browser(self, url: str, user_agent: str) -> Optional[PageRecord]:
+        """Render a page in a pooled browser context"""
+        browser_pool = await get_browser_pool()
+
+        try:
+            # Robots.txt and opt-in resource blocking come from the pool's ContextConfig
+            async with browser_pool.context(urlparse(url).netloc, user_agent=user_agent) as context:
+                page = await context.new_page()
+                response = await page.goto(url, wait_until="domcontentloaded",
+                                           timeout=self.config.browser_timeout_ms)
+                if not response:
+                    return None
+
+                html = await page.content()
+                text = await page.evaluate("() => document.body ? document.body.innerText : ''")
+                self.stats['browser_pages'] += 1
+
+                return build_page_record(page.url, response.status, response.headers, html, text,
+                                         fetch_method=MODE_BROWSER)
+
+        except Exception as e:
+            logger.debug(f"Browser fetch failed for {url}: {e}")
+            return None
+
+    def _init_database(self):
+        """Initialize per-domain fetch mode table"""
+        try:
+            with sqlite3.connect(self.config.memory_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS domain_fetch_modes (
+                        domain TEXT PRIMARY KEY,
+                        mode TEXT,
+                        reason TEXT,
+                        updated_at REAL
+                    )
+                """)
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Fetch strategy database initialization error: {e}")
+            self.config.memory_path = None
+
+    def _load_domain_mode(self, domain: str) -> Optional[str]:
+        """Load a non-expired domain fetch mode from SQLite"""
+        if not self.config.memory_path:
+            return None
+
+        try:
+            cutoff = time.time() - self.config.memory_ttl_days * 86400
+            with sqlite3.connect(self.config.memory_path) as conn:
+                row = conn.execute(
+                    "SELECT mode FROM domain_fetch_modes WHERE domain = ? AND updated_at > ?",
+                    (domain, cutoff)
+                ).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            logger.debug(f"Fetch mode lookup error: {e}")
+            return None
+
+    def _persist_domain_mode(self, domain: str, mode: str, reason: str):
+        """Write a domain fetch mode to SQLite"""
+        try:
+            with sqlite3.connect(self.config.memory_path) as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO domain_fetch_modes (domain, mode, reason, updated_at)
+                    VALUES (?, ?, ?, ?)
+                """, (domain, mode, reason, time.time()))
+                conn.commit()
+        except Exception as e:
+            logger.debug(f"Fetch mode persist error: {e}")
+
+# Global fetch strategy instance
+_fetch_strategy: Optional[FetchStrategy] = None
+
+async def get_fetch_strategy() -> FetchStrategy:
+    """Get global fetch strategy instance"""
+    global _fetch_strategy
+    if _fetch_strategy is None:
+        _fetch_strategy = FetchStrategy()
+
+    return _fetch_strategy
+
+async def close_fetch_strategy():
+    """Drop the global fetch strategy (HTTP connections belong to the shared client)"""
+    global _fetch_strategy
+    _fetch_strategy = None
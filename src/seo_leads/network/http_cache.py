@@ -0,0 +1,543 @@
+"""
+Persistent Conditional-GET HTTP Cache
+
+On-disk cache under the fetch layer so weekly re-runs over the same companies
+don't download every page again. Each URL's ETag / Last-Modified and its
+zlib-compressed body are kept in SQLite. Entries with a validator are
+revalidated with If-None-Match / If-Modified-Since on every fetch (unless the
+server's Cache-Control max-age still covers them) and a 304 is served from
+disk. Entries without a validator are served from disk within the per-source
+TTL and refetched after it. SQLite and zlib work runs off the event loop.
+The cache is off unless HTTP_CACHE_DB names its SQLite file.
+
+Source types:
+- company_site: Company websites (pages, sitemaps)
+- directory: Business directory listing pages (via Playwright routing)
+- companies_house: Companies House search and officer pages
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import zlib
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+from urllib.parse import quote, unquote, urlsplit, urlunsplit
+
+import aiohttp
+
+try:
+    from charset_normalizer import from_bytes as detect_encoding
+except ImportError:
+    detect_encoding = None
+
+logger = logging.getLogger(__name__)
+
+SOURCE_COMPANY_SITE = 'company_site'
+SOURCE_DIRECTORY = 'directory'
+SOURCE_COMPANIES_HOUSE = 'companies_house'
+
+# Headers that describe the wire encoding rather than the stored (decoded) body
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection', 'set-cookie'}
+
+CHARSET_PATTERN = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.IGNORECASE)
+MAX_AGE_PATTERN = re.compile(r'max-age=(\d+)', re.IGNORECASE)
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+_BOMS = (
+    (b'\xef\xbb\xbf', 'utf-8-sig'),
+    (b'\xff\xfe', 'utf-16'),
+    (b'\xfe\xff', 'utf-16')
+)
+
+STREAM_CHUNK_BYTES = 64 * 1024
+
+@dataclass
+class HttpCacheConfig:
+    """HTTP cache location and per-source freshness"""
+
+    cache_path: Optional[str] = None  # SQLite file for the cache; set HTTP_CACHE_DB to enable
+    company_site_ttl_hours: float = 144  # Weekly re-runs revalidate
+    directory_ttl_hours: float = 24
+    companies_house_ttl_hours: float = 168
+    max_entry_bytes: int = 5 * 1024 * 1024
+    max_age_days: int = 90
+
+    def __post_init__(self):
+        self.cache_path = os.environ.get('HTTP_CACHE_DB', self.cache_path) or None
+        self.company_site_ttl_hours = float(os.environ.get('HTTP_CACHE_TTL_COMPANY_SITE_HOURS', self.company_site_ttl_hours))
+        self.directory_ttl_hours = float(os.environ.get('HTTP_CACHE_TTL_DIRECTORY_HOURS', self.directory_ttl_hours))
+        self.companies_house_ttl_hours = float(os.environ.get('HTTP_CACHE_TTL_COMPANIES_HOUSE_HOURS', self.companies_house_ttl_hours))
+
+    def ttl_seconds(self, source: str) -> float:
+        """Freshness window for a source type"""
+        hours = {
+            SOURCE_COMPANY_SITE: self.company_site_ttl_hours,
+            SOURCE_DIRECTORY: self.directory_ttl_hours,
+            SOURCE_COMPANIES_HOUSE: self.companies_house_ttl_hours
+        }.get(source, self.company_site_ttl_hours)
+        return hours * 3600
+
+def cache_key(url: str) -> str:
+    """
+    Normalised URL used as the cache key and to match browser requests
+
+    Lower-cases scheme and host, drops default ports and fragments, gives an
+    empty path '/' and re-quotes path and query the way browsers send them.
+    """
+    try:
+        parsed = urlsplit(url.strip())
+        scheme = parsed.scheme.lower()
+        netloc = (parsed.hostname or '').lower()
+        if parsed.port and parsed.port != _DEFAULT_PORTS.get(scheme):
+            netloc = f"{netloc}:{parsed.port}"
+        path = quote(unquote(parsed.path), safe="/:@!$&'()*+,;=-._~") or '/'
+        query = quote(unquote(parsed.query), safe="=&/:@!$'()*+,;?-._~")
+        return urlunsplit((scheme, netloc, path, query, ''))
+    except ValueError:
+        return url
+
+def looks_like_html(body: bytes) -> bool:
+    """Whether a body starts like an HTML document (markup after any BOM/whitespace)"""
+    for bom, _ in _BOMS:
+        if body.startswith(bom):
+            body = body[len(bom):]
+            break
+    return body[:512].lstrip().startswith(b'<')
+
+def is_html_content_type(headers: Dict[str, str], body: Optional[bytes] = None) -> bool:
+    """
+    Whether a response is HTML by its Content-Type
+
+    Without a Content-Type the body, when given, is sniffed instead; with
+    neither the response doesn't count as HTML.
+    """
+    content_type = headers.get('content-type', '').split(';')[0].strip().lower()
+    if content_type:
+        return content_type in HTML_CONTENT_TYPES
+    return body is not None and looks_like_html(body)
+
+def declared_charset(body: bytes, headers: Dict[str, str]) -> Optional[str]:
+    """Charset from the Content-Type header, a byte-order mark or a <meta> tag"""
+    match = CHARSET_PATTERN.search(headers.get('content-type', ''))
+    if match:
+        return match.group(1)
+
+    for bom, encoding in _BOMS:
+        if body.startswith(bom):
+            return encoding
+
+    match = META_CHARSET_PATTERN.search(body[:2048])
+    if match:
+        return match.group(1).decode('ascii', errors='ignore')
+
+    return None
+
+def decode_body(body: bytes, headers: Dict[str, str]) -> str:
+    """
+    Decode a response body
+
+    Uses the declared charset (header, BOM, <meta>) first. Undeclared bodies
+    are tried as UTF-8, and only bodies that aren't valid UTF-8 go through
+    charset detection.
+    """
+    encoding = declared_charset(body, headers)
+    if encoding:
+        try:
+            return body.decode(encoding, errors='replace')
+        except LookupError:
+            pass
+
+    try:
+        return body.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A capped body can end part-way through a multi-byte character
+        if e.start >= len(body) - 3:
+            return body.decode('utf-8', errors='replace')
+
+    if detect_encoding is not None:
+        match = detect_encoding(body[:STREAM_CHUNK_BYTES]).best()
+        if match is not None:
+            return body.decode(match.encoding, errors='replace')
+
+    return body.decode('cp1252', errors='replace')
+
+async def read_body(response: aiohttp.ClientResponse, max_bytes: Optional[int] = None) -> Tuple[bytes, bool]:
+    """
+    Read a response body, stopping at max_bytes
+
+    Returns:
+        (body, truncated)
+    """
+    if max_bytes is None:
+        return await response.read(), False
+
+    chunks = []
+    size = 0
+    async for chunk in response.content.iter_chunked(STREAM_CHUNK_BYTES):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= max_bytes:
+            break
+
+    body = b''.join(chunks)
+    truncated = size > max_bytes or (size == max_bytes and not response.content.at_eof())
+    return body[:max_bytes], truncated
+
+async def read_page_body(response: aiohttp.ClientResponse, headers: Dict[str, str],
+                         max_bytes: Optional[int] = None, html_only: bool = False) -> Tuple[bytes, bool]:
+    """
+    Read a response body, skipping non-HTML bodies when html_only is set
+
+    A declared non-HTML Content-Type is rejected before any of the body is
+    read; a body with no Content-Type is read (up to max_bytes) and kept only
+    if it looks like HTML.
+
+    Returns:
+        (body, truncated)
+    """
+    if html_only and headers.get('content-type') and not is_html_content_type(headers):
+        return b'', True
+
+    body, truncated = await read_body(response, max_bytes)
+    if html_only and not is_html_content_type(headers, body):
+        return b'', True
+    return body, truncated
+
+@dataclass
+class CachedResponse:
+    """A response served from the network or the cache"""
+    url: str  # Final URL after redirects
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    from_cache: bool = False
+    revalidated: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    source: str = SOURCE_COMPANY_SITE
+    stored_at: float = field(default_factory=time.time)
+    truncated: bool = False  # Body capped or skipped, never stored
+
+    def text(self) -> str:
+        """Body decoded with the response charset"""
+        return decode_body(self.body, self.headers)
+
+class HttpCache:
+    """
+    Conditional-GET cache shared by every fetch path
+
+    Usage:
+        http_cache = get_http_cache()
+        response = await http_cache.get(session, url, source=SOURCE_COMPANY_SITE)
+
+        async with http_cache.cached_navigation(context, url, SOURCE_DIRECTORY):
+            await page.goto(url)
+    """
+
+    def __init__(self, config: Optional[HttpCacheConfig] = None):
+        self.config = config or HttpCacheConfig()
+
+        self.stats = {
+            'hits': 0,
+            'revalidated': 0,
+            'misses': 0,
+            'stored': 0,
+            'bytes_saved': 0
+        }
+
+        if self.config.cache_path:
+            self._init_database()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.config.cache_path)
+
+    async def get(self, session: aiohttp.ClientSession, url: str, source: str = SOURCE_COMPANY_SITE,
+                  headers: Optional[Dict[str, str]] = None, max_bytes: Optional[int] = None,
+                  html_only: bool = False, **request_kwargs: Any) -> CachedResponse:
+        """
+        GET a URL through the cache
+
+        Args:
+            session: aiohttp session used on a miss or revalidation
+            url: Requested URL
+            source: Source type selecting the TTL
+            headers: Extra request headers
+            max_bytes: Stop reading the body after this many bytes
+            html_only: Skip reading bodies that aren't HTML
+            **request_kwargs: Passed through to session.get()
+
+        Returns:
+            CachedResponse (from_cache set when served from disk)
+        """
+        entry = await asyncio.to_thread(self.lookup, url)
+        if entry is not None and self.is_fresh(entry, source):
+            return self._serve_hit(entry)
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(self.conditional_headers(entry))
+
+        async with session.get(url, headers=request_headers, **request_kwargs) as response:
+            if response.status == 304 and entry is not None:
+                return await self._serve_revalidated(url, entry)
+
+            response_headers = {k.lower(): v for k, v in response.headers.items()}
+            body, truncated = await read_page_body(response, response_headers, max_bytes, html_only)
+
+            result = CachedResponse(
+                url=str(response.url),
+                status=response.status,
+                headers=response_headers,
+                body=body,
+                source=source,
+                truncated=truncated
+            )
+
+        self.stats['misses'] += 1
+        await asyncio.to_thread(self.store, url, result)
+        return result
+
+    @asynccontextmanager
+    async def cached_navigation(self, context, url: str, source: str = SOURCE_DIRECTORY) -> AsyncIterator[None]:
+        """
+        Serve a Playwright document navigation to url through the cache
+
+        Only document requests for this URL (compared after cache_key
+        normalisation, so the browser's trailing slash or re-quoting still
+        matches) are routed; sub-resources never pass through Python.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        key = cache_key(url)
+
+        def matches(request_url: str) -> bool:
+            return cache_key(request_url) == key
+
+        async def handle_route(route):
+            request = route.request
+            if request.method != 'GET' or request.resource_type != 'document':
+                await route.fallback()
+                return
+
+            entry = await asyncio.to_thread(self.lookup, url)
+            if entry is not None and self.is_fresh(entry, source):
+                hit = self._serve_hit(entry)
+                await route.fulfill(status=hit.status, headers=hit.headers, body=hit.body)
+                return
+
+            request_headers = dict(request.headers)
+            if entry is not None:
+                request_headers.update(self.conditional_headers(entry))
+
+            response = await route.fetch(headers=request_headers)
+            if response.status == 304 and entry is not None:
+                hit = await self._serve_revalidated(url, entry)
+                await route.fulfill(status=hit.status, headers=hit.headers, body=hit.body)
+                return
+
+            body = await response.body()
+            self.stats['misses'] += 1
+            await asyncio.to_thread(self.store, url, CachedResponse(
+                url=response.url,
+                status=response.status,
+                headers={k.lower(): v for k, v in response.headers.items()},
+                body=body,
+                source=source
+            ))
+            await route.fulfill(response=response, body=body)
+
+        await context.route(matches, handle_route)
+        try:
+            yield
+        finally:
+            try:
+                await context.unroute(matches, handle_route)
+            except Exception as e:
+                logger.debug(f"Error removing cache route for {url}: {e}")
+
+    def lookup(self, url: str) -> Optional[CachedResponse]:
+        """Load a stored response regardless of freshness"""
+        if not self.enabled:
+            return None
+
+        try:
+            with sqlite3.connect(self.config.cache_path) as conn:
+                row = conn.execute("""
+                    SELECT final_url, status, headers, body, etag, last_modified, source, stored_at
+                    FROM http_cache WHERE url = ?
+                """, (cache_key(url),)).fetchone()
+
+            if row:
+                return CachedResponse(
+                    url=row[0],
+                    status=row[1],
+                    headers=json.loads(row[2] or '{}'),
+                    body=zlib.decompress(row[3]) if row[3] else b'',
+                    from_cache=True,
+                    etag=row[4],
+                    last_modified=row[5],
+                    source=row[6],
+                    stored_at=row[7]
+                )
+        except Exception as e:
+            logger.debug(f"HTTP cache lookup error for {url}: {e}")
+
+        return None
+
+    def is_fresh(self, entry: CachedResponse, source: str) -> bool:
+        """
+        Whether an entry can be served without revalidation
+
+        The server's max-age wins; otherwise entries with a validator are always
+        revalidated (a 304 is cheap) and the source TTL only applies to
+        entries the server gave no validator for.
+        """
+        age = time.time() - entry.stored_at
+        cache_control = entry.headers.get('cache-control', '').lower()
+        if 'no-cache' in cache_control:
+            return False
+
+        match = MAX_AGE_PATTERN.search(cache_control)
+        if match and age < int(match.group(1)):
+            return True
+
+        if entry.etag or entry.last_modified:
+            return False
+        return age < self.config.ttl_seconds(source)
+
+    def conditional_headers(self, entry: CachedResponse) -> Dict[str, str]:
+        """Revalidation headers for a stored entry (only validators the server sent)"""
+        headers = {}
+        if entry.etag:
+            headers['If-None-Match'] = entry.etag
+        if entry.last_modified:
+            headers['If-Modified-Since'] = entry.last_modified
+        return headers
+
+    def store(self, url: str, response: CachedResponse):
+        """Store a 200 response unless the server forbids it"""
+        if not self.enabled or response.status != 200 or response.truncated:
+            return
+        if 'no-store' in response.headers.get('cache-control', '').lower():
+            return
+        if len(response.body) > self.config.max_entry_bytes:
+            return
+
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in _DROPPED_HEADERS}
+
+        try:
+            with sqlite3.connect(self.config.cache_path) as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO http_cache
+                    (url, final_url, status, headers, body, body_size, etag, last_modified, source, stored_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (cache_key(url), response.url, response.status, json.dumps(headers), zlib.compress(response.body),
+                      len(response.body), response.headers.get('etag'), response.headers.get('last-modified'),
+                      response.source, time.time()))
+                conn.commit()
+            self.stats['stored'] += 1
+        except Exception as e:
+            logger.debug(f"HTTP cache store error for {url}: {e}")
+
+    def purge_expired(self) -> int:
+        """Delete entries older than max_age_days"""
+        if not self.enabled:
+            return 0
+
+        try:
+            cutoff = time.time() - self.config.max_age_days * 86400
+            with sqlite3.connect(self.config.cache_path) as conn:
+                deleted = conn.execute("DELETE FROM http_cache WHERE stored_at < ?", (cutoff,)).rowcount
+                conn.commit()
+            return deleted
+        except Exception as e:
+            logger.error(f"HTTP cache purge error: {e}")
+            return 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache hit/miss and bytes-saved counters"""
+        stats = dict(self.stats)
+        served = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['revalidated']) / served if served else 0.0
+
+        if self.enabled:
+            try:
+                with sqlite3.connect(self.config.cache_path) as conn:
+                    count, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(body_size), 0) FROM http_cache").fetchone()
+                stats['entries'] = count
+                stats['stored_bytes'] = size
+            except Exception as e:
+                logger.debug(f"HTTP cache stats error: {e}")
+
+        return stats
+
+    def _serve_hit(self, entry: CachedResponse) -> CachedResponse:
+        """Count and return a fresh entry"""
+        self.stats['hits'] += 1
+        self.stats['bytes_saved'] += len(entry.body)
+        return entry
+
+    async def _serve_revalidated(self, url: str, entry: CachedResponse) -> CachedResponse:
+        """Count a 304, restart the entry's freshness window and return it"""
+        self.stats['revalidated'] += 1
+        self.stats['bytes_saved'] += len(entry.body)
+        entry.revalidated = True
+
+        await asyncio.to_thread(self._refresh, url)
+        return entry
+
+    def _refresh(self, url: str):
+        """Restart a stored entry's freshness window"""
+        try:
+            with sqlite3.connect(self.config.cache_path) as conn:
+                conn.execute("UPDATE http_cache SET stored_at = ? WHERE url = ?", (time.time(), cache_key(url)))
+                conn.commit()
+        except Exception as e:
+            logger.debug(f"HTTP cache refresh error for {url}: {e}")
+
+    def _init_database(self):
+        """Initialize HTTP cache table"""
+        try:
+            with sqlite3.connect(self.config.cache_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS http_cache (
+                        url TEXT PRIMARY KEY,
+                        final_url TEXT,
+                        status INTEGER,
+                        headers TEXT,
+                        body BLOB,
+                        body_size INTEGER,
+                        etag TEXT,
+                        last_modified TEXT,
+                        source TEXT,
+                        stored_at REAL
+                    )
+                """)
+                conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_stored_at ON http_cache(stored_at)")
+                conn.commit()
+        except Exception as e:
+            logger.error(f"HTTP cache database initialization error: {e}")
+            self.config.cache_path = None
+
+# Global HTTP cache instance
+_http_cache: Optional[HttpCache] = None
+
+def get_http_cache() -> HttpCache:
+    """Get global HTTP cache instance"""
+    global _http_cache
+    if _http_cache is None:
+        _http_cache = HttpCache()
+    return _http_cache
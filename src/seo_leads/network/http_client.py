@@ -0,0 +1,231 @@
+"""
+Shared Async HTTP Client
+
+One pooled aiohttp session for every plain HTTP request in seo_leads, so
+concurrent companies overlap their I/O instead of queuing behind blocking
+requests.get calls. The connector keeps connections alive between requests,
+resolves hosts through the shared DNS cache and caps connections per host, so
+50 companies running at once can't open 50 sockets to the same directory or
+API.
+
+Website pages are read with get_html(): the body is streamed and cut off at
+max_page_bytes, and non-HTML responses (PDFs, images, archives) are rejected
+from their Content-Type before any of the body is downloaded. A response
+without a Content-Type is kept only if its body looks like HTML.
+
+The session is bound to the event loop that created it; get_http_client()
+hands out a fresh client when called from a different loop.
+"""
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+import aiohttp
+
+from .dns_cache import CachingResolver
+from .http_cache import CachedResponse, get_http_cache, is_html_content_type, read_page_body
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+@dataclass
+class HttpClientConfig:
+    """Connection pool and timeout settings"""
+
+    total_timeout: float = 15
+    connect_timeout: float = 10
+    limit: int = 100  # Open connections across all hosts
+    limit_per_host: int = 8
+    keepalive_timeout: float = 30
+    verify_ssl: bool = False  # Many SME sites have broken certificate chains
+    user_agent: str = DEFAULT_USER_AGENT
+    max_page_bytes: int = 2 * 1024 * 1024  # Per-page body cap for get_html()
+
+    def __post_init__(self):
+        self.total_timeout = float(os.environ.get('HTTP_CLIENT_TIMEOUT', self.total_timeout))
+        self.limit = int(os.environ.get('HTTP_CLIENT_LIMIT', self.limit))
+        self.limit_per_host = int(os.environ.get('HTTP_CLIENT_LIMIT_PER_HOST', self.limit_per_host))
+        self.max_page_bytes = int(os.environ.get('HTTP_MAX_PAGE_BYTES', self.max_page_bytes))
+
+class AsyncHttpClient:
+    """
+    Pooled keep-alive HTTP client shared across the process
+
+    Usage:
+        client = await get_http_client()
+        response = await client.get(url, timeout=10)
+        if response.status == 200:
+            html = response.text()
+
+        # Through the conditional-GET cache
+        response = await client.get(url, cache_source=SOURCE_COMPANIES_HOUSE)
+
+        # Website page: capped, HTML only
+        response = await client.get_html(url, cache_source=SOURCE_COMPANY_SITE)
+    """
+
+    def __init__(self, config: Optional[HttpClientConfig] = None):
+        self.config = config or HttpClientConfig()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+        self.stats = {
+            'requests': 0,
+            'errors': 0,
+            'cache_hits': 0,
+            'truncated': 0,
+            'rejected_content_type': 0
+        }
+
+    async def session(self) -> aiohttp.ClientSession:
+        """Get the pooled session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self.loop = asyncio.get_running_loop()
+            connector = aiohttp.TCPConnector(
+                limit=self.config.limit,
+                limit_per_host=self.config.limit_per_host,
+                use_dns_cache=False,  # CachingResolver already caches per record TTL
+                keepalive_timeout=self.config.keepalive_timeout,
+                ssl=None if self.config.verify_ssl else False,
+                resolver=CachingResolver()
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(
+                    total=self.config.total_timeout,
+                    connect=self.config.connect_timeout
+                ),
+                headers={
+                    'User-Agent': self.config.user_agent,
+                    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                    'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8'
+                }
+            )
+        return self._session
+
+    async def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                      timeout: Optional[float] = None, cache_source: Optional[str] = None,
+                      max_bytes: Optional[int] = None, html_only: bool = False,
+                      **request_kwargs: Any) -> CachedResponse:
+        """
+        Send a request and read the body
+
+        Args:
+            method: HTTP method
+            url: Request URL (include the query string when using cache_source)
+            headers: Extra request headers
+            timeout: Total timeout in seconds, overriding the client default
+            cache_source: Serve GETs through the HTTP cache with this source's TTL
+            max_bytes: Stop reading the body after this many bytes (sets truncated)
+            html_only: Leave the body empty for non-HTML Content-Types (sets truncated)
+            **request_kwargs: Passed through to aiohttp (params, data, json, auth, ...)
+
+        Returns:
+            CachedResponse with the final URL, status, headers and body
+
+        Raises:
+            aiohttp.ClientError / asyncio.TimeoutError on network failure
+        """
+        session = await self.session()
+        if timeout is not None:
+            request_kwargs['timeout'] = aiohttp.ClientTimeout(total=timeout)
+        request_kwargs.setdefault('allow_redirects', True)
+        self.stats['requests'] += 1
+
+        try:
+            if cache_source and method.upper() == 'GET':
+                response = await get_http_cache().get(session, url, cache_source, headers=headers,
+                                                      max_bytes=max_bytes, html_only=html_only,
+                                                      **request_kwargs)
+                if response.from_cache:
+                    self.stats['cache_hits'] += 1
+                    response = self._limit_cached(response, max_bytes, html_only)
+            else:
+                async with session.request(method, url, headers=headers, **request_kwargs) as raw_response:
+                    response_headers = {k.lower(): v for k, v in raw_response.headers.items()}
+                    body, truncated = await read_page_body(raw_response, response_headers, max_bytes, html_only)
+
+                    response = CachedResponse(
+                        url=str(raw_response.url),
+                        status=raw_response.status,
+                        headers=response_headers,
+                        body=body,
+                        truncated=truncated
+                    )
+        except Exception:
+            self.stats['errors'] += 1
+            raise
+
+        if response.truncated:
+            if html_only and not is_html_content_type(response.headers, response.body):
+                self.stats['rejected_content_type'] += 1
+                logger.debug(f"Skipped non-HTML body from {url} ({response.headers.get('content-type')})")
+            else:
+                self.stats['truncated'] += 1
+                logger.debug(f"Body of {url} truncated at {max_bytes} bytes")
+
+        return response
+
+    async def get(self, url: str, **kwargs: Any) -> CachedResponse:
+        """GET a URL"""
+        return await self.request('GET', url, **kwargs)
+
+    async def get_html(self, url: str, max_bytes: Optional[int] = None, **kwargs: Any) -> CachedResponse:
+        """GET a web page, capped at max_page_bytes and skipping non-HTML bodies"""
+        return await self.request('GET', url, max_bytes=max_bytes or self.config.max_page_bytes,
+                                  html_only=True, **kwargs)
+
+    async def head(self, url: str, **kwargs: Any) -> CachedResponse:
+        """HEAD a URL, following redirects"""
+        return await self.request('HEAD', url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> CachedResponse:
+        """POST to a URL"""
+        return await self.request('POST', url, **kwargs)
+
+    async def close(self):
+        """Close the pooled session and its connections"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get request counters"""
+        return dict(self.stats)
+
+    @staticmethod
+    def _limit_cached(response: CachedResponse, max_bytes: Optional[int], html_only: bool) -> CachedResponse:
+        """Apply the body limits to a response served from the cache"""
+        if html_only and not is_html_content_type(response.headers, response.body):
+            return replace(response, body=b'', truncated=True)
+        if max_bytes is not None and len(response.body) > max_bytes:
+            return replace(response, body=response.body[:max_bytes], truncated=True)
+        return response
+
+# Global HTTP client instance
+_http_client: Optional[AsyncHttpClient] = None
+
+async def get_http_client() -> AsyncHttpClient:
+    """Get global HTTP client instance for the running event loop"""
+    global _http_client
+    loop = asyncio.get_running_loop()
+
+    # The aiohttp session is bound to the loop that created it
+    if _http_client is None or (_http_client.loop is not None and _http_client.loop is not loop):
+        _http_client = AsyncHttpClient()
+
+    return _http_client
+
+async def close_http_client():
+    """Close the global HTTP client session"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.close()
+        _http_client = None
@@ -0,0 +1,283 @@
+"""
+Canonical Origin Resolver
+
+Races lightweight probes at every URL variation of a site (https/http x
+www/non-www) instead of trying variations one after another with a full
+navigation timeout each. Once one variation answers, more preferred ones (https
+first, then the caller's order) get a short grace period to answer too, so a
+fast http or redirect variant doesn't beat the canonical origin. The chosen
+origin is cached per domain (in memory, and in SQLite when ORIGIN_CACHE_DB is
+set) so later companies and later runs skip resolution entirely; an origin
+picked while preferred probes were still pending is used but not cached.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import urlparse, urlunparse
+
+import aiohttp
+
+from .fetch_strategy import domain_key
+from .http_client import DEFAULT_USER_AGENT, get_http_client
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class OriginResolverConfig:
+    """Origin racing and caching settings"""
+
+    probe_timeout: int = 8
+    cache_path: Optional[str] = None  # SQLite file for cross-run caching (ORIGIN_CACHE_DB)
+    cache_ttl_days: int = 30
+    preferred_grace: float = 1.5  # Seconds preferred variants get after the first answer
+    user_agent: str = DEFAULT_USER_AGENT
+
+    def __post_init__(self):
+        self.probe_timeout = int(os.environ.get('ORIGIN_PROBE_TIMEOUT', self.probe_timeout))
+        self.preferred_grace = float(os.environ.get('ORIGIN_PREFERRED_GRACE', self.preferred_grace))
+        self.cache_path = os.environ.get('ORIGIN_CACHE_DB', self.cache_path) or None
+
+def origin_of(url: str) -> str:
+    """scheme://host part of a URL"""
+    parsed = urlparse(url)
+    return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}"
+
+def with_origin(origin: str, url: str) -> str:
+    """Move a URL's path and query onto another origin"""
+    parsed_origin = urlparse(origin)
+    parsed = urlparse(url)
+    return urlunparse((parsed_origin.scheme, parsed_origin.netloc, parsed.path or '/', '', parsed.query, ''))
+
+class OriginResolver:
+    """
+    Resolve the working origin of a website by racing URL variations
+
+    Usage:
+        resolver = await get_origin_resolver()
+        working_url = await resolver.resolve(url, variations)
+    """
+
+    def __init__(self, config: Optional[OriginResolverConfig] = None):
+        self.config = config or OriginResolverConfig()
+        self._origins: Dict[str, str] = {}
+        self._looked_up: Set[str] = set()  # Domains already checked in SQLite
+
+        self.stats = {
+            'cache_hits': 0,
+            'races': 0,
+            'uncached': 0,
+            'unresolved': 0
+        }
+
+        if self.config.cache_path:
+            self._init_database()
+
+    async def resolve(self, website_url: str, variations: List[str]) -> Optional[str]:
+        """
+        Find the working URL for a website
+
+        Args:
+            website_url: URL as provided (its path and query are preserved)
+            variations: Candidate URLs to race, in preference order
+
+        Returns:
+            Working URL, or None if no variation responded
+        """
+        domain = domain_key(website_url)
+
+        origin = await self.get_cached_origin(domain)
+        if origin:
+            self.stats['cache_hits'] += 1
+            return with_origin(origin, website_url)
+
+        self.stats['races'] += 1
+        final_url, settled = await self._race(variations)
+
+        if final_url is None:
+            self.stats['unresolved'] += 1
+            logger.info(f"No URL variation of {domain} responded")
+            return None
+
+        if settled:
+            await self.remember_origin(domain, origin_of(final_url))
+        else:
+            self.stats['uncached'] += 1
+            logger.debug(f"Using {origin_of(final_url)} for {domain} without caching it")
+        return final_url
+
+    async def get_cached_origin(self, domain: str) -> Optional[str]:
+        """Get the cached canonical origin for a domain"""
+        if domain in self._origins or domain in self._looked_up:
+            return self._origins.get(domain)
+
+        # SQLite runs in a worker thread so lookups don't stall other companies' probes
+        origin = await asyncio.to_thread(self._load_origin, domain)
+        self._looked_up.add(domain)
+        if origin and domain not in self._origins:
+            self._origins[domain] = origin
+        return self._origins.get(domain)
+
+    async def remember_origin(self, domain: str, origin: str):
+        """Cache the canonical origin for a domain"""
+        self._origins[domain] = origin
+        if self.config.cache_path:
+            await asyncio.to_thread(self._persist_origin, domain, origin)
+
+    async def forget_origin(self, domain: str):
+        """Drop a cached origin, e.g. after the site moved"""
+        self._origins.pop(domain, None)
+        self._looked_up.add(domain)
+        if self.config.cache_path:
+            await asyncio.to_thread(self._delete_origin, domain)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get resolver statistics"""
+        return {**self.stats, 'origins_known': len(self._origins)}
+
+    async def _race(self, variations: List[str]) -> Tuple[Optional[str], bool]:
+        """
+        Probe all variations concurrently and pick the preferred working final URL
+
+        Returns:
+            (final URL or None, whether every more preferred variation was heard from)
+        """
+        probes = {asyncio.ensure_future(self._probe(url)): index for index, url in enumerate(variations)}
+        best: Optional[Tuple[Tuple[bool, int], str]] = None
+        deadline = None
+
+        def outranks_best(index: int) -> bool:
+            # A pending probe can still win if it may come back https, or is earlier in order
+            return best is None or best[0][0] or index < best[0][1]
+
+        try:
+            pending = set(probes)
+            while pending:
+                timeout = None
+                if deadline is not None:
+                    timeout = deadline - asyncio.get_running_loop().time()
+                    if timeout <= 0:
+                        break
+
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for probe in done:
+                    final_url = probe.result()
+                    if final_url:
+                        rank = (urlparse(final_url).scheme.lower() != 'https', probes[probe])
+                        if best is None or rank < best[0]:
+                            best = (rank, final_url)
+
+                if best is not None:
+                    if not any(outranks_best(probes[probe]) for probe in pending):
+                        return best[1], True
+                    if deadline is None:
+                        deadline = asyncio.get_running_loop().time() + self.config.preferred_grace
+
+            if best is None:
+                return None, True
+            return best[1], not any(outranks_best(probes[probe]) for probe in pending)
+        finally:
+            for probe in probes:
+                if not probe.done():
+                    probe.cancel()
+            await asyncio.gather(*probes, return_exceptions=True)
+
+    async def _probe(self, url: str) -> Optional[str]:
+        """HEAD (falling back to GET) a URL, returning its final URL if it works"""
+        http_client = await get_http_client()
+        session = await http_client.session()
+        request_options = {
+            'allow_redirects': True,
+            'headers': {'User-Agent': self.config.user_agent},
+            'timeout': aiohttp.ClientTimeout(total=self.config.probe_timeout)
+        }
+
+        try:
+            async with session.head(url, **request_options) as response:
+                if response.status < 400:
+                    return str(response.url)
+                if response.status not in (403, 405, 501):
+                    return None
+
+            # Some servers reject HEAD; a GET without reading the body is still cheap
+            async with session.get(url, **request_options) as response:
+                if response.status < 400:
+                    return str(response.url)
+        except Exception as e:
+            logger.debug(f"Origin probe failed for {url}: {e}")
+
+        return None
+
+    def _init_database(self):
+        """Initialize canonical origin table"""
+        try:
+            with sqlite3.connect(self.config.cache_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS canonical_origins (
+                        domain TEXT PRIMARY KEY,
+                        origin TEXT,
+                        resolved_at REAL
+                    )
+                """)
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Origin cache database initialization error: {e}")
+            self.config.cache_path = None
+
+    def _load_origin(self, domain: str) -> Optional[str]:
+        """Load a non-expired origin from SQLite"""
+        if not self.config.cache_path:
+            return None
+
+        try:
+            cutoff = time.time() - self.config.cache_ttl_days * 86400
+            with sqlite3.connect(self.config.cache_path) as conn:
+                row = conn.execute(
+                    "SELECT origin FROM canonical_origins WHERE domain = ? AND resolved_at > ?",
+                    (domain, cutoff)
+                ).fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            logger.debug(f"Origin cache lookup error: {e}")
+            return None
+
+    def _persist_origin(self, domain: str, origin: str):
+        """Write a canonical origin to SQLite"""
+        try:
+            with sqlite3.connect(self.config.cache_path) as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO canonical_origins (domain, origin, resolved_at)
+                    VALUES (?, ?, ?)
+                """, (domain, origin, time.time()))
+                conn.commit()
+        except Exception as e:
+            logger.debug(f"Origin cache persist error: {e}")
+
+    def _delete_origin(self, domain: str):
+        """Remove a canonical origin from SQLite"""
+        try:
+            with sqlite3.connect(self.config.cache_path) as conn:
+                conn.execute("DELETE FROM canonical_origins WHERE domain = ?", (domain,))
+                conn.commit()
+        except Exception as e:
+            logger.debug(f"Origin cache delete error: {e}")
+
+# Global origin resolver instance
+_origin_resolver: Optional[OriginResolver] = None
+
+async def get_origin_resolver() -> OriginResolver:
+    """Get global origin resolver instance"""
+    global _origin_resolver
+    if _origin_resolver is None:
+        _origin_resolver = OriginResolver()
+
+    return _origin_resolver
+
+async def close_origin_resolver():
+    """Drop the global origin resolver (HTTP connections belong to the shared client)"""
+    global _origin_resolver
+    _origin_resolver = None
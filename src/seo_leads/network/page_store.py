@@ -0,0 +1,377 @@
+"""
+Crawl-Once Page Store
+
+Per-run store of fetched website pages shared by every discovery stage, so a
+site is crawled once per company instead of once per stage. Pages are keyed by
+their final URL after redirects; requested URLs that redirect to (or serve the
+same bytes as) an already stored page are folded into that page.
+
+Features:
+- Fetch-on-miss through a pluggable async page fetcher
+- Redirect and identical-content folding (e.g. /team -> homepage)
+- Concurrent requests for the same URL share one fetch
+- Concurrent priority-path probing under a per-host limit
+- Per-company byte budget: once max_bytes of HTML has been downloaded,
+  further misses are skipped instead of fetched
+- Optional SQLite persistence across runs with TTL
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from urllib.parse import urlparse, urlunparse
+
+from bs4 import BeautifulSoup
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class PageRecord:
+    """A fetched page with its parsed text and content hash"""
+    url: str  # Final URL after redirects
+    status: int
+    headers: Dict[str, str]
+    html: str
+    text: str
+    content_hash: str
+    fetch_method: str = ""
+    fetched_at: float = field(default_factory=time.time)
+
+    @property
+    def ok(self) -> bool:
+        """Whether the page was served successfully"""
+        return 200 <= self.status < 400 and bool(self.html)
+
+PageFetcher = Callable[[str], Awaitable[Optional[PageRecord]]]
+
+def normalize_page_url(url: str) -> str:
+    """Normalize a URL for use as a store key"""
+    parsed = urlparse(url.strip())
+    path = parsed.path or '/'
+    if len(path) > 1:
+        path = path.rstrip('/')
+    return urlunparse((
+        parsed.scheme.lower(),
+        parsed.netloc.lower(),
+        path,
+        '',
+        parsed.query,
+        ''
+    ))
+
+def extract_page_text(html: str) -> str:
+    """Extract visible text from HTML, one block per line"""
+    try:
+        soup = BeautifulSoup(html, 'html.parser')
+        for element in soup(['script', 'style', 'noscript', 'template']):
+            element.decompose()
+        lines = (line.strip() for line in soup.get_text(separator='\n').splitlines())
+        return '\n'.join(line for line in lines if line)
+    except Exception as e:
+        logger.debug(f"Text extraction failed: {e}")
+        return ""
+
+def build_page_record(url: str, status: int, headers: Optional[Dict[str, str]], html: str,
+                      text: Optional[str] = None, fetch_method: str = "") -> PageRecord:
+    """Build a PageRecord, extracting text and hashing content"""
+    html = html or ""
+    return PageRecord(
+        url=url,
+        status=status,
+        headers={k.lower(): v for k, v in (headers or {}).items()},
+        html=html,
+        text=text if text is not None else extract_page_text(html),
+        content_hash=hashlib.md5(html.encode('utf-8', errors='ignore')).hexdigest(),
+        fetch_method=fetch_method
+    )
+
+class PageStore:
+    """
+    Crawl-once store of website pages for a discovery run
+
+    Usage:
+        store = PageStore(fetcher=fetch_page)
+        homepage = await store.fetch("https://example.co.uk")
+        pages = await store.fetch_unique([urljoin(base, p) for p in paths])
+    """
+
+    def __init__(self, fetcher: Optional[PageFetcher] = None, persist_path: Optional[str] = None,
+                 ttl_seconds: int = 86400, max_per_host: int = 4, max_bytes: Optional[int] = None):
+        self.fetcher = fetcher
+        self.persist_path = persist_path
+        self.ttl_seconds = ttl_seconds
+        self.max_per_host = max(1, max_per_host)
+        self.max_bytes = max_bytes  # UTF-8 bytes of HTML fetched before misses are skipped
+        self.bytes_fetched = 0
+
+        self._pages: Dict[str, PageRecord] = {}  # normalized final URL -> record
+        self._aliases: Dict[str, str] = {}  # normalized requested URL -> normalized final URL
+        self._by_hash: Dict[str, str] = {}  # content hash -> normalized final URL
+        self._failed: Set[str] = set()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'fetch_failures': 0,
+            'duplicates_folded': 0,
+            'probes_cancelled': 0,
+            'budget_skips': 0
+        }
+
+        if self.persist_path:
+            self._init_database()
+
+    def get(self, url: str) -> Optional[PageRecord]:
+        """Get a stored page by requested or final URL without fetching"""
+        key = normalize_page_url(url)
+        record = self._lookup(key)
+        if record is None and self.persist_path:
+            record = self._load_persisted(key)
+            if record is not None:
+                self._remember(key, record)
+
+        return record
+
+    def put(self, requested_url: str, record: PageRecord) -> PageRecord:
+        """
+        Store a fetched page, folding redirect and content duplicates
+
+        Returns:
+            The canonical record for the page (an existing one if folded)
+        """
+        canonical = self._remember(normalize_page_url(requested_url), record)
+
+        if self.persist_path:
+            self._persist(requested_url, canonical, write_page=canonical is record)
+
+        return canonical
+
+    async def fetch(self, url: str) -> Optional[PageRecord]:
+        """Get a page from the store, fetching it on a miss"""
+        key = normalize_page_url(url)
+
+        # SQLite persistence runs in a worker thread so it doesn't stall other fetches
+        record = self._lookup(key)
+        if record is None and self.persist_path:
+            record = await asyncio.to_thread(self._load_persisted, key)
+            if record is not None:
+                record = self._remember(key, record)
+
+        if record is not None:
+            self.stats['hits'] += 1
+            return record
+
+        if key in self._failed or self.fetcher is None:
+            return None
+
+        # Share one fetch between concurrent requests for the same URL
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+
+        if self.budget_exhausted:
+            self.stats['budget_skips'] += 1
+            return None
+
+        self.stats['misses'] += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+
+        try:
+            async with self._host_limit(key):
+                record = await self.fetcher(url)
+            if record is None:
+                self._failed.add(key)
+                self.stats['fetch_failures'] += 1
+            else:
+                self.bytes_fetched += len(record.html.encode('utf-8', errors='ignore'))
+                canonical = self._remember(key, record)
+                if self.persist_path:
+                    await asyncio.to_thread(self._persist, url, canonical, canonical is record)
+                record = canonical
+            future.set_result(record)
+            return record
+        except BaseException as e:
+            future.set_result(None)
+            if isinstance(e, Exception):
+                logger.debug(f"Page fetch failed for {url}: {e}")
+                self._failed.add(key)
+                self.stats['fetch_failures'] += 1
+                return None
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+    async def fetch_unique(self, urls: List[str], content_budget: Optional[int] = None) -> List[PageRecord]:
+        """
+        Fetch pages concurrently, returning each distinct successful page once
+
+        All URLs are probed at once under the per-host limit, but results are
+        assembled in priority order. Once the content budget is met the
+        outstanding probes are cancelled.
+
+        Args:
+            urls: Requested URLs in priority order
+            content_budget: Stop once this many characters of HTML+text are collected
+
+        Returns:
+            Successful, de-duplicated PageRecords in priority order
+        """
+        records = []
+        seen = set()
+        collected = 0
+
+        probes = [asyncio.ensure_future(self.fetch(url)) for url in urls]
+
+        try:
+            for probe in probes:
+                record = await probe
+                if record is None or not record.ok or record.url in seen:
+                    continue
+
+                seen.add(record.url)
+                records.append(record)
+                collected += len(record.html) + len(record.text)
+
+                if content_budget is not None and collected > content_budget:
+                    break
+        finally:
+            outstanding = [probe for probe in probes if not probe.done()]
+            for probe in outstanding:
+                probe.cancel()
+            if outstanding:
+                self.stats['probes_cancelled'] += len(outstanding)
+                await asyncio.gather(*outstanding, return_exceptions=True)
+
+        return records
+
+    @property
+    def budget_exhausted(self) -> bool:
+        """Whether the per-company byte budget has been used up"""
+        return self.max_bytes is not None and self.bytes_fetched >= self.max_bytes
+
+    def pages(self) -> List[PageRecord]:
+        """All distinct pages stored in this run"""
+        return list(self._pages.values())
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get store hit/miss statistics"""
+        return {**self.stats, 'pages_stored': len(self._pages), 'bytes_fetched': self.bytes_fetched}
+
+    def _host_limit(self, key: str) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent fetches to one host"""
+        host = urlparse(key).netloc
+        if host.startswith('www.'):
+            host = host[4:]
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_limits[host]
+
+    def _lookup(self, key: str) -> Optional[PageRecord]:
+        """In-memory record for a normalized requested or final URL"""
+        return self._pages.get(self._aliases.get(key, key))
+
+    def _remember(self, requested_key: str, record: PageRecord) -> PageRecord:
+        """Index a record in memory and return the canonical record"""
+        final_key = normalize_page_url(record.url)
+
+        existing_key = final_key if final_key in self._pages else None
+        if existing_key is None and record.ok:
+            existing_key = self._by_hash.get(record.content_hash)
+
+        if existing_key is not None:
+            self._aliases[requested_key] = existing_key
+            if final_key != existing_key:
+                self._aliases[final_key] = existing_key
+            if requested_key != existing_key:
+                self.stats['duplicates_folded'] += 1
+            return self._pages[existing_key]
+
+        self._pages[final_key] = record
+        if record.ok:
+            self._by_hash[record.content_hash] = final_key
+        if requested_key != final_key:
+            self._aliases[requested_key] = final_key
+
+        return record
+
+    def _init_database(self):
+        """Initialize SQLite persistence tables"""
+        try:
+            with sqlite3.connect(self.persist_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS pages (
+                        url TEXT PRIMARY KEY,
+                        status INTEGER,
+                        headers TEXT,
+                        html TEXT,
+                        text TEXT,
+                        content_hash TEXT,
+                        fetch_method TEXT,
+                        fetched_at REAL
+                    )
+                """)
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS page_aliases (
+                        requested_url TEXT PRIMARY KEY,
+                        url TEXT
+                    )
+                """)
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Page store database initialization error: {e}")
+            self.persist_path = None
+
+    def _load_persisted(self, key: str) -> Optional[PageRecord]:
+        """Load a non-expired page from SQLite by requested or final URL"""
+        try:
+            with sqlite3.connect(self.persist_path) as conn:
+                row = conn.execute("""
+                    SELECT p.url, p.status, p.headers, p.html, p.text, p.content_hash, p.fetch_method, p.fetched_at
+                    FROM pages p
+                    LEFT JOIN page_aliases a ON a.url = p.url
+                    WHERE (p.url = ? OR a.requested_url = ?) AND p.fetched_at > ?
+                    LIMIT 1
+                """, (key, key, time.time() - self.ttl_seconds)).fetchone()
+
+            if row:
+                return PageRecord(
+                    url=row[0],
+                    status=row[1],
+                    headers=json.loads(row[2] or '{}'),
+                    html=row[3] or '',
+                    text=row[4] or '',
+                    content_hash=row[5],
+                    fetch_method=row[6] or '',
+                    fetched_at=row[7]
+                )
+        except Exception as e:
+            logger.debug(f"Page store lookup error: {e}")
+
+        return None
+
+    def _persist(self, requested_url: str, record: PageRecord, write_page: bool = True):
+        """Write a page and its requested-URL alias to SQLite"""
+        final_key = normalize_page_url(record.url)
+
+        try:
+            with sqlite3.connect(self.persist_path) as conn:
+                if write_page:
+                    conn.execute("""
+                        INSERT OR REPLACE INTO pages
+                        (url, status, headers, html, text, content_hash, fetch_method, fetched_at)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """, (final_key, record.status, json.dumps(record.headers), record.html,
+                          record.text, record.content_hash, record.fetch_method, record.fetched_at))
+                conn.execute("""
+                    INSERT OR REPLACE INTO page_aliases (requested_url, url) VALUES (?, ?)
+                """, (normalize_page_url(requested_url), final_key))
+                conn.commit()
+        except Exception as e:
+            logger.debug(f"Page store persist error: {e}")
@@ -0,0 +1,287 @@
+"""
+Unified Async Rate Limiter
+
+One token-bucket limiter keyed by host or provider replaces the per-class
+sleep loops in the fetchers, enrichers and integrations. Waiting is always
+asyncio.sleep, so a throttled directory never freezes the event loop.
+
+Each bucket is stored as its theoretical arrival time (GCRA): acquiring a
+token reserves the next free slot in one read-modify-write and then sleeps
+outside any lock, so concurrent callers queue up fairly. With RATE_LIMIT_DB
+set, slots are reserved inside a SQLite write transaction and every worker
+process sharing the file draws from one global budget per key.
+
+Limits are resolved in order:
+1. RATE_LIMITS env overrides ("yell.com=6,companies_house=0.5", seconds)
+2. Limits registered with configure()
+3. DIRECTORY_CONFIGS rate_limit_ms per directory host (APIConfig.yell_page_delay
+   only when Yell has no directory entry)
+4. The default passed by the caller to acquire()
+"""
+
+import asyncio
+import logging
+import os
+import random
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Provider keys for APIs reached through more than one client
+COMPANIES_HOUSE_RATE_KEY = 'companies_house'
+TWITTER_RATE_KEY = 'twitter_api'
+MAKE_WEBHOOK_RATE_KEY = 'make_webhook'
+LINKEDIN_RATE_KEY = 'linkedin.com'
+GOOGLE_SEARCH_RATE_KEY = 'google.com'
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Sustained rate and burst size for one key"""
+    rate: float  # Tokens per second
+    burst: float = 1.0  # Tokens available after an idle period
+    jitter: float = 0.0  # Random +/- fraction of the interval added to waits
+
+    @property
+    def interval(self) -> float:
+        """Seconds per token"""
+        return 1.0 / self.rate
+
+    @classmethod
+    def per_interval(cls, seconds: float, burst: float = 1.0, jitter: float = 0.0) -> 'RateLimit':
+        """One request every `seconds`"""
+        return cls(rate=1.0 / seconds, burst=burst, jitter=jitter)
+
+    @classmethod
+    def per_window(cls, max_requests: int, window_seconds: float, burst: Optional[float] = None) -> 'RateLimit':
+        """
+        At most max_requests per window
+
+        The whole window's budget may be spent at once after an idle window
+        (burst defaults to max_requests), as with the windowed limiters this
+        replaces; sustained traffic is held to the window's average rate.
+        """
+        return cls(rate=max_requests / window_seconds, burst=max_requests if burst is None else burst)
+
+# Google search is reached by several enrichers and scrapers; all of them share this budget
+GOOGLE_SEARCH_RATE_LIMIT = RateLimit.per_interval(3.0, jitter=0.2)
+
+@dataclass
+class RateLimiterConfig:
+    """Rate limiter shared state and overrides"""
+
+    shared_state_path: Optional[str] = None  # SQLite file shared by worker processes
+    overrides: str = ""  # "key=seconds,key=seconds"
+    lock_timeout: float = 10.0
+
+    def __post_init__(self):
+        self.shared_state_path = os.environ.get('RATE_LIMIT_DB', self.shared_state_path) or None
+        self.overrides = os.environ.get('RATE_LIMITS', self.overrides)
+
+    def override_limits(self) -> Dict[str, RateLimit]:
+        """Parse the RATE_LIMITS overrides"""
+        limits = {}
+        for item in self.overrides.split(','):
+            if '=' not in item:
+                continue
+            key, seconds = item.split('=', 1)
+            try:
+                limits[rate_limit_key(key)] = RateLimit.per_interval(float(seconds))
+            except (ValueError, ZeroDivisionError):
+                logger.warning(f"Ignoring invalid rate limit override: {item.strip()}")
+        return limits
+
+def rate_limit_key(url_or_host: str) -> str:
+    """Bucket key for a URL, host or provider name"""
+    value = url_or_host.strip().lower()
+    if '://' in value:
+        value = urlparse(value).netloc
+    value = value.split('@')[-1].split(':')[0]
+    return value[4:] if value.startswith('www.') else value
+
+def _default_limits() -> Dict[str, RateLimit]:
+    """Per-host limits from the directory and API configuration"""
+    limits = {}
+
+    try:
+        from ..fetchers.directory_config import DIRECTORY_CONFIGS
+        for directory in DIRECTORY_CONFIGS.values():
+            limits[rate_limit_key(directory.base_url)] = RateLimit.per_interval(
+                directory.rate_limit_ms / 1000, jitter=0.2
+            )
+    except Exception as e:
+        logger.debug(f"Directory rate limits unavailable: {e}")
+
+    try:
+        from ..config import get_api_config
+        # Only a fallback: a DIRECTORY_CONFIGS entry for Yell is authoritative
+        yell_delay = get_api_config().yell_page_delay
+        limits.setdefault(rate_limit_key('yell.com'), RateLimit.per_interval(yell_delay, jitter=0.2))
+    except Exception as e:
+        logger.debug(f"API rate limits unavailable: {e}")
+
+    return limits
+
+class AsyncRateLimiter:
+    """
+    Token-bucket limiter shared by every outbound request path
+
+    Usage:
+        limiter = get_rate_limiter()
+        await limiter.acquire("yell.com")
+        await limiter.acquire("companies_house", RateLimit.per_interval(0.5))
+    """
+
+    def __init__(self, config: Optional[RateLimiterConfig] = None):
+        self.config = config or RateLimiterConfig()
+        self._configured: Dict[str, RateLimit] = {}
+        self._overrides = self.config.override_limits()
+        self._defaults: Optional[Dict[str, RateLimit]] = None
+        self._arrival_times: Dict[str, float] = {}
+
+        self.stats = {
+            'acquired': 0,
+            'throttled': 0,
+            'waited_seconds': 0.0,
+            'shared_state_errors': 0
+        }
+
+        if self.config.shared_state_path:
+            self._init_database()
+
+    @property
+    def shared(self) -> bool:
+        return bool(self.config.shared_state_path)
+
+    def configure(self, key: str, limit: RateLimit):
+        """Register a limit for a key, taking precedence over caller defaults"""
+        self._configured[rate_limit_key(key)] = limit
+
+    def get_limit(self, key: str, default: Optional[RateLimit] = None) -> Optional[RateLimit]:
+        """Resolve the limit that applies to a key"""
+        key = rate_limit_key(key)
+        if key in self._overrides:
+            return self._overrides[key]
+        if key in self._configured:
+            return self._configured[key]
+
+        if self._defaults is None:
+            self._defaults = _default_limits()
+        return self._defaults.get(key, default)
+
+    async def acquire(self, key: str, default: Optional[RateLimit] = None, tokens: float = 1.0) -> float:
+        """
+        Wait until tokens are available for a key
+
+        Args:
+            key: Host, URL or provider name
+            default: Limit to use if none is configured for the key
+            tokens: Tokens to consume
+
+        Returns:
+            Seconds waited
+        """
+        key = rate_limit_key(key)
+        limit = self.get_limit(key, default)
+        if limit is None:
+            return 0.0
+
+        wait = await self._reserve(key, limit, tokens)
+        self.stats['acquired'] += 1
+
+        if wait > 0 and limit.jitter:
+            wait = max(0.0, wait + random.uniform(-limit.jitter, limit.jitter) * limit.interval)
+
+        if wait > 0:
+            self.stats['throttled'] += 1
+            self.stats['waited_seconds'] += wait
+            logger.debug(f"Rate limiting {key}: sleeping {wait:.2f}s")
+            await asyncio.sleep(wait)
+
+        return wait
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get acquisition and wait counters"""
+        return {**self.stats, 'keys': len(self._arrival_times), 'shared': self.shared}
+
+    async def _reserve(self, key: str, limit: RateLimit, tokens: float) -> float:
+        """Reserve the next slot for a key and return the wait before it"""
+        if self.shared:
+            try:
+                # BEGIN IMMEDIATE can block for up to lock_timeout; keep it off the event loop
+                return await asyncio.to_thread(self._reserve_shared, key, limit, tokens)
+            except Exception as e:
+                self.stats['shared_state_errors'] += 1
+                logger.debug(f"Shared rate limit state unavailable for {key}: {e}")
+
+        now = time.time()
+        arrival, wait = self._next_arrival(self._arrival_times.get(key, now), now, limit, tokens)
+        self._arrival_times[key] = arrival
+        return wait
+
+    def _reserve_shared(self, key: str, limit: RateLimit, tokens: float) -> float:
+        """Reserve a slot inside a SQLite write transaction shared across processes"""
+        conn = sqlite3.connect(self.config.shared_state_path, timeout=self.config.lock_timeout,
+                               isolation_level=None)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT arrival_time FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+
+            now = time.time()
+            arrival, wait = self._next_arrival(row[0] if row else now, now, limit, tokens)
+
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (key, arrival_time, updated_at) VALUES (?, ?, ?)",
+                (key, arrival, now)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        self._arrival_times[key] = arrival
+        return wait
+
+    @staticmethod
+    def _next_arrival(arrival: float, now: float, limit: RateLimit, tokens: float):
+        """Advance a bucket's arrival time; returns (new arrival time, wait)"""
+        arrival = max(arrival, now)
+        tolerance = (limit.burst - 1) * limit.interval
+        wait = max(0.0, arrival - tolerance - now)
+        return arrival + tokens * limit.interval, wait
+
+    def _init_database(self):
+        """Initialize shared bucket table"""
+        try:
+            with sqlite3.connect(self.config.shared_state_path) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                        key TEXT PRIMARY KEY,
+                        arrival_time REAL,
+                        updated_at REAL
+                    )
+                """)
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Rate limiter database initialization error: {e}")
+            self.config.shared_state_path = None
+
+# Global rate limiter instance
+_rate_limiter: Optional[AsyncRateLimiter] = None
+
+def get_rate_limiter() -> AsyncRateLimiter:
+    """Get global rate limiter instance"""
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = AsyncRateLimiter()
+        _rate_limiter.configure(GOOGLE_SEARCH_RATE_KEY, GOOGLE_SEARCH_RATE_LIMIT)
+    return _rate_limiter
@@ -0,0 +1,423 @@
+"""
+Site Map Discovery
+
+Finds the pages a website actually has, so discovery engines stop guessing
+/about, /team, /leadership... and paying for the 404s. Sitemaps (including
+sitemap indexes and robots.txt Sitemap: entries) and homepage navigation links
+are read once per domain, cached (in memory, and in SQLite when
+SITE_MAP_CACHE_DB is set), and ranked with the executive link-text heuristics
+used by the website scraper.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse, unquote
+
+from bs4 import BeautifulSoup
+
+from .fetch_strategy import domain_key, get_fetch_strategy
+from .http_cache import SOURCE_COMPANY_SITE
+from .http_client import DEFAULT_USER_AGENT, get_http_client
+
+logger = logging.getLogger(__name__)
+
+EXECUTIVE_LINK_KEYWORDS = [
+    'team', 'about', 'leadership', 'management', 'executives',
+    'staff', 'people', 'directors', 'board', 'who we are',
+    'meet the team', 'our people', 'key people'
+]
+
+# Keywords that point at people rather than general company info
+STRONG_EXECUTIVE_KEYWORDS = {
+    'team', 'leadership', 'management', 'executives', 'staff', 'people',
+    'directors', 'board', 'meet the team', 'our people', 'key people'
+}
+
+CONTACT_LINK_KEYWORDS = ['contact']
+
+NAVIGATION_SELECTOR = 'nav a, header a, footer a, .menu a, .navigation a'
+
+SKIPPED_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.zip', '.doc', '.docx', '.xml')
+
+def is_executive_link_text(text: str) -> bool:
+    """Check if link text suggests executive content"""
+    text = text.lower()
+    for keyword in EXECUTIVE_LINK_KEYWORDS:
+        if keyword in text:
+            return True
+    return False
+
+def link_score(url: str, text: str = "") -> int:
+    """
+    Rank a link for executive discovery
+
+    Returns:
+        0 if irrelevant; higher for people pages, then about pages, then contact pages
+    """
+    path_words = re.sub(r'[-_/.]+', ' ', unquote(urlparse(url).path)).lower()
+    combined = f"{text.lower()} {path_words}"
+
+    if is_executive_link_text(combined):
+        if any(keyword in combined for keyword in STRONG_EXECUTIVE_KEYWORDS):
+            return 3
+        return 2
+
+    if any(keyword in combined for keyword in CONTACT_LINK_KEYWORDS):
+        return 1
+
+    return 0
+
+@dataclass
+class SiteMapConfig:
+    """Site map discovery limits and cache settings"""
+
+    request_timeout: int = 10
+    max_sitemaps: int = 5
+    max_sitemap_urls: int = 2000
+    cache_path: Optional[str] = None  # SQLite file for cross-run caching (SITE_MAP_CACHE_DB)
+    cache_ttl_days: int = 7
+    user_agent: str = DEFAULT_USER_AGENT
+
+    def __post_init__(self):
+        self.cache_path = os.environ.get('SITE_MAP_CACHE_DB', self.cache_path) or None
+
+@dataclass
+class SiteMap:
+    """Known pages of a website and its ranked executive/contact candidates"""
+    domain: str
+    homepage_url: str
+    candidates: List[Tuple[str, int]] = field(default_factory=list)  # (url, score), best first
+    sitemap_urls: int = 0
+    navigation_urls: int = 0
+    discovered_at: float = field(default_factory=time.time)
+
+    def candidate_urls(self, limit: Optional[int] = None, include_contact: bool = True) -> List[str]:
+        """Ranked candidate URLs"""
+        urls = [url for url, score in self.candidates if include_contact or score > 1]
+        return urls[:limit] if limit else urls
+
+class SiteMapDiscovery:
+    """
+    Discover and rank the executive-relevant pages of a website
+
+    Usage:
+        discovery = await get_site_map_discovery()
+        site_map = await discovery.discover("https://example.co.uk", page_store)
+        urls = site_map.candidate_urls(limit=7)
+    """
+
+    def __init__(self, config: Optional[SiteMapConfig] = None):
+        self.config = config or SiteMapConfig()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._site_maps: Dict[str, SiteMap] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+        self.stats = {
+            'cache_hits': 0,
+            'discoveries': 0,
+            'sitemaps_parsed': 0
+        }
+
+        if self.config.cache_path:
+            self._init_database()
+
+    async def discover(self, base_url: str, page_store=None) -> SiteMap:
+        """
+        Get the site map for a website, discovering it once per domain
+
+        Args:
+            base_url: Website homepage URL
+            page_store: Optional PageStore the homepage is read from
+
+        Returns:
+            SiteMap (with no candidates if nothing could be discovered)
+        """
+        domain = domain_key(base_url)
+
+        site_map = self._site_maps.get(domain)
+        if site_map is not None:
+            self.stats['cache_hits'] += 1
+            return site_map
+
+        # Engines running for the same site share one cache lookup and discovery
+        if domain in self._inflight:
+            return await asyncio.shield(self._inflight[domain])
+
+        self.loop = asyncio.get_running_loop()
+        future = self.loop.create_future()
+        self._inflight[domain] = future
+
+        try:
+            # SQLite runs in a worker thread so it doesn't stall other engines' fetches
+            if self.config.cache_path:
+                site_map = await asyncio.to_thread(self._load_site_map, domain)
+            if site_map is not None:
+                self._site_maps[domain] = site_map
+                self.stats['cache_hits'] += 1
+                future.set_result(site_map)
+                return site_map
+
+            site_map = await self._discover(base_url, domain, page_store)
+            # Don't pin an unreachable site as "no pages" for the whole TTL
+            if site_map.sitemap_urls or site_map.navigation_urls:
+                self._site_maps[domain] = site_map
+                if self.config.cache_path:
+                    await asyncio.to_thread(self._persist_site_map, site_map)
+            future.set_result(site_map)
+            return site_map
+        except BaseException as e:
+            site_map = SiteMap(domain=domain, homepage_url=base_url)
+            future.set_result(site_map)
+            if isinstance(e, Exception):
+                logger.debug(f"Site map discovery failed for {domain}: {e}")
+                return site_map
+            raise
+        finally:
+            self._inflight.pop(domain, None)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get discovery statistics"""
+        return {**self.stats, 'domains_known': len(self._site_maps)}
+
+    async def _discover(self, base_url: str, domain: str, page_store) -> SiteMap:
+        """Read sitemaps and homepage navigation concurrently and rank the links"""
+        self.stats['discoveries'] += 1
+
+        sitemap_links, navigation_links = await asyncio.gather(
+            self._sitemap_links(base_url),
+            self._navigation_links(base_url, page_store)
+        )
+
+        scores: Dict[str, int] = {}
+        order: Dict[str, int] = {}
+
+        # Navigation first: a linked page is the strongest sign it exists and matters
+        for url, text in navigation_links + [(url, "") for url in sitemap_links]:
+            url = url.split('#')[0]
+            if not self._is_same_site(url, domain) or url.lower().endswith(SKIPPED_EXTENSIONS):
+                continue
+
+            score = link_score(url, text)
+            if score == 0:
+                continue
+
+            order.setdefault(url, len(order))
+            scores[url] = max(scores.get(url, 0), score)
+
+        ranked = sorted(
+            scores.items(),
+            key=lambda item: (-item[1], urlparse(item[0]).path.count('/'), order[item[0]])
+        )
+
+        logger.info(f"Site map for {domain}: {len(sitemap_links)} sitemap URLs, "
+                    f"{len(navigation_links)} navigation links, {len(ranked)} candidates")
+
+        return SiteMap(
+            domain=domain,
+            homepage_url=base_url,
+            candidates=ranked,
+            sitemap_urls=len(sitemap_links),
+            navigation_urls=len(navigation_links)
+        )
+
+    async def _navigation_links(self, base_url: str, page_store) -> List[Tuple[str, str]]:
+        """Links and their text from the homepage navigation, header and footer"""
+        try:
+            if page_store is not None:
+                record = await page_store.fetch(base_url)
+            else:
+                fetch_strategy = await get_fetch_strategy()
+                record = await fetch_strategy.fetch(base_url)
+
+            if record is None or not record.ok:
+                return []
+
+            soup = BeautifulSoup(record.html, 'html.parser')
+            links = []
+            for link in soup.select(NAVIGATION_SELECTOR):
+                href = link.get('href')
+                if href and not href.startswith(('mailto:', 'tel:', 'javascript:')):
+                    links.append((urljoin(record.url, href), link.get_text(" ", strip=True)))
+            return links
+
+        except Exception as e:
+            logger.debug(f"Navigation discovery failed for {base_url}: {e}")
+            return []
+
+    async def _sitemap_links(self, base_url: str) -> List[str]:
+        """Page URLs listed in the site's sitemaps"""
+        sitemap_queue = [urljoin(base_url, '/sitemap.xml'), urljoin(base_url, '/sitemap_index.xml')]
+        sitemap_queue.extend(await self._robots_sitemaps(base_url))
+
+        seen_sitemaps = set()
+        page_urls: List[str] = []
+
+        while sitemap_queue and len(seen_sitemaps) < self.config.max_sitemaps:
+            batch = []
+            for sitemap_url in sitemap_queue:
+                if sitemap_url not in seen_sitemaps and len(seen_sitemaps) < self.config.max_sitemaps:
+                    seen_sitemaps.add(sitemap_url)
+                    batch.append(sitemap_url)
+            sitemap_queue = []
+
+            for child_sitemaps, urls in await asyncio.gather(*(self._parse_sitemap(url) for url in batch)):
+                page_urls.extend(urls)
+                # Page sitemaps before post/product/category ones
+                sitemap_queue.extend(sorted(child_sitemaps, key=lambda u: 0 if 'page' in u.lower() else 1))
+
+            if len(page_urls) >= self.config.max_sitemap_urls:
+                break
+
+        return list(dict.fromkeys(page_urls))[:self.config.max_sitemap_urls]
+
+    async def _robots_sitemaps(self, base_url: str) -> List[str]:
+        """Sitemap: entries from robots.txt"""
+        body = await self._get(urljoin(base_url, '/robots.txt'))
+        if not body:
+            return []
+
+        text = body.decode('utf-8', errors='replace')
+        return [
+            line.split(':', 1)[1].strip()
+            for line in text.splitlines()
+            if line.lower().startswith('sitemap:')
+        ]
+
+    async def _parse_sitemap(self, sitemap_url: str) -> Tuple[List[str], List[str]]:
+        """
+        Parse a sitemap or sitemap index
+
+        Returns:
+            (child sitemap URLs, page URLs)
+        """
+        body = await self._get(sitemap_url)
+        if not body:
+            return [], []
+
+        if body[:2] == b'\x1f\x8b':
+            try:
+                body = gzip.decompress(body)
+            except Exception:
+                return [], []
+
+        try:
+            root = ET.fromstring(body)
+        except ET.ParseError:
+            return [], []
+
+        self.stats['sitemaps_parsed'] += 1
+        locations = [
+            element.text.strip()
+            for element in root.iter()
+            if element.tag.endswith('loc') and element.text
+        ]
+
+        if root.tag.endswith('sitemapindex'):
+            return locations, []
+        return [], locations
+
+    async def _get(self, url: str) -> Optional[bytes]:
+        """Plain GET returning the body of a 200 response"""
+        try:
+            http_client = await get_http_client()
+            response = await http_client.get(
+                url, headers={'User-Agent': self.config.user_agent},
+                timeout=self.config.request_timeout, cache_source=SOURCE_COMPANY_SITE
+            )
+            if response.status == 200:
+                return response.body
+        except Exception as e:
+            logger.debug(f"Sitemap fetch failed for {url}: {e}")
+        return None
+
+    def _is_same_site(self, url: str, domain: str) -> bool:
+        """Whether a URL belongs to the site being discovered"""
+        parsed = urlparse(url)
+        return parsed.scheme in ('http', 'https') and domain_key(url) == domain
+
+    def _init_database(self):
+        """Initialize site map cache table"""
+        try:
+            with sqlite3.connect(self.config.cache_path) as conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS site_maps (
+                        domain TEXT PRIMARY KEY,
+                        homepage_url TEXT,
+                        candidates TEXT,
+                        sitemap_urls INTEGER,
+                        navigation_urls INTEGER,
+                        discovered_at REAL
+                    )
+                """)
+                conn.commit()
+        except Exception as e:
+            logger.error(f"Site map cache database initialization error: {e}")
+            self.config.cache_path = None
+
+    def _load_site_map(self, domain: str) -> Optional[SiteMap]:
+        """Load a non-expired site map from SQLite"""
+        if not self.config.cache_path:
+            return None
+
+        try:
+            cutoff = time.time() - self.config.cache_ttl_days * 86400
+            with sqlite3.connect(self.config.cache_path) as conn:
+                row = conn.execute("""
+                    SELECT homepage_url, candidates, sitemap_urls, navigation_urls, discovered_at
+                    FROM site_maps WHERE domain = ? AND discovered_at > ?
+                """, (domain, cutoff)).fetchone()
+
+            if row:
+                return SiteMap(
+                    domain=domain,
+                    homepage_url=row[0],
+                    candidates=[tuple(candidate) for candidate in json.loads(row[1] or '[]')],
+                    sitemap_urls=row[2],
+                    navigation_urls=row[3],
+                    discovered_at=row[4]
+                )
+        except Exception as e:
+            logger.debug(f"Site map cache lookup error: {e}")
+
+        return None
+
+    def _persist_site_map(self, site_map: SiteMap):
+        """Write a site map to SQLite"""
+        try:
+            with sqlite3.connect(self.config.cache_path) as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO site_maps
+                    (domain, homepage_url, candidates, sitemap_urls, navigation_urls, discovered_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (site_map.domain, site_map.homepage_url, json.dumps(site_map.candidates),
+                      site_map.sitemap_urls, site_map.navigation_urls, site_map.discovered_at))
+                conn.commit()
+        except Exception as e:
+            logger.debug(f"Site map cache persist error: {e}")
+
+# Global site map discovery instance
+_site_map_discovery: Optional[SiteMapDiscovery] = None
+
+async def get_site_map_discovery() -> SiteMapDiscovery:
+    """Get global site map discovery instance for the running event loop"""
+    global _site_map_discovery
+    loop = asyncio.get_running_loop()
+
+    if _site_map_discovery is None or (_site_map_discovery.loop is not None and _site_map_discovery.loop is not loop):
+        _site_map_discovery = SiteMapDiscovery()
+
+    return _site_map_discovery
+
+async def close_site_map_discovery():
+    """Drop the global site map discovery (HTTP connections belong to the shared client)"""
+    global _site_map_discovery
+    _site_map_discovery = None
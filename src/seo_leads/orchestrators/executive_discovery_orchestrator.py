@@ -18,10 +18,16 @@ import os
 # Add project root to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from playwright.async_api import async_playwright, Page
+from playwright.async_api import Page
 import aiohttp
 from bs4 import BeautifulSoup
 
+from ..network.fetch_strategy import domain_key, get_fetch_strategy
+from ..network.origin_resolver import get_origin_resolver
+from ..network.page_store import PageRecord, PageStore
+from ..network.site_map import get_site_map_discovery
+from ..exporters.results_warehouse import ResultsWarehouse, get_results_warehouse
+
 # Import Companies House enricher for official UK government data
 try:
     from ..enrichers.companies_house_enricher import CompaniesHouseEnricher
@@ -96,9 +102,21 @@ class ExecutiveDiscoveryResult:
 class ExecutiveDiscoveryOrchestrator:
     """Master Executive Discovery Orchestrator implementing 8-step discovery logic with REAL data extraction"""
     
-    def __init__(self):
+    def __init__(self, page_store_path: Optional[str] = None, max_probes_per_host: int = 4,
+                 max_company_bytes: int = 4 * 1024 * 1024,
+                 results_warehouse: Optional[ResultsWarehouse] = None):
         logger.info("Initializing 8-Step Executive Discovery Orchestrator with REAL executive data extraction")
         
+        # Parquet sink for results and step timings (None unless RESULTS_WAREHOUSE_DIR is set)
+        self.results_warehouse = results_warehouse or get_results_warehouse()
+        
+        # Optional SQLite file so fetched pages are reused across runs
+        self.page_store_path = page_store_path
+        # Concurrent page probes per site; keep low to stay polite to SME hosts
+        self.max_probes_per_host = max_probes_per_host
+        # HTML downloaded per company before further page fetches are skipped
+        self.max_company_bytes = max_company_bytes
+        
         # Initialize Phase9a Contact Extraction Engine for real data
         if Phase9aContactExtractionEngine:
             self.contact_engine = Phase9aContactExtractionEngine(Phase9aConfig())
@@ -162,8 +180,15 @@ class ExecutiveDiscoveryOrchestrator:
                 
         return unique_variations
         
-    async def execute_comprehensive_discovery(self, website_url: str) -> ExecutiveDiscoveryResult:
-        """Execute all 8 steps with validation and fallbacks - NOW WITH REAL EXECUTIVE DATA"""
+    async def execute_comprehensive_discovery(self, website_url: str, company_id: Optional[str] = None,
+                                              sector: Optional[str] = None,
+                                              city: Optional[str] = None) -> ExecutiveDiscoveryResult:
+        """
+        Execute all 8 steps with validation and fallbacks - NOW WITH REAL EXECUTIVE DATA
+
+        company_id, sector and city, when the caller knows the company, are
+        recorded with the result in the results warehouse.
+        """
         
         start_time = time.time()
         discovery_steps = []
@@ -171,10 +196,13 @@ class ExecutiveDiscoveryOrchestrator:
         
         logger.info(f"Starting 8-step REAL executive discovery for {website_url}")
         
+        # Every stage reads pages from one store so the site is crawled once per run
+        page_store = self._new_page_store()
+        
         try:
             # Step 1: Identify Company on Website
             step_start = time.time()
-            company_data = await self._step1_identify_company(website_url)
+            company_data = await self._step1_identify_company(website_url, page_store)
             step_time = int((time.time() - step_start) * 1000)
             
             # Update actual working URL
@@ -220,7 +248,9 @@ class ExecutiveDiscoveryOrchestrator:
             
             # Step 3-8: REAL Executive Discovery using Phase9a Engine
             step_start = time.time()
-            website_executives = await self._steps3to8_real_executive_discovery(company_data.name, actual_working_url)
+            website_executives = await self._steps3to8_real_executive_discovery(
+                company_data.name, actual_working_url, page_store
+            )
             step_time = int((time.time() - step_start) * 1000)
             
             # Merge Companies House executives with website-discovered executives
@@ -231,7 +261,7 @@ class ExecutiveDiscoveryOrchestrator:
             logger.info(f"8-step REAL executive discovery complete for {company_data.name} (URL: {actual_working_url})")
             logger.info(f"Found {len(all_executives)} real executives with contact information")
             
-            return ExecutiveDiscoveryResult(
+            result = ExecutiveDiscoveryResult(
                 company_name=company_data.name,
                 website_url=website_url,
                 actual_working_url=actual_working_url,
@@ -243,14 +273,17 @@ class ExecutiveDiscoveryOrchestrator:
                     'steps_completed': len(discovery_steps), 
                     'real_executives_found': len(all_executives),
                     'companies_house_directors': len(companies_house_executives),
-                    'website_executives': len(website_executives)
+                    'website_executives': len(website_executives),
+                    'page_store': page_store.get_stats()
                 }
             )
+            self._record_result(result, company_id, sector, city)
+            return result
             
         except Exception as e:
             logger.error(f"8-step orchestration failed: {e}")
             
-            return ExecutiveDiscoveryResult(
+            result = ExecutiveDiscoveryResult(
                 company_name=urlparse(website_url).netloc or website_url,
                 website_url=website_url,
                 actual_working_url=actual_working_url,
@@ -260,8 +293,21 @@ class ExecutiveDiscoveryOrchestrator:
                 overall_confidence=0.0,
                 validation_summary={'orchestration_error': str(e)}
             )
+            self._record_result(result, company_id, sector, city)
+            return result
+    
+    def _record_result(self, result: ExecutiveDiscoveryResult, company_id: Optional[str] = None,
+                       sector: Optional[str] = None, city: Optional[str] = None):
+        """Append a discovery result and its step timings to the results warehouse"""
+        if self.results_warehouse:
+            try:
+                self.results_warehouse.record_discovery(result, source='orchestrator', company_id=company_id,
+                                                        sector=sector, city=city)
+            except Exception as e:
+                logger.warning(f"Failed to record discovery result: {e}")
     
-    async def _steps3to8_real_executive_discovery(self, company_name: str, website_url: str) -> List[ExecutiveContact]:
+    async def _steps3to8_real_executive_discovery(self, company_name: str, website_url: str,
+                                                  page_store: Optional[PageStore] = None) -> List[ExecutiveContact]:
         """Steps 3-8: Extract REAL executive information using Phase9a engine and enhanced extraction"""
         
         executives = []
@@ -272,7 +318,10 @@ class ExecutiveDiscoveryOrchestrator:
             if self.contact_engine:
                 # Use Phase9a Contact Extraction Engine for real data
                 logger.info("Using Phase9a Contact Extraction Engine for real executive discovery")
-                result = await self.contact_engine.extract_executive_contacts(company_name, website_url)
+                candidate_urls = await self._discover_candidate_pages(website_url, page_store)
+                result = await self.contact_engine.extract_executive_contacts(
+                    company_name, website_url, page_store=page_store, candidate_urls=candidate_urls
+                )
                 
                 if result and 'executive_profiles' in result:
                     for profile in result['executive_profiles']:
@@ -286,7 +335,7 @@ class ExecutiveDiscoveryOrchestrator:
             # Fallback: Enhanced direct extraction if Phase9a didn't find enough
             if len(executives) < 2:
                 logger.info("Using enhanced fallback extraction to find more executives")
-                fallback_executives = await self._enhanced_fallback_extraction(company_name, website_url)
+                fallback_executives = await self._enhanced_fallback_extraction(company_name, website_url, page_store)
                 executives.extend(fallback_executives)
             
             # Final validation and confidence scoring
@@ -486,7 +535,8 @@ class ExecutiveDiscoveryOrchestrator:
         default_titles = ["Managing Director", "Director", "Owner", "Manager"]
         return default_titles[0]  # Most common for UK SMEs
     
-    async def _enhanced_fallback_extraction(self, company_name: str, website_url: str) -> List[ExecutiveContact]:
+    async def _enhanced_fallback_extraction(self, company_name: str, website_url: str,
+                                            page_store: Optional[PageStore] = None) -> List[ExecutiveContact]:
         """Enhanced fallback extraction for real executive data with improved name detection"""
         
         executives = []
@@ -495,7 +545,7 @@ class ExecutiveDiscoveryOrchestrator:
             logger.info(f"Running enhanced fallback extraction for {company_name}")
             
             # Fetch comprehensive content from multiple pages
-            content_data = await self._fetch_comprehensive_content(website_url)
+            content_data = await self._fetch_comprehensive_content(website_url, page_store)
             
             # Use multiple extraction strategies
             strategies = [
@@ -815,11 +865,12 @@ class ExecutiveDiscoveryOrchestrator:
         """Validate if a name looks like a real person's name - ENHANCED VERSION"""
         return self._is_valid_person_name(name)  # Use the enhanced validation
     
-    async def _fetch_comprehensive_content(self, website_url: str) -> Dict[str, Any]:
+    async def _fetch_comprehensive_content(self, website_url: str, page_store: Optional[PageStore] = None) -> Dict[str, Any]:
         """Fetch comprehensive content from multiple pages for executive discovery"""
         
         content_data = {
             'content': '',
+            'pages': [],
             'pages_analyzed': 0
         }
         
@@ -832,63 +883,58 @@ class ExecutiveDiscoveryOrchestrator:
             '/company', '/organization', '/who-we-are'
         ]
         
-        async with async_playwright() as playwright:
-            browser = await playwright.chromium.launch(
-                headless=True,
-                args=[
-                    '--no-sandbox',
-                    '--disable-web-security',
-                    '--disable-features=VizDisplayCompositor',
-                    '--ignore-certificate-errors',
-                    '--ignore-ssl-errors',
-                    '--ignore-certificate-errors-spki-list'
-                ]
-            )
-            
-            context = await browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                ignore_https_errors=True,
-                bypass_csp=True,
-                java_script_enabled=True
-            )
-            
-            # Robots.txt bypass
-            async def handle_route(route):
-                if route.request.url.endswith('/robots.txt'):
-                    await route.abort()
-                else:
-                    await route.continue_()
-            await context.route("**/*", handle_route)
-            
-            page = await context.new_page()
-            
-            for path in priority_paths[:8]:  # Limit to 8 pages for performance
-                try:
-                    url = urljoin(website_url, path)
-                    
-                    response = await page.goto(url, wait_until="domcontentloaded", timeout=15000)
-                    
-                    if response and response.status < 400:
-                        # Extract page content
-                        text_content = await page.evaluate("() => document.body.innerText")
-                        html_content = await page.content()
-                        
-                        content_data['content'] += f"\n\n=== PAGE: {url} ===\n{text_content}\n\n=== HTML: ===\n{html_content}\n\n"
-                        content_data['pages_analyzed'] += 1
-                        
-                        # Stop if we have enough content
-                        if len(content_data['content']) > 50000:  # 50KB limit
-                            break
-                        
-                except Exception as e:
-                    logger.debug(f"Failed to fetch {url}: {e}")
-                    continue
-            
-            await browser.close()
+        if page_store is None:
+            page_store = self._new_page_store()
+        
+        # Pages the site actually links to or lists in its sitemap; guessed
+        # paths are only used when nothing could be discovered
+        candidate_urls = await self._discover_candidate_pages(website_url, page_store)
+        
+        # Limit to 8 pages for performance; pages already fetched by earlier
+        # steps come from the store and redirect duplicates are returned once.
+        # Probes run concurrently and are cancelled once the budget is met.
+        if candidate_urls:
+            urls = [website_url] + candidate_urls[:7]
+        else:
+            urls = [urljoin(website_url, path) for path in priority_paths[:8]]
+        records = await page_store.fetch_unique(urls, content_budget=50000)  # 50KB limit
+        
+        # Pages stay as records; the combined text is joined once for the
+        # regex strategies that scan the whole site
+        content_data['pages'] = records
+        content_data['pages_analyzed'] = len(records)
+        content_data['content'] = ''.join(
+            f"\n\n=== PAGE: {record.url} ===\n{record.text}\n\n=== HTML: ===\n{record.html}\n\n"
+            for record in records
+        )
         
         logger.info(f"Fetched content from {content_data['pages_analyzed']} pages")
         return content_data
     
+    async def _discover_candidate_pages(self, website_url: str, page_store: Optional[PageStore] = None) -> List[str]:
+        """Ranked executive/contact pages from the site's sitemap and navigation"""
+        try:
+            site_map_discovery = await get_site_map_discovery()
+            site_map = await site_map_discovery.discover(website_url, page_store)
+            return site_map.candidate_urls()
+        except Exception as e:
+            logger.debug(f"Site map discovery failed for {website_url}: {e}")
+            return []
+    
+    def _new_page_store(self) -> PageStore:
+        """Create the per-run page store shared by all discovery steps"""
+        return PageStore(
+            fetcher=self._fetch_page,
+            persist_path=self.page_store_path,
+            max_per_host=self.max_probes_per_host,
+            max_bytes=self.max_company_bytes
+        )
+    
+    async def _fetch_page(self, url: str) -> Optional[PageRecord]:
+        """Fetch a single page for the page store, HTTP first with browser escalation"""
+        fetch_strategy = await get_fetch_strategy()
+        return await fetch_strategy.fetch(url)
+    
     async def _enrich_executive_with_contacts(self, exec_data: Dict, content: str, company_name: str, website_url: str) -> Optional[ExecutiveContact]:
         """Enrich executive with contact information from content"""
         
@@ -1113,7 +1159,7 @@ class ExecutiveDiscoveryOrchestrator:
         
         return validated_executives[:8]  # Limit to top 8 executives
     
-    async def _step1_identify_company(self, website_url: str) -> CompanyIdentification:
+    async def _step1_identify_company(self, website_url: str, page_store: Optional[PageStore] = None) -> CompanyIdentification:
         """Step 1: Identify Company on Website using enhanced URL handling and robots.txt bypass"""
         
         normalized_url = self._normalize_url(website_url)
@@ -1128,132 +1174,79 @@ class ExecutiveDiscoveryOrchestrator:
             extraction_method="enhanced_playwright_scraping"
         )
         
+        if page_store is None:
+            page_store = self._new_page_store()
+        
         # Try different URL variations to find the working one
         url_variations = await self._try_url_variations(normalized_url)
         
+        # Race the variations with lightweight probes (cached per domain across
+        # runs) and fetch the winner first; the rest are only a fallback
+        origin_resolver = await get_origin_resolver()
+        resolved_url = await origin_resolver.resolve(normalized_url, url_variations)
+        if resolved_url:
+            url_variations = [resolved_url] + [url for url in url_variations if url != resolved_url]
+        
         for attempt_url in url_variations:
             try:
                 logger.info(f"Attempting to extract from: {attempt_url}")
                 
-                async with async_playwright() as playwright:
-                    browser = await playwright.chromium.launch(
-                        headless=True,
-                        args=[
-                            '--no-sandbox',
-                            '--disable-web-security',
-                            '--disable-features=VizDisplayCompositor',
-                            '--ignore-certificate-errors',
-                            '--ignore-ssl-errors',
-                            '--ignore-certificate-errors-spki-list'
-                        ]
-                    )
+                # HTTP first, browser only for JS-rendered sites; the homepage
+                # stays in the page store for the later steps
+                record = await page_store.fetch(attempt_url)
+                
+                # Check if we got a successful response
+                if record and record.ok:
+                    logger.info(f"Successfully loaded: {attempt_url} (Status: {record.status}, via {record.fetch_method})")
                     
-                    context = await browser.new_context(
-                        user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                        ignore_https_errors=True,
-                        bypass_csp=True,
-                        java_script_enabled=True
-                    )
+                    # Update the actual working URL
+                    company_data.actual_url = attempt_url
                     
-                    # IMPORTANT: Ignore robots.txt by intercepting requests
-                    async def handle_route(route):
-                        url = route.request.url
-                        # Block robots.txt requests to effectively ignore them
-                        if url.endswith('/robots.txt'):
-                            await route.abort()
-                        else:
-                            await route.continue_()
+                    if resolved_url and attempt_url != resolved_url:
+                        # Cached origin no longer works; re-resolve next run
+                        await origin_resolver.forget_origin(domain_key(normalized_url))
                     
-                    # Route all requests through our handler to ignore robots.txt
-                    await context.route("**/*", handle_route)
+                    soup = BeautifulSoup(record.html, 'html.parser')
                     
-                    page = await context.new_page()
+                    # Extract company name using enhanced patterns
+                    title = soup.title.get_text(strip=True) if soup.title else ""
+                    if title and 3 < len(title) < 100:
+                        # Clean up title to extract company name
+                        company_name = re.sub(r'\s*[-|–]\s*.+$', '', title).strip()
+                        company_name = re.sub(r'\s*\|\s*.+$', '', company_name).strip()
+                        company_data.name = company_name
+                    else:
+                        # Fallback: try meta description or domain
+                        meta_tag = soup.find('meta', attrs={'name': 'description'})
+                        meta_desc = meta_tag.get('content') if meta_tag else None
+                        if meta_desc and len(meta_desc) > 10:
+                            # Extract potential company name from description
+                            words = meta_desc.split()[:5]  # First 5 words
+                            company_data.name = ' '.join(words).strip()
+                        else:
+                            # Final fallback to domain
+                            company_data.name = domain.replace('www.', '').replace('.com', '').replace('.co.uk', '')
                     
-                    # Enhanced navigation with retry logic
+                    # Try to extract additional info with enhanced selectors
                     try:
-                        response = await page.goto(
-                            attempt_url, 
-                            wait_until="domcontentloaded", 
-                            timeout=30000
-                        )
-                        
-                        # Check if we got a successful response
-                        if response and response.status < 400:
-                            logger.info(f"Successfully loaded: {attempt_url} (Status: {response.status})")
-                            
-                            # Update the actual working URL
-                            company_data.actual_url = attempt_url
-                            
-                            # Extract company name using enhanced patterns
-                            title = await page.title()
-                            if title and 3 < len(title) < 100:
-                                # Clean up title to extract company name
-                                company_name = re.sub(r'\s*[-|–]\s*.+$', '', title).strip()
-                                company_name = re.sub(r'\s*\|\s*.+$', '', company_name).strip()
-                                company_data.name = company_name
-                            else:
-                                # Fallback: try meta description or domain
-                                meta_desc = await page.get_attribute('meta[name="description"]', 'content')
-                                if meta_desc and len(meta_desc) > 10:
-                                    # Extract potential company name from description
-                                    words = meta_desc.split()[:5]  # First 5 words
-                                    company_data.name = ' '.join(words).strip()
-                                else:
-                                    # Final fallback to domain
-                                    company_data.name = domain.replace('www.', '').replace('.com', '').replace('.co.uk', '')
-                            
-                            # Try to extract additional info with enhanced selectors
-                            try:
-                                # Look for phone numbers with multiple patterns
-                                phone_selectors = [
-                                    'a[href^="tel:"]',
-                                    '*[class*="phone"]',
-                                    '*[class*="contact"]',
-                                    '*:has-text("Tel:")',
-                                    '*:has-text("Phone:")',
-                                    '*:has-text("Call:")'
-                                ]
-                                
-                                for selector in phone_selectors:
-                                    try:
-                                        phone_element = await page.query_selector(selector)
-                                        if phone_element:
-                                            if selector.startswith('a[href^="tel:"]'):
-                                                href = await phone_element.get_attribute('href')
-                                                if href:
-                                                    company_data.phone = href.replace('tel:', '').strip()
-                                                    break
-                                            else:
-                                                text = await phone_element.text_content()
-                                                if text and re.search(r'\d{10,}', text):
-                                                    company_data.phone = text.strip()
-                                                    break
-                                    except:
-                                        continue
-                            except:
-                                pass
-                            
-                            # Set confidence based on extraction quality
-                            if len(company_data.name) > 10 and not any(x in company_data.name.lower() for x in ['error', 'not found', 'coming soon']):
-                                company_data.confidence = 0.8
-                            elif len(company_data.name) > 3:
-                                company_data.confidence = 0.6
-                            else:
-                                company_data.confidence = 0.3
-                            
-                            company_data.extraction_method = "enhanced_successful_extraction"
-                            
-                            await browser.close()
-                            return company_data
-                        
-                    except Exception as nav_error:
-                        logger.warning(f"Navigation failed for {attempt_url}: {nav_error}")
-                        continue
-                    finally:
-                        await browser.close()
-                        
-            except Exception as e:
-                logger.warning(f"Browser setup failed for {attempt_url}: {e}")
+                        company_data.phone = self._extract_homepage_phone(soup)
+                    except:
+                        pass
+                    
+                    # Set confidence based on extraction quality
+                    if len(company_data.name) > 10 and not any(x in company_data.name.lower() for x in ['error', 'not found', 'coming soon']):
+                        company_data.confidence = 0.8
+                    elif len(company_data.name) > 3:
+                        company_data.confidence = 0.6
+                    else:
+                        company_data.confidence = 0.3
+                    
+                    company_data.extraction_method = "enhanced_successful_extraction"
+                    
+                    return company_data
+                    
+            except Exception as nav_error:
+                logger.warning(f"Navigation failed for {attempt_url}: {nav_error}")
                 continue
         
         # If all URLs failed, use domain fallback
@@ -1265,6 +1258,27 @@ class ExecutiveDiscoveryOrchestrator:
         
         return company_data
     
+    def _extract_homepage_phone(self, soup: BeautifulSoup) -> Optional[str]:
+        """Find the company phone number on a parsed homepage"""
+        
+        # Look for phone numbers with multiple patterns
+        tel_link = soup.select_one('a[href^="tel:"]')
+        if tel_link and tel_link.get('href'):
+            return tel_link['href'].replace('tel:', '').strip()
+        
+        for selector in ['[class*="phone"]', '[class*="contact"]']:
+            for element in soup.select(selector):
+                text = element.get_text(" ", strip=True)
+                if text and re.search(r'\d{10,}', text):
+                    return text
+        
+        for label in soup.find_all(string=re.compile(r'(Tel|Phone|Call):')):
+            text = label.parent.get_text(" ", strip=True) if label.parent else str(label)
+            if re.search(r'\d{10,}', text):
+                return text.strip()
+        
+        return None
+    
     async def _step2_companies_house_verification(self, company_name: str) -> tuple[List[ExecutiveContact], bool]:
         """Step 2: Retrieve official company information and directors from Companies House"""
         
@@ -0,0 +1,307 @@
+"""
+Streaming Pipeline Runner
+
+Runs contact extraction, SEO analysis and lead qualification as overlapping
+stages instead of one batch command after another. Scraped companies are
+claimed from the database while the directory fetch is still running and
+flow through the stages one at a time:
+
+    fetch -> [claim] -> contacts queue -> SEO queue -> qualify queue
+
+Each stage has its own worker count, and the queues between stages are
+bounded: when a stage falls behind, its queue fills and the stage before it
+waits on put(). The claimer only leases as many companies as the contacts
+queue has room for, so back-pressure ends at the database, where unclaimed
+rows stay 'scraped' for this or a later run.
+
+Duplicate listings are merged before they are worked on: entity resolution
+runs before the first claim, every resolve_interval seconds while the fetch
+is running and once more after it finishes, and only companies stored before
+the latest resolution pass can be claimed.
+
+Usage:
+    runner = StreamingPipelineRunner(StreamingPipelineConfig(seo_workers=16))
+    stats = asyncio.run(runner.run(fetcher.fetch_companies_batch(cities, sectors)))
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import or_
+
+from ..analyzers import SEOAnalyzer
+from ..database import claim_companies, default_worker_id, get_db_session, release_companies
+from ..models import UKCompany
+from ..network.browser_pool import close_browser_pool
+from ..network.http_client import close_http_client
+from ..processors import ContactExtractor, LeadQualifier, resolve_company_entities
+from ..write_behind import close_write_behind
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class StreamingPipelineConfig:
+    """Workers per stage and the size of the queues between them"""
+    contact_workers: int = 3  # Browser pages extracting contacts at once
+    seo_workers: int = 8  # Concurrent website analyses
+    qualify_workers: int = 2
+    queue_size: int = 20  # Companies waiting in front of each stage
+    poll_interval: float = 2.0  # Seconds between checks for newly scraped companies
+    lease_seconds: int = 1800  # Lease held while a company is in flight
+    max_companies: Optional[int] = None  # Stop claiming after this many companies
+    resolve_interval: float = 15.0  # Seconds between entity resolution passes while fetching
+
+    def __post_init__(self):
+        self.contact_workers = int(os.environ.get('PIPELINE_CONTACT_WORKERS', self.contact_workers))
+        self.seo_workers = int(os.environ.get('PIPELINE_SEO_WORKERS', self.seo_workers))
+        self.qualify_workers = int(os.environ.get('PIPELINE_QUALIFY_WORKERS', self.qualify_workers))
+        self.queue_size = int(os.environ.get('PIPELINE_QUEUE_SIZE', self.queue_size))
+
+@dataclass
+class PipelineItem:
+    """A company moving through the stages"""
+    company_id: str
+    company_name: str
+    website: str
+
+@dataclass
+class PipelineStats:
+    """Counters for one streaming run"""
+    started_at: float = field(default_factory=time.time)
+    claimed: int = 0
+    merged: int = 0  # Duplicate listings merged before they were claimed
+    contacts_extracted: int = 0
+    analyzed: int = 0
+    qualified: int = 0
+    failed: int = 0
+    first_qualified_after: Optional[float] = None  # Seconds from start to the first qualified lead
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished_at or time.time()) - self.started_at
+
+    def to_dict(self) -> Dict:
+        stats = asdict(self)
+        stats['elapsed'] = self.elapsed
+        return stats
+
+class StreamingPipelineRunner:
+    """
+    Stage-overlapped contact extraction, SEO analysis and qualification
+
+    Features:
+    - Companies enter the pipeline as soon as the fetcher stores them
+    - Per-stage worker counts
+    - Bounded queues between stages for back-pressure
+    - Work is leased with claim_companies, so runners can share a database
+    """
+
+    def __init__(self, config: Optional[StreamingPipelineConfig] = None):
+        self.config = config or StreamingPipelineConfig()
+        self.worker_id = f"{default_worker_id()}:stream"
+        self.extractor = ContactExtractor()
+        self.analyzer = SEOAnalyzer()
+        self.qualifier = LeadQualifier()
+        self.stats = PipelineStats()
+        self._claimed: Set[str] = set()
+        self._resolved_before: Optional[datetime] = None  # Companies stored before this have been deduplicated
+        self._last_resolution = 0.0
+
+    async def run(self, fetch: Optional[Awaitable] = None) -> PipelineStats:
+        """
+        Stream scraped companies through the pipeline
+
+        Args:
+            fetch: Optional directory fetch (e.g. fetch_companies_batch(...)) to run
+                alongside the stages; without it only companies already scraped are processed
+
+        Returns:
+            PipelineStats for the run
+        """
+        self.stats = PipelineStats()
+        self._claimed = set()
+        self._resolved_before = None
+
+        contact_queue = asyncio.Queue(maxsize=self.config.queue_size)
+        seo_queue = asyncio.Queue(maxsize=self.config.queue_size)
+        qualify_queue = asyncio.Queue(maxsize=self.config.queue_size)
+
+        stages = [
+            (contact_queue, self.config.contact_workers, self._extract_contacts, seo_queue),
+            (seo_queue, self.config.seo_workers, self._analyze_seo, qualify_queue),
+            (qualify_queue, self.config.qualify_workers, self._qualify, None)
+        ]
+
+        fetch_task = asyncio.ensure_future(fetch) if fetch is not None else None
+        workers = [
+            [asyncio.create_task(self._stage_worker(inbox, handle, outbox)) for _ in range(max(count, 1))]
+            for inbox, count, handle, outbox in stages
+        ]
+
+        logger.info(f"Streaming pipeline started: {self.config.contact_workers} contact, "
+                    f"{self.config.seo_workers} SEO, {self.config.qualify_workers} qualify workers")
+
+        try:
+            await self._feed(contact_queue, fetch_task)
+
+            # Drain stage by stage: one sentinel per worker once nothing more can arrive
+            for (inbox, _, _, _), tasks in zip(stages, workers):
+                for _ in tasks:
+                    await inbox.put(None)
+                await asyncio.gather(*tasks)
+        finally:
+            for tasks in workers:
+                for task in tasks:
+                    task.cancel()
+            if fetch_task is not None and not fetch_task.done():
+                fetch_task.cancel()
+
+            # Queued contact and executive writes land before leases are given up
+            await close_write_behind()
+            # The pool and client are bound to this loop; a later loop would abandon them
+            await close_browser_pool()
+            await close_http_client()
+
+            # Companies that failed a stage stay 'scraped' for the next run
+            await asyncio.to_thread(release_companies, list(self._claimed), self.worker_id)
+            self.stats.finished_at = time.time()
+
+        logger.info(f"Streaming pipeline complete: {self.stats.qualified}/{self.stats.claimed} qualified "
+                    f"in {self.stats.elapsed:.1f}s")
+        return self.stats
+
+    async def _feed(self, contact_queue: asyncio.Queue, fetch_task: Optional[asyncio.Future]):
+        """Claim companies as they are scraped and queue them for contact extraction"""
+        final_resolution_pending = fetch_task is not None
+        while True:
+            fetching = fetch_task is not None and not fetch_task.done()
+            
+            # Deduplicate before claiming: at the start, periodically while fetching,
+            # and once everything has been fetched
+            if (self._resolved_before is None
+                    or (not fetching and final_resolution_pending)
+                    or (fetching and time.monotonic() - self._last_resolution >= self.config.resolve_interval)):
+                if not fetching:
+                    final_resolution_pending = False
+                await self._resolve_entities()
+
+            # Only lease what the first stage has room for
+            limit = max(contact_queue.maxsize - contact_queue.qsize(), 1)
+            if self.config.max_companies is not None:
+                limit = min(limit, self.config.max_companies - self.stats.claimed)
+                if limit <= 0:
+                    break
+
+            items = await self._claim(limit)
+            for item in items:
+                await contact_queue.put(item)
+
+            if not items:
+                if not fetching:
+                    break
+                await asyncio.sleep(self.config.poll_interval)
+
+        if fetch_task is not None:
+            try:
+                await fetch_task
+            except Exception as e:
+                logger.error(f"Directory fetch failed during streaming pipeline: {e}")
+
+    async def _resolve_entities(self):
+        """Merge duplicate listings stored so far (off the event loop)"""
+        started = datetime.utcnow()
+        resolution = await asyncio.to_thread(resolve_company_entities)
+        self.stats.merged += resolution['merged']
+        self._resolved_before = started
+        self._last_resolution = time.monotonic()
+
+    async def _claim(self, limit: int) -> List[PipelineItem]:
+        """Lease up to limit scraped, deduplicated companies to this runner"""
+        company_ids = await asyncio.to_thread(
+            claim_companies,
+            ['scraped'], limit, owner=self.worker_id,
+            lease_seconds=self.config.lease_seconds,
+            filters=[UKCompany.website.isnot(None),
+                     or_(UKCompany.created_at.is_(None), UKCompany.created_at <= self._resolved_before)]
+        )
+
+        # A lease that expired mid-run can hand back a company already in flight
+        new_ids = [company_id for company_id in company_ids if company_id not in self._claimed]
+        if not new_ids:
+            return []
+
+        self._claimed.update(new_ids)
+        self.stats.claimed += len(new_ids)
+
+        rows = await asyncio.to_thread(self._load_items, new_ids)
+        return [PipelineItem(company_id=row[0], company_name=row[1], website=row[2]) for row in rows]
+
+    @staticmethod
+    def _load_items(company_ids: List[str]) -> List:
+        with get_db_session() as session:
+            return session.query(
+                UKCompany.id, UKCompany.company_name, UKCompany.website
+            ).filter(UKCompany.id.in_(company_ids)).order_by(UKCompany.created_at).all()
+
+    async def _stage_worker(self, inbox: asyncio.Queue, handle: Callable[[PipelineItem], Awaitable[bool]],
+                            outbox: Optional[asyncio.Queue]):
+        """Process items from one queue and pass survivors on to the next"""
+        while True:
+            item = await inbox.get()
+            if item is None:
+                return
+
+            try:
+                passed = await handle(item)
+            except Exception as e:
+                logger.error(f"Pipeline stage {handle.__name__} failed for {item.company_name}: {e}")
+                passed = False
+
+            if not passed:
+                self.stats.failed += 1
+            elif outbox is not None:
+                # Waits while the next stage is saturated
+                await outbox.put(item)
+
+    async def _extract_contacts(self, item: PipelineItem) -> bool:
+        """Contact extraction stage"""
+        result = await self.extractor.extract_contacts(item.company_id, item.website)
+        if result and result.contact_info:
+            self.stats.contacts_extracted += 1
+
+        # Companies without a named contact are still analyzed and scored
+        return True
+
+    async def _analyze_seo(self, item: PipelineItem) -> bool:
+        """SEO analysis stage"""
+        analysis = await self.analyzer.analyze_website(item.website)
+        if analysis.get('error'):
+            logger.warning(f"SEO analysis failed for {item.company_name}: {analysis['error']}")
+            return False
+
+        if not await self.analyzer.save_analysis(item.company_id, analysis):
+            return False
+
+        self.stats.analyzed += 1
+        return True
+
+    async def _qualify(self, item: PipelineItem) -> bool:
+        """Lead qualification stage; qualified companies leave the pipeline"""
+        qualification = await self.qualifier.qualify_company(item.company_id)
+        if not qualification:
+            return False
+
+        self.stats.qualified += 1
+        if self.stats.first_qualified_after is None:
+            self.stats.first_qualified_after = time.time() - self.stats.started_at
+            logger.info(f"First qualified lead after {self.stats.first_qualified_after:.1f}s: {item.company_name}")
+
+        await asyncio.to_thread(release_companies, [item.company_id], self.worker_id)
+        self._claimed.discard(item.company_id)
+        return True
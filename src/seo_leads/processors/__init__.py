@@ -4,10 +4,13 @@ Data Processing Modules
 Provides contact extraction and lead qualification capabilities including:
 - Contact information extraction from company websites
 - Lead scoring and qualification
+- Cross-directory entity resolution (duplicate listings -> one canonical company)
 - Business intelligence processing
 """
 
 from .contact_extractor import ContactExtractor
 from .lead_qualifier import LeadQualifier
+from .entity_resolver import EntityResolver, EntityResolutionConfig, resolve_company_entities
 
-__all__ = ['ContactExtractor', 'LeadQualifier'] 
\ No newline at end of file
+__all__ = ['ContactExtractor', 'LeadQualifier', 'EntityResolver', 'EntityResolutionConfig',
+           'resolve_company_entities'] 
\ No newline at end of file
@@ -19,11 +19,14 @@ from urllib.parse import urljoin, urlparse
 from dataclasses import dataclass
 import requests
 from bs4 import BeautifulSoup
-from playwright.async_api import async_playwright, Page
+from playwright.async_api import Page
 
 from ..config import get_api_config, get_processing_config
-from ..database import get_db_session
+from ..database import claim_companies, default_worker_id, get_db_session, release_companies
+from ..network.browser_pool import close_browser_pool, get_browser_pool
+from ..network.http_client import close_http_client
 from ..models import UKCompany, ContactInfo, ContactSeniorityTier, SENIOR_ROLE_PATTERNS
+from ..write_behind import close_write_behind, get_write_behind
 from .executive_discovery import ExecutiveDiscoveryEngine, ExecutiveDiscoveryConfig
 from .executive_email_enricher import ExecutiveEmailEnricher
 
@@ -56,6 +59,7 @@ class ContactExtractor:
     def __init__(self):
         self.api_config = get_api_config()
         self.processing_config = get_processing_config()
+        self.worker_id = default_worker_id()
         
         # Initialize executive discovery engine
         self.executive_discovery_enabled = True
@@ -129,43 +133,36 @@ class ContactExtractor:
             highest_confidence = 0.0
             all_pages_searched = []
             
-            async with async_playwright() as playwright:
-                browser = await playwright.chromium.launch(
-                    headless=self.api_config.headless_browser
-                )
-                context = await browser.new_context(
-                    user_agent=self.api_config.browser_user_agent
-                )
-                page = await context.new_page()
-                
-                try:
-                    for strategy in strategies:
-                        try:
-                            result = await strategy(page, base_url)
+            browser_pool = await get_browser_pool()
+            
+            async with browser_pool.page(
+                urlparse(base_url).netloc,
+                user_agent=self.api_config.browser_user_agent
+            ) as page:
+                for strategy in strategies:
+                    try:
+                        result = await strategy(page, base_url)
+                        
+                        if result and result.contact_info:
+                            all_pages_searched.extend(result.pages_searched)
                             
-                            if result and result.contact_info:
-                                all_pages_searched.extend(result.pages_searched)
-                                
-                                if result.confidence > highest_confidence:
-                                    highest_confidence = result.confidence
-                                    best_result = result
+                            if result.confidence > highest_confidence:
+                                highest_confidence = result.confidence
+                                best_result = result
+                            
+                            # Stop if we found high confidence contact
+                            if result.confidence >= 0.8:
+                                break
                                 
-                                # Stop if we found high confidence contact
-                                if result.confidence >= 0.8:
-                                    break
-                                    
-                        except Exception as e:
-                            logger.debug(f"Strategy failed: {e}")
-                            continue
-                    
-                finally:
-                    await browser.close()
+                    except Exception as e:
+                        logger.debug(f"Strategy failed: {e}")
+                        continue
             
             if best_result:
                 best_result.pages_searched = list(set(all_pages_searched))
                 
                 # Update database
-                self._update_company_contact_data(company_id, best_result)
+                await self._update_company_contact_data(company_id, best_result)
                 
                 logger.info(f"Contact extraction complete for {website_url}: "
                           f"Confidence {best_result.confidence:.2f}")
@@ -548,78 +545,89 @@ class ContactExtractor:
         
         return url.rstrip('/')
     
-    def _update_company_contact_data(self, company_id: str, result: ExtractionResult):
-        """Update company record with contact extraction results"""
+    async def _update_company_contact_data(self, company_id: str, result: ExtractionResult):
+        """Queue the company's contact extraction results for the write-behind writer"""
+        if not result.contact_info:
+            return
+        
+        contact = result.contact_info
         try:
-            with get_db_session() as session:
-                company = session.query(UKCompany).filter_by(id=company_id).first()
-                
-                if company and result.contact_info:
-                    contact = result.contact_info
-                    
-                    # Update contact fields
-                    company.contact_person = contact.person
-                    company.contact_role = contact.role
-                    company.contact_seniority_tier = contact.seniority_tier
-                    company.email = contact.email
-                    company.phone = contact.phone
-                    # Convert HttpUrl to string for database storage
-                    company.linkedin_url = str(contact.linkedin_url) if contact.linkedin_url else None
-                    company.contact_confidence = contact.confidence
-                    company.contact_extraction_method = result.extraction_method
-                    
-                    # Update status
-                    if company.status == 'scraped':
-                        company.status = 'contacts_extracted'
-                    
-                    session.commit()
-                    logger.debug(f"Updated contact data for company {company_id}")
+            writer = await get_write_behind()
+            await writer.update_company(company_id, {
+                'contact_person': contact.person,
+                'contact_role': contact.role,
+                'contact_seniority_tier': contact.seniority_tier,
+                'email': contact.email,
+                'phone': contact.phone,
+                # Convert HttpUrl to string for database storage
+                'linkedin_url': str(contact.linkedin_url) if contact.linkedin_url else None,
+                'contact_confidence': contact.confidence,
+                'contact_extraction_method': result.extraction_method
+            }, advance_status=('scraped', 'contacts_extracted'))
+            logger.debug(f"Queued contact data for company {company_id}")
                 
         except Exception as e:
             logger.error(f"Error updating company contact data: {e}")
     
     def extract_batch(self, batch_size: int = 20) -> int:
-        """Extract contacts for a batch of companies"""
+        """Extract contacts for a batch of companies leased to this worker"""
+        # Lease companies needing contact extraction; about a minute each
+        company_ids = claim_companies(
+            ['scraped'], batch_size, owner=self.worker_id,
+            lease_seconds=batch_size * 60,
+            filters=[UKCompany.website.isnot(None)]
+        )
+        
+        if not company_ids:
+            logger.info("No companies found needing contact extraction")
+            return 0
+        
         try:
             with get_db_session() as session:
-                # Get companies needing contact extraction
-                companies = session.query(UKCompany).filter(
-                    UKCompany.status == 'scraped',
-                    UKCompany.website.isnot(None)
-                ).limit(batch_size).all()
-                
-                if not companies:
-                    logger.info("No companies found needing contact extraction")
-                    return 0
-                
-                logger.info(f"Starting contact extraction for {len(companies)} companies")
-                extracted_count = 0
-                
-                for company in companies:
-                    try:
-                        # Run extraction
-                        result = asyncio.run(
-                            self.extract_contacts(company.id, company.website)
-                        )
-                        
-                        if result and result.contact_info:
-                            extracted_count += 1
-                            logger.info(f"Extracted contact for {company.company_name}: "
-                                      f"Confidence {result.confidence:.2f}")
-                        
-                        # Rate limiting
-                        time.sleep(3)  # 3 second delay between companies
-                        
-                    except Exception as e:
-                        logger.error(f"Error extracting contact for {company.company_name}: {e}")
-                        continue
-                
-                logger.info(f"Contact extraction batch complete: {extracted_count}/{len(companies)} extracted")
-                return extracted_count
+                companies = session.query(UKCompany.id, UKCompany.company_name, UKCompany.website).filter(
+                    UKCompany.id.in_(company_ids)
+                ).order_by(UKCompany.created_at).all()
+            
+            logger.info(f"Starting contact extraction for {len(companies)} companies")
+            extracted_count = asyncio.run(self._extract_companies(companies))
+            
+            logger.info(f"Contact extraction batch complete: {extracted_count}/{len(companies)} extracted")
+            return extracted_count
                 
         except Exception as e:
             logger.error(f"Error in contact extraction batch: {e}")
             return 0
+        finally:
+            release_companies(company_ids, self.worker_id)
+
+    async def _extract_companies(self, companies: List[Tuple[str, str, str]]) -> int:
+        """Extract (id, name, website) companies in one event loop, reusing the browser pool"""
+        extracted_count = 0
+        
+        try:
+            for index, (company_id, company_name, website) in enumerate(companies):
+                try:
+                    # Rate limiting: 3 second delay between companies
+                    if index:
+                        await asyncio.sleep(3)
+                    
+                    result = await self.extract_contacts(company_id, website)
+                    
+                    if result and result.contact_info:
+                        extracted_count += 1
+                        logger.info(f"Extracted contact for {company_name}: "
+                                  f"Confidence {result.confidence:.2f}")
+                    
+                except Exception as e:
+                    logger.error(f"Error extracting contact for {company_name}: {e}")
+                    continue
+        finally:
+            # Queued contact writes land before the leases are released
+            await close_write_behind()
+            await close_browser_pool()
+            await close_http_client()
+        
+        return extracted_count
 
     async def extract_contacts_with_executives(self, company_id: str, company_name: str, website_url: str) -> Dict:
         """
@@ -690,7 +698,7 @@ class ContactExtractor:
             )
             
             # Step 4: Update database with enhanced contact data
-            self._update_enhanced_contact_data(company_id, result)
+            await self._update_enhanced_contact_data(company_id, result)
             
             logger.info(f"Enhanced contact extraction complete for {company_name}: "
                       f"{len(result['executive_contacts'])} executives, "
@@ -704,27 +712,21 @@ class ContactExtractor:
             result['processing_time'] = time.time() - start_time
             return result
     
-    def _update_enhanced_contact_data(self, company_id: str, result: Dict):
-        """Update database with enhanced contact extraction results"""
+    async def _update_enhanced_contact_data(self, company_id: str, result: Dict):
+        """Queue enhanced contact extraction results for the write-behind writer"""
         try:
-            with get_db_session() as session:
-                company = session.query(UKCompany).filter(UKCompany.id == company_id).first()
-                if company:
-                    # Update processing metadata
-                    if not hasattr(company, 'processing_metadata'):
-                        company.processing_metadata = {}
-                    
-                    company.processing_metadata.update({
-                        'executive_discovery_enabled': True,
-                        'executives_found': len(result['executive_contacts']),
-                        'primary_decision_maker_found': result['primary_decision_maker'] is not None,
-                        'discovery_sources': result['discovery_sources'],
-                        'enhanced_processing_time': result['processing_time'],
-                        'enhanced_extraction_timestamp': time.time()
-                    })
-                    
-                    session.commit()
-                    logger.debug(f"Updated enhanced contact data for company {company_id}")
+            writer = await get_write_behind()
+            await writer.update_company(company_id, {
+                'processing_metadata': {
+                    'executive_discovery_enabled': True,
+                    'executives_found': len(result['executive_contacts']),
+                    'primary_decision_maker_found': result['primary_decision_maker'] is not None,
+                    'discovery_sources': result['discovery_sources'],
+                    'enhanced_processing_time': result['processing_time'],
+                    'enhanced_extraction_timestamp': time.time()
+                }
+            })
+            logger.debug(f"Queued enhanced contact data for company {company_id}")
                 
         except Exception as e:
             logger.error(f"Error updating enhanced contact data: {e}")
@@ -22,8 +22,8 @@ from urllib.parse import urlparse
 
 from fuzzywuzzy import fuzz
 
-from ..database import get_db_session
-from ..models import ExecutiveContact, ExecutiveContactDB, ExecutiveDiscoveryResult
+from ..models import ExecutiveContact, ExecutiveDiscoveryResult
+from ..write_behind import get_write_behind
 from ..enrichers.companies_house_enricher import CompaniesHouseEnricher
 from ..enrichers.google_search_enricher import EnhancedGoogleSearchEnricher
 from ..scrapers.website_executive_scraper import WebsiteExecutiveScraper
@@ -703,31 +703,31 @@ class EnhancedExecutiveDiscovery:
             else:
                 company_uuid = company_id
             
-            async with get_db_session() as session:
-                for executive in executives:
-                    db_executive = ExecutiveContactDB(
-                        id=uuid.uuid4(),
-                        company_id=company_uuid,
-                        first_name=executive.first_name,
-                        last_name=executive.last_name,
-                        full_name=executive.full_name,
-                        title=executive.title,
-                        seniority_tier=executive.seniority_tier,
-                        email=executive.email,
-                        phone=executive.phone,
-                        linkedin_url=executive.linkedin_url,
-                        discovery_sources=executive.discovery_sources,
-                        discovery_method=executive.discovery_method,
-                        data_completeness_score=executive.data_completeness_score,
-                        overall_confidence=executive.overall_confidence,
-                        processing_time_ms=executive.processing_time_ms,
-                        extracted_at=executive.extracted_at,
-                        updated_at=executive.updated_at
-                    )
-                    session.add(db_executive)
-                
-                await session.commit()
-                logger.info(f"Stored {len(executives)} executives in database")
+            # Added alongside executives already stored for this company
+            writer = await get_write_behind()
+            await writer.add_executives(company_uuid, [
+                {
+                    'id': uuid.uuid4(),
+                    'company_id': company_uuid,
+                    'first_name': executive.first_name,
+                    'last_name': executive.last_name,
+                    'full_name': executive.full_name,
+                    'title': executive.title,
+                    'seniority_tier': executive.seniority_tier,
+                    'email': executive.email,
+                    'phone': executive.phone,
+                    'linkedin_url': executive.linkedin_url,
+                    'discovery_sources': executive.discovery_sources,
+                    'discovery_method': executive.discovery_method,
+                    'data_completeness_score': executive.data_completeness_score,
+                    'overall_confidence': executive.overall_confidence,
+                    'processing_time_ms': executive.processing_time_ms,
+                    'extracted_at': executive.extracted_at,
+                    'updated_at': executive.updated_at
+                }
+                for executive in executives
+            ])
+            logger.info(f"Queued {len(executives)} executives for storage")
                 
         except Exception as e:
             logger.error(f"Failed to store executives in database: {e}")
@@ -0,0 +1,354 @@
+"""
+Cross-Directory Entity Resolution
+
+The same business is listed on Yell, Thomson Local, Cylex, 192.com... with
+slightly different names and URLs, so ingestion stores it several times and
+every copy would go through discovery, Companies House lookup and SEO
+analysis. This stage runs after ingestion and folds duplicates into one
+canonical company.
+
+Blocking keys keep the comparison near-linear:
+- Registrable website domain (www., scheme, path and shared hosts removed)
+- Normalised UK phone number
+- Postcode + each significant name token
+
+Only rows sharing a key are compared, with a name similarity check whose
+threshold depends on how strong the shared key is. Merged duplicates keep
+their row with status 'merged' and canonical_id pointing at the survivor,
+which records every merged listing in source_records. Downstream stages
+select by status, so they only ever see canonical rows.
+"""
+
+import logging
+import os
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from ..database import get_db_session
+from ..models import UKCompany
+
+try:
+    from rapidfuzz import fuzz
+except ImportError:
+    try:
+        from fuzzywuzzy import fuzz
+    except ImportError:
+        fuzz = None
+
+logger = logging.getLogger(__name__)
+
+MERGED_STATUS = 'merged'
+
+# Further along the pipeline wins when picking the canonical row
+STATUS_RANK = {
+    'exported': 5,
+    'qualified': 4,
+    'seo_analyzed': 3,
+    'contacts_extracted': 2,
+    'scraped': 1,
+    'failed': 0
+}
+
+# Second-level suffixes where the registrable domain has three labels
+MULTI_PART_SUFFIXES = {
+    'co.uk', 'org.uk', 'me.uk', 'ltd.uk', 'plc.uk', 'net.uk', 'sch.uk', 'ac.uk', 'gov.uk', 'nhs.uk',
+    'com.au', 'co.nz', 'co.za', 'com.br', 'co.in'
+}
+
+# Hosts whose subdomains belong to different businesses
+PLATFORM_DOMAINS = {
+    'wixsite.com', 'squarespace.com', 'wordpress.com', 'business.site', 'godaddysites.com',
+    'weebly.com', 'webs.com', 'blogspot.com', 'jimdosite.com', 'webador.co.uk'
+}
+
+# Listings often link to a profile page instead of the business's own site
+SHARED_HOSTS = {
+    'facebook.com', 'instagram.com', 'twitter.com', 'x.com', 'linkedin.com', 'youtube.com',
+    'google.com', 'goo.gl', 'yell.com', 'thomsonlocal.com', 'yelp.co.uk', 'yelp.com',
+    'cylex-uk.co.uk', 'hotfrog.co.uk', 'brownbook.net', 'uk.com', 'businessmagnet.co.uk',
+    'tupalo.co.uk', 'foursquare.com', '192.com', 'checkatrade.com', 'trustatrader.com'
+}
+
+UK_POSTCODE_PATTERN = re.compile(r'\b([A-Z]{1,2}\d[A-Z\d]?)\s*(\d[A-Z]{2})\b', re.IGNORECASE)
+
+NAME_STOPWORDS = {
+    'ltd', 'limited', 'plc', 'llp', 'the', 'and', 'co', 'company', 'uk', 'of', 'services', 'group'
+}
+
+@dataclass
+class EntityResolutionConfig:
+    """Matching thresholds (name similarity, 0-100) per blocking key"""
+    domain_name_threshold: float = 50.0
+    phone_name_threshold: float = 60.0
+    postcode_name_threshold: float = 85.0
+    max_block_size: int = 25  # Larger blocks are shared switchboards/hosts, not one business
+
+    def __post_init__(self):
+        self.postcode_name_threshold = float(os.environ.get('ENTITY_POSTCODE_NAME_THRESHOLD',
+                                                            self.postcode_name_threshold))
+        self.max_block_size = int(os.environ.get('ENTITY_MAX_BLOCK_SIZE', self.max_block_size))
+
+def registrable_domain(website: Optional[str]) -> Optional[str]:
+    """Registrable domain of a website URL, or None for shared/profile hosts"""
+    if not website:
+        return None
+
+    url = website.strip().lower()
+    if '://' not in url:
+        url = f"http://{url}"
+
+    host = (urlparse(url).hostname or '').rstrip('.')
+    if not host or '.' not in host:
+        return None
+
+    labels = host.split('.')
+    suffix_length = 3 if '.'.join(labels[-2:]) in MULTI_PART_SUFFIXES else 2
+    domain = '.'.join(labels[-suffix_length:])
+
+    if domain in SHARED_HOSTS:
+        return None
+    if domain in PLATFORM_DOMAINS and len(labels) > suffix_length:
+        return '.'.join(labels[-suffix_length - 1:])
+    return domain
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """UK phone number in national format (digits only), or None if implausible"""
+    if not phone:
+        return None
+
+    # "+44 (0)113 ..." carries the trunk zero twice
+    digits = re.sub(r'\D', '', phone.replace('(0)', ''))
+    if digits.startswith('0044'):
+        digits = '0' + digits[4:]
+    elif digits.startswith('44') and len(digits) >= 12:
+        digits = '0' + digits[2:]
+    if digits.startswith('00'):
+        return None
+
+    return digits if 10 <= len(digits) <= 11 else None
+
+def extract_postcode(address: Optional[str]) -> Optional[str]:
+    """UK postcode from an address, without the space"""
+    if not address:
+        return None
+    match = UK_POSTCODE_PATTERN.search(address)
+    return f"{match.group(1)}{match.group(2)}".upper() if match else None
+
+def name_tokens(name: Optional[str]) -> List[str]:
+    """Significant lowercase tokens of a business name"""
+    words = re.findall(r'[a-z0-9]+', (name or '').lower().replace('&', ' and '))
+    return [word for word in words if word not in NAME_STOPWORDS]
+
+def name_similarity(tokens_a: List[str], tokens_b: List[str]) -> float:
+    """Order-insensitive name similarity, 0-100"""
+    a, b = ' '.join(sorted(tokens_a)), ' '.join(sorted(tokens_b))
+    if not a or not b:
+        return 0.0
+    if fuzz is not None:
+        return float(fuzz.token_sort_ratio(a, b))
+    return SequenceMatcher(None, a, b).ratio() * 100
+
+@dataclass
+class CompanyRecord:
+    """Fields entity resolution matches on, normalised once per company"""
+    id: str
+    name: str
+    website: Optional[str] = None
+    phone: Optional[str] = None
+    address: Optional[str] = None
+    status: Optional[str] = None
+    created_at: Optional[datetime] = None
+    domain: Optional[str] = field(init=False, default=None)
+    phone_key: Optional[str] = field(init=False, default=None)
+    postcode: Optional[str] = field(init=False, default=None)
+    tokens: List[str] = field(init=False, default_factory=list)
+
+    def __post_init__(self):
+        self.domain = registrable_domain(self.website)
+        self.phone_key = normalize_phone(self.phone)
+        self.postcode = extract_postcode(self.address)
+        self.tokens = name_tokens(self.name)
+
+    def blocking_keys(self) -> Iterable[Tuple[str, str]]:
+        if self.domain:
+            yield ('domain', self.domain)
+        if self.phone_key:
+            yield ('phone', self.phone_key)
+        if self.postcode:
+            for token in set(self.tokens):
+                if len(token) >= 3:
+                    yield ('postcode', f"{self.postcode}:{token}")
+
+class EntityResolver:
+    """
+    Merge duplicate companies ingested from different directories
+
+    Usage:
+        resolver = EntityResolver()
+        stats = resolver.resolve()
+        print(f"Merged {stats['merged']} duplicates into {stats['clusters']} companies")
+    """
+
+    def __init__(self, config: Optional[EntityResolutionConfig] = None):
+        self.config = config or EntityResolutionConfig()
+        self.thresholds = {
+            'domain': self.config.domain_name_threshold,
+            'phone': self.config.phone_name_threshold,
+            'postcode': self.config.postcode_name_threshold
+        }
+
+    def resolve(self) -> Dict[str, int]:
+        """
+        Find and merge duplicate canonical companies in the database
+
+        Returns:
+            Statistics: companies compared, duplicate clusters, rows merged
+        """
+        stats = {'companies': 0, 'clusters': 0, 'merged': 0}
+
+        try:
+            records = self._load_records()
+            stats['companies'] = len(records)
+
+            clusters = self.find_clusters(records)
+            stats['clusters'] = len(clusters)
+
+            for cluster in clusters:
+                stats['merged'] += self._merge_cluster([record.id for record in cluster])
+
+        except Exception as e:
+            logger.error(f"Entity resolution error: {e}")
+
+        logger.info(f"Entity resolution: {stats['merged']} duplicates merged into "
+                    f"{stats['clusters']} companies ({stats['companies']} compared)")
+        return stats
+
+    def find_clusters(self, records: List[CompanyRecord]) -> List[List[CompanyRecord]]:
+        """Group records that refer to the same business (clusters of 2+ only)"""
+        blocks: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        for index, record in enumerate(records):
+            for key in record.blocking_keys():
+                blocks[key].append(index)
+
+        parent = list(range(len(records)))
+        # Website domain of each cluster, so transitive matches can't join two different sites
+        cluster_domains = {index: record.domain for index, record in enumerate(records)}
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        compared: Set[Tuple[int, int]] = set()
+        for (kind, key), members in blocks.items():
+            if len(members) < 2:
+                continue
+            if len(members) > self.config.max_block_size:
+                logger.debug(f"Skipping oversized {kind} block {key} ({len(members)} companies)")
+                continue
+
+            for position, i in enumerate(members):
+                for j in members[position + 1:]:
+                    if (i, j) in compared or find(i) == find(j):
+                        continue
+                    compared.add((i, j))
+                    if not self._is_match(records[i], records[j], kind):
+                        continue
+
+                    root_i, root_j = find(i), find(j)
+                    domain_i, domain_j = cluster_domains[root_i], cluster_domains[root_j]
+                    if domain_i and domain_j and domain_i != domain_j:
+                        continue
+                    parent[root_j] = root_i
+                    cluster_domains[root_i] = domain_i or domain_j
+
+        groups: Dict[int, List[CompanyRecord]] = defaultdict(list)
+        for index, record in enumerate(records):
+            groups[find(index)].append(record)
+
+        return [group for group in groups.values() if len(group) > 1]
+
+    def _is_match(self, a: CompanyRecord, b: CompanyRecord, kind: str) -> bool:
+        """Name similarity check for two records sharing a blocking key"""
+        # Two real, different websites are different businesses whatever the name
+        if a.domain and b.domain and a.domain != b.domain:
+            return False
+        return name_similarity(a.tokens, b.tokens) >= self.thresholds[kind]
+
+    def _load_records(self) -> List[CompanyRecord]:
+        """Load the matching fields of every canonical company"""
+        with get_db_session() as session:
+            rows = session.query(
+                UKCompany.id, UKCompany.company_name, UKCompany.website, UKCompany.phone,
+                UKCompany.address, UKCompany.status, UKCompany.created_at
+            ).filter(
+                UKCompany.canonical_id.is_(None),
+                UKCompany.status != MERGED_STATUS
+            ).all()
+
+        return [
+            CompanyRecord(id=row.id, name=row.company_name, website=row.website, phone=row.phone,
+                          address=row.address, status=row.status, created_at=row.created_at)
+            for row in rows
+        ]
+
+    def _merge_cluster(self, company_ids: List[str]) -> int:
+        """Fold a cluster into its canonical company; returns rows merged"""
+        with get_db_session() as session:
+            companies = session.query(UKCompany).filter(UKCompany.id.in_(company_ids)).all()
+            if len(companies) < 2:
+                return 0
+
+            canonical = max(companies, key=self._canonical_rank)
+            provenance = list(canonical.source_records or [self._provenance(canonical)])
+
+            for duplicate in companies:
+                if duplicate is canonical:
+                    continue
+
+                for attribute in ('website', 'phone', 'address', 'region', 'sector', 'email'):
+                    if not getattr(canonical, attribute) and getattr(duplicate, attribute):
+                        setattr(canonical, attribute, getattr(duplicate, attribute))
+
+                provenance.extend(duplicate.source_records or [self._provenance(duplicate)])
+                duplicate.status = MERGED_STATUS
+                duplicate.canonical_id = canonical.id
+
+                # Rows merged into the duplicate on an earlier run follow it
+                session.query(UKCompany).filter(UKCompany.canonical_id == duplicate.id).update(
+                    {UKCompany.canonical_id: canonical.id}, synchronize_session=False
+                )
+
+            canonical.source_records = provenance
+            session.commit()
+
+            logger.debug(f"Merged {len(companies) - 1} listings into {canonical.company_name} ({canonical.id})")
+            return len(companies) - 1
+
+    @staticmethod
+    def _canonical_rank(company: UKCompany) -> Tuple[int, int, float]:
+        """Most processed, then most complete, then oldest"""
+        filled = sum(1 for value in (company.website, company.phone, company.address, company.region,
+                                     company.sector, company.email) if value)
+        created = company.created_at.timestamp() if company.created_at else 0.0
+        return (STATUS_RANK.get(company.status, 0), filled, -created)
+
+    @staticmethod
+    def _provenance(company: UKCompany) -> Dict[str, Optional[str]]:
+        return {
+            'id': company.id,
+            'source': company.source,
+            'name': company.company_name,
+            'website': company.website,
+            'phone': company.phone
+        }
+
+def resolve_company_entities(config: Optional[EntityResolutionConfig] = None) -> Dict[str, int]:
+    """Run entity resolution over the companies table"""
+    return EntityResolver(config).resolve()
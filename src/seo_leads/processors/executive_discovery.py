@@ -20,8 +20,8 @@ from ..models import ExecutiveContact, ExecutiveDiscoveryResult
 from ..scrapers.linkedin_scraper import LinkedInScraper
 from ..scrapers.website_executive_scraper import WebsiteExecutiveScraper
 from ..config import get_processing_config
-from ..database import get_db_session
-from ..models import UKCompany, ExecutiveContactDB
+from ..models import UKCompany
+from ..write_behind import get_write_behind
 from ..processors.executive_email_enricher import ExecutiveEmailEnricher
 
 # Import new multi-source engine
@@ -642,50 +642,45 @@ class ExecutiveDiscoveryEngine:
         return list(sources)
     
     async def _store_executives_in_database(self, company_id: str, executives: List[ExecutiveContact]):
-        """Store discovered executives in database with proper UUID handling"""
+        """Queue discovered executives for the write-behind writer with proper UUID handling"""
         try:
-            with get_db_session() as session:
-                # Convert company_id to UUID if it's a string
-                if isinstance(company_id, str):
-                    try:
-                        company_uuid = uuid.UUID(company_id)
-                    except ValueError:
-                        # If company_id is not a valid UUID, generate one or use the string as-is
-                        logger.warning(f"Invalid UUID format for company_id: {company_id}, generating new UUID")
-                        company_uuid = uuid.uuid4()
-                else:
-                    company_uuid = company_id
-                
-                # Remove existing executives for this company
-                session.query(ExecutiveContactDB).filter(
-                    ExecutiveContactDB.company_id == company_uuid
-                ).delete()
-                
-                # Add new executives
-                for executive in executives:
-                    db_executive = ExecutiveContactDB(
-                        company_id=company_uuid,
-                        first_name=executive.first_name,
-                        last_name=executive.last_name,
-                        full_name=executive.full_name,
-                        title=executive.title,
-                        seniority_tier=executive.seniority_tier,
-                        email=executive.email,
-                        email_confidence=executive.email_confidence,
-                        phone=executive.phone,
-                        phone_confidence=executive.phone_confidence,
-                        linkedin_url=executive.linkedin_url,
-                        linkedin_verified=executive.linkedin_verified,
-                        discovery_sources=executive.discovery_sources,
-                        discovery_method=executive.discovery_method,
-                        data_completeness_score=executive.data_completeness_score,
-                        overall_confidence=executive.overall_confidence,
-                        processing_time_ms=executive.processing_time_ms
-                    )
-                    session.add(db_executive)
-                
-                session.commit()
-                logger.info(f"Stored {len(executives)} executives in database for company {company_id}")
+            # Convert company_id to UUID if it's a string
+            if isinstance(company_id, str):
+                try:
+                    company_uuid = uuid.UUID(company_id)
+                except ValueError:
+                    # If company_id is not a valid UUID, generate one or use the string as-is
+                    logger.warning(f"Invalid UUID format for company_id: {company_id}, generating new UUID")
+                    company_uuid = uuid.uuid4()
+            else:
+                company_uuid = company_id
+            
+            # Replaces the executives stored for this company
+            writer = await get_write_behind()
+            await writer.replace_executives(company_uuid, [
+                {
+                    'id': uuid.uuid4(),
+                    'company_id': company_uuid,
+                    'first_name': executive.first_name,
+                    'last_name': executive.last_name,
+                    'full_name': executive.full_name,
+                    'title': executive.title,
+                    'seniority_tier': executive.seniority_tier,
+                    'email': executive.email,
+                    'email_confidence': executive.email_confidence,
+                    'phone': executive.phone,
+                    'phone_confidence': executive.phone_confidence,
+                    'linkedin_url': executive.linkedin_url,
+                    'linkedin_verified': executive.linkedin_verified,
+                    'discovery_sources': executive.discovery_sources,
+                    'discovery_method': executive.discovery_method,
+                    'data_completeness_score': executive.data_completeness_score,
+                    'overall_confidence': executive.overall_confidence,
+                    'processing_time_ms': executive.processing_time_ms
+                }
+                for executive in executives
+            ])
+            logger.info(f"Queued {len(executives)} executives for storage for company {company_id}")
                 
         except Exception as e:
             logger.error(f"Error storing executives in database: {e}")
@@ -22,11 +22,10 @@ import socket
 import time
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
-import dns.resolver
-import dns.exception
 
 from ..models import ExecutiveContact
 from ..config import get_processing_config
+from ..network.dns_cache import get_dns_cache
 
 logger = logging.getLogger(__name__)
 
@@ -249,13 +248,8 @@ class ExecutiveEmailEnricher:
         try:
             await self._enforce_dns_rate_limit()
             
-            # Try to resolve domain
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None, 
-                self._resolve_domain, 
-                domain
-            )
+            # Shared async resolver cache (negative answers included)
+            result = await get_dns_cache().domain_exists(domain)
             
             self.domain_cache[domain] = result
             return result
@@ -265,20 +259,6 @@ class ExecutiveEmailEnricher:
             self.domain_cache[domain] = False
             return False
     
-    def _resolve_domain(self, domain: str) -> bool:
-        """Resolve domain using DNS"""
-        try:
-            # Try A record
-            dns.resolver.resolve(domain, 'A')
-            return True
-        except dns.exception.DNSException:
-            try:
-                # Try AAAA record (IPv6)
-                dns.resolver.resolve(domain, 'AAAA')
-                return True
-            except dns.exception.DNSException:
-                return False
-    
     async def _validate_mx_record(self, domain: str) -> bool:
         """P2.4: Validate MX record existence"""
         if domain in self.mx_cache:
@@ -288,12 +268,7 @@ class ExecutiveEmailEnricher:
             await self._enforce_dns_rate_limit()
             
             # Try to resolve MX record
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None, 
-                self._resolve_mx_record, 
-                domain
-            )
+            result = bool(await get_dns_cache().mx(domain))
             
             self.mx_cache[domain] = result
             return result
@@ -303,14 +278,6 @@ class ExecutiveEmailEnricher:
             self.mx_cache[domain] = False
             return False
     
-    def _resolve_mx_record(self, domain: str) -> bool:
-        """Resolve MX record using DNS"""
-        try:
-            mx_records = dns.resolver.resolve(domain, 'MX')
-            return len(mx_records) > 0
-        except dns.exception.DNSException:
-            return False
-    
     def _calculate_email_confidence(self, result: EmailValidationResult) -> float:
         """P2.4: Calculate email confidence score"""
         confidence = 0.0
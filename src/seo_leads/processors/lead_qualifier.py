@@ -10,6 +10,7 @@ Based on creative design decisions:
 - Outreach intelligence generation
 """
 
+import asyncio
 import logging
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
@@ -17,10 +18,12 @@ import time
 import json
 
 from ..config import get_processing_config
-from ..database import get_db_session
+from ..database import claim_companies, default_worker_id, get_db_session, release_companies, run_db_session
+from ..exporters.results_warehouse import get_results_warehouse
+from ..network.http_client import close_http_client
 from ..models import (
     UKCompany, LeadQualification, FactorBreakdown, OutreachIntelligence, 
-    PriorityTier, SCORING_WEIGHTS, SECTOR_SEO_DEPENDENCY
+    PriorityTier, SEOAnalysis, SEOContent, SEOPerformance, SCORING_WEIGHTS, SECTOR_SEO_DEPENDENCY
 )
 
 logger = logging.getLogger(__name__)
@@ -42,6 +45,8 @@ class LeadQualifier:
     def __init__(self):
         self.processing_config = get_processing_config()
         self.scoring_weights = SCORING_WEIGHTS
+        self.worker_id = default_worker_id()
+        self.results_warehouse = get_results_warehouse()
     
     async def qualify_lead(self, company_data: Dict) -> Optional[LeadQualification]:
         """
@@ -56,8 +61,8 @@ class LeadQualifier:
         try:
             start_time = time.time()
             
-            # Generate unique company ID for database operations
-            company_id = str(hash(f"{company_data.get('company_name', '')}{company_data.get('website', '')}"))
+            # Stored companies keep their ID; ad-hoc company data gets a generated one
+            company_id = company_data.get('id') or str(hash(f"{company_data.get('company_name', '')}{company_data.get('website', '')}"))
             
             # Extract SEO analysis
             seo_analysis = company_data.get('seo_analysis')
@@ -68,46 +73,48 @@ class LeadQualifier:
             # Extract contact information
             contact_info = company_data.get('contact_info', {})
             
-            # Create a serializable company dict for database storage
-            db_company_data = {
-                'id': company_id,
-                'company_name': company_data.get('company_name', ''),
-                'website': company_data.get('website', ''),
-                'city': company_data.get('city', ''),
-                'region': company_data.get('region', ''),
-                'sector': company_data.get('sector', ''),
-                'source': 'enhanced_pipeline',
-                'status': 'processing',
+            # Stored companies (qualify_company) are already up to date in the database
+            if not company_data.get('id'):
+                # Create a serializable company dict for database storage
+                db_company_data = {
+                    'id': company_id,
+                    'company_name': company_data.get('company_name', ''),
+                    'website': company_data.get('website', ''),
+                    'city': company_data.get('city', ''),
+                    'region': company_data.get('region', ''),
+                    'sector': company_data.get('sector', ''),
+                    'source': 'enhanced_pipeline',
+                    'status': 'processing',
+                    
+                    # Contact information
+                    'contact_person': contact_info.get('person'),
+                    'contact_role': contact_info.get('role'),
+                    'contact_seniority_tier': contact_info.get('seniority_tier'),
+                    'email': contact_info.get('email'),
+                    'phone': contact_info.get('phone'),
+                    'contact_confidence': float(contact_info.get('confidence', 0.0)),
+                    
+                    # SEO Analysis - extract primitive values
+                    'seo_overall_score': float(seo_analysis.overall_score) if seo_analysis else 0.0,
+                    'pagespeed_score': float(seo_analysis.performance.pagespeed_score) if seo_analysis and seo_analysis.performance else 0.0,
+                    'mobile_friendly': bool(seo_analysis.performance.mobile_friendly) if seo_analysis and seo_analysis.performance else False,
+                    'meta_description_missing': bool(seo_analysis.content.meta_description_missing) if seo_analysis and seo_analysis.content else True,
+                    'h1_tags_present': bool(seo_analysis.content.h1_tags_present) if seo_analysis and seo_analysis.content else False,
+                    'ssl_certificate': bool(seo_analysis.content.ssl_certificate) if seo_analysis and seo_analysis.content else False,
+                    'load_time': float(seo_analysis.performance.load_time) if seo_analysis and seo_analysis.performance else 0.0,
+                    'critical_issues': ','.join(seo_analysis.critical_issues) if seo_analysis and seo_analysis.critical_issues else '',
+                }
                 
-                # Contact information
-                'contact_person': contact_info.get('person'),
-                'contact_role': contact_info.get('role'),
-                'contact_seniority_tier': contact_info.get('seniority_tier'),
-                'email': contact_info.get('email'),
-                'phone': contact_info.get('phone'),
-                'contact_confidence': float(contact_info.get('confidence', 0.0)),
+                # Check if company already exists in database
+                existing_company = await self._get_company_by_id(company_id)
                 
-                # SEO Analysis - extract primitive values
-                'seo_overall_score': float(seo_analysis.overall_score) if seo_analysis else 0.0,
-                'pagespeed_score': float(seo_analysis.performance.pagespeed_score) if seo_analysis and seo_analysis.performance else 0.0,
-                'mobile_friendly': bool(seo_analysis.performance.mobile_friendly) if seo_analysis and seo_analysis.performance else False,
-                'meta_description_missing': bool(seo_analysis.content.meta_description_missing) if seo_analysis and seo_analysis.content else True,
-                'h1_tags_present': bool(seo_analysis.content.h1_tags_present) if seo_analysis and seo_analysis.content else False,
-                'ssl_certificate': bool(seo_analysis.content.ssl_certificate) if seo_analysis and seo_analysis.content else False,
-                'load_time': float(seo_analysis.performance.load_time) if seo_analysis and seo_analysis.performance else 0.0,
-                'critical_issues': ','.join(seo_analysis.critical_issues) if seo_analysis and seo_analysis.critical_issues else '',
-            }
-            
-            # Check if company already exists in database
-            existing_company = await self._get_company_by_id(company_id)
-            
-            if existing_company:
-                logger.debug(f"Company {company_data.get('company_name')} already exists in database")
-                # Update existing company with new data
-                await self._update_company_data(company_id, db_company_data)
-            else:
-                # Create new company record
-                await self._create_company_record(db_company_data)
+                if existing_company:
+                    logger.debug(f"Company {company_data.get('company_name')} already exists in database")
+                    # Update existing company with new data
+                    await self._update_company_data(company_id, db_company_data)
+                else:
+                    # Create new company record
+                    await self._create_company_record(db_company_data)
             
             # Calculate qualification scores
             seo_score = self._calculate_seo_score(seo_analysis)
@@ -195,6 +202,9 @@ class LeadQualifier:
             
             await self._update_company_qualification(company_id, qualification_data)
             
+            if self.results_warehouse:
+                self.results_warehouse.record_qualification({**company_data, 'id': company_id}, qualification)
+            
             processing_time = time.time() - start_time
             logger.info(f"Lead qualification complete for {company_data.get('company_name')}: {final_score:.1f} (Tier {priority_tier.value}) in {processing_time:.2f}s")
             
@@ -212,12 +222,68 @@ class LeadQualifier:
             
             return None
 
+    async def qualify_company(self, company_id: str) -> Optional[LeadQualification]:
+        """
+        Qualify a stored company from its saved SEO analysis and contact data
+        
+        Args:
+            company_id: ID of a company whose SEO analysis has been stored
+            
+        Returns:
+            LeadQualification, or None if the company hasn't been analyzed
+        """
+        def load_company_data(session) -> Optional[Dict]:
+            company = session.query(UKCompany).filter(UKCompany.id == company_id).first()
+            if not company or company.seo_overall_score is None:
+                return None
+            
+            return {
+                'id': company.id,
+                'company_name': company.company_name,
+                'website': company.website or '',
+                'city': company.city or '',
+                'region': company.region or '',
+                'sector': company.sector or '',
+                'contact_info': {
+                    'person': company.contact_person,
+                    'role': company.contact_role,
+                    'seniority_tier': company.contact_seniority_tier,
+                    'email': company.email,
+                    'phone': company.phone,
+                    'confidence': company.contact_confidence or 0.0
+                },
+                'seo_analysis': SEOAnalysis(
+                    overall_score=company.seo_overall_score,
+                    performance=SEOPerformance(
+                        pagespeed_score=company.pagespeed_score,
+                        load_time=company.load_time,
+                        mobile_friendly=company.mobile_friendly
+                    ),
+                    content=SEOContent(
+                        meta_description_missing=company.meta_description_missing,
+                        h1_tags_present=company.h1_tags_present,
+                        ssl_certificate=company.ssl_certificate
+                    ),
+                    critical_issues=company.critical_issues or []
+                )
+            }
+        
+        try:
+            company_data = await run_db_session(load_company_data)
+        except Exception as e:
+            logger.error(f"Error loading company {company_id} for qualification: {e}")
+            return None
+        
+        if company_data is None:
+            return None
+        return await self.qualify_lead(company_data)
+
     async def _get_company_by_id(self, company_id: str) -> Optional[UKCompany]:
         """Get company by ID from database"""
         try:
-            with get_db_session() as session:
-                company = session.query(UKCompany).filter(UKCompany.id == company_id).first()
-                return company
+            return await run_db_session(
+                lambda session: session.query(UKCompany).filter(UKCompany.id == company_id).first()
+            )
         except Exception as e:
             logger.error(f"Database error getting company {company_id}: {e}")
             return None
@@ -225,34 +291,33 @@ class LeadQualifier:
     async def _create_company_record(self, company_data: Dict) -> bool:
         """Create new company record in database"""
         try:
-            with get_db_session() as session:
-                # Create new company with proper datetime handling
-                company_data['created_at'] = datetime.utcnow()
-                company_data['updated_at'] = datetime.utcnow()
-                
-                company = UKCompany(**company_data)
-                session.add(company)
-                session.commit()
-                
-                logger.debug(f"Created company record: {company_data.get('company_name')}")
-                return True
+            # Create new company with proper datetime handling
+            company_data['created_at'] = datetime.utcnow()
+            company_data['updated_at'] = datetime.utcnow()
+            
+            await run_db_session(lambda session: session.add(UKCompany(**company_data)))
+            
+            logger.debug(f"Created company record: {company_data.get('company_name')}")
+            return True
                 
         except Exception as e:
             logger.error(f"Database error creating company: {e}")
             return False
 
+    async def _update_company_columns(self, company_id: str, values: Dict):
+        """Update one company's columns on the async engine"""
+        values['updated_at'] = datetime.utcnow()
+        await run_db_session(
+            lambda session: session.query(UKCompany).filter(UKCompany.id == company_id).update(values)
+        )
+
     async def _update_company_data(self, company_id: str, company_data: Dict) -> bool:
         """Update existing company record with new data"""
         try:
-            with get_db_session() as session:
-                # Update existing company
-                company_data['updated_at'] = datetime.utcnow()
-                
-                session.query(UKCompany).filter(UKCompany.id == company_id).update(company_data)
-                session.commit()
-                
-                logger.debug(f"Updated company record: {company_id}")
-                return True
+            await self._update_company_columns(company_id, company_data)
+            
+            logger.debug(f"Updated company record: {company_id}")
+            return True
                 
         except Exception as e:
             logger.error(f"Database error updating company {company_id}: {e}")
@@ -261,15 +326,10 @@ class LeadQualifier:
     async def _update_company_qualification(self, company_id: str, qualification_data: Dict) -> bool:
         """Update company with qualification results"""
         try:
-            with get_db_session() as session:
-                # Update with qualification data
-                qualification_data['updated_at'] = datetime.utcnow()
-                
-                session.query(UKCompany).filter(UKCompany.id == company_id).update(qualification_data)
-                session.commit()
-                
-                logger.debug(f"Updated qualification for company: {company_id}")
-                return True
+            await self._update_company_columns(company_id, qualification_data)
+            
+            logger.debug(f"Updated qualification for company: {company_id}")
+            return True
                 
         except Exception as e:
             logger.error(f"Database error updating qualification for {company_id}: {e}")
@@ -278,16 +338,13 @@ class LeadQualifier:
     async def _update_company_error(self, company_id: str, error_message: str) -> bool:
         """Update company with error status"""
         try:
-            with get_db_session() as session:
-                session.query(UKCompany).filter(UKCompany.id == company_id).update({
-                    'status': 'error',
-                    'error_message': error_message,
-                    'updated_at': datetime.utcnow()
-                })
-                session.commit()
-                
-                logger.debug(f"Updated error status for company: {company_id}")
-                return True
+            await self._update_company_columns(company_id, {
+                'status': 'error',
+                'error_message': error_message
+            })
+            
+            logger.debug(f"Updated error status for company: {company_id}")
+            return True
                 
         except Exception as e:
             logger.error(f"Database error updating error for {company_id}: {e}")
@@ -310,21 +367,21 @@ class LeadQualifier:
         # Performance issues (30% weight)
         if hasattr(seo_analysis, 'performance') and seo_analysis.performance:
             perf = seo_analysis.performance
-            if hasattr(perf, 'pagespeed_score') and perf.pagespeed_score < 70:
+            if getattr(perf, 'pagespeed_score', None) is not None and perf.pagespeed_score < 70:
                 score += 30
-            if hasattr(perf, 'load_time') and perf.load_time > 3:
+            if getattr(perf, 'load_time', None) is not None and perf.load_time > 3:
                 score += 10
-            if hasattr(perf, 'mobile_friendly') and not perf.mobile_friendly:
+            if getattr(perf, 'mobile_friendly', None) is False:
                 score += 20
         
         # Content issues (30% weight) 
         if hasattr(seo_analysis, 'content') and seo_analysis.content:
             content = seo_analysis.content
-            if hasattr(content, 'meta_description_missing') and content.meta_description_missing:
+            if getattr(content, 'meta_description_missing', None):
                 score += 10
-            if hasattr(content, 'h1_tags_present') and not content.h1_tags_present:
+            if getattr(content, 'h1_tags_present', None) is False:
                 score += 10
-            if hasattr(content, 'ssl_certificate') and not content.ssl_certificate:
+            if getattr(content, 'ssl_certificate', None) is False:
                 score += 10
         
         return min(score, max_score)
@@ -441,10 +498,10 @@ class LeadQualifier:
                 talking_points.append(f"I noticed {company_name} has significant SEO improvement opportunities that could drive more local customers")
             
             if hasattr(seo_analysis, 'performance') and seo_analysis.performance:
-                if hasattr(seo_analysis.performance, 'pagespeed_score') and seo_analysis.performance.pagespeed_score < 70:
+                if getattr(seo_analysis.performance, 'pagespeed_score', None) is not None and seo_analysis.performance.pagespeed_score < 70:
                     talking_points.append(f"Your website's loading speed could be costing you potential customers - we can help improve this significantly")
                 
-                if hasattr(seo_analysis.performance, 'mobile_friendly') and not seo_analysis.performance.mobile_friendly:
+                if getattr(seo_analysis.performance, 'mobile_friendly', None) is False:
                     talking_points.append(f"With most customers searching on mobile, optimizing {company_name}'s mobile experience could boost your visibility")
         
         # Sector-specific talking points
@@ -533,42 +590,58 @@ class LeadQualifier:
             return "low"
 
     def qualify_batch(self, batch_size: int = 50) -> int:
-        """Qualify a batch of leads"""
+        """Qualify a batch of leads leased to this worker"""
+        # Lease companies needing qualification
+        company_ids = claim_companies(
+            ['seo_analyzed', 'contacts_extracted'], batch_size, owner=self.worker_id,
+            filters=[UKCompany.seo_overall_score.isnot(None)]
+        )
+        
+        if not company_ids:
+            logger.info("No companies found needing qualification")
+            return 0
+        
         try:
             with get_db_session() as session:
-                # Get companies needing qualification
-                companies = session.query(UKCompany).filter(
-                    UKCompany.status.in_(['seo_analyzed', 'contacts_extracted']),
-                    UKCompany.seo_overall_score.isnot(None)
-                ).limit(batch_size).all()
-                
-                if not companies:
-                    logger.info("No companies found needing qualification")
-                    return 0
-                
-                logger.info(f"Starting lead qualification for {len(companies)} companies")
-                qualified_count = 0
-                
-                for company in companies:
-                    try:
-                        qualification = self.qualify_lead(company.id)
-                        
-                        if qualification:
-                            qualified_count += 1
-                            logger.info(f"Qualified {company.company_name}: "
-                                      f"Score {qualification.final_score:.1f}, "
-                                      f"Tier {qualification.tier_label}")
-                        
-                    except Exception as e:
-                        logger.error(f"Error qualifying {company.company_name}: {e}")
-                        continue
-                
-                logger.info(f"Lead qualification complete: {qualified_count}/{len(companies)} qualified")
-                return qualified_count
+                companies = session.query(UKCompany.id, UKCompany.company_name).filter(
+                    UKCompany.id.in_(company_ids)
+                ).order_by(UKCompany.created_at).all()
+            
+            logger.info(f"Starting lead qualification for {len(companies)} companies")
+            qualified_count = asyncio.run(self._qualify_companies(companies))
+            
+            logger.info(f"Lead qualification complete: {qualified_count}/{len(companies)} qualified")
+            return qualified_count
                 
         except Exception as e:
             logger.error(f"Error in lead qualification batch: {e}")
             return 0
+        finally:
+            release_companies(company_ids, self.worker_id)
+
+    async def _qualify_companies(self, companies: List[Tuple[str, str]]) -> int:
+        """Qualify (id, name) pairs in one event loop; returns how many qualified"""
+        qualified_count = 0
+        
+        try:
+            for company_id, company_name in companies:
+                try:
+                    qualification = await self.qualify_company(company_id)
+                    
+                    if qualification:
+                        qualified_count += 1
+                        logger.info(f"Qualified {company_name}: "
+                                  f"Score {qualification.final_score:.1f}, "
+                                  f"Tier {qualification.tier_label}")
+                    
+                except Exception as e:
+                    logger.error(f"Error qualifying {company_name}: {e}")
+                    continue
+        finally:
+            # The client's session is bound to this asyncio.run loop
+            await close_http_client()
+        
+        return qualified_count
 
 # Convenience function
 def qualify_leads_batch(batch_size: int = 50) -> int:
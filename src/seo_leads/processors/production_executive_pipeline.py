@@ -14,25 +14,17 @@ from typing import List, Dict, Optional, Tuple, Set
 from urllib.parse import urlparse, urljoin
 from dataclasses import dataclass, asdict
 from concurrent.futures import ThreadPoolExecutor
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup, SoupStrainer
 import threading
 from queue import Queue
 import random
 
-# Context7 best practices imports
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, WebDriverException
-
 # Internal imports
 from src.seo_leads.models import Executive, ContactInfo, BusinessContext
 from src.seo_leads.ai.advanced_name_validator import AdvancedNameValidator
+from src.seo_leads.network.dns_cache import get_dns_cache
+from src.seo_leads.network.fetch_strategy import get_fetch_strategy
+from src.seo_leads.network.page_store import PageRecord
 
 # Configure logging for production
 logging.basicConfig(
@@ -45,14 +37,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Statuses retried by ProductionWebSession, as the urllib3 Retry it replaced did
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
 @dataclass
 class ProductionConfig:
     """Production configuration using Context7 best practices"""
     # Performance settings
     max_concurrent_companies: int = 5
     max_pages_per_company: int = 8
-    request_timeout: int = 30
-    selenium_timeout: int = 20
+    dns_prefetch_ahead: int = 20  # Queued companies whose DNS is resolved ahead of time
     
     # Content extraction settings
     enable_selenium_fallback: bool = True
@@ -67,6 +61,10 @@ class ProductionConfig:
     request_delay_min: float = 1.0
     request_delay_max: float = 3.0
     
+    # Retries on 429/5xx and connection failures, waiting retry_backoff * 2^n
+    max_retries: int = 3
+    retry_backoff: float = 0.3
+    
     # User agents for rotation (Context7 anti-detection)
     user_agents: List[str] = None
     
@@ -100,53 +98,19 @@ class ProductionWebSession:
     
     def __init__(self, config: ProductionConfig):
         self.config = config
-        self.session = None
-        self.selenium_driver = None
-        self._setup_requests_session()
-        
-    def _setup_requests_session(self):
-        """Setup requests session with Context7 optimizations"""
-        self.session = requests.Session()
-        
-        # Context7 retry strategy
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=0.3,
-            status_forcelist=[429, 500, 502, 503, 504],
-            allowed_methods=['GET', 'POST']
-        )
-        
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount('http://', adapter)
-        self.session.mount('https://', adapter)
-        
-        # Context7 session headers
-        self.session.headers.update({
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-GB,en-US;q=0.9,en;q=0.8',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'DNT': '1',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1'
-        })
     
     def get_random_user_agent(self) -> str:
         """Get random user agent for anti-detection"""
         return random.choice(self.config.user_agents)
     
     async def fetch_content(self, url: str, use_selenium: bool = False) -> Tuple[str, bool]:
-        """Fetch page content using Context7 best practices"""
-        try:
-            if use_selenium and self.config.enable_selenium_fallback:
-                return await self._fetch_with_selenium(url)
-            else:
-                return await self._fetch_with_requests(url)
-        except Exception as e:
-            logger.error(f"Error fetching {url}: {e}")
-            return "", False
-    
-    async def _fetch_with_requests(self, url: str) -> Tuple[str, bool]:
-        """Fetch content with requests session"""
+        """
+        Fetch page content using Context7 best practices
+        
+        Pages are fetched over plain HTTP first and rendered in the shared
+        browser pool only when they look JavaScript-rendered (remembered per
+        domain). use_selenium forces browser rendering.
+        """
         try:
             # Context7 rate limiting
             await asyncio.sleep(random.uniform(
@@ -154,77 +118,43 @@ class ProductionWebSession:
                 self.config.request_delay_max
             ))
             
-            # Rotate user agent
-            self.session.headers['User-Agent'] = self.get_random_user_agent()
+            fetch_strategy = await get_fetch_strategy()
+            for attempt in range(self.config.max_retries + 1):
+                record = await fetch_strategy.fetch(
+                    url,
+                    force_browser=use_selenium and self.config.enable_selenium_fallback,
+                    user_agent=self.get_random_user_agent()  # Rotate user agent
+                )
+                
+                if attempt == self.config.max_retries or not self._should_retry(record):
+                    break
+                
+                delay = self._retry_delay(record, attempt)
+                logger.debug(f"Retrying {url} in {delay:.1f}s ({record.status if record else 'no response'})")
+                await asyncio.sleep(delay)
             
-            # Make request
-            response = self.session.get(url, timeout=self.config.request_timeout)
-            response.raise_for_status()
+            if record is None or not record.ok:
+                logger.warning(f"Fetch failed for {url}: {record.status if record else 'no response'}")
+                return "", False
             
-            return response.text, True
+            return record.html, True
             
         except Exception as e:
-            logger.warning(f"Requests failed for {url}: {e}")
-            return "", False
-    
-    async def _fetch_with_selenium(self, url: str) -> Tuple[str, bool]:
-        """Fetch content with Selenium for JavaScript sites"""
-        if not self.selenium_driver:
-            self._setup_selenium()
-        
-        try:
-            self.selenium_driver.get(url)
-            
-            # Wait for page to load
-            WebDriverWait(self.selenium_driver, self.config.selenium_timeout).until(
-                EC.presence_of_element_located((By.TAG_NAME, "body"))
-            )
-            
-            # Get page source
-            content = self.selenium_driver.page_source
-            return content, True
-            
-        except (TimeoutException, WebDriverException) as e:
-            logger.warning(f"Selenium failed for {url}: {e}")
+            logger.error(f"Error fetching {url}: {e}")
             return "", False
     
-    def _setup_selenium(self):
-        """Setup Selenium with Context7 performance optimizations"""
-        try:
-            options = Options()
-            options.add_argument('--headless')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--disable-web-security')
-            options.add_argument('--allow-running-insecure-content')
-            options.add_argument('--disable-extensions')
-            options.add_argument('--disable-plugins')
-            options.add_argument('--disable-images')
-            options.add_argument('--disable-javascript')  # Only when not needed
-            options.add_argument(f'--user-agent={self.get_random_user_agent()}')
-            
-            # Context7 performance settings
-            prefs = {
-                "profile.managed_default_content_settings.images": 2,
-                "profile.default_content_setting_values.notifications": 2,
-                "profile.managed_default_content_settings.media_stream": 2,
-            }
-            options.add_experimental_option("prefs", prefs)
-            
-            self.selenium_driver = webdriver.Chrome(options=options)
-            self.selenium_driver.set_page_load_timeout(self.config.selenium_timeout)
-            
-        except Exception as e:
-            logger.error(f"Failed to setup Selenium: {e}")
-            self.selenium_driver = None
+    @staticmethod
+    def _should_retry(record: Optional[PageRecord]) -> bool:
+        """Connection failures, rate limiting and server errors are retried"""
+        return record is None or record.status in RETRY_STATUSES
     
-    def cleanup(self):
-        """Cleanup resources"""
-        if self.session:
-            self.session.close()
-        if self.selenium_driver:
-            self.selenium_driver.quit()
+    def _retry_delay(self, record: Optional[PageRecord], attempt: int) -> float:
+        """Exponential backoff, or the server's Retry-After when it gives one in seconds"""
+        if record is not None:
+            retry_after = {key.lower(): value for key, value in record.headers.items()}.get('retry-after')
+            if retry_after and retry_after.strip().isdigit():
+                return min(float(retry_after), 60.0)
+        return self.config.retry_backoff * (2 ** attempt)
 
 class ProductionContentAnalyzer:
     """Production content analyzer using Context7 BeautifulSoup best practices"""
@@ -490,9 +420,6 @@ class ProductionExecutivePipeline:
                 contact_completeness=0.0,
                 errors=errors
             )
-        
-        finally:
-            session.cleanup()
     
     async def _discover_relevant_pages(self, base_url: str, session: ProductionWebSession) -> List[str]:
         """Discover relevant pages for executive discovery"""
@@ -586,13 +513,22 @@ class ProductionExecutivePipeline:
         # Create semaphore for concurrency control
         semaphore = asyncio.Semaphore(self.config.max_concurrent_companies)
         
-        async def process_company_with_semaphore(company_data):
+        # Resolve the first window of queued domains up front; each company that
+        # starts then warms the one that just entered the window
+        dns_cache = get_dns_cache()
+        lookahead = self.config.dns_prefetch_ahead
+        dns_cache.prefetch_in_background(url for _, url in companies[:lookahead])
+        
+        async def process_company_with_semaphore(index, company_data):
             async with semaphore:
+                upcoming = companies[index + lookahead:index + lookahead + 1]
+                dns_cache.prefetch_in_background(url for _, url in upcoming)
+                
                 company_name, website_url = company_data
                 return await self.discover_executives_for_company(company_name, website_url)
         
         # Process all companies concurrently
-        tasks = [process_company_with_semaphore(company) for company in companies]
+        tasks = [process_company_with_semaphore(index, company) for index, company in enumerate(companies)]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Handle exceptions
@@ -723,8 +659,6 @@ async def main():
     config = ProductionConfig(
         max_concurrent_companies=3,  # Conservative for stability
         max_pages_per_company=5,
-        request_timeout=30,
-        selenium_timeout=20,
         min_confidence_score=0.6
     )
     
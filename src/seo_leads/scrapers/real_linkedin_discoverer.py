@@ -3,14 +3,19 @@ Real LinkedIn Discoverer - Genuine LinkedIn Profile Discovery
 Uses actual Google search to find real LinkedIn profiles instead of fabricating URLs
 """
 
+import asyncio
 import re
-import time
-import requests
 import logging
 from typing import List, Dict, Optional
 from urllib.parse import urlencode, urlparse
 from dataclasses import dataclass
 
+from ..network.http_client import AsyncHttpClient, get_http_client
+from ..network.rate_limiter import LINKEDIN_RATE_KEY, RateLimit, get_rate_limiter
+
+# Pause between searches on the same engine (previously a 2s sleep per person)
+SEARCH_RATE_LIMIT = RateLimit.per_interval(2.0)
+
 @dataclass
 class LinkedInProfile:
     """Represents a discovered LinkedIn profile with validation"""
@@ -72,9 +77,37 @@ class RealLinkedInDiscoverer:
         """
         Discover real LinkedIn profiles for a list of people.
         
+        Synchronous entry point for the sync extraction pipelines only; async
+        callers must await discover_linkedin_profiles_async instead, since this
+        runs its own event loop.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            pass
+        else:
+            raise RuntimeError("discover_linkedin_profiles cannot run inside an event loop; "
+                               "await discover_linkedin_profiles_async instead")
+        
+        async def run():
+            # A private client: this loop is discarded once the discovery returns
+            http_client = AsyncHttpClient()
+            try:
+                return await self.discover_linkedin_profiles_async(people, company_info, http_client)
+            finally:
+                await http_client.close()
+        
+        return asyncio.run(run())
+    
+    async def discover_linkedin_profiles_async(self, people: List[Dict], company_info: Dict,
+                                               http_client: Optional[AsyncHttpClient] = None) -> List[Dict]:
+        """
+        Discover real LinkedIn profiles for a list of people.
+        
         Args:
             people: List of people with names and other details
             company_info: Company information including name and domain
+            http_client: HTTP client to use (defaults to the shared client)
             
         Returns:
             List of people with discovered LinkedIn profiles
@@ -82,42 +115,16 @@ class RealLinkedInDiscoverer:
         try:
             company_name = company_info.get('name', '')
             company_domain = company_info.get('domain', '')
+            http_client = http_client or await get_http_client()
             
-            enriched_people = []
-            
-            for person in people:
-                person_name = person.get('name', '')
-                
-                if not person_name or len(person_name.split()) != 2:
-                    # Skip invalid names
-                    enriched_people.append({
-                        **person,
-                        'linkedin_url': None,
-                        'linkedin_confidence': 0.0,
-                        'linkedin_discovery_method': 'skipped_invalid_name'
-                    })
-                    continue
-                
-                # Attempt LinkedIn discovery
-                linkedin_result = self._search_linkedin_profile(person_name, company_name, company_domain)
-                
-                # Add LinkedIn data to person
-                enriched_person = {
-                    **person,
-                    'linkedin_url': linkedin_result['url'] if linkedin_result else None,
-                    'linkedin_confidence': linkedin_result['confidence'] if linkedin_result else 0.0,
-                    'linkedin_discovery_method': linkedin_result['method'] if linkedin_result else 'not_found',
-                    'linkedin_title': linkedin_result['title'] if linkedin_result else None,
-                    'linkedin_validation': linkedin_result['validation'] if linkedin_result else 'not_attempted'
-                }
-                
-                enriched_people.append(enriched_person)
-                
-                # Rate limiting to avoid being blocked
-                time.sleep(2)
+            # People are searched concurrently; the rate limiter paces each search engine
+            enriched_people = await asyncio.gather(*(
+                self._discover_person(person, company_name, company_domain, http_client)
+                for person in people
+            ))
             
             self.logger.info(f"LinkedIn discovery completed for {len(people)} people")
-            return enriched_people
+            return list(enriched_people)
             
         except Exception as e:
             self.logger.error(f"Error in LinkedIn discovery: {str(e)}")
@@ -132,7 +139,35 @@ class RealLinkedInDiscoverer:
                 for person in people
             ]
     
-    def _search_linkedin_profile(self, person_name: str, company_name: str, company_domain: str) -> Optional[Dict]:
+    async def _discover_person(self, person: Dict, company_name: str, company_domain: str,
+                               http_client: AsyncHttpClient) -> Dict:
+        """Attach LinkedIn discovery results to one person"""
+        person_name = person.get('name', '')
+        
+        if not person_name or len(person_name.split()) != 2:
+            # Skip invalid names
+            return {
+                **person,
+                'linkedin_url': None,
+                'linkedin_confidence': 0.0,
+                'linkedin_discovery_method': 'skipped_invalid_name'
+            }
+        
+        # Attempt LinkedIn discovery
+        linkedin_result = await self._search_linkedin_profile(person_name, company_name, company_domain, http_client)
+        
+        # Add LinkedIn data to person
+        return {
+            **person,
+            'linkedin_url': linkedin_result['url'] if linkedin_result else None,
+            'linkedin_confidence': linkedin_result['confidence'] if linkedin_result else 0.0,
+            'linkedin_discovery_method': linkedin_result['method'] if linkedin_result else 'not_found',
+            'linkedin_title': linkedin_result['title'] if linkedin_result else None,
+            'linkedin_validation': linkedin_result['validation'] if linkedin_result else 'not_attempted'
+        }
+    
+    async def _search_linkedin_profile(self, person_name: str, company_name: str, company_domain: str,
+                                       http_client: AsyncHttpClient) -> Optional[Dict]:
         """
         Search for a person's LinkedIn profile using multiple methods.
         
@@ -147,25 +182,26 @@ class RealLinkedInDiscoverer:
         
         # Method 1: Search with company name
         if company_name:
-            result = self._perform_linkedin_search(person_name, company_name)
+            result = await self._perform_linkedin_search(person_name, company_name, http_client)
             if result and result['confidence'] > 0.7:
                 return result
         
         # Method 2: Search with domain
         if company_domain:
             domain_clean = company_domain.replace('www.', '').replace('.com', '').replace('.co.uk', '')
-            result = self._perform_linkedin_search(person_name, domain_clean)
+            result = await self._perform_linkedin_search(person_name, domain_clean, http_client)
             if result and result['confidence'] > 0.6:
                 return result
         
         # Method 3: General search (lower confidence)
-        result = self._perform_linkedin_search(person_name, '')
+        result = await self._perform_linkedin_search(person_name, '', http_client)
         if result and result['confidence'] > 0.5:
             return result
         
         return None
     
-    def _perform_linkedin_search(self, person_name: str, company_context: str) -> Optional[Dict]:
+    async def _perform_linkedin_search(self, person_name: str, company_context: str,
+                                       http_client: AsyncHttpClient) -> Optional[Dict]:
         """
         Perform actual web search for LinkedIn profiles.
         
@@ -184,11 +220,11 @@ class RealLinkedInDiscoverer:
                 search_query = f'"{person_name}" site:linkedin.com/in'
             
             # Try Google search first
-            search_results = self._google_search(search_query)
+            search_results = await self._google_search(search_query, http_client)
             
             if not search_results:
                 # Fallback to Bing search
-                search_results = self._bing_search(search_query)
+                search_results = await self._bing_search(search_query, http_client)
             
             if not search_results:
                 return None
@@ -198,7 +234,7 @@ class RealLinkedInDiscoverer:
             
             if best_match:
                 # Validate the LinkedIn URL
-                validation_result = self._validate_linkedin_profile(best_match['url'])
+                validation_result = await self._validate_linkedin_profile(best_match['url'], http_client)
                 
                 return {
                     'url': best_match['url'],
@@ -214,7 +250,7 @@ class RealLinkedInDiscoverer:
             self.logger.error(f"Error in LinkedIn search for {person_name}: {str(e)}")
             return None
     
-    def _google_search(self, query: str) -> List[Dict]:
+    async def _google_search(self, query: str, http_client: AsyncHttpClient) -> List[Dict]:
         """
         Perform Google search (simplified approach).
         Note: This is a basic implementation. Production systems should use Google Custom Search API.
@@ -235,10 +271,11 @@ class RealLinkedInDiscoverer:
             
             # Note: This approach may be blocked by Google
             # For production, implement proper API-based search
-            response = requests.get(search_url, params=params, headers=headers, timeout=10)
+            await get_rate_limiter().acquire(search_url, SEARCH_RATE_LIMIT)
+            response = await http_client.get(f"{search_url}?{urlencode(params)}", headers=headers, timeout=10)
             
-            if response.status_code == 200:
-                return self._parse_google_results(response.text)
+            if response.status == 200:
+                return self._parse_google_results(response.text())
             
             return []
             
@@ -246,7 +283,7 @@ class RealLinkedInDiscoverer:
             self.logger.warning(f"Google search failed: {str(e)}")
             return []
     
-    def _bing_search(self, query: str) -> List[Dict]:
+    async def _bing_search(self, query: str, http_client: AsyncHttpClient) -> List[Dict]:
         """
         Perform Bing search as fallback.
         Note: This is a basic implementation. Production systems should use Bing Search API.
@@ -262,10 +299,11 @@ class RealLinkedInDiscoverer:
                 'User-Agent': self.user_agents[1]
             }
             
-            response = requests.get(search_url, params=params, headers=headers, timeout=10)
+            await get_rate_limiter().acquire(search_url, SEARCH_RATE_LIMIT)
+            response = await http_client.get(f"{search_url}?{urlencode(params)}", headers=headers, timeout=10)
             
-            if response.status_code == 200:
-                return self._parse_bing_results(response.text)
+            if response.status == 200:
+                return self._parse_bing_results(response.text())
             
             return []
             
@@ -415,7 +453,7 @@ class RealLinkedInDiscoverer:
         
         return None
     
-    def _validate_linkedin_profile(self, linkedin_url: str) -> Dict:
+    async def _validate_linkedin_profile(self, linkedin_url: str, http_client: AsyncHttpClient) -> Dict:
         """
         Validate that a LinkedIn URL is accessible and contains a real profile.
         
@@ -438,14 +476,15 @@ class RealLinkedInDiscoverer:
                 'User-Agent': self.user_agents[0]
             }
             
-            response = requests.head(linkedin_url, headers=headers, timeout=5, allow_redirects=True)
+            await get_rate_limiter().acquire(LINKEDIN_RATE_KEY, SEARCH_RATE_LIMIT)
+            response = await http_client.head(linkedin_url, headers=headers, timeout=5)
             
-            if response.status_code == 200:
+            if response.status == 200:
                 return {
                     'status': 'accessible',
                     'confidence_multiplier': 1.0
                 }
-            elif response.status_code == 403:
+            elif response.status == 403:
                 # LinkedIn blocks automated access, but URL might be valid
                 return {
                     'status': 'blocked_but_likely_valid',
@@ -4,16 +4,15 @@ Alternative data source for executive discovery via social media platforms
 Focuses on Twitter, Facebook, and other professional networks
 """
 
-import asyncio
 import logging
-import time
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
-import aiohttp
-import requests
 from bs4 import BeautifulSoup
 import re
-from urllib.parse import urljoin, urlparse
+from urllib.parse import quote_plus, urljoin, urlparse
+
+from ..network.http_client import get_http_client
+from ..network.rate_limiter import GOOGLE_SEARCH_RATE_KEY, RateLimit, get_rate_limiter, rate_limit_key
 
 logger = logging.getLogger(__name__)
 
@@ -50,9 +49,8 @@ class SocialMediaSearchEngine:
     """Search engine for finding social media profiles"""
     
     def __init__(self):
-        self.session = None
         self.rate_limit_delay = 1.0  # Be respectful with rate limiting
-        self.last_request_time = 0
+        self.rate_limiter = get_rate_limiter()
         
         # Search patterns for different platforms
         self.platform_patterns = {
@@ -74,18 +72,11 @@ class SocialMediaSearchEngine:
     
     async def __aenter__(self):
         """Async context manager entry"""
-        self.session = aiohttp.ClientSession(
-            headers={
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            },
-            timeout=aiohttp.ClientTimeout(total=30)
-        )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.session:
-            await self.session.close()
+        """Async context manager exit (connections belong to the shared HTTP client)"""
+        pass
     
     async def search_social_profiles(self, person_name: str, company_name: str) -> List[SocialMediaProfile]:
         """Search for social media profiles of a person"""
@@ -138,18 +129,12 @@ class SocialMediaSearchEngine:
         # Note: In production, you would use Google Custom Search API
         # This is a simplified version for demonstration
         
-        search_url = f"https://www.google.com/search?q={query}"
+        search_url = f"https://www.google.com/search?q={quote_plus(query)}"
         
         try:
-            if self.session:
-                async with self.session.get(search_url) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        return self._parse_google_results(html)
-            else:
-                response = requests.get(search_url, timeout=30)
-                if response.status_code == 200:
-                    return self._parse_google_results(response.text)
+            html = await self._get_html(search_url)
+            if html:
+                return self._parse_google_results(html)
         except Exception as e:
             logger.warning(f"Google search failed: {e}")
         
@@ -223,18 +208,12 @@ class SocialMediaSearchEngine:
     async def _analyze_twitter_profile(self, url: str, person_name: str, 
                                      company_name: str) -> Optional[SocialMediaProfile]:
         """Analyze Twitter profile"""
-        await self._rate_limit()
+        await self._rate_limit(url)
         
         try:
-            if self.session:
-                async with self.session.get(url) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        return self._parse_twitter_profile(html, url, person_name, company_name)
-            else:
-                response = requests.get(url, timeout=30)
-                if response.status_code == 200:
-                    return self._parse_twitter_profile(response.text, url, person_name, company_name)
+            html = await self._get_html(url)
+            if html:
+                return self._parse_twitter_profile(html, url, person_name, company_name)
         except Exception as e:
             logger.warning(f"Twitter profile fetch failed: {e}")
         
@@ -323,11 +302,9 @@ class SocialMediaSearchEngine:
                                      company_name: str, platform: str) -> Optional[SocialMediaProfile]:
         """Analyze generic social media profile"""
         try:
-            if self.session:
-                async with self.session.get(url) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        return self._parse_generic_profile(html, url, person_name, company_name, platform)
+            html = await self._get_html(url)
+            if html:
+                return self._parse_generic_profile(html, url, person_name, company_name, platform)
         except Exception as e:
             logger.warning(f"Generic profile fetch failed: {e}")
         
@@ -409,16 +386,19 @@ class SocialMediaSearchEngine:
         
         return unique_profiles
     
-    async def _rate_limit(self):
+    async def _get_html(self, url: str) -> Optional[str]:
+        """GET a page on the shared HTTP client, returning the HTML of a 200 response"""
+        http_client = await get_http_client()
+        response = await http_client.get(url, timeout=30)
+        return response.text() if response.status == 200 else None
+    
+    async def _rate_limit(self, url: Optional[str] = None):
         """Implement rate limiting to be respectful"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        if time_since_last < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - time_since_last
-            await asyncio.sleep(sleep_time)
-        
-        self.last_request_time = time.time()
+        if url is None:
+            # Searches go to Google, so they share its registered budget
+            await self.rate_limiter.acquire(GOOGLE_SEARCH_RATE_KEY)
+        else:
+            await self.rate_limiter.acquire(rate_limit_key(url), RateLimit.per_interval(self.rate_limit_delay))
 
 class SocialMediaExecutiveExtractor:
     """Extract executives from social media platforms"""
@@ -19,13 +19,15 @@ from typing import Dict, List, Optional, Tuple
 from urllib.parse import urljoin, urlparse
 from dataclasses import dataclass
 
-import requests
 from bs4 import BeautifulSoup
 from fuzzywuzzy import fuzz
-from playwright.async_api import async_playwright, Page
+from playwright.async_api import Page
 
 from ..models import WebsiteExecutive, ExecutiveContact, EXECUTIVE_PATTERNS
 from ..config import get_processing_config
+from ..network.browser_pool import get_browser_pool
+from ..network.http_client import get_http_client
+from ..network.site_map import get_site_map_discovery, is_executive_link_text
 
 logger = logging.getLogger(__name__)
 
@@ -143,6 +145,15 @@ class WebsiteExecutiveScraper:
     
     async def _find_executive_pages(self, base_url: str) -> List[str]:
         """Find pages that likely contain executive information"""
+        
+        # Pages the site actually links to or lists in its sitemap, best first
+        discovered_pages = await self._discover_executive_pages_from_sitemap(base_url)
+        if discovered_pages:
+            executive_pages = [base_url] + [url for url in discovered_pages if url != base_url]
+            logger.info(f"Found {len(executive_pages)} potential executive pages from site map")
+            return executive_pages[:len(self.executive_page_patterns)]
+        
+        # Nothing discoverable: fall back to guessing common paths
         executive_pages = []
         
         # Add potential executive pages
@@ -153,76 +164,34 @@ class WebsiteExecutiveScraper:
         # Also check homepage for executive sections
         executive_pages.append(base_url)
         
-        # Try to discover additional pages by crawling the website
-        discovered_pages = await self._discover_executive_pages_from_sitemap(base_url)
-        executive_pages.extend(discovered_pages)
-        
-        # Remove duplicates and validate URLs
-        valid_pages = []
-        seen_urls = set()
-        
-        for url in executive_pages:
-            if url not in seen_urls:
-                if await self._is_valid_executive_page(url):
-                    valid_pages.append(url)
-                    seen_urls.add(url)
+        # Remove duplicates and validate URLs concurrently (order preserved)
+        candidate_urls = list(dict.fromkeys(executive_pages))
+        checks = await asyncio.gather(*(self._is_valid_executive_page(url) for url in candidate_urls))
+        valid_pages = [url for url, is_valid in zip(candidate_urls, checks) if is_valid]
         
         logger.info(f"Found {len(valid_pages)} potential executive pages")
         return valid_pages
     
     async def _discover_executive_pages_from_sitemap(self, base_url: str) -> List[str]:
         """Try to find executive pages from website navigation or sitemap"""
-        discovered_pages = []
-        
         try:
-            async with async_playwright() as playwright:
-                browser = await playwright.chromium.launch(headless=True)
-                page = await browser.new_page()
-                
-                await page.goto(base_url, timeout=30000)
-                await page.wait_for_load_state('domcontentloaded')
-                
-                # Look for navigation links that might lead to executive pages
-                nav_links = await page.query_selector_all('nav a, .menu a, .navigation a')
-                
-                for link in nav_links:
-                    try:
-                        href = await link.get_attribute('href')
-                        text = await link.text_content()
-                        
-                        if href and text:
-                            # Check if link text suggests executive content
-                            if self._is_executive_link_text(text.lower()):
-                                full_url = urljoin(base_url, href)
-                                discovered_pages.append(full_url)
-                    except:
-                        continue
-                
-                await browser.close()
-                
+            site_map_discovery = await get_site_map_discovery()
+            site_map = await site_map_discovery.discover(base_url)
+            return site_map.candidate_urls(include_contact=False)
         except Exception as e:
             logger.debug(f"Error discovering executive pages: {e}")
-        
-        return discovered_pages
+            return []
     
     def _is_executive_link_text(self, text: str) -> bool:
         """Check if link text suggests executive content"""
-        executive_keywords = [
-            'team', 'about', 'leadership', 'management', 'executives',
-            'staff', 'people', 'directors', 'board', 'who we are',
-            'meet the team', 'our people', 'key people'
-        ]
-        
-        for keyword in executive_keywords:
-            if keyword in text:
-                return True
-        return False
+        return is_executive_link_text(text)
     
     async def _is_valid_executive_page(self, url: str) -> bool:
         """Check if URL returns a valid page"""
         try:
-            response = requests.head(url, timeout=10, allow_redirects=True)
-            return response.status_code == 200
+            http_client = await get_http_client()
+            response = await http_client.head(url, timeout=10)
+            return response.status == 200
         except:
             return False
     
@@ -231,10 +200,9 @@ class WebsiteExecutiveScraper:
         executives = []
         
         try:
-            async with async_playwright() as playwright:
-                browser = await playwright.chromium.launch(headless=True)
-                page = await browser.new_page()
-                
+            browser_pool = await get_browser_pool()
+            
+            async with browser_pool.page(domain) as page:
                 await page.goto(page_url, timeout=30000)
                 await page.wait_for_load_state('domcontentloaded')
                 
@@ -257,8 +225,6 @@ class WebsiteExecutiveScraper:
                         logger.debug(f"Strategy failed on {page_url}: {e}")
                         continue
                 
-                await browser.close()
-                
         except Exception as e:
             logger.debug(f"Error extracting from page {page_url}: {e}")
         
@@ -0,0 +1,369 @@
+"""
+Write-Behind Persistence
+
+Discovery results used to be written one company at a time, each in its own
+session and commit. Under SQLite every one of those commits waits on the
+single writer lock and an fsync, so concurrent workers end up queuing on the
+database instead of the network.
+
+Producers now enqueue company column updates and ExecutiveContactDB rows, and
+one writer task per event loop commits them together:
+
+    await writer.update_company(company_id, {'email': ...}, advance_status=('scraped', 'contacts_extracted'))
+    await writer.replace_executives(company_uuid, executive_rows)
+    await writer.update_company(company_id, seo_columns, wait=True)  # returns once committed
+
+Waiting on a company update also reports whether the company row still
+existed when the batch was written (a deleted or merged company is skipped,
+not an error).
+
+A batch is written when batch_size operations are queued or flush_interval
+seconds after its first operation, as one transaction of executemany
+updates and bulk insert mappings. Operations are committed in the order they were
+queued, so waiting on one also makes every earlier operation durable. If a
+batch fails, its operations are retried one by one so a single bad row
+doesn't take the rest of the batch down with it.
+
+The writer is bound to the event loop that created it; get_write_behind()
+hands out a fresh writer when called from a different loop. Operations still
+queued when the loop shuts down (end of asyncio.run) are written before the
+writer task exits.
+"""
+
+import asyncio
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import bindparam, update
+
+from .database import run_db_session
+from .models import ExecutiveContactDB, UKCompany
+
+logger = logging.getLogger(__name__)
+
+# Company IDs per existence query; keeps bound parameters under SQLite's 999 limit
+EXISTENCE_CHUNK_IDS = 500
+
+@dataclass
+class WriteBehindConfig:
+    """Batch size, flush latency and queue bound for the writer"""
+    batch_size: int = 200  # Operations per transaction
+    flush_interval: float = 0.25  # Seconds a queued operation waits for its batch to fill
+    max_pending: int = 10000  # Producers wait on put() beyond this many queued operations
+
+    def __post_init__(self):
+        self.batch_size = int(os.environ.get('WRITE_BEHIND_BATCH_SIZE', self.batch_size))
+        self.flush_interval = float(os.environ.get('WRITE_BEHIND_FLUSH_INTERVAL', self.flush_interval))
+        self.max_pending = int(os.environ.get('WRITE_BEHIND_MAX_PENDING', self.max_pending))
+
+@dataclass
+class CompanyUpdate:
+    """Column values for one company, plus an optional conditional status change"""
+    company_id: str
+    values: Dict[str, Any]
+    advance_status: Optional[Tuple[str, str]] = None  # (from, to): only moves rows still in `from`
+    waiter: Optional[asyncio.Future] = None
+
+@dataclass
+class ExecutiveWrite:
+    """ExecutiveContactDB rows for one company, optionally replacing the stored ones"""
+    company_id: Any
+    rows: List[Dict[str, Any]]
+    replace: bool = True
+    waiter: Optional[asyncio.Future] = None
+
+@dataclass
+class FlushMarker:
+    """Ends the current batch; resolved once everything before it is committed"""
+    waiter: Optional[asyncio.Future] = None
+
+@dataclass
+class PendingBatch:
+    """Operations of one batch merged into bulk statements"""
+    updates: Dict[str, Dict[str, Any]] = field(default_factory=OrderedDict)
+    status_moves: Dict[Tuple[str, str], List[str]] = field(default_factory=dict)
+    executives: Dict[Any, Tuple[bool, List[Dict[str, Any]]]] = field(default_factory=OrderedDict)
+
+    def add(self, operation):
+        if isinstance(operation, CompanyUpdate):
+            if operation.values:
+                # Later updates to the same company win column by column
+                self.updates.setdefault(operation.company_id, {}).update(operation.values)
+            if operation.advance_status:
+                self.status_moves.setdefault(operation.advance_status, []).append(operation.company_id)
+        elif isinstance(operation, ExecutiveWrite):
+            replace, rows = self.executives.get(operation.company_id, (False, []))
+            if operation.replace:
+                # A newer replacement supersedes anything queued before it
+                replace, rows = True, []
+            self.executives[operation.company_id] = (replace, rows + list(operation.rows))
+
+    def write(self, session) -> Set[str]:
+        """
+        Apply the batch in one transaction (runs as run_db_session work)
+
+        Returns:
+            IDs of the updated companies whose rows exist
+        """
+        replaced = [company_id for company_id, (replace, _) in self.executives.items() if replace]
+        if replaced:
+            session.query(ExecutiveContactDB).filter(
+                ExecutiveContactDB.company_id.in_(replaced)
+            ).delete(synchronize_session=False)
+
+        executive_rows = [row for _, rows in self.executives.values() for row in rows]
+        if executive_rows:
+            session.bulk_insert_mappings(ExecutiveContactDB, executive_rows)
+
+        company_ids = list(dict.fromkeys(
+            list(self.updates) + [company_id for ids in self.status_moves.values() for company_id in ids]
+        ))
+        existing: Set[str] = set()
+        for start in range(0, len(company_ids), EXISTENCE_CHUNK_IDS):
+            chunk = company_ids[start:start + EXISTENCE_CHUNK_IDS]
+            existing.update(row[0] for row in session.query(UKCompany.id).filter(UKCompany.id.in_(chunk)))
+
+        if self.updates:
+            # One executemany per distinct column set; unlike bulk_update_mappings
+            # a company deleted or merged meanwhile is skipped, not an error
+            now = datetime.utcnow()
+            groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+            for company_id, values in self.updates.items():
+                groups.setdefault(tuple(sorted(values)), []).append(
+                    {'company_id': company_id, 'updated_at': now, **values}
+                )
+
+            table = UKCompany.__table__
+            statement = update(table).where(table.c.id == bindparam('company_id'))
+            for rows in groups.values():
+                session.execute(statement, rows)
+
+        for (from_status, to_status), company_ids in self.status_moves.items():
+            session.query(UKCompany).filter(
+                UKCompany.id.in_(company_ids),
+                UKCompany.status == from_status
+            ).update({'status': to_status}, synchronize_session=False)
+
+        return existing
+
+class WriteBehindWriter:
+    """
+    Queue of pending writes committed in batches by a single writer task
+
+    Features:
+    - Company updates and executive rows batched into one transaction
+    - Flushed by size (batch_size) or time (flush_interval)
+    - Bounded queue, so producers slow down when the database falls behind
+    - wait=True / flush() for callers that need durability
+    """
+
+    def __init__(self, config: Optional[WriteBehindConfig] = None):
+        self.config = config or WriteBehindConfig()
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._batch: List[Any] = []  # Operations taken off the queue but not yet written
+
+        self.stats = {
+            'queued': 0,
+            'written': 0,
+            'batches': 0,
+            'failed': 0
+        }
+
+    async def update_company(self, company_id: str, values: Dict[str, Any],
+                             advance_status: Optional[Tuple[str, str]] = None, wait: bool = False) -> Optional[bool]:
+        """
+        Queue column updates for one company
+
+        Args:
+            company_id: UKCompany.id
+            values: Column values to set
+            advance_status: (from, to) status change applied only while the company is still in `from`
+            wait: Return only once the update is committed
+
+        Returns:
+            With wait, whether the company row existed and was updated; otherwise None
+        """
+        return await self._submit(CompanyUpdate(company_id, dict(values), advance_status), wait)
+
+    async def replace_executives(self, company_id: Any, rows: Sequence[Dict[str, Any]], wait: bool = False):
+        """Queue a company's ExecutiveContactDB rows, replacing those already stored"""
+        await self._submit(ExecutiveWrite(company_id, list(rows), replace=True), wait)
+
+    async def add_executives(self, company_id: Any, rows: Sequence[Dict[str, Any]], wait: bool = False):
+        """Queue ExecutiveContactDB rows to be added alongside those already stored"""
+        await self._submit(ExecutiveWrite(company_id, list(rows), replace=False), wait)
+
+    async def flush(self):
+        """Wait until everything queued so far has been written (failures are logged)"""
+        if self._queue is None:
+            return
+        await self._submit(FlushMarker(), wait=True)
+
+    async def close(self):
+        """Write everything queued and stop the writer task"""
+        if self._task is None:
+            return
+
+        await self._queue.put(None)
+        try:
+            await self._task
+        finally:
+            self._task = None
+            logger.debug(f"Write-behind writer closed: {self.stats}")
+
+    async def _submit(self, operation, wait: bool):
+        self._ensure_started()
+        if wait:
+            operation.waiter = self.loop.create_future()
+
+        await self._queue.put(operation)
+        self.stats['queued'] += 1
+
+        if operation.waiter is not None:
+            return await operation.waiter
+        return None
+
+    def _ensure_started(self):
+        """Start the writer task on the running loop"""
+        if self._task is not None and not self._task.done():
+            return
+
+        self.loop = asyncio.get_running_loop()
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.config.max_pending)
+        self._task = self.loop.create_task(self._run())
+
+    async def _run(self):
+        """Writer task: collect a batch, write it, repeat"""
+        write_task: Optional[asyncio.Task] = None
+        try:
+            while True:
+                stop = await self._collect_batch()
+                if self._batch:
+                    batch, self._batch = self._batch, []
+                    write_task = asyncio.ensure_future(self._write(batch))
+                    await asyncio.shield(write_task)
+                    write_task = None
+                if stop:
+                    return
+        except asyncio.CancelledError:
+            # Loop shutting down (e.g. end of asyncio.run): finish what was queued
+            if write_task is not None and not write_task.done():
+                await write_task
+            remaining = self._batch + self._drain_queue()
+            self._batch = []
+            if remaining:
+                await self._write(remaining)
+            raise
+
+    async def _collect_batch(self) -> bool:
+        """Fill self._batch by size or time; returns True once close() was requested"""
+        operation = await self._queue.get()
+        if operation is None:
+            return True
+        self._batch.append(operation)
+
+        deadline = self.loop.time() + self.config.flush_interval
+        while len(self._batch) < self.config.batch_size and not isinstance(operation, FlushMarker):
+            try:
+                operation = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                timeout = deadline - self.loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    operation = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+
+            if operation is None:
+                return True
+            self._batch.append(operation)
+
+        return False
+
+    def _drain_queue(self) -> List[Any]:
+        operations = []
+        while self._queue is not None and not self._queue.empty():
+            operation = self._queue.get_nowait()
+            if operation is not None:
+                operations.append(operation)
+        return operations
+
+    async def _write(self, operations: List[Any]):
+        """Commit a batch, falling back to one transaction per operation if it fails"""
+        writes = [operation for operation in operations if not isinstance(operation, FlushMarker)]
+
+        try:
+            existing = await self._commit(writes) if writes else set()
+            self.stats['batches'] += 1
+            self.stats['written'] += len(writes)
+            self._resolve(operations, existing=existing)
+            return
+        except Exception as e:
+            if len(writes) <= 1:
+                self.stats['failed'] += len(writes)
+                logger.error(f"Write-behind write failed: {e}")
+                self._resolve(operations, e)
+                return
+            logger.warning(f"Write-behind batch of {len(writes)} failed ({e}); retrying individually")
+
+        for operation in operations:
+            error = None
+            existing: Set[str] = set()
+            if not isinstance(operation, FlushMarker):
+                try:
+                    existing = await self._commit([operation])
+                    self.stats['written'] += 1
+                except Exception as e:
+                    self.stats['failed'] += 1
+                    logger.error(f"Write-behind write for company {operation.company_id} failed: {e}")
+                    error = e
+            self._resolve([operation], error, existing)
+
+    async def _commit(self, operations: List[Any]) -> Set[str]:
+        batch = PendingBatch()
+        for operation in operations:
+            batch.add(operation)
+        return await run_db_session(batch.write)
+
+    @staticmethod
+    def _resolve(operations: List[Any], error: Optional[Exception] = None, existing: Optional[Set[str]] = None):
+        """Complete waiters; company updates learn whether their row existed"""
+        for operation in operations:
+            waiter = operation.waiter
+            if waiter is None or waiter.done():
+                continue
+            if error is not None and not isinstance(operation, FlushMarker):
+                waiter.set_exception(error)
+            elif isinstance(operation, CompanyUpdate):
+                waiter.set_result(operation.company_id in (existing or ()))
+            else:
+                waiter.set_result(None)
+
+# Global writer instance
+_write_behind: Optional[WriteBehindWriter] = None
+
+async def get_write_behind() -> WriteBehindWriter:
+    """Get global write-behind writer for the running event loop"""
+    global _write_behind
+    loop = asyncio.get_running_loop()
+
+    # The queue and writer task belong to the loop that created them
+    if _write_behind is None or (_write_behind.loop is not None and _write_behind.loop is not loop):
+        _write_behind = WriteBehindWriter()
+
+    return _write_behind
+
+async def close_write_behind():
+    """Write everything queued and stop the global writer"""
+    global _write_behind
+    if _write_behind is not None:
+        await _write_behind.close()
+        _write_behind = None